@@ -0,0 +1,92 @@
+"""
+Benchmark of the memory use and run time of the IRLS iterations in GLM
+
+The IRLS loop of GLM.fit is compared with a loop that builds the working
+weights and response from the separate link and variance functions and
+fits a WLS model in each iteration, which is how GLM was estimated before
+the loop worked on preallocated arrays.
+
+Peak memory is traced with tracemalloc, which requires Python 3 and numpy
+1.13 or later.  The number of observations can be given on the command
+line, the default of 10 million rows needs several GB of memory:
+
+    python glm_irls_benchmark.py 10000000
+"""
+from __future__ import print_function, division
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import statsmodels.api as sm
+from statsmodels.genmod.generalized_linear_model import _check_convergence
+
+
+def fit_reference(model, maxiter=100, tol=1e-8):
+    """
+    IRLS with a new WLS model in each iteration
+    """
+    family = model.family
+    endog, exog = model.endog, model.exog
+    mu = family.starting_mu(endog)
+    lin_pred = family.predict(mu)
+    dev = family.deviance(endog, mu)
+    history = dict(params=[np.inf], deviance=[np.inf, dev])
+    for iteration in range(maxiter):
+        weights = family.weights(mu)
+        wlsendog = lin_pred + family.link.deriv(mu) * (endog - mu)
+        wls_results = sm.WLS(wlsendog, exog, weights).fit()
+        lin_pred = np.dot(exog, wls_results.params)
+        mu = family.fitted(lin_pred)
+        history['deviance'].append(family.deviance(endog, mu))
+        if _check_convergence(history['deviance'], iteration + 1, tol, 0.):
+            break
+    return wls_results.params, iteration + 1
+
+
+def fit_glm(model, maxiter=100, tol=1e-8):
+    res = model.fit(maxiter=maxiter, tol=tol)
+    return res.params, res.fit_history['iteration']
+
+
+def measure(func, model):
+    tracemalloc.start()
+    t0 = time.time()
+    params, n_iter = func(model)
+    elapsed = time.time() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return params, n_iter, elapsed, peak
+
+
+def simulate(nobs, family, k=5, seed=987125):
+    np.random.seed(seed)
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, k - 1)))
+    params = np.linspace(0.5, -0.5, k) / np.sqrt(k)
+    mu = family.fitted(exog.dot(params))
+    if isinstance(family, sm.families.Poisson):
+        endog = np.random.poisson(mu).astype(np.float64)
+    else:
+        endog = (np.random.rand(nobs) < mu).astype(np.float64)
+    return endog, exog
+
+
+if __name__ == '__main__':
+    nobs = int(sys.argv[1]) if len(sys.argv) > 1 else 10**7
+    mb = 2.**20
+    for family in [sm.families.Poisson(), sm.families.Binomial()]:
+        endog, exog = simulate(nobs, family)
+        model = sm.GLM(endog, exog, family=family)
+        print('%s, nobs=%d, data %.0f MB' % (family.__class__.__name__, nobs,
+                                             (endog.nbytes + exog.nbytes) / mb))
+        results = []
+        for name, func in [('reference', fit_reference), ('GLM.fit', fit_glm)]:
+            params, n_iter, elapsed, peak = measure(func, model)
+            results.append(params)
+            print('  %-10s %3d iterations, %8.3f s per iteration, '
+                  'peak memory %8.1f MB' % (name, n_iter, elapsed / n_iter,
+                                            peak / mb))
+        print('  max abs difference of params: %.2g' %
+              np.abs(results[0] - results[1]).max())
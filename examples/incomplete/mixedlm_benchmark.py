@@ -0,0 +1,81 @@
+"""
+Benchmark of the fit time of MixedLM versus the number of groups
+
+Three versions of the covariance solves are compared:
+
+    uncached  every call of loglike, score and hessian factors the
+              covariance matrices of all groups again, one group at a
+              time, which is how MixedLM was estimated before the solves
+              were cached
+    loop      the solves are shared between the calls at the same
+              parameter value, the groups are solved one at a time
+    batched   the solves are shared, and groups of equal size are solved
+              together with stacked linear algebra (the default)
+
+The model has random intercepts and slopes and a variance component, the
+groups have between 4 and 6 observations.  The numbers of groups can be
+given on the command line:
+
+    python mixedlm_benchmark.py 100 1000 10000
+"""
+from __future__ import print_function, division
+
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from statsmodels.regression.mixed_linear_model import MixedLM
+
+
+class LoopMixedLM(MixedLM):
+    _batch_groups = False
+
+
+class UncachedMixedLM(LoopMixedLM):
+
+    def _get_factors(self, cov_re, vcomp):
+        self._factor_cache = None
+        return super(UncachedMixedLM, self)._get_factors(cov_re, vcomp)
+
+
+def simulate(n_groups, seed=3253):
+    np.random.seed(seed)
+    sizes = np.random.randint(4, 7, size=n_groups)
+    groups = np.repeat(np.arange(n_groups), sizes)
+    nobs = len(groups)
+    exog = np.column_stack((np.ones(nobs), np.random.normal(size=(nobs, 2))))
+    exog_re = np.column_stack((np.ones(nobs), np.random.normal(size=nobs)))
+    x_vc = np.random.normal(size=nobs)
+    endog = (exog.sum(1) + np.random.normal(size=n_groups)[groups] +
+             0.5 * exog_re[:, 1] * np.random.normal(size=n_groups)[groups] +
+             0.5 * x_vc * np.random.normal(size=n_groups)[groups] +
+             np.random.normal(size=nobs))
+    bounds = np.concatenate(([0], np.cumsum(sizes)))
+    exog_vc = {'vc': dict((i, x_vc[bounds[i]:bounds[i + 1], None])
+                          for i in range(n_groups))}
+    return endog, exog, groups, exog_re, exog_vc
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        n_groups_list = [int(arg) for arg in sys.argv[1:]]
+    else:
+        n_groups_list = [100, 1000, 10000]
+    print('%8s %12s %12s %12s' % ('groups', 'uncached', 'loop', 'batched'))
+    for n_groups in n_groups_list:
+        data = simulate(n_groups)
+        times, params = [], []
+        for klass in [UncachedMixedLM, LoopMixedLM, MixedLM]:
+            model = klass(*data)
+            t0 = time.time()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                result = model.fit()
+            times.append(time.time() - t0)
+            params.append(result.params)
+        print('%8d %11.2fs %11.2fs %11.2fs' % ((n_groups,) + tuple(times)))
+        diff = max(np.abs(p - params[-1]).max() for p in params)
+        if diff > 1e-6:
+            print('    max abs difference of params: %.2g' % diff)
@@ -55,15 +55,26 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
         heteroscedasticity robust covariance
     - 'HAC' and keywords
 
-        - `maxlag` integer (required) : number of lags to use
-        - `kernel` string (optional) : kernel, default is Bartlett
+        - `maxlags` integer (optional) : number of lags to use.  If None
+              (default), the number of lags is chosen by `lag_selection`.
+        - `lag_selection` string (optional) : 'newey-west' (default) or
+              'andrews' plug-in for the automatic number of lags, see
+              `sandwich_covariance.hac_nlags`
+        - `weights_func` callable (optional) : kernel, default is Bartlett
         - `use_correction` bool (optional) : If true, use small sample
               correction
+        - `chunk_size` int (optional) : If given, the covariance is
+              accumulated over chunks of observations, see
+              `sandwich_covariance.S_hac_stream`
 
     - 'cluster' and required keyword `groups`, integer group indicator
 
         - `groups` array_like, integer (required) :
-              index of clusters or groups
+              index of clusters or groups.
+              If 2-dimensional, then each column is a cluster dimension and
+              the multi-way cluster robust covariance of Cameron,
+              Gelbach and Miller is used, see
+              `sandwich_covariance.cov_cluster_multi`.
         - `use_correction` bool (optional) :
               If True the sandwich covariance is calulated with a small
               sample correction.
@@ -176,19 +187,34 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
             res.cov_params_default = sw.cov_white_simple(self,
                                                          use_correction=False)
     elif cov_type == 'HAC':
-        maxlags = kwds['maxlags']   # required?, default in cov_hac_simple
-        res.cov_kwds['maxlags'] = maxlags
+        maxlags = kwds.get('maxlags', None)
         weights_func = kwds.get('weights_func', sw.weights_bartlett)
         res.cov_kwds['weights_func'] = weights_func
         use_correction = kwds.get('use_correction', False)
         res.cov_kwds['use_correction'] = use_correction
+        chunk_size = kwds.get('chunk_size', None)
+        res.cov_kwds['chunk_size'] = chunk_size
+        sandwich = self
+        if maxlags is None:
+            # automatic lag selection, ignores the constant
+            lag_selection = kwds.get('lag_selection', 'newey-west')
+            res.cov_kwds['lag_selection'] = lag_selection
+            sandwich = sw._get_sandwich_arrays(self)
+            weights = np.ones(sandwich[0].shape[1])
+            const_idx = getattr(self.model.data, 'const_idx', None)
+            if const_idx is not None and len(weights) > 1:
+                weights[const_idx] = 0
+            maxlags = sw.hac_nlags(sandwich[0], method=lag_selection,
+                                   weights_func=weights_func, weights=weights)
+        res.cov_kwds['maxlags'] = maxlags
         res.cov_kwds['description'] = ('Standard Errors are heteroscedasticity ' +
              'and autocorrelation robust (HAC) using %d lags and %s small ' +
              'sample correction') % (maxlags, ['without', 'with'][use_correction])
 
-        res.cov_params_default = sw.cov_hac_simple(self, nlags=maxlags,
+        res.cov_params_default = sw.cov_hac_simple(sandwich, nlags=maxlags,
                                              weights_func=weights_func,
-                                             use_correction=use_correction)
+                                             use_correction=use_correction,
+                                             chunk_size=chunk_size)
     elif cov_type == 'cluster':
         #cluster robust standard errors, one- or two-way
         groups = kwds['groups']
@@ -205,7 +231,7 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
             if adjust_df:
                 # need to find number of groups
                 # duplicate work
-                self.n_groups = n_groups = len(np.unique(groups))
+                self.n_groups = n_groups = sw._group_codes(groups)[1]
             res.cov_params_default = sw.cov_cluster(self, groups,
                                              use_correction=use_correction)
 
@@ -216,16 +242,15 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
             if adjust_df:
                 # need to find number of groups
                 # duplicate work
-                n_groups0 = len(np.unique(groups[:,0]))
-                n_groups1 = len(np.unique(groups[:, 1]))
-                self.n_groups = (n_groups0, n_groups1)
-                n_groups = min(n_groups0, n_groups1) # use for adjust_df
-
-            # Note: sw.cov_cluster_2groups has 3 returns
-            res.cov_params_default = sw.cov_cluster_2groups(self, groups,
-                                         use_correction=use_correction)[0]
+                self.n_groups = tuple(sw._group_codes(groups[:, i])[1]
+                                      for i in range(groups.shape[1]))
+                n_groups = min(self.n_groups) # use for adjust_df
+
+            # Cameron-Gelbach-Miller for two or more cluster dimensions
+            res.cov_params_default = sw.cov_cluster_multi(self, groups,
+                                         use_correction=use_correction)
         else:
-            raise ValueError('only two groups are supported')
+            raise ValueError('groups need to be 1 or 2 dimensional')
         res.cov_kwds['description'] = ('Standard Errors are robust to' +
                             'cluster correlation ' + '(' + cov_type + ')')
 
@@ -6,6 +6,7 @@ from statsmodels.compat.python import reduce, iteritems, lmap, zip, range
 from statsmodels.compat.numpy import np_matrix_rank
 import numpy as np
 from pandas import DataFrame, Series, isnull
+from scipy import sparse
 from statsmodels.tools.decorators import (resettable_cache, cache_readonly,
                                           cache_writable)
 import statsmodels.tools.data as data_util
@@ -452,6 +453,72 @@ class ModelData(object):
         return result
 
 
+class SparseData(ModelData):
+    """
+    Data handling class for a scipy.sparse exog
+
+    exog is kept as a float64 CSR matrix.  Models that support sparse exog
+    use sparse products with it and never create the dense nobs x k array.
+    """
+
+    @classmethod
+    def handle_missing(cls, endog, exog, missing, **kwargs):
+        # rows with a nan entry in the stored elements of exog are passed to
+        # the dense missing value handling as a 1d indicator
+        exog = sparse.csr_matrix(exog)
+        nan_rows = np.zeros(exog.shape[0])
+        rows = np.repeat(np.arange(exog.shape[0]), np.diff(exog.indptr))
+        nan_rows[rows[np.isnan(exog.data)]] = np.nan
+        combined, dropped = super(SparseData, cls).handle_missing(
+            endog, nan_rows, missing, **kwargs)
+        if dropped:
+            keep = np.ones(exog.shape[0], bool)
+            keep[dropped] = False
+            exog = exog[keep]
+        combined['exog'] = exog
+        return combined, dropped
+
+    def _get_xarr(self, exog):
+        return sparse.csr_matrix(exog, dtype=np.float64)
+
+    def _handle_constant(self, hasconst):
+        if hasconst is not None:
+            self.k_constant = int(bool(hasconst))
+            self.const_idx = None
+            return
+
+        exog = self.exog.tocsc()
+        nobs = exog.shape[0]
+        col_max = exog.max(0).toarray().ravel()
+        col_min = exog.min(0).toarray().ravel()
+        # all rows stored and identical
+        const = (np.diff(exog.indptr) == nobs) & (col_max == col_min)
+        const_idx = np.nonzero(const & (col_max != 0))[0]
+        if const_idx.size > 0:
+            ones = np.nonzero(col_max[const_idx] == 1)[0]
+            self.const_idx = const_idx[ones[0] if ones.size else 0]
+            self.k_constant = 1
+        else:
+            # implicit constant, e.g. a full set of dummy variables
+            from scipy.sparse.linalg import lsqr
+            ones = np.ones(nobs)
+            fitted = exog.dot(lsqr(exog, ones, atol=1e-12, btol=1e-12)[0])
+            self.k_constant = int(np.max(np.abs(fitted - ones)) < 1e-8)
+            self.const_idx = None
+
+    def _check_integrity(self):
+        if self.exog.shape[0] != len(self.endog):
+            raise ValueError("endog and exog matrices are different sizes")
+
+    @cache_writable()
+    def xnames(self):
+        xnames = ['x%d' % i for i in range(1, self.exog.shape[1] + 1)]
+        if self.const_idx is not None:
+            xnames.pop(-1)
+            xnames.insert(self.const_idx, 'const')
+        return xnames
+
+
 class PatsyData(ModelData):
     def _get_names(self, arr):
         return arr.design_info.column_names
@@ -597,7 +664,9 @@ def handle_data_class_factory(endog, exog):
     """
     Given inputs
     """
-    if data_util._is_using_ndarray_type(endog, exog):
+    if sparse.issparse(exog):
+        klass = SparseData
+    elif data_util._is_using_ndarray_type(endog, exog):
         klass = ModelData
     elif data_util._is_using_pandas(endog, exog):
         klass = PandasData
@@ -1,3 +1,5 @@
+import copy
+
 import numpy as np
 import statsmodels.base.wrapper as wrap
 from statsmodels.base.model import Results
@@ -321,6 +323,372 @@ def _opt_1d(func, grad, hess, model, start, L1_wt, tol):
     return x_opt
 
 
+def fit_elasticnet_path(model, alphas, L1_wt=1., maxiter=100,
+                        cnvrg_tol=1e-7, zero_tol=1e-8, strong_rules=True,
+                        loglike_kwds=None, score_kwds=None, hess_kwds=None,
+                        gram=None):
+    """
+    Return the elastic net coefficient path over a sequence of penalties.
+
+    Parameters
+    ----------
+    model : model object
+        A statsmodels object implementing ``loglike``, ``score``, and
+        ``hessian``.
+    alphas : array-like
+        1d array of scalar penalty weights.
+    L1_wt : scalar
+        The fraction of the penalty given to the L1 penalty term.
+        Must be between 0 and 1 (inclusive).
+    maxiter : integer
+        The maximum number of Newton iterations, and of coordinate
+        descent sweeps within each of them.
+    cnvrg_tol : scalar
+        Convergence threshold on the sup-norm of the change in `params`.
+    zero_tol : scalar
+        Any estimated coefficient smaller than this value is
+        replaced with zero.
+    strong_rules : bool
+        If True, coefficients are screened with the sequential strong
+        rule before the optimization at each alpha.  The
+        Karush-Kuhn-Tucker conditions are checked at the solution and
+        violating coefficients are added back.
+    loglike_kwds, score_kwds, hess_kwds : dict-like or None
+        Keyword arguments for the log-likelihood, score and Hessian.
+    gram : tuple or None
+        ``(xtx, xty)`` if ``-loglike / nobs`` is, up to a constant, the
+        quadratic function ``params' xtx params / 2 - xty' params``, as for
+        the Gaussian linear model.  Coordinate descent then works on these
+        cross-products and each sweep costs O(k**2) operations instead of
+        O(nobs * k).
+
+    Returns
+    -------
+    params : ndarray
+        len(alphas) x k array, row i contains the estimate for alphas[i].
+
+    Notes
+    -----
+    The function that is minimized at each alpha is the same as in
+    `fit_elasticnet`:
+
+    -loglike/n + alpha*((1-L1_wt)*|params|_2^2/2 + L1_wt*|params|_1)
+
+    The penalties are processed in decreasing order, each fit is started
+    from the solution at the previous, larger penalty.  For models that
+    are not quadratic a proximal Newton method is used: the smooth part
+    is replaced by its second order expansion, which is minimized by
+    coordinate descent cycling over the nonzero coefficients, followed by
+    a backtracking line search.  Screened coefficients are excluded by
+    fitting a model with the remaining columns of exog only.
+
+    References
+    ----------
+    Friedman, Hastie, Tibshirani (2008).  Regularization paths for
+    generalized linear models via coordinate descent.  Journal of
+    Statistical Software 33(1), 1-22 Feb 2010.
+
+    Tibshirani, R., Bien, J., Friedman, J., Hastie, T., Simon, N.,
+    Taylor, J. and Tibshirani, R. J. (2012).  Strong rules for discarding
+    predictors in lasso-type problems.  Journal of the Royal Statistical
+    Society, Series B 74(2), 245-266.
+    """
+
+    k_exog = model.exog.shape[1]
+    # the discrete models do not define nobs
+    nobs = getattr(model, 'nobs', model.exog.shape[0])
+
+    loglike_kwds = {} if loglike_kwds is None else loglike_kwds
+    score_kwds = {} if score_kwds is None else score_kwds
+    hess_kwds = {} if hess_kwds is None else hess_kwds
+
+    alphas = np.atleast_1d(np.asarray(alphas, dtype=np.float64))
+    if alphas.ndim != 1:
+        raise ValueError("alphas must be a 1d array of scalars")
+    if np.any(alphas < 0):
+        raise ValueError("alphas must be nonnegative")
+
+    if gram is not None:
+        xtx, xty = gram
+
+        def loss_grad(params):
+            return np.dot(xtx, params) - xty
+
+        def solve(params, idx, alpha):
+            return _cd_quadratic(xtx, xty, alpha, L1_wt, params, idx,
+                                 maxiter, cnvrg_tol)
+    else:
+        init_args = _get_init_args(model)
+
+        def loss_grad(params):
+            return -model.score(params, **score_kwds) / nobs
+
+        def solve(params, idx, alpha):
+            if len(idx) == 0:
+                return np.zeros(k_exog)
+            if len(idx) < k_exog:
+                model_r = model.__class__(model.endog, model.exog[:, idx],
+                                          **init_args)
+            else:
+                model_r = model
+            params_r = _prox_newton(model_r, params[idx], alpha, L1_wt,
+                                    maxiter, cnvrg_tol, loglike_kwds,
+                                    score_kwds, hess_kwds)
+            params = np.zeros(k_exog)
+            params[idx] = params_r
+            return params
+
+    params = np.zeros(k_exog)
+    grad = loss_grad(params)
+    alpha_prev = np.max(np.abs(grad)) / L1_wt if L1_wt > 0 else np.inf
+    path = np.empty((len(alphas), k_exog))
+    for ia in np.argsort(-alphas, kind='mergesort'):
+        alpha = alphas[ia]
+        if L1_wt > 0 and strong_rules:
+            # sequential strong rule
+            strong = ((np.abs(grad) >= L1_wt * (2 * alpha - alpha_prev)) |
+                      (params != 0))
+        else:
+            strong = np.ones(k_exog, dtype=bool)
+
+        while True:
+            params = solve(params, np.flatnonzero(strong), alpha)
+            params[np.abs(params) < zero_tol] = 0
+            grad = loss_grad(params)
+            if strong.all():
+                break
+            # check the KKT conditions for the screened coefficients
+            viol = ~strong & (np.abs(grad) > alpha * L1_wt + 1e-8)
+            if not viol.any():
+                break
+            strong |= viol
+
+        path[ia] = params
+        alpha_prev = alpha
+
+    return path
+
+
+def _get_init_args(model):
+    """
+    Keyword arguments to create a model of the same class for a subset of
+    the columns of exog.
+    """
+    init_args = dict([(k, getattr(model, k, None)) for k in model._init_keys])
+    # exposure is stored as log(exposure) by GLM and the count models
+    if init_args.get('exposure') is not None:
+        init_args['exposure'] = np.exp(init_args['exposure'])
+    return init_args
+
+
+def _cd_quadratic(xtx, xty, alpha, L1_wt, params, idx, maxiter, tol):
+    """
+    Coordinate descent for an elastic net penalized quadratic function.
+
+    Minimizes ``b' xtx b / 2 - xty' b + alpha * ((1 - L1_wt) * |b|_2^2 / 2
+    + L1_wt * |b|_1)`` over the coordinates in `idx`, the other coordinates
+    are kept fixed.  The gradient ``xty - xtx b`` is updated after each
+    coordinate step, so that a sweep costs O(k * len(idx)).  Sweeps cycle
+    over the nonzero coefficients until convergence, then a full sweep
+    over `idx` checks whether the active set changes.
+    """
+    params = params.copy()
+    resid = xty - np.dot(xtx, params)
+    l1 = alpha * L1_wt
+    denom = np.maximum(np.diag(xtx), 1e-10) + alpha * (1 - L1_wt)
+
+    def sweep(coords):
+        pchange = 0.
+        for j in coords:
+            old = params[j]
+            z = resid[j] + xtx[j, j] * old
+            new = np.sign(z) * max(abs(z) - l1, 0) / denom[j]
+            if new != old:
+                resid[:] -= xtx[:, j] * (new - old)
+                params[j] = new
+                pchange = max(pchange, abs(new - old))
+        return pchange
+
+    for itr in range(maxiter):
+        pchange = sweep(idx)
+        active = idx[params[idx] != 0]
+        if pchange < tol:
+            break
+        for _ in range(maxiter):
+            if sweep(active) < tol:
+                break
+
+    return params
+
+
+def _prox_newton(model, params, alpha, L1_wt, maxiter, tol, loglike_kwds,
+                 score_kwds, hess_kwds):
+    """
+    Proximal Newton method for the elastic net penalized log-likelihood.
+    """
+    nobs = getattr(model, 'nobs', model.exog.shape[0])
+    idx = np.arange(len(params))
+
+    def objective(params):
+        llf = model.loglike(params, **loglike_kwds)
+        pen = alpha * ((1 - L1_wt) * np.sum(params**2) / 2 +
+                       L1_wt * np.sum(np.abs(params)))
+        return -llf / nobs + pen
+
+    obj = objective(params)
+    for itr in range(maxiter):
+        grad = -model.score(params, **score_kwds) / nobs
+        hess = -model.hessian(params, **hess_kwds) / nobs
+        # the loss need not be convex, e.g. the profile likelihood of OLS,
+        # shift the Hessian so that the quadratic approximation is
+        eigvals = np.linalg.eigvalsh(hess)
+        if eigvals[0] <= 0:
+            shift = 1e-6 * max(1., abs(eigvals[-1])) - eigvals[0]
+            hess = hess + shift * np.eye(len(params))
+        # minimize the quadratic approximation
+        params_new = _cd_quadratic(hess, np.dot(hess, params) - grad, alpha,
+                                   L1_wt, params, idx, maxiter, tol)
+        step = params_new - params
+        # backtracking line search
+        t = 1.
+        while True:
+            obj_new = objective(params + t * step)
+            if obj_new <= obj + 1e-12 * abs(obj) or t < 1e-10:
+                break
+            t /= 2
+        params = params + t * step
+        obj = obj_new
+        if np.max(np.abs(t * step)) < tol:
+            break
+
+    return params
+
+
+def fit_elasticnet_cv(model, alphas, L1_wt=1., cv=10, n_jobs=1,
+                      random_state=None, **kwargs):
+    """
+    Choose the elastic net penalty weight by K-fold cross-validation.
+
+    Parameters
+    ----------
+    model : model object
+        A statsmodels model that implements ``fit_regularized_path``.
+    alphas : array-like
+        1d array of scalar penalty weights.
+    L1_wt : scalar
+        The fraction of the penalty given to the L1 penalty term.
+        Must be between 0 and 1 (inclusive).
+    cv : int or iterable
+        If an integer, the number of folds, the observations are randomly
+        assigned to folds of (almost) equal size.  Otherwise an iterable
+        of ``(train_index, test_index)`` pairs of boolean masks or integer
+        indices, for example one of the iterators in
+        `statsmodels.tools.cross_val`.
+    n_jobs : int
+        Number of folds that are evaluated in parallel, requires joblib.
+        -1 uses all available cores.
+    random_state : None, int or RandomState
+        Seed or random number generator for the assignment of the
+        observations to the folds if `cv` is an integer.  If None, then
+        the folds differ between calls.
+    kwargs
+        Additional keyword arguments for the model's
+        ``fit_regularized_path``.
+
+    Returns
+    -------
+    results : ElasticNetCVResults
+
+    Notes
+    -----
+    The full regularization path is computed on the training data of each
+    fold and evaluated on the held out observations.  The held out
+    deviance is ``sum(wresid**2)`` for regression models and the deviance
+    of the family for GLM.  For PHReg the held out partial likelihood
+    is not defined, the deviance is computed as
+    ``-2 * (loglike(params) - loglike_train(params))``, the contribution
+    of the fold to the partial likelihood of all observations (Verweij and
+    Van Houwelingen, 1993).
+
+    Each fold contributes its deviance per held out observation.
+    `alpha_1se` is the largest penalty weight whose mean deviance is
+    within one standard error of the smallest mean deviance.
+
+    References
+    ----------
+    Verweij, P. J. M. and Van Houwelingen, H. C. (1993).  Cross-validation
+    in survival analysis.  Statistics in Medicine 12(24), 2305-2314.
+    """
+    from statsmodels.tools.cross_val import KFold
+    from statsmodels.tools.parallel import parallel_func
+
+    alphas = np.asarray(alphas, dtype=np.float64)
+    nobs = model.endog.shape[0]
+    if np.isscalar(cv) or isinstance(cv, np.integer):
+        cv = KFold(nobs, int(cv), shuffle=True, random_state=random_state)
+    index = np.arange(nobs)
+    folds = [(index[train], index[test]) for train, test in cv]
+
+    if n_jobs == 1:
+        deviance = [_cv_fold(model, train, test, alphas, L1_wt, kwargs)
+                    for train, test in folds]
+    else:
+        parallel, p_func, n_jobs = parallel_func(_cv_fold, n_jobs,
+                                                 verbose=0)
+        deviance = parallel(p_func(model, train, test, alphas, L1_wt, kwargs)
+                            for train, test in folds)
+
+    params = model.fit_regularized_path(alphas, L1_wt=L1_wt, **kwargs)
+
+    return ElasticNetCVResults(model, alphas, L1_wt, np.array(deviance),
+                               params)
+
+
+def _subset_model(model, index):
+    """
+    Model of the same class for a subset of the observations.
+    """
+    nobs = model.endog.shape[0]
+    init_args = _get_init_args(model)
+    for key, value in init_args.items():
+        if isinstance(value, np.ndarray) and value.ndim > 0 and \
+                value.shape[0] == nobs:
+            init_args[key] = value[index]
+    # GLM initializes the family with the data
+    if 'family' in init_args:
+        init_args['family'] = copy.deepcopy(init_args['family'])
+    return model.__class__(model.endog[index], model.exog[index],
+                           **init_args)
+
+
+def _cv_fold(model, train, test, alphas, L1_wt, kwargs):
+    """
+    Held out deviance per observation for the path fit to one fold.
+    """
+    train_model = _subset_model(model, train)
+    path = train_model.fit_regularized_path(alphas, L1_wt=L1_wt, **kwargs)
+
+    if hasattr(model, 'surv'):
+        # PHReg, the partial likelihood does not split across observations
+        deviance = [-2 * (model.loglike(params) - train_model.loglike(params))
+                    for params in path]
+    else:
+        test_model = _subset_model(model, test)
+        if hasattr(model, 'family'):
+            deviance = [test_model.family.deviance(
+                            test_model.endog, test_model.predict(params),
+                            test_model.freq_weights)
+                        for params in path]
+        elif hasattr(model, 'wendog'):
+            resid = test_model.wendog[:, None] - np.dot(test_model.wexog,
+                                                        path.T)
+            deviance = (resid**2).sum(0)
+        else:
+            deviance = [-2 * test_model.loglike(params) for params in path]
+
+    return np.asarray(deviance) / len(test)
+
+
 class RegularizedResults(Results):
 
     def __init__(self, model, params):
@@ -342,3 +710,70 @@ class RegularizedResultsWrapper(wrap.ResultsWrapper):
 
 wrap.populate_wrapper(RegularizedResultsWrapper,
                       RegularizedResults)
+
+
+class ElasticNetCVResults(object):
+    """
+    Results of choosing the elastic net penalty by cross-validation
+
+    Attributes
+    ----------
+    alphas : ndarray
+        The penalty weights, in the order in which they were given.
+    L1_wt : float
+        The fraction of the penalty given to the L1 penalty term.
+    cv_deviance : ndarray
+        n_folds x len(alphas) array of held out deviance per observation.
+    mean_deviance : ndarray
+        Mean of the held out deviance over the folds.
+    se_deviance : ndarray
+        Standard error of `mean_deviance`.
+    alpha_min : float
+        Penalty weight with the smallest mean deviance.
+    alpha_1se : float
+        Largest penalty weight with mean deviance within one standard
+        error of the smallest mean deviance.
+    params_path : ndarray
+        len(alphas) x k array of estimates on all observations.
+    params : ndarray
+        The estimate on all observations for `alpha_1se`.
+    """
+
+    def __init__(self, model, alphas, L1_wt, cv_deviance, params_path):
+        self.model = model
+        self.alphas = alphas
+        self.L1_wt = L1_wt
+        self.cv_deviance = cv_deviance
+        self.params_path = params_path
+
+    @cache_readonly
+    def mean_deviance(self):
+        return self.cv_deviance.mean(0)
+
+    @cache_readonly
+    def se_deviance(self):
+        n_folds = self.cv_deviance.shape[0]
+        return self.cv_deviance.std(0, ddof=1) / np.sqrt(n_folds)
+
+    @cache_readonly
+    def _idx_min(self):
+        return np.argmin(self.mean_deviance)
+
+    @cache_readonly
+    def _idx_1se(self):
+        i = self._idx_min
+        bound = self.mean_deviance[i] + self.se_deviance[i]
+        candidates = np.flatnonzero(self.mean_deviance <= bound)
+        return candidates[np.argmax(self.alphas[candidates])]
+
+    @cache_readonly
+    def alpha_min(self):
+        return self.alphas[self._idx_min]
+
+    @cache_readonly
+    def alpha_1se(self):
+        return self.alphas[self._idx_1se]
+
+    @cache_readonly
+    def params(self):
+        return self.params_path[self._idx_1se]
@@ -1,7 +1,7 @@
 from __future__ import print_function
 from statsmodels.compat.python import iterkeys, lzip, range, reduce
 import numpy as np
-from scipy import stats
+from scipy import stats, sparse
 from statsmodels.base.data import handle_data
 from statsmodels.tools.data import _is_using_pandas
 from statsmodels.tools.tools import recipr, nan_dot
@@ -752,7 +752,7 @@ class Results(object):
             exog = dmatrix(self.model.data.design_info.builder,
                            exog)
 
-        if exog is not None:
+        if exog is not None and not sparse.issparse(exog):
             exog = np.asarray(exog)
             if exog.ndim == 1 and (self.model.exog.ndim == 1 or
                                    self.model.exog.shape[1] == 1):
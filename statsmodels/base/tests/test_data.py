@@ -886,6 +886,44 @@ def test_formula_missing_extra_arrays():
     assert_raises(ValueError, sm_data.handle_data, endog, exog, **kwargs)
 
 
+def test_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(1234)
+    groups = np.repeat(np.arange(4), 5)
+    x = np.random.randn(20)
+    endog = np.random.randn(20)
+
+    # implicit constant from a full set of dummies
+    exog = sparse.hstack((dummy_sparse(groups), x[:, None])).tocsr()
+    data = sm_data.handle_data(endog, exog)
+    assert_(isinstance(data, sm_data.SparseData))
+    assert_(sparse.isspmatrix_csr(data.exog))
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, None)
+    assert_equal(data.xnames, ['x1', 'x2', 'x3', 'x4', 'x5'])
+
+    exog = sparse.csr_matrix(np.column_stack((x, np.ones(20))))
+    data = sm_data.handle_data(endog, exog)
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, 1)
+    assert_equal(data.xnames, ['x1', 'const'])
+
+    data = sm_data.handle_data(endog, dummy_sparse(groups)[:, 1:])
+    assert_equal(data.k_constant, 0)
+
+    exog = np.column_stack((x, np.arange(20.)))
+    exog[3, 1] = np.nan
+    endog[7] = np.nan
+    data = sm_data.handle_data(endog, sparse.csr_matrix(exog),
+                               missing='drop')
+    keep = np.ones(20, bool)
+    keep[[3, 7]] = False
+    assert_equal(data.missing_row_idx, [3, 7])
+    assert_equal(data.exog.toarray(), exog[keep])
+    assert_equal(data.endog, endog[keep])
+
+
 if __name__ == "__main__":
     import nose
     #nose.runmodule(argv=[__file__, '-vvs', '-x', '--pdb', '--pdb-failure'],
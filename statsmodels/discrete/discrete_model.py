@@ -41,6 +41,7 @@ from statsmodels.compat.numpy import np_matrix_rank
 from pandas.core.api import get_dummies
 
 from statsmodels.base.l1_slsqp import fit_l1_slsqp
+from statsmodels.tools.grouputils import compress_rows
 try:
     import cvxopt
     have_cvxopt = True
@@ -54,6 +55,14 @@ FLOAT_EPS = np.finfo(float).eps
 #TODO: add options for the parameter covariance/variance
 # ie., OIM, EIM, and BHHH see Green 21.4
 
+_compress_param_doc = """compress : bool
+        If True, then the model is estimated on the unique rows of endog,
+        exog, offset and exposure weighted by the number of times they
+        occur.  Estimates, loglikelihood and residuals are the same as
+        without compression, which is faster for data with few distinct
+        covariate patterns.
+    """
+
 _discrete_models_docs = """
 """
 
@@ -151,9 +160,30 @@ class DiscreteModel(base.LikelihoodModel):
     call signature expected of child classes in addition to those of
     statsmodels.model.LikelihoodModel.
     """
+    # frequency weights of the unique rows if the model is a compressed copy
+    _freq_weights = None
+    # whether loglike, score and hessian support _freq_weights
+    _can_compress = False
+    # number of rows that method 'sgd' reads from the data at once
+    _block_rows = 2**16
+
     def __init__(self, endog, exog, **kwargs):
+        compress = kwargs.pop('compress', False)
         super(DiscreteModel, self).__init__(endog, exog, **kwargs)
         self.raise_on_perfect_prediction = True
+        self.compress = compress
+        if compress:
+            if not self._can_compress:
+                raise ValueError('compress is not available for %s' %
+                                 self.__class__.__name__)
+            self._init_keys.append('compress')
+
+    @property
+    def _obs_weights(self):
+        # weights of the observations in loglike, score and hessian
+        if self._freq_weights is None:
+            return 1.
+        return self._freq_weights
 
     def initialize(self):
         """
@@ -162,9 +192,25 @@ class DiscreteModel(base.LikelihoodModel):
         and should contain any preprocessing that needs to be done for a model.
         """
         # assumes constant
-        self.df_model = float(np_matrix_rank(self.exog) - 1)
-        self.df_resid = (float(self.exog.shape[0] -
-                         np_matrix_rank(self.exog)))
+        rank = self._exog_rank()
+        self.df_model = float(rank - 1)
+        self.df_resid = float(self.exog.shape[0] - rank)
+
+    def _exog_rank(self):
+        # exog with more than one block of rows is reduced to the R factor
+        # of a QR decomposition block by block, R has the singular values
+        # of exog and large or memory-mapped exog is not copied at once
+        exog = self.exog
+        if exog.ndim < 2 or exog.shape[0] <= self._block_rows:
+            return np_matrix_rank(exog)
+        rfac = np.zeros((0, exog.shape[1]))
+        for start in range(0, exog.shape[0], self._block_rows):
+            block = np.asarray(exog[start:start + self._block_rows],
+                               dtype=np.float64)
+            rfac = np.linalg.qr(np.vstack((rfac, block)), mode='r')
+        sv = np.linalg.svd(rfac, compute_uv=False)
+        tol = sv.max() * max(exog.shape) * np.finfo(sv.dtype).eps
+        return int((sv > tol).sum())
 
     def cdf(self, X):
         """
@@ -178,6 +224,15 @@ class DiscreteModel(base.LikelihoodModel):
         """
         raise NotImplementedError
 
+    def _linpred_derivs(self, endog, linpred):
+        """
+        Loglikelihood of the observations and its first and second
+        derivative with respect to the linear predictor
+
+        Models that implement it can be estimated with method 'sgd'.
+        """
+        raise NotImplementedError
+
     def _check_perfect_pred(self, params, *args):
         endog = self.endog
         fittedvalues = self.cdf(np.dot(self.exog, params[:self.exog.shape[1]]))
@@ -191,9 +246,47 @@ class DiscreteModel(base.LikelihoodModel):
         """
         Fit the model using maximum likelihood.
 
+        Logit, Probit and Poisson can also be estimated with
+        ``method='sgd'``, averaged stochastic gradient ascent for data that
+        is too large for the full data optimizers.  The rows of endog and
+        exog, which can be memory-mapped arrays, are read in blocks, and
+        `maxiter` is the maximum number of passes over the data.  The
+        estimate is completed by one pass over the data that computes the
+        score and the Hessian, which give the covariance of the parameters
+        and one Newton step.  The options of 'sgd' are
+
+            batch_size : int
+                Number of rows in each stochastic gradient step, default
+                512.
+            learning_rate : float
+                Step size of the first step, default 1.  The steps are
+                preconditioned by the inverse of the Hessian of a sample of
+                rows, so that the default is a Newton step.
+            power : float
+                The step size decays as ``learning_rate * t**(-power)``
+                with the number of steps t, default 0.6.
+            tol : float
+                Convergence tolerance, the iterations stop if the estimates
+                averaged over a pass change by less than `tol` times their
+                approximate standard errors, default 0.01.
+            newton_step : bool
+                If True (default), then the Newton step of the final pass
+                is added to the averaged estimates.
+            seed : int or None
+                Seed of the random order of blocks and rows.
+
         The rest of the docstring is from
         statsmodels.base.model.LikelihoodModel.fit
         """
+        if self.compress:
+            return self._fit_compressed(start_params=start_params,
+                method=method, maxiter=maxiter, full_output=full_output,
+                disp=disp, callback=callback, **kwargs)
+
+        if method == 'sgd':
+            return self._fit_sgd(start_params=start_params, maxiter=maxiter,
+                                 disp=disp, callback=callback, **kwargs)
+
         if callback is None:
             callback = self._check_perfect_pred
         else:
@@ -207,6 +300,201 @@ class DiscreteModel(base.LikelihoodModel):
 
     fit.__doc__ += base.LikelihoodModel.fit.__doc__
 
+    def _compressed_model(self):
+        """
+        Copy of the model on the unique rows, weighted by their frequency
+        """
+        offset = getattr(self, 'offset', None)
+        exposure = getattr(self, 'exposure', None)
+        index, _, counts = compress_rows([self.endog, self.exog, offset,
+                                          exposure])
+        kwds = self._get_init_kwds()
+        kwds['compress'] = False
+        for key in ['offset', 'exposure']:
+            if kwds.get(key) is not None:
+                kwds[key] = np.asarray(kwds[key])[index]
+        model = self.__class__(self.endog[index], self.exog[index], **kwds)
+        model._freq_weights = counts
+        model.raise_on_perfect_prediction = self.raise_on_perfect_prediction
+        if hasattr(self, '_transparams'):
+            model._transparams = self._transparams
+        return model
+
+    def _fit_compressed(self, start_params=None, **kwargs):
+        """
+        Estimate on the unique rows and attach the estimates to this model
+
+        The frequency weighted loglikelihood, score and hessian of the
+        compressed model are equal to those of the full model, so that the
+        parameters and the nonrobust covariance are the same.  Robust
+        covariances use the scores of all observations.
+        """
+        kwds = dict((key, kwargs.pop(key)) for key in
+                    ['cov_type', 'cov_kwds', 'use_t'] if key in kwargs)
+        model = self._compressed_model()
+        fit_c = DiscreteModel.fit(model, start_params=start_params, **kwargs)
+        if kwds.get('cov_kwds') is None:
+            kwds.pop('cov_kwds', None)
+        mlefit = base.LikelihoodModelResults(self, fit_c.params,
+                                             fit_c.normalized_cov_params,
+                                             scale=1., **kwds)
+        for attr in ['mle_retvals', 'mle_settings']:
+            if hasattr(fit_c, attr):
+                setattr(mlefit, attr, getattr(fit_c, attr))
+        self.nobs_compressed = model.endog.shape[0]
+        return mlefit
+
+    def _iter_blocks(self, shuffle=None):
+        """
+        Generate consecutive blocks of rows as in-memory arrays
+
+        Yields endog, exog, the sum of offset and log exposure, and the
+        frequency weights of the rows.  If shuffle is a RandomState, then
+        the blocks are generated in random order.
+        """
+        nobs = self.endog.shape[0]
+        bounds = np.arange(0, nobs, self._block_rows).tolist() + [nobs]
+        order = np.arange(len(bounds) - 1)
+        if shuffle is not None:
+            order = shuffle.permutation(order)
+        extra = [getattr(self, name) for name in ['offset', 'exposure']
+                 if getattr(self, name, None) is not None]
+        for i in order:
+            sl = slice(bounds[i], bounds[i + 1])
+            endog = np.asarray(self.endog[sl], dtype=np.float64)
+            exog = np.asarray(self.exog[sl], dtype=np.float64)
+            offset = np.zeros(endog.shape[0])
+            for arr in extra:
+                offset += arr[sl]
+            if self._freq_weights is None:
+                weights = np.ones(endog.shape[0])
+            else:
+                weights = np.asarray(self._freq_weights[sl], dtype=np.float64)
+            yield endog, exog, offset, weights
+
+    def _fit_sgd(self, start_params=None, maxiter=35, disp=False,
+                 callback=None, batch_size=512, learning_rate=1., power=0.6,
+                 tol=0.01, newton_step=True, seed=None, **kwargs):
+        """
+        Estimate by averaged stochastic gradient ascent over blocks of rows
+
+        Each pass visits the blocks and the rows within a block in random
+        order.  The gradient steps are preconditioned by the inverse of the
+        average Hessian of a sample of rows at the current estimate.  The
+        estimates are averaged over all steps after the first pass
+        (Polyak-Ruppert averaging).  The final pass over all blocks computes
+        the loglikelihood, score and Hessian at the averaged estimate.
+        """
+        try:
+            self._linpred_derivs(np.zeros(1), np.zeros(1))
+        except NotImplementedError:
+            raise ValueError("method 'sgd' is not available for %s" %
+                             self.__class__.__name__)
+        kwds = dict((key, kwargs.pop(key)) for key in
+                    ['cov_type', 'cov_kwds', 'use_t'] if key in kwargs)
+        if kwds.get('cov_kwds') is None:
+            kwds.pop('cov_kwds', None)
+        warn_convergence = kwargs.pop('warn_convergence', True)
+        if kwargs:
+            raise ValueError("unknown options for method 'sgd': %s" %
+                             ', '.join(sorted(kwargs)))
+
+        nobs = self.endog.shape[0]
+        if start_params is None:
+            if hasattr(self, 'start_params'):
+                start_params = self.start_params
+            else:
+                start_params = np.zeros(self.exog.shape[1])
+        params = np.array(start_params, dtype=np.float64)
+        rng = np.random.RandomState(seed)
+
+        def inv_curvature(endog, exog, offset, weights, params):
+            # inverse of the average negative Hessian of the rows
+            linpred = np.dot(exog, params) + offset
+            d2 = self._linpred_derivs(endog, linpred)[2]
+            hess = np.dot(exog.T * (-d2 * weights), exog)
+            return np.linalg.pinv(hess / weights.sum())
+
+        n_steps = iteration = 0
+        converged = False
+        avg_params = params.copy()
+        for iteration in range(1, maxiter + 1):
+            prev_params = avg_params.copy()
+            if iteration <= 2:
+                # the average starts after the first pass
+                n_avg = 0
+            for endog, exog, offset, weights in self._iter_blocks(rng):
+                order = rng.permutation(endog.shape[0])
+                for start in range(0, endog.shape[0], batch_size):
+                    # the curvature is updated at the start of each block
+                    # and, while the estimates move fast, after 2**j steps
+                    if start == 0 or (n_steps & (n_steps - 1)) == 0:
+                        rows = np.take(order, np.arange(start, start +
+                                       8 * batch_size), mode='wrap')
+                        pinv_hess = inv_curvature(endog[rows], exog[rows],
+                                                  offset[rows], weights[rows],
+                                                  params)
+                    rows = order[start:start + batch_size]
+                    exog_b, weights_b = exog[rows], weights[rows]
+                    linpred = np.dot(exog_b, params) + offset[rows]
+                    d1 = self._linpred_derivs(endog[rows], linpred)[1]
+                    grad = np.dot(d1 * weights_b, exog_b) / weights_b.sum()
+                    n_steps += 1
+                    step = learning_rate * n_steps**(-power)
+                    step = step * np.dot(pinv_hess, grad)
+                    # no step changes the linear predictor by more than 1
+                    max_change = np.abs(np.dot(exog_b, step)).max()
+                    if max_change > 1:
+                        step /= max_change
+                    params = params + step
+                    n_avg += 1
+                    avg_params += (params - avg_params) / n_avg
+            if callback is not None:
+                callback(avg_params)
+            # approximate standard errors of the estimates
+            bse = np.sqrt(np.abs(np.diag(pinv_hess)) / nobs)
+            change = np.abs(avg_params - prev_params) / bse
+            if disp:
+                print('pass %d, max change in standard errors: %g' %
+                      (iteration, change.max()))
+            if iteration > 1 and change.max() < tol:
+                converged = True
+                break
+
+        # one pass over the data for the loglikelihood, score and Hessian
+        llf = 0.
+        score = np.zeros_like(params)
+        hess = np.zeros((params.shape[0], params.shape[0]))
+        for endog, exog, offset, weights in self._iter_blocks():
+            linpred = np.dot(exog, avg_params) + offset
+            ll, d1, d2 = self._linpred_derivs(endog, linpred)
+            llf += np.dot(weights, ll)
+            score += np.dot(d1 * weights, exog)
+            hess += np.dot(exog.T * (d2 * weights), exog)
+        cov_params = np.linalg.inv(-hess)
+        params = avg_params
+        if newton_step:
+            params = params + np.dot(cov_params, score)
+
+        mlefit = base.LikelihoodModelResults(self, params, cov_params,
+                                             scale=1., **kwds)
+        mlefit.mle_retvals = {'fopt': -llf / nobs, 'iterations': iteration,
+                              'score': -score / nobs, 'Hessian': -hess / nobs,
+                              'converged': converged, 'warnflag': 0}
+        mlefit.mle_settings = {'optimizer': 'sgd',
+                               'start_params': start_params,
+                               'maxiter': maxiter, 'disp': disp,
+                               'callback': callback, 'batch_size': batch_size,
+                               'learning_rate': learning_rate, 'power': power,
+                               'tol': tol, 'newton_step': newton_step,
+                               'seed': seed}
+        if warn_convergence and not converged:
+            from warnings import warn
+            from statsmodels.tools.sm_exceptions import ConvergenceWarning
+            warn("The stochastic gradient iterations failed to converge. "
+                 "Check mle_retvals", ConvergenceWarning)
+        return mlefit
+
     def fit_regularized(self, start_params=None, method='l1',
                         maxiter='defined_by_method', full_output=1, disp=True,
                         callback=None, alpha=0, trim_mode='auto',
@@ -383,6 +671,57 @@ class DiscreteModel(base.LikelihoodModel):
 
         return cov_params
 
+    def fit_regularized_path(self, alphas, L1_wt=1., **kwargs):
+        """
+        Return the elastic net coefficient path for a sequence of penalties.
+
+        Parameters
+        ----------
+        alphas : array-like
+            1d array of scalar penalty weights.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        kwargs
+            Additional keyword arguments for `fit_elasticnet_path`:
+            maxiter, cnvrg_tol, zero_tol and strong_rules.
+
+        Returns
+        -------
+        params : ndarray
+            len(alphas) x k array, row i contains the estimate for
+            alphas[i].
+
+        Notes
+        -----
+        The function that is minimized for each alpha is
+
+        -loglike/n + alpha*((1-L1_wt)*|params|_2^2/2 + L1_wt*|params|_1)
+
+        This is the elastic net penalty of GLM and OLS, which differs from
+        the scaling of the 'l1' method of `fit_regularized`.  The
+        penalties are processed in decreasing order with warm starts,
+        strong rule screening and active set coordinate descent within
+        proximal Newton steps.
+
+        Only models with one parameter per column of exog are supported.
+
+        See Also
+        --------
+        statsmodels.base.elastic_net.fit_elasticnet_path
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_path
+
+        if getattr(self, 'k_extra', 0) > 0:
+            raise NotImplementedError("models with extra parameters are "
+                                      "not supported")
+
+        defaults = {"maxiter" : 50, "cnvrg_tol" : 1e-10,
+                    "zero_tol" : 1e-10}
+        defaults.update(kwargs)
+
+        return fit_elasticnet_path(self, alphas, L1_wt=L1_wt, **defaults)
+
     def predict(self, params, exog=None, linear=False):
         """
         Predict response variable of a model given exogenous variables.
@@ -609,6 +948,9 @@ class MultinomialModel(BinaryModel):
         return L1MultinomialResultsWrapper(mnfit)
     fit_regularized.__doc__ = DiscreteModel.fit_regularized.__doc__
 
+    def fit_regularized_path(self, alphas, L1_wt=1., **kwargs):
+        raise NotImplementedError("not available for multinomial models")
+
 
     def _derivative_predict(self, params, exog=None, transform='dydx'):
         """
@@ -868,8 +1210,9 @@ class Poisson(CountModel):
     exposure : array_like
         Log(exposure) is added to the linear prediction with coefficient
         equal to 1.
+    """ + _compress_param_doc + base._missing_param_doc}
 
-    """ + base._missing_param_doc}
+    _can_compress = True
 
 
     def cdf(self, X):
@@ -953,7 +1296,8 @@ class Poisson(CountModel):
         exposure = getattr(self, "exposure", 0)
         XB = np.dot(self.exog, params) + offset + exposure
         endog = self.endog
-        return np.sum(-np.exp(XB) +  endog*XB - gammaln(endog+1))
+        return np.sum(self._obs_weights *
+                      (-np.exp(XB) +  endog*XB - gammaln(endog+1)))
 
     def loglikeobs(self, params):
         """
@@ -1110,7 +1454,7 @@ class Poisson(CountModel):
         exposure = getattr(self, "exposure", 0)
         X = self.exog
         L = np.exp(np.dot(X,params) + offset + exposure)
-        return np.dot(self.endog - L, X)
+        return np.dot(self._obs_weights * (self.endog - L), X)
 
     def score_obs(self, params):
         """
@@ -1145,6 +1489,10 @@ class Poisson(CountModel):
     jac = np.deprecate(score_obs, 'jac', 'score_obs', "Use score_obs method."
                        " jac will be removed in 0.7")
 
+    def _linpred_derivs(self, endog, linpred):
+        mu = np.exp(linpred)
+        return -mu + endog * linpred - gammaln(endog + 1), endog - mu, -mu
+
     def hessian(self, params):
         """
         Poisson model Hessian matrix of the loglikelihood
@@ -1173,7 +1521,7 @@ class Poisson(CountModel):
         exposure = getattr(self, "exposure", 0)
         X = self.exog
         L = np.exp(np.dot(X,params) + exposure + offset)
-        return -np.dot(L*X.T, X)
+        return -np.dot(self._obs_weights * L * X.T, X)
 
 class Logit(BinaryModel):
     __doc__ = """
@@ -1189,7 +1537,9 @@ class Logit(BinaryModel):
     exog : array
         A reference to the exogenous design.
     """ % {'params' : base._model_params_doc,
-           'extra_params' : base._missing_param_doc}
+           'extra_params' : _compress_param_doc + base._missing_param_doc}
+
+    _can_compress = True
 
     def cdf(self, X):
         """
@@ -1261,7 +1611,8 @@ class Logit(BinaryModel):
         """
         q = 2*self.endog - 1
         X = self.exog
-        return np.sum(np.log(self.cdf(q*np.dot(X,params))))
+        return np.sum(self._obs_weights *
+                      np.log(self.cdf(q*np.dot(X,params))))
 
     def loglikeobs(self, params):
         """
@@ -1314,7 +1665,7 @@ class Logit(BinaryModel):
         y = self.endog
         X = self.exog
         L = self.cdf(np.dot(X,params))
-        return np.dot(y - L,X)
+        return np.dot(self._obs_weights * (y - L),X)
 
     def score_obs(self, params):
         """
@@ -1347,6 +1698,11 @@ class Logit(BinaryModel):
     jac = np.deprecate(score_obs, 'jac', 'score_obs', "Use score_obs method."
                        " jac will be removed in 0.7")
 
+    def _linpred_derivs(self, endog, linpred):
+        L = self.cdf(linpred)
+        loglike = np.log(self.cdf((2 * endog - 1) * linpred))
+        return loglike, endog - L, -L * (1 - L)
+
     def hessian(self, params):
         """
         Logit model Hessian matrix of the log-likelihood
@@ -1368,7 +1724,7 @@ class Logit(BinaryModel):
         """
         X = self.exog
         L = self.cdf(np.dot(X,params))
-        return -np.dot(L*(1-L)*X.T,X)
+        return -np.dot(self._obs_weights*L*(1-L)*X.T,X)
 
     def fit(self, start_params=None, method='newton', maxiter=35,
             full_output=1, disp=1, callback=None, **kwargs):
@@ -1562,6 +1918,12 @@ class Probit(BinaryModel):
     jac = np.deprecate(score_obs, 'jac', 'score_obs', "Use score_obs method."
                        " jac will be removed in 0.7")
 
+    def _linpred_derivs(self, endog, linpred):
+        q = 2 * endog - 1
+        cdf = self.cdf(q * linpred)
+        L = q * self.pdf(q * linpred) / np.clip(cdf, FLOAT_EPS, 1 - FLOAT_EPS)
+        return np.log(np.clip(cdf, FLOAT_EPS, 1)), L, -L * (L + linpred)
+
     def hessian(self, params):
         """
         Probit model Hessian matrix of the log-likelihood
@@ -1954,8 +2316,10 @@ class NegativeBinomial(CountModel):
     exposure : array_like
         Log(exposure) is added to the linear prediction with coefficient
         equal to 1.
+    """ + _compress_param_doc + base._missing_param_doc}
+
+    _can_compress = True
 
-    """ + base._missing_param_doc}
     def __init__(self, endog, exog, loglike_method='nb2', offset=None,
                        exposure=None, missing='none', **kwargs):
         super(NegativeBinomial, self).__init__(endog, exog, offset=offset,
@@ -2065,14 +2429,15 @@ class NegativeBinomial(CountModel):
         For the geometric, :math:`\alpha=0` as well.
 
         """
-        llf = np.sum(self.loglikeobs(params))
+        llf = np.sum(self._obs_weights * self.loglikeobs(params))
         return llf
 
     def _score_geom(self, params):
         exog = self.exog
         y = self.endog[:,None]
         mu = self.predict(params)[:,None]
-        dparams = exog * (y-mu)/(mu+1)
+        w = np.reshape(self._obs_weights, (-1, 1))
+        dparams = exog * w * (y-mu)/(mu+1)
         return dparams.sum(0)
 
     def _score_nbin(self, params, Q=0):
@@ -2087,24 +2452,26 @@ class NegativeBinomial(CountModel):
         exog = self.exog
         y = self.endog[:,None]
         mu = self.predict(params)[:,None]
+        w = np.reshape(self._obs_weights, (-1, 1))
         a1 = 1/alpha * mu**Q
         if Q: # nb1
-            dparams = exog*mu/alpha*(np.log(1/(alpha + 1)) +
+            dparams = w*exog*mu/alpha*(np.log(1/(alpha + 1)) +
                        special.digamma(y + mu/alpha) -
                        special.digamma(mu/alpha))
-            dalpha = ((alpha*(y - mu*np.log(1/(alpha + 1)) -
+            dalpha = (w*((alpha*(y - mu*np.log(1/(alpha + 1)) -
                               mu*(special.digamma(y + mu/alpha) -
                               special.digamma(mu/alpha) + 1)) -
                        mu*(np.log(1/(alpha + 1)) +
                            special.digamma(y + mu/alpha) -
                            special.digamma(mu/alpha)))/
-                       (alpha**2*(alpha + 1))).sum()
+                       (alpha**2*(alpha + 1)))).sum()
 
         else: # nb2
-            dparams = exog*a1 * (y-mu)/(mu+a1)
+            dparams = w*exog*a1 * (y-mu)/(mu+a1)
             da1 = -alpha**-2
-            dalpha = (special.digamma(a1+y) - special.digamma(a1) + np.log(a1)
-                        - np.log(a1+mu) - (a1+y)/(a1+mu) + 1).sum()*da1
+            dalpha = (w*(special.digamma(a1+y) - special.digamma(a1) +
+                         np.log(a1) - np.log(a1+mu) - (a1+y)/(a1+mu) + 1)
+                      ).sum()*da1
 
         #multiply above by constant outside sum to reduce rounding error
         if self._transparams:
@@ -2123,7 +2490,8 @@ class NegativeBinomial(CountModel):
         # for dl/dparams dparams
         dim = exog.shape[1]
         hess_arr = np.empty((dim, dim))
-        const_arr = mu*(1+y)/(mu+1)**2
+        w = np.reshape(self._obs_weights, (-1, 1))
+        const_arr = w*mu*(1+y)/(mu+1)**2
         for i in range(dim):
             for j in range(dim):
                 if j > i:
@@ -2150,6 +2518,7 @@ class NegativeBinomial(CountModel):
         mu = self.predict(params)[:,None]
 
         a1 = mu/alpha
+        w = np.reshape(self._obs_weights, (-1, 1))
 
         # for dl/dparams dparams
         dim = exog.shape[1]
@@ -2168,16 +2537,16 @@ class NegativeBinomial(CountModel):
             for j in range(dim):
                 if j > i:
                     continue
-                hess_arr[i,j] = np.sum(dparams[:,i,None] * dmudb[:,j,None] +
-                                 xmu_alpha[:,i,None] * xmu_alpha[:,j,None] *
-                                 trigamma, axis=0)
+                hess_arr[i,j] = np.sum(w * (dparams[:,i,None] *
+                                 dmudb[:,j,None] + xmu_alpha[:,i,None] *
+                                 xmu_alpha[:,j,None] * trigamma), axis=0)
         tri_idx = np.triu_indices(dim, k=1)
         hess_arr[tri_idx] = hess_arr.T[tri_idx]
 
         # for dl/dparams dalpha
         da1 = -alpha**-2
-        dldpda = np.sum(-mu/alpha * dparams + exog*mu/alpha *
-                        (-trigamma*mu/alpha**2 - 1/(alpha+1)), axis=0)
+        dldpda = np.sum(w * (-mu/alpha * dparams + exog*mu/alpha *
+                        (-trigamma*mu/alpha**2 - 1/(alpha+1))), axis=0)
 
         hess_arr[-1,:-1] = dldpda
         hess_arr[:-1,-1] = dldpda
@@ -2197,7 +2566,7 @@ class NegativeBinomial(CountModel):
                 2*alpha*mu2*trigamma +
                 2*alpha*mu*(log_alpha + digamma_part) +
                 mu2*trigamma)/(alpha**4*(alpha2 + 2*alpha + 1)))
-        hess_arr[-1,-1] = dada.sum()
+        hess_arr[-1,-1] = (w * dada).sum()
 
         return hess_arr
 
@@ -2216,10 +2585,12 @@ class NegativeBinomial(CountModel):
         y = self.endog[:,None]
         mu = self.predict(params)[:,None]
 
+        w = np.reshape(self._obs_weights, (-1, 1))
+
         # for dl/dparams dparams
         dim = exog.shape[1]
         hess_arr = np.empty((dim+1,dim+1))
-        const_arr = a1*mu*(a1+y)/(mu+a1)**2
+        const_arr = w*a1*mu*(a1+y)/(mu+a1)**2
         for i in range(dim):
             for j in range(dim):
                 if j > i:
@@ -2231,7 +2602,7 @@ class NegativeBinomial(CountModel):
 
         # for dl/dparams dalpha
         da1 = -alpha**-2
-        dldpda = np.sum(mu*exog*(y-mu)*da1/(mu+a1)**2 , axis=0)
+        dldpda = np.sum(w*mu*exog*(y-mu)*da1/(mu+a1)**2 , axis=0)
         hess_arr[-1,:-1] = dldpda
         hess_arr[:-1,-1] = dldpda
 
@@ -2240,9 +2611,9 @@ class NegativeBinomial(CountModel):
         da2 = 2*alpha**-3
         dalpha = da1 * (special.digamma(a1+y) - special.digamma(a1) +
                     np.log(a1) - np.log(a1+mu) - (a1+y)/(a1+mu) + 1)
-        dada = (da2 * dalpha/da1 + da1**2 * (special.polygamma(1, a1+y) -
+        dada = (w * (da2 * dalpha/da1 + da1**2 * (special.polygamma(1, a1+y) -
                     special.polygamma(1, a1) + 1/a1 - 1/(a1 + mu) +
-                    (y - mu)/(mu + a1)**2)).sum()
+                    (y - mu)/(mu + a1)**2))).sum()
         hess_arr[-1,-1] = dada
 
         return hess_arr
@@ -2274,7 +2645,8 @@ class NegativeBinomial(CountModel):
             offset = getattr(self, "offset", 0) + getattr(self, "exposure", 0)
             if np.size(offset) == 1 and offset == 0:
                 offset = None
-            mod_poi = Poisson(self.endog, self.exog, offset=offset)
+            mod_poi = Poisson(self.endog, self.exog, offset=offset,
+                              compress=self.compress)
             start_params = mod_poi.fit(disp=0).params
             if self.loglike_method.startswith('nb'):
                 start_params = np.append(start_params, 0.1)
@@ -1319,6 +1319,32 @@ def test_poisson_newton():
         res = mod.fit(start_params=-np.ones(4), method='newton', disp=0)
     assert_(not res.mle_retvals['converged'])
 
+def test_regularized_path():
+    # elastic net path agrees with GLM, which uses the same objective
+    np.random.seed(9823)
+    n, k = 300, 10
+    exog = np.random.normal(size=(n, k))
+    lin_pred = 0.5 * exog[:, :3].sum(1)
+    alphas = [0.1, 0.01, 0.03]
+
+    endog = (np.random.uniform(size=n) <
+             1 / (1 + np.exp(-lin_pred))).astype(np.float64)
+    path = Logit(endog, exog).fit_regularized_path(alphas, L1_wt=0.5)
+    path_glm = sm.GLM(endog, exog, family=sm.families.Binomial()
+                      ).fit_regularized_path(alphas, L1_wt=0.5)
+    assert_allclose(path, path_glm, rtol=1e-7, atol=1e-9)
+
+    endog = np.random.poisson(np.exp(lin_pred))
+    offset = np.random.uniform(size=n)
+    path = Poisson(endog, exog, offset=offset).fit_regularized_path(alphas)
+    path_glm = sm.GLM(endog, exog, family=sm.families.Poisson(),
+                      offset=offset).fit_regularized_path(alphas)
+    assert_allclose(path, path_glm, rtol=1e-7, atol=1e-9)
+
+    assert_raises(NotImplementedError,
+                  NegativeBinomial(endog, exog).fit_regularized_path, alphas)
+
+
 def test_issue_339():
     # make sure MNLogit summary works for J != K.
     data = sm.datasets.anes96.load()
@@ -1407,6 +1433,137 @@ def test_formula_missing_exposure():
     assert_raises(ValueError, sm.Poisson, df.Foo, df[['constant', 'Bar']],
                   exposure=exposure)
 
+
+def test_compress():
+    np.random.seed(31415)
+    nobs = 1000
+    exog = sm.add_constant(np.random.randint(0, 3, size=(nobs, 2)))
+    linpred = exog.dot([0.5, 0.3, -0.2])
+    endog_binary = (np.random.rand(nobs) < 1 / (1 + np.exp(-linpred)))
+    endog_count = np.random.poisson(np.exp(linpred) *
+                                    np.random.gamma(2, 0.5, size=nobs))
+    exposure = np.random.randint(1, 3, size=nobs)
+    cases = [(Logit, endog_binary, {}),
+             (Poisson, endog_count, {'exposure': exposure}),
+             (NegativeBinomial, endog_count, {}),
+             (NegativeBinomial, endog_count, {'loglike_method': 'nb1'}),
+             (NegativeBinomial, endog_count, {'loglike_method': 'geometric'})]
+    for klass, endog, kwds in cases:
+        mod1 = klass(endog, exog, **kwds)
+        mod2 = klass(endog, exog, compress=True, **kwds)
+        res1 = mod1.fit(method='newton', disp=0)
+        res2 = mod2.fit(method='newton', disp=0)
+        assert_(mod2.nobs_compressed < nobs)
+        assert_allclose(res2.params, res1.params, rtol=1e-10)
+        assert_allclose(res2.bse, res1.bse, rtol=1e-10)
+        assert_allclose(res2.llf, res1.llf, rtol=1e-10)
+        assert_allclose(res2.llnull, res1.llnull, rtol=1e-10)
+        assert_allclose(res2.predict(), res1.predict(), rtol=1e-10)
+
+    res1 = Logit(endog_binary, exog).fit(disp=0, cov_type='HC0')
+    res2 = Logit(endog_binary, exog, compress=True).fit(disp=0,
+                                                        cov_type='HC0')
+    assert_allclose(res2.bse, res1.bse, rtol=1e-10)
+
+    assert_raises(ValueError, Probit, endog_binary, exog, compress=True)
+
+
+def test_sgd():
+    np.random.seed(2718)
+    nobs = 3000
+    exog = sm.add_constant(np.random.normal(size=(nobs, 3)))
+    linpred = exog.dot([0.2, 0.5, -0.5, 0.25])
+    endog_binary = (linpred + np.random.logistic(size=nobs) > 0) * 1.
+    offset = np.random.uniform(size=nobs)
+    exposure = np.random.randint(1, 4, size=nobs)
+    endog_count = np.random.poisson(np.exp(linpred + offset) * exposure)
+    cases = [(Logit, endog_binary, {}),
+             (Probit, endog_binary, {}),
+             (Poisson, endog_count, {'offset': offset, 'exposure': exposure})]
+    for klass, endog, kwds in cases:
+        mod = klass(endog, exog, **kwds)
+        # several blocks of rows
+        mod._block_rows = 1000
+        res1 = mod.fit(method='newton', disp=0)
+        res2 = mod.fit(method='sgd', disp=0, batch_size=100, tol=0.05,
+                       seed=0)
+        assert_(isinstance(res2, type(res1)))
+        assert_equal(res2.mle_settings['optimizer'], 'sgd')
+        assert_equal(res2.mle_retvals['converged'], True)
+        assert_array_less(np.abs(res2.params - res1.params),
+                          0.05 * res1.bse)
+        assert_allclose(res2.bse, res1.bse, rtol=1e-2)
+        assert_allclose(res2.llf, res1.llf, rtol=1e-6)
+
+        # without the Newton step the estimates are close, and the Hessian
+        # is evaluated at the estimates
+        res3 = mod.fit(method='sgd', disp=0, batch_size=100, tol=0.05,
+                       seed=0, newton_step=False)
+        assert_array_less(np.abs(res3.params - res1.params),
+                          res1.bse)
+        assert_allclose(res3.normalized_cov_params,
+                        np.linalg.inv(-mod.hessian(res3.params)), rtol=1e-8)
+        assert_allclose(res3.mle_retvals['score'],
+                        -mod.score(res3.params) / nobs, rtol=1e-8)
+        assert_allclose(-res3.mle_retvals['fopt'] * nobs, res3.llf,
+                        rtol=1e-10)
+
+    # robust covariance and the compressed data
+    mod = Logit(endog_binary, np.round(exog), compress=True)
+    res1 = Logit(endog_binary, np.round(exog)).fit(disp=0, cov_type='HC0')
+    res2 = mod.fit(method='sgd', disp=0, cov_type='HC0', tol=0.05, seed=0)
+    assert_(mod.nobs_compressed < nobs)
+    assert_array_less(np.abs(res2.params - res1.params),
+                      0.05 * res1.bse)
+    assert_allclose(res2.bse, res1.bse, rtol=1e-2)
+
+    mod = NegativeBinomial(endog_count, exog)
+    assert_raises(ValueError, mod.fit, method='sgd')
+    assert_raises(ValueError, Logit(endog_binary, exog).fit, method='sgd',
+                  step_size=0.1)
+
+
+def test_sgd_memmap():
+    import tempfile
+    import shutil
+
+    class BlockLogit(Logit):
+        _block_rows = 500
+
+    np.random.seed(1414)
+    nobs = 2000
+    tmpdir = tempfile.mkdtemp()
+    try:
+        exog = np.memmap(os.path.join(tmpdir, 'exog.dat'), dtype=np.float64,
+                         mode='w+', shape=(nobs, 3))
+        exog[:, 0] = 1
+        exog[:, 1:] = np.random.normal(size=(nobs, 2))
+        endog = np.memmap(os.path.join(tmpdir, 'endog.dat'),
+                          dtype=np.float64, mode='w+', shape=(nobs,))
+        endog[:] = np.dot(exog, [0., 1., -1.]) + np.random.logistic(
+            size=nobs) > 0
+        mod = BlockLogit(endog, exog)
+        assert_(np.may_share_memory(mod.exog, exog))
+        # the rank from the blocks of exog
+        assert_equal(mod.df_model, 2)
+        assert_equal(mod.df_resid, nobs - 3)
+
+        res1 = Logit(np.array(endog), np.array(exog)).fit(disp=0)
+        res2 = mod.fit(method='sgd', disp=0, tol=0.05, seed=0)
+        assert_array_less(np.abs(res2.params - res1.params),
+                          0.05 * res1.bse)
+        assert_allclose(res2.bse, res1.bse, rtol=1e-2)
+        del mod, res2, exog, endog
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    exog = np.column_stack((np.ones(nobs), np.random.normal(size=(nobs, 2))))
+    exog = np.column_stack((exog, exog[:, 1] - exog[:, 2]))
+    mod = BlockLogit(np.random.randint(0, 2, size=nobs), exog)
+    assert_equal(mod.df_model, 2)
+    assert_equal(mod.df_resid, nobs - 3)
+
+
 if __name__ == "__main__":
     import nose
     nose.runmodule(argv=[__file__, '-vvs', '-x', '--pdb'],
@@ -341,6 +341,7 @@ class PHReg(model.LikelihoodModel):
                              "`breslow`")
 
         self.ties = ties
+        self._init_keys.append('ties')
 
     @classmethod
     def from_formula(cls, formula, data, status=None, entry=None,
@@ -515,6 +516,89 @@ class PHReg(model.LikelihoodModel):
                               refit=refit,
                               **defaults)
 
+    def fit_regularized_path(self, alphas, L1_wt=1., **kwargs):
+        """
+        Return the elastic net coefficient path for a sequence of penalties.
+
+        Parameters
+        ----------
+        alphas : array-like
+            1d array of scalar penalty weights.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        kwargs
+            Additional keyword arguments for `fit_elasticnet_path`:
+            maxiter, cnvrg_tol, zero_tol and strong_rules.
+
+        Returns
+        -------
+        params : ndarray
+            len(alphas) x k array, row i contains the elastic net estimate
+            for alphas[i], see `fit_regularized`.
+
+        Notes
+        -----
+        The penalties are processed in decreasing order, each fit is warm
+        started at the previous solution, coefficients are screened with
+        the sequential strong rule and coordinate descent cycles over the
+        active set within proximal Newton steps.
+
+        See Also
+        --------
+        statsmodels.base.elastic_net.fit_elasticnet_path
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_path
+
+        defaults = {"maxiter" : 50, "cnvrg_tol" : 1e-10,
+                    "zero_tol" : 1e-10}
+        defaults.update(kwargs)
+
+        return fit_elasticnet_path(self, alphas, L1_wt=L1_wt, **defaults)
+
+    def fit_regularized_cv(self, alphas, L1_wt=1., cv=10, n_jobs=1,
+                           random_state=None, **kwargs):
+        """
+        Choose the elastic net penalty weight by K-fold cross-validation.
+
+        Parameters
+        ----------
+        alphas : array-like
+            1d array of scalar penalty weights.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        cv : int or iterable
+            The number of randomly assigned folds, or an iterable of
+            ``(train_index, test_index)`` pairs, see
+            `statsmodels.tools.cross_val`.
+        n_jobs : int
+            Number of folds that are evaluated in parallel, requires
+            joblib.
+        random_state : None, int or RandomState
+            Seed or random number generator for the assignment of the
+            observations to the folds if `cv` is an integer.
+        kwargs
+            Additional keyword arguments for `fit_regularized_path`.
+
+        Returns
+        -------
+        results : ElasticNetCVResults
+            Contains the mean and standard error of the held out
+            partial likelihood deviance for each alpha, `alpha_min`, the
+            1-SE choice `alpha_1se` and the estimate for `alpha_1se` on
+            all observations.
+
+        See Also
+        --------
+        statsmodels.base.elastic_net.fit_elasticnet_cv
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_cv
+
+        return fit_elasticnet_cv(self, alphas, L1_wt=L1_wt, cv=cv,
+                                 n_jobs=n_jobs, random_state=random_state,
+                                 **kwargs)
+
 
     def loglike(self, params):
         """
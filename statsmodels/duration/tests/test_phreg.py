@@ -374,6 +374,40 @@ class TestPHReg(object):
                 llf_sm = plf(sm_result.params)
                 assert_equal(np.sign(llf_sm - llf_r), 1)
 
+    def test_fit_regularized_path(self):
+
+        time, status, entry, exog = self.load_file("survival_data_100_5.csv")
+        exog -= exog.mean(0)
+        exog /= exog.std(0, ddof=1)
+        model = PHReg(time, exog, status=status, ties='breslow')
+
+        alphas = [0.1, 0.01, 0.05]
+        path = model.fit_regularized_path(alphas)
+        for alpha, params in zip(alphas, path):
+            result = model.fit_regularized(alpha=alpha)
+            assert_allclose(params, result.params, rtol=1e-4, atol=1e-5)
+
+    def test_fit_regularized_cv(self):
+
+        time, status, entry, exog = self.load_file("survival_data_100_5.csv")
+        model = PHReg(time, exog, status=status, ties='efron')
+        alphas = [0.1, 0.05, 0.01]
+        folds = [(np.arange(100) % 3 != g, np.arange(100) % 3 == g)
+                 for g in range(3)]
+        res = model.fit_regularized_cv(alphas, cv=folds)
+
+        # the held out deviance uses the partial likelihood of all data
+        train, test = folds[0]
+        path = PHReg(time[train], exog[train], status=status[train],
+                     ties='efron').fit_regularized_path(alphas)
+        deviance = [-2 * (model.loglike(p) - PHReg(
+                        time[train], exog[train], status=status[train],
+                        ties='efron').loglike(p)) for p in path]
+        assert_allclose(res.cv_deviance[0], np.array(deviance) / test.sum(),
+                        rtol=1e-8)
+        assert_allclose(res.params_path, model.fit_regularized_path(alphas),
+                        rtol=1e-10)
+
 
 if  __name__=="__main__":
 
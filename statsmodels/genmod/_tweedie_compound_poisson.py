@@ -1,6 +1,12 @@
 """
 Private experimental module for miscellaneous Tweedie functions.
 
+The density of the compound Poisson-gamma distribution, 1 < p < 2, is
+evaluated by the series of Dunn and Smyth (2001, 2005).  All functions are
+vectorized over arrays of y, mu, p and phi.  The series is summed over a
+window of terms around its largest term, the window is found separately for
+each observation so that the omitted terms are negligible.
+
 References
 ----------
 
@@ -8,6 +14,10 @@ Dunn, Peter K. and Smyth,  Gordon K. 2001. Tweedie family densities: methods of
     evaluation. In Proceedings of the 16th International Workshop on
     Statistical Modelling, Odense, Denmark, 2–6 July.
 
+Dunn, Peter K. and Smyth, Gordon K. 2005. Series evaluation of Tweedie
+    exponential dispersion model densities. Statistics and Computing 15:
+    267–280.
+
 Jørgensen, B., Demétrio, C.G.B., Kristensen, E., Banta, G.T., Petersen, H.C.,
     Delefosse, M.: Bias-corrected Pearson estimating functions for Taylor’s
     power law applied to benthic macrofauna data. Stat. Probab. Lett. 81,
@@ -20,6 +30,16 @@ import numpy as np
 from scipy._lib._util import _lazywhere as lazywhere
 from scipy.special import gammaln
 
+# terms smaller than the largest term by this factor, on the log scale,
+# do not change the sum in double precision
+_LOG_TOL = 37.
+# maximum number of series terms that are held in memory at once
+_MAX_TERMS = 2**22
+# log(j!) for j < len(_log_factorial_table), extended when needed up to
+# _MAX_TABLE entries, gammaln is used for larger j
+_log_factorial_table = np.zeros(1)
+_MAX_TABLE = 2**16
+
 
 def _theta(mu, p):
     return np.where(p == 1, np.log(mu), mu ** (1 - p) / (1 - p))
@@ -29,58 +49,210 @@ def _alpha(p):
     return (2 - p) / (1 - p)
 
 
-def _logWj(y, j, p, phi):
+def _log_factorial(j):
+    """
+    log(j!) for arrays of integer valued floats, looked up in a table
+    """
+    global _log_factorial_table
+    jmax = int(j.max()) if j.size else 0
+    if jmax >= _MAX_TABLE:
+        return gammaln(1 + j)
+    # use a local reference, another thread can replace the global table
+    table = _log_factorial_table
+    if jmax >= len(table):
+        size = min(max(2 * jmax, 1024), _MAX_TABLE)
+        table = gammaln(np.arange(1., size + 1))
+        if len(table) > len(_log_factorial_table):
+            _log_factorial_table = table
+    return table[j.astype(np.intp)]
+
+
+def _logz(y, p, phi):
     alpha = _alpha(p)
-    logz = (-alpha * np.log(y) + alpha * np.log(p - 1) - (1 - alpha) *
+    return (-alpha * np.log(y) + alpha * np.log(p - 1) - (1 - alpha) *
             np.log(phi) - np.log(2 - p))
-    return (j * logz - gammaln(1 + j) - gammaln(-alpha * j))
 
 
 def kappa(mu, p):
     return mu ** (2 - p) / (2 - p)
 
 
-@np.vectorize
-def _sumw(y, j_l, j_u, logWmax, p, phi):
-    j = np.arange(j_l, j_u + 1)
-    sumw = np.sum(np.exp(_logWj(y, j, p, phi) - logWmax))
-    return sumw
+def _series_bound(logw, j0, thresh, direction, step):
+    """
+    Index in direction from j0 beyond which the terms are below thresh
+
+    The terms are log-concave in j.  Starting from the initial distance
+    `step`, the distance is doubled, vectorized over the observations,
+    until the term is below the threshold.
+    """
+    def inside(dist):
+        j = j0 + direction * dist
+        return (j >= 1) & (logw(np.maximum(j, 1)) > thresh)
+
+    is_inside = inside(step)
+    while is_inside.any():
+        step = np.where(is_inside, 2 * step, step)
+        is_inside = inside(step)
+    return np.maximum(j0 + direction * step, 1)
+
+
+def _sum_series(j_l, j_u, logz, neg_alpha, logw_max, lgamma_alpha):
+    """
+    log of the sum of the terms j_l, ..., j_u for each observation
+
+    logw_max is the log of the largest term, up to rounding, it is
+    subtracted before the terms are exponentiated.
+    """
+    counts = (j_u - j_l + 1).astype(np.intp)
+    starts = np.cumsum(counts) - counts
+    j = np.arange(counts.sum(), dtype=np.float64)
+    j -= np.repeat(starts - j_l, counts)
+    if lgamma_alpha is not None:
+        lgam = lgamma_alpha[j.astype(np.intp)]
+    else:
+        lgam = gammaln(np.repeat(neg_alpha, counts) * j)
+    logw = j * np.repeat(logz, counts)
+    logw -= _log_factorial(j)
+    logw -= lgam
+    logw -= np.repeat(logw_max, counts)
+    np.exp(logw, out=logw)
+    return logw_max + np.log(np.add.reduceat(logw, starts))
 
 
 def logW(y, p, phi):
-    alpha = _alpha(p)
+    """
+    Log of the series W(y, p, phi) of the Tweedie density for y > 0
+
+    Parameters
+    ----------
+    y : array-like
+        Positive observations
+    p : float or array-like
+        Variance power, 1 < p < 2
+    phi : float or array-like
+        Dispersion parameter
+
+    Returns
+    -------
+    logW : ndarray
+        The log of the sum over j of the terms W_j, with the shape of the
+        broadcast arguments.
+
+    Notes
+    -----
+    The largest term is near ``j = y**(2 - p) / ((2 - p) * phi)``.  For
+    each observation the terms are summed over the range of j in which they
+    are within a factor exp(-37) of the largest term.  The log-gamma terms
+    are taken from tables, log(j!) is cached across calls and, if p is a
+    scalar, log(Gamma(-alpha j)) is tabulated once per call.
+    """
+    y, p, phi = np.broadcast_arrays(*[np.asarray(x, dtype=np.float64)
+                                      for x in (y, p, phi)])
+    shape = y.shape
+    y, p, phi = y.ravel(), p.ravel(), phi.ravel()
+    scalar_p = p.size > 0 and (p == p[0]).all()
+
+    neg_alpha = -_alpha(p)
+    logz = _logz(y, p, phi)
+
+    def logw(j):
+        return j * logz - _log_factorial(j) - gammaln(neg_alpha * j)
+
     jmax = y ** (2 - p) / ((2 - p) * phi)
-    logWmax = np.array((1 - alpha) * jmax)
-    tol = logWmax - 37  # Machine accuracy for 64 bit.
-    j = np.ceil(jmax)
-    while (_logWj(y, np.ceil(j), p, phi) > tol).any():
-        j = np.where(_logWj(y, j, p, phi) > tol, j + 1, j)
-    j_u = j
-    j = np.floor(jmax)
-    j = np.where(j > 1, j, 1)
-    while (_logWj(y, j, p, phi) > tol).any() and (j > 1).any():
-        j = np.where(_logWj(y, j, p, phi) > tol, j - 1, 1)
-    j_l = j
-    sumw = _sumw(y, j_l, j_u, logWmax, p, phi)
-    return logWmax + np.log(sumw)
+    j0 = np.maximum(np.round(jmax), 1)
+    logw_max = logw(j0)
+    thresh = logw_max - _LOG_TOL
+    # the terms are approximately normal in j with variance
+    # jmax / (1 - alpha), which gives the initial width of the window
+    step = np.ceil(np.sqrt(2 * _LOG_TOL * j0 / (1 + neg_alpha)))
+    j_l = _series_bound(logw, j0, thresh, -1, step)
+    j_u = _series_bound(logw, j0, thresh, 1, step)
+
+    lgamma_alpha = None
+    n_terms = (j_u - j_l + 1).sum()
+    if scalar_p and y.size and j_u.max() < max(n_terms, 1024):
+        lgamma_alpha = gammaln(neg_alpha[0] * np.arange(j_u.max() + 1))
+
+    # split the observations so that the terms of each block fit in memory
+    result = np.empty(y.shape)
+    cum_terms = np.cumsum(j_u - j_l + 1)
+    bounds = np.searchsorted(cum_terms,
+                             np.arange(_MAX_TERMS, n_terms, _MAX_TERMS))
+    bounds = np.unique(np.concatenate(([0], bounds + 1, [y.size])))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        sl = slice(start, stop)
+        result[sl] = _sum_series(j_l[sl], j_u[sl], logz[sl], neg_alpha[sl],
+                                 logw_max[sl], lgamma_alpha)
+    return result.reshape(shape)
+
+
+def log_density_at_zero(y, mu, p, phi):
+    return -(mu ** (2 - p)) / (phi * (2 - p))
+
+
+def log_density_otherwise(y, mu, p, phi):
+    theta = _theta(mu, p)
+    return (logW(y, p, phi) - np.log(y) +
+            (1 / phi * (y * theta - kappa(mu, p))))
+
+
+def log_saddlepoint(y, mu, p, phi):
+    """
+    Saddlepoint approximation to the log density for y > 0
+    """
+    dev = 2 * (y ** (2 - p) / ((1 - p) * (2 - p)) -
+               y * mu ** (1 - p) / (1 - p) + mu ** (2 - p) / (2 - p))
+    return -0.5 * np.log(2 * np.pi * phi * y ** p) - dev / (2 * phi)
+
+
+def log_density(y, mu, p, phi, method='series'):
+    """
+    Log density of the Tweedie distribution for 1 < p < 2
+
+    Parameters
+    ----------
+    y : array-like
+        Nonnegative observations
+    mu : array-like
+        Mean
+    p : float or array-like
+        Variance power, 1 < p < 2
+    phi : float or array-like
+        Dispersion parameter
+    method : str
+        'series' (default) evaluates the series expansion, 'saddlepoint'
+        uses the saddlepoint approximation for y > 0.  The probability of
+        y = 0 is exact for both methods.
+
+    Returns
+    -------
+    logpdf : ndarray
+        Log of the density for y > 0 and log of the probability of zero for
+        y = 0.
+    """
+    if method == 'series':
+        func = log_density_otherwise
+    elif method == 'saddlepoint':
+        func = log_saddlepoint
+    else:
+        raise ValueError("method has to be 'series' or 'saddlepoint'")
+    if np.any(np.asarray(p) <= 1) or np.any(np.asarray(p) >= 2):
+        raise ValueError('the density is only available for 1 < p < 2')
+    y, mu, p, phi = np.broadcast_arrays(*[np.asarray(x, dtype=np.float64)
+                                          for x in (y, mu, p, phi)])
+    return lazywhere(y > 0, (y, mu, p, phi), f=func, f2=log_density_at_zero)
 
 
 def density_at_zero(y, mu, p, phi):
-    return np.exp(-(mu ** (2 - p)) / (phi * (2 - p)))
+    return np.exp(log_density_at_zero(y, mu, p, phi))
 
 
 def density_otherwise(y, mu, p, phi):
-    theta = _theta(mu, p)
-    logd = logW(y, p, phi) - np.log(y) + (1 / phi * (y * theta - kappa(mu, p)))
-    return np.exp(logd)
+    return np.exp(log_density_otherwise(y, mu, p, phi))
 
 
 def series_density(y, mu, p, phi):
-    density = lazywhere(np.array(y) > 0,
-                        (y, mu, p, phi),
-                        f=density_otherwise,
-                        f2=density_at_zero)
-    return density
+    return np.exp(log_density(y, mu, p, phi, method='series'))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,336 @@
+"""
+Generalized linear models for data that are processed in chunks
+
+Each iteration of iteratively reweighted least squares only needs the
+weighted cross-products ``X'WX`` and ``X'Wz`` and the deviance, which are
+sums over observations.  They are accumulated over blocks of rows, so the
+full design matrix never has to be in memory at once, for example if the
+blocks are read from a memory-mapped array or a HDF5 file.
+"""
+from __future__ import division
+
+import copy
+
+import numpy as np
+
+from statsmodels.base.data import handle_data
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.tools import _pinv_crossprod
+from statsmodels.tools.sm_exceptions import PerfectSeparationError
+from . import families
+from .generalized_linear_model import (GLM, GLMResults, GLMResultsWrapper,
+                                       _check_convergence)
+
+__all__ = ['ChunkedGLM', 'ChunkedGLMResults']
+
+
+class ChunkedGLM(GLM):
+    """
+    Generalized linear model estimated by IRLS on chunks of the data
+
+    Parameters
+    ----------
+    chunks : callable or iterable
+        Source of the data blocks.  Each block is a tuple
+        ``(endog, exog, offset, exposure)`` for a subset of the rows, offset
+        and exposure can be None or omitted.  The data are read once in
+        each iteration, so `chunks` has to be either a callable that
+        returns a new iterator over the blocks, or an iterable that can be
+        iterated over several times, e.g. a list of memory-mapped slices.
+        A generator can only be used through a callable that creates it.
+    family : family class instance
+        The default is Gaussian, see GLM.
+
+    Attributes
+    ----------
+    nobs : int
+        Number of observations in all blocks, available after fit.
+    n_chunks : int
+        Number of blocks, available after fit.
+
+    Notes
+    -----
+    The variable names and the data class used to wrap the results are
+    taken from the first block.  Blocks are not checked for missing
+    values.  Results that are defined for each observation, like the
+    residuals, are not available, use `predict` on the blocks instead.
+
+    Examples
+    --------
+    >>> def chunks():
+    ...     for start in range(0, nobs, 10000):
+    ...         sl = slice(start, start + 10000)
+    ...         yield endog_mmap[sl], exog_mmap[sl], None, exposure[sl]
+    >>> mod = ChunkedGLM(chunks, family=sm.families.Poisson())
+    >>> res = mod.fit()
+    """
+
+    def __init__(self, chunks, family=None):
+        if not callable(chunks) and iter(chunks) is chunks:
+            raise ValueError('chunks cannot be a one-time iterator, use a '
+                             'callable that returns the iterator')
+        self.chunks = chunks
+        if family is None:
+            family = families.Gaussian()
+        self.family = family
+
+        endog, exog = next(iter(self._get_chunks()))[:2]
+        self.data = handle_data(endog, exog, missing='none')
+        self.k_exog = self.data.exog.shape[1]
+        self.endog = self.exog = None
+        self.freq_weights = 1.
+        self.n_trials = 1.
+        self.pinv_wexog = None
+        self._has_freq_weights = False
+        self.scaletype = None
+        self._init_keys = ['family']
+
+    def _get_chunks(self):
+        if callable(self.chunks):
+            return self.chunks()
+        return self.chunks
+
+    def _iter_chunks(self):
+        """
+        Blocks of the data as arrays with family and combined offset
+        """
+        is_log = isinstance(self.family.link, families.links.Log)
+        for chunk in self._get_chunks():
+            endog = np.asarray(chunk[0], dtype=np.float64)
+            exog = np.asarray(chunk[1], dtype=np.float64)
+            if exog.ndim == 1:
+                exog = exog[:, None]
+            offset = chunk[2] if len(chunk) > 2 else None
+            exposure = chunk[3] if len(chunk) > 3 else None
+
+            offset_exposure = 0.
+            if offset is not None:
+                offset_exposure = np.asarray(offset, dtype=np.float64)
+            if exposure is not None:
+                if not is_log:
+                    raise ValueError("exposure can only be used with the "
+                                     "log link function")
+                offset_exposure = offset_exposure + np.log(exposure)
+
+            family = self.family
+            n_trials = 1.
+            if isinstance(family, families.Binomial):
+                # Binomial stores the number of trials of the data
+                family = copy.copy(family)
+                family.n = 1
+                endog, n_trials = family.initialize(endog, 1.)
+            yield family, endog, exog, offset_exposure, n_trials
+
+    def _irls_pass(self, params):
+        """
+        Accumulate the IRLS cross-products and fit statistics at params
+
+        If params is None, then the family starting values are used.
+        """
+        k = self.k_exog
+        xtwx = np.zeros((k, k))
+        xtwz = np.zeros(k)
+        xtx = np.zeros((k, k))
+        deviance = pearson_chi2 = 0.
+        nobs = n_chunks = 0
+        col_min = np.inf * np.ones(k)
+        col_max = -col_min
+        for family, endog, exog, offset, n_trials in self._iter_chunks():
+            if params is None:
+                mu = family.starting_mu(endog)
+                lin_pred = family.predict(mu)
+            else:
+                lin_pred = exog.dot(params) + offset
+                mu = family.fitted(lin_pred)
+            weights = n_trials * family.weights(mu)
+            wlsendog = (lin_pred + family.link.deriv(mu) * (endog - mu) -
+                        offset)
+            wexog = exog * weights[:, None]
+            xtwx += wexog.T.dot(exog)
+            xtwz += wexog.T.dot(wlsendog)
+            xtx += exog.T.dot(exog)
+            deviance += family.deviance(endog, mu, np.ones(exog.shape[0]))
+            pearson_chi2 += ((endog - mu)**2 / family.variance(mu)).sum()
+            nobs += exog.shape[0]
+            n_chunks += 1
+            col_min = np.minimum(col_min, exog.min(0))
+            col_max = np.maximum(col_max, exog.max(0))
+            if (endog.ndim == 1 and params is not None and
+                    np.allclose(mu - endog, 0)):
+                msg = "Perfect separation detected, results not available"
+                raise PerfectSeparationError(msg)
+
+        if nobs == 0:
+            raise ValueError('chunks did not return any data')
+        self.nobs = self.wnobs = nobs
+        self.n_chunks = n_chunks
+        self._xtx = xtx
+        self.k_constant = int(((col_min == col_max) & (col_max != 0)).sum())
+        return xtwx, xtwz, deviance, pearson_chi2
+
+    def _loglike_pass(self, params, scale):
+        """
+        Loglikelihood at params accumulated over the blocks
+        """
+        llf = ssr = 0.
+        nobs = 0
+        for family, endog, exog, offset, _ in self._iter_chunks():
+            mu = family.fitted(exog.dot(params) + offset)
+            llf += family.loglike(endog, mu, np.ones(exog.shape[0]),
+                                  scale=scale)
+            ssr += ((endog - mu)**2).sum()
+            nobs += exog.shape[0]
+
+        link = self.family.link
+        if (isinstance(self.family, families.Gaussian) and
+                isinstance(link, families.links.Power) and link.power == 1):
+            # the OLS loglikelihood is concentrated and not a sum over blocks
+            nobs2 = nobs / 2.
+            llf = -np.log(ssr) * nobs2 - (1 + np.log(np.pi / nobs2)) * nobs2
+        return llf
+
+    def _null_model(self):
+        """
+        Chunked model that only has a constant, the offset and exposure
+        """
+        def null_chunks():
+            for chunk in self._get_chunks():
+                ones = np.ones((np.shape(chunk[0])[0], 1))
+                yield (chunk[0], ones) + tuple(chunk[2:])
+
+        return ChunkedGLM(null_chunks, family=self.family)
+
+    def initialize(self):
+        pass
+
+    def fit(self, start_params=None, maxiter=100, tol=1e-8, scale=None,
+            cov_type='nonrobust', use_t=None, **kwargs):
+        """
+        Fit the model by IRLS with one pass over the blocks per iteration
+
+        Parameters
+        ----------
+        start_params : array-like, optional
+            Initial guess of the parameters.  The default uses the starting
+            values of the family.
+        maxiter : int
+            Maximum number of IRLS iterations.
+        tol : float
+            Convergence tolerance for the change in the deviance.
+        scale : string or float, optional
+            'X2', 'dev' or a float, see GLM.fit.  The default is 1 for the
+            Binomial and Poisson families and Pearson's chi-square divided
+            by `df_resid` otherwise.
+        cov_type : string
+            Only 'nonrobust' is available, robust covariances need the
+            scores of the individual observations.
+        use_t : bool
+            If True, the Student t-distribution is used for inference.
+        atol, rtol : float, optional
+            Absolute and relative tolerance for the deviance, see GLM.fit.
+
+        Returns
+        -------
+        results : ChunkedGLMResults
+        """
+        if cov_type != 'nonrobust':
+            raise ValueError('only nonrobust covariance is available')
+        atol = kwargs.get('atol')
+        rtol = kwargs.get('rtol', 0.)
+        atol = tol if atol is None else atol
+        self.scaletype = scale
+
+        if start_params is not None:
+            start_params = np.asarray(start_params, dtype=np.float64)
+        xtwx, xtwz, dev, chi2 = self._irls_pass(start_params)
+        if start_params is None:
+            start_params = np.zeros(self.k_exog)
+        history = dict(params=[np.inf, start_params], deviance=[np.inf, dev])
+        converged = False
+        params = start_params
+        iteration = 0
+        for iteration in range(maxiter):
+            params = _pinv_crossprod(xtwx)[0].dot(xtwz)
+            xtwx, xtwz, dev, chi2 = self._irls_pass(params)
+            history['params'].append(params)
+            history['deviance'].append(dev)
+            converged = _check_convergence(history['deviance'],
+                                           iteration + 1, atol, rtol)
+            if converged:
+                break
+
+        normalized_cov_params = _pinv_crossprod(xtwx)[0]
+        self.df_model = _pinv_crossprod(self._xtx)[2] - 1
+        self.df_resid = self.nobs - self.df_model - 1
+        self.scale = self._estimate_scale(dev, chi2)
+
+        results = ChunkedGLMResults(self, params, normalized_cov_params,
+                                    self.scale, use_t=use_t)
+        results.method = 'IRLS'
+        history['iteration'] = iteration + 1
+        results.fit_history = history
+        results.converged = converged
+        results._cache['deviance'] = dev
+        results._cache['pearson_chi2'] = chi2
+        return GLMResultsWrapper(results)
+
+    def _estimate_scale(self, deviance, pearson_chi2):
+        scaletype = self.scaletype
+        if not scaletype:
+            if isinstance(self.family, (families.Binomial, families.Poisson)):
+                return 1.
+            return pearson_chi2 / self.df_resid
+        if isinstance(scaletype, float):
+            return np.array(scaletype)
+        if scaletype.lower() == 'x2':
+            return pearson_chi2 / self.df_resid
+        elif scaletype.lower() == 'dev':
+            return deviance / self.df_resid
+        raise ValueError("Scale %s with type %s not understood" %
+                         (scaletype, type(scaletype)))
+
+    def fit_regularized(self, *args, **kwargs):
+        raise NotImplementedError('not available for chunked data')
+
+    def fit_constrained(self, *args, **kwargs):
+        raise NotImplementedError('not available for chunked data')
+
+
+class ChunkedGLMResults(GLMResults):
+    """
+    Results of a generalized linear model estimated on chunks of data
+
+    The summary statistics are accumulated over the blocks, the
+    loglikelihood and the statistics of the null model need additional
+    passes over the data and are computed when they are first used.
+    Attributes that are defined for each observation, like residuals and
+    fitted values, are not available.
+    """
+
+    @cache_readonly
+    def mu(self):
+        raise NotImplementedError('fitted values and residuals are not '
+                                  'available for chunked data, use predict')
+
+    @cache_readonly
+    def null(self):
+        raise NotImplementedError('fitted values of the null model are not '
+                                  'available for chunked data')
+
+    @cache_readonly
+    def _null_results(self):
+        return self.model._null_model().fit()
+
+    @cache_readonly
+    def null_deviance(self):
+        return self._null_results.deviance
+
+    @cache_readonly
+    def llnull(self):
+        null_model = self._null_results.model
+        return null_model._loglike_pass(self._null_results.params,
+                                        self.scale)
+
+    @cache_readonly
+    def llf(self):
+        return self.model._loglike_pass(self.params, self.scale)
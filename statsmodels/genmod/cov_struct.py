@@ -44,6 +44,11 @@ class CovStruct(object):
         # Method for projecting the covariance matrix if it not SPD.
         self.cov_nearest_method = cov_nearest_method
 
+        # Factorizations for each cluster size at the current value of
+        # dep_params.
+        self._factor_cache = {}
+        self._factor_dep_params = None
+
     def initialize(self, model):
         """
         Called by GEE, used by implementations that need additional
@@ -172,6 +177,102 @@ class CovStruct(object):
         soln = [spl.cho_solve(vco, x) for x in rhs]
         return soln
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        """
+        Solves the covariance equations for several clusters of equal
+        size at once.
+
+        Parameters
+        ----------
+        expval: ndarray
+           g x m array of the expected values of endog in g clusters that
+           have m observations each.
+        index: array-like
+           The indices of the g clusters.
+        stdev : ndarray
+            g x m array of the standard deviations of endog.
+        rhs : list/tuple of ndarray
+            A set of right-hand sides, each is a g x m or g x m x k array
+            that stacks the right hand sides of the clusters.
+
+        Returns
+        -------
+        soln : list of ndarray
+            The solutions to the matrix equations stacked in the same way
+            as `rhs`, or None if the solver fails.
+
+        Notes
+        -----
+        The default implementation stacks the covariance matrices of the
+        clusters, factors them with one batched Cholesky decomposition and
+        solves all systems with the factors.
+        If a covariance matrix is not SPD, or if a subclass overrides
+        `covariance_matrix_solve` without providing a batched version, the
+        clusters are solved one at a time with `covariance_matrix_solve`.
+        """
+        if _defining_class(self, 'covariance_matrix_solve') is not CovStruct:
+            return self._covariance_matrix_solve_loop(expval, index, stdev,
+                                                      rhs)
+        return self._covariance_matrix_solve_dense(expval, index, stdev, rhs)
+
+    def _covariance_matrix_solve_dense(self, expval, index, stdev, rhs):
+        """
+        Batched solve with the stacked dense covariance matrices
+        """
+        vmat = []
+        for j, i in enumerate(index):
+            vmat_i, is_cor = self.covariance_matrix(expval[j], i)
+            vmat.append(vmat_i)
+        vmat = np.array(vmat, dtype=np.float64)
+        if is_cor:
+            vmat *= stdev[:, :, None] * stdev[:, None, :]
+        try:
+            lmat = np.linalg.cholesky(vmat)
+        except np.linalg.LinAlgError:
+            # the default per-cluster solver conditions the matrix
+            soln = [np.empty(x.shape) for x in rhs]
+            for j, i in enumerate(index):
+                rslt = CovStruct.covariance_matrix_solve(
+                    self, expval[j], i, stdev[j], [x[j] for x in rhs])
+                for y, y_i in zip(soln, rslt):
+                    y[j] = y_i
+            return soln
+        self.cov_adjust.extend([0] * len(index))
+
+        # all right hand sides use the same factorization
+        cols = [x[:, :, None] if x.ndim == 2 else x for x in rhs]
+        soln = _cho_solve_batch(lmat, np.concatenate(cols, axis=2))
+        splits = np.cumsum([c.shape[2] for c in cols])[:-1]
+        return [y.reshape(x.shape)
+                for x, y in zip(rhs, np.split(soln, splits, axis=2))]
+
+    def _covariance_matrix_solve_loop(self, expval, index, stdev, rhs):
+        """
+        Batched solve that calls covariance_matrix_solve for each cluster
+        """
+        soln = [np.empty(x.shape) for x in rhs]
+        for j, i in enumerate(index):
+            rslt = self.covariance_matrix_solve(expval[j], i, stdev[j],
+                                                [x[j] for x in rhs])
+            if rslt is None:
+                return None
+            for y, y_i in zip(soln, rslt):
+                y[j] = y_i
+        return soln
+
+    def _cached_factor(self, size, factor):
+        """
+        Returns `factor(size)`, computed once for each cluster size
+        while dep_params does not change.
+        """
+        dep_params = np.asarray(self.dep_params, dtype=np.float64).tostring()
+        if dep_params != self._factor_dep_params:
+            self._factor_cache = {}
+            self._factor_dep_params = dep_params
+        if size not in self._factor_cache:
+            self._factor_cache[size] = factor(size)
+        return self._factor_cache[size]
+
     def summary(self):
         """
         Returns a text summary of the current estimate of the
@@ -180,6 +281,34 @@ class CovStruct(object):
         raise NotImplementedError
 
 
+def _cho_solve_batch(lmat, rhs):
+    """
+    Solves the equations `lmat[j] * lmat[j].T * soln[j] = rhs[j]` for a
+    g x m x m stack of lower triangular Cholesky factors and a g x m x k
+    stack of right hand sides by forward and back substitution.
+    """
+    m = lmat.shape[1]
+    soln = np.array(rhs, dtype=np.float64)
+    diag = lmat[:, np.arange(m), np.arange(m)]
+    for i in range(m):
+        soln[:, i] -= np.matmul(lmat[:, i:i+1, :i], soln[:, :i])[:, 0]
+        soln[:, i] /= diag[:, i, None]
+    for i in range(m - 1, -1, -1):
+        soln[:, i] -= np.matmul(lmat[:, None, i+1:, i],
+                                soln[:, i+1:])[:, 0]
+        soln[:, i] /= diag[:, i, None]
+    return soln
+
+
+def _defining_class(obj, name):
+    """
+    The first class in the method resolution order of obj defining name
+    """
+    for klass in type(obj).__mro__:
+        if name in vars(klass):
+            return klass
+
+
 class Independence(CovStruct):
     """
     An independence working dependence structure.
@@ -203,9 +332,15 @@ class Independence(CovStruct):
                 rslt.append(x / v[:, None])
         return rslt
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        v = stdev ** 2
+        return [x / v if x.ndim == 2 else x / v[:, :, None] for x in rhs]
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
         return ("Observations within a cluster are modeled "
@@ -237,23 +372,26 @@ class Exchangeable(CovStruct):
         has_weights = self.model.weights is not None
         weights_li = self.model.weights
 
-        residsq_sum, scale = 0, 0
-        fsum1, fsum2, n_pairs = 0., 0., 0.
-        for i in range(self.model.num_group):
-            expval, _ = cached_means[i]
-            stdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / stdev
-            f = weights_li[i] if has_weights else 1.
-
-            ssr = np.sum(resid * resid)
-            scale += f * ssr
-            fsum1 += f * len(endog[i])
-
-            residsq_sum += f * (resid.sum() ** 2 - ssr) / 2
-            ngrp = len(resid)
+        def partial_sums(ix):
+            # the clusters in ix are concatenated
+            expval = np.concatenate([cached_means[i][0] for i in ix])
+            resid = np.concatenate([endog[i] for i in ix]) - expval
+            resid /= np.sqrt(varfunc(expval))
+            ngrp = np.array([len(endog[i]) for i in ix])
+            starts = np.cumsum(ngrp) - ngrp
+            f = weights_li[ix] if has_weights else np.ones(len(ix))
+
+            ssr = np.add.reduceat(resid * resid, starts)
+            rsum = np.add.reduceat(resid, starts)
             npr = 0.5 * ngrp * (ngrp - 1)
-            fsum2 += f * npr
-            n_pairs += npr
+            return np.r_[np.dot(f, ssr), np.dot(f, ngrp),
+                         np.dot(f, (rsum ** 2 - ssr) / 2), np.dot(f, npr),
+                         npr.sum()]
+
+        sums = 0
+        for sums_k in self.model._map_clusters(partial_sums):
+            sums = sums + sums_k
+        scale, fsum1, residsq_sum, fsum2, n_pairs = sums
 
         ddof = self.model.ddof_scale
         scale /= (fsum1 * (nobs - ddof) / float(nobs))
@@ -289,9 +427,28 @@ class Exchangeable(CovStruct):
 
         return rslt
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        k = expval.shape[1]
+        c = self.dep_params / (1. - self.dep_params)
+        c /= 1. + self.dep_params * (k - 1)
+
+        rslt = []
+        for x in rhs:
+            sd = stdev if x.ndim == 2 else stdev[:, :, None]
+            x1 = x / sd
+            y = x1 / (1. - self.dep_params)
+            y -= c * x1.sum(1)[:, None]
+            y /= sd
+            rslt.append(y)
+
+        return rslt
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
         return ("The correlation between two observations in the " +
@@ -341,7 +498,9 @@ class Nested(CovStruct):
     The calculations for this dependence structure involve all pairs
     of observations within a group (that is, within the top level
     `group` structure passed to GEE).  Large group sizes will result
-    in slow iterations.
+    in slow iterations.  If `dep_data` is nested as described above,
+    the working covariance equations are solved in closed form,
+    otherwise the covariance matrices are factorized.
 
     The variance components are estimated using least squares
     regression of the products r*r', for standardized residuals r and
@@ -416,6 +575,25 @@ class Nested(CovStruct):
         self.designx_s = svd[1]
         self.designx_v = svd[2].T
 
+        # Labels of the blocks of observations that share the variance
+        # components of level 0 (the cluster) to level n_nest.  They are
+        # only used if the subgroups are nested, i.e. if the number of
+        # common variance components of two observations is the number
+        # of leading columns of dep_data in which they agree.
+        labels = [np.unique(self.model.groups, return_inverse=True)[1]]
+        is_nested = True
+        for k in range(n_nest):
+            column = np.unique(id_matrix[:, k], return_inverse=True)[1]
+            n_column = column.max() + 1
+            block = labels[-1] * n_column + column
+            labels.append(np.unique(block, return_inverse=True)[1])
+            within = labels[0] * n_column + column
+            is_nested &= len(np.unique(within)) == labels[-1].max() + 1
+        self._block_labels = None
+        if is_nested:
+            self._block_labels = [self.model.cluster_list(lab)
+                                  for lab in labels]
+
     def update(self, params):
 
         endog = self.model.endog_li
@@ -430,27 +608,38 @@ class Nested(CovStruct):
 
         varfunc = self.model.family.variance
 
-        dvmat = []
-        scale = 0.
-        for i in range(self.model.num_group):
+        # The rows of designx for the pairs in each cluster
+        n_pairs = [len(y) * (len(y) - 1) // 2 for y in endog]
+        pair_bounds = np.r_[0, np.cumsum(n_pairs)]
 
-            expval, _ = cached_means[i]
+        def partial_sums(ix):
+            dvmat = []
+            scale = 0.
+            for i in ix:
 
-            stdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / stdev
+                expval, _ = cached_means[i]
+
+                stdev = np.sqrt(varfunc(expval))
+                resid = (endog[i] - expval) / stdev
+
+                ix1, ix2 = np.tril_indices(len(resid), -1)
+                dvmat.append(resid[ix1] * resid[ix2])
 
-            ix1, ix2 = np.tril_indices(len(resid), -1)
-            dvmat.append(resid[ix1] * resid[ix2])
+                scale += np.sum(resid ** 2)
 
-            scale += np.sum(resid ** 2)
+            dvmat = np.concatenate(dvmat)
+            rows = slice(pair_bounds[ix[0]], pair_bounds[ix[-1] + 1])
+            return np.dot(self.designx_u[rows].T, dvmat), scale
 
-        dvmat = np.concatenate(dvmat)
+        udv, scale = 0, 0.
+        for udv_k, scale_k in self.model._map_clusters(partial_sums):
+            udv = udv + udv_k
+            scale += scale_k
         scale /= (nobs - dim)
 
         # Use least squares regression to estimate the variance
         # components
-        vcomp_coeff = np.dot(self.designx_v, np.dot(self.designx_u.T,
-                                                    dvmat) / self.designx_s)
+        vcomp_coeff = np.dot(self.designx_v, udv / self.designx_s)
 
         self.vcomp_coeff = np.clip(vcomp_coeff, 0, np.inf)
         self.scale = scale
@@ -472,8 +661,64 @@ class Nested(CovStruct):
         vmat /= self.scale
         return vmat, True
 
+    def covariance_matrix_solve(self, expval, index, stdev, rhs):
+        rslt = self.covariance_matrix_solve_batch(
+            expval[None], [index], stdev[None], [x[None] for x in rhs])
+        if rslt is None:
+            return None
+        return [y[0] for y in rslt]
+
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        # First iteration
+        if self.dep_params is None:
+            v = stdev ** 2
+            return [x / v if x.ndim == 2 else x / v[:, :, None] for x in rhs]
+
+        # The working covariance of the standardized data, times scale,
+        # is resid_var * I plus vcomp_coeff[k] times the indicator
+        # matrix of the blocks of level k, for each level k.  Starting
+        # from resid_var * I, the levels are added from the innermost
+        # one with the Sherman-Morrison formula applied to each block,
+        # which takes O(m * n_nest) operations for clusters of size m.
+        resid_var = self.scale - self.vcomp_coeff.sum()
+        if self._block_labels is None or resid_var <= 0:
+            return self._covariance_matrix_solve_dense(expval, index, stdev,
+                                                       rhs)
+
+        g, m = expval.shape
+        # w is the inverse of the covariance up to the current level
+        # times a vector of ones
+        w = np.ones(g * m) / resid_var
+        updates = []
+        for k in range(len(self.vcomp_coeff) - 1, -1, -1):
+            labels = np.concatenate([self._block_labels[k][i]
+                                     for i in index])
+            labels = np.unique(labels, return_inverse=True)[1]
+            wsum = np.bincount(labels, weights=w)
+            c = self.vcomp_coeff[k] / (1 + self.vcomp_coeff[k] * wsum)
+            updates.append((labels, w, c))
+            w = w - w * (c * wsum)[labels]
+
+        soln = []
+        for x in rhs:
+            sd = stdev if x.ndim == 2 else stdev[:, :, None]
+            z = (x / sd).reshape(g * m, -1) / resid_var
+            for labels, w, c in updates:
+                zsum = np.column_stack([np.bincount(labels, weights=col,
+                                                    minlength=len(c))
+                                        for col in z.T])
+                z = z - w[:, None] * (c[:, None] * zsum)[labels]
+            z *= self.scale
+            soln.append(z.reshape(x.shape) / sd)
+
+        return soln
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
+    covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
         """
@@ -536,17 +781,29 @@ class Stationary(CovStruct):
         cached_means = self.model.cached_means
         varfunc = self.model.family.variance
 
-        dep_params = np.zeros(self.max_lag + 1)
-        for i in range(self.model.num_group):
-
-            expval, _ = cached_means[i]
-            stdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / stdev
-
-            dep_params[0] += np.sum(resid * resid) / len(resid)
+        def partial_sums(ix):
+            # the clusters in ix are concatenated, products at lag j are
+            # only used if both observations are in the same cluster
+            expval = np.concatenate([cached_means[i][0] for i in ix])
+            resid = np.concatenate([endog[i] for i in ix]) - expval
+            resid /= np.sqrt(varfunc(expval))
+            ngrp = np.array([len(endog[i]) for i in ix])
+            labels = np.repeat(np.arange(len(ix)), ngrp)
+
+            sums = np.zeros(self.max_lag + 1)
+            sums[0] = np.sum(np.bincount(labels, weights=resid * resid) /
+                             ngrp)
             for j in range(1, self.max_lag + 1):
-                dep_params[j] += np.sum(resid[0:-j] *
-                                        resid[j:]) / len(resid[j:])
+                same = labels[:-j] == labels[j:]
+                lag_sum = np.bincount(labels[j:][same],
+                                      weights=(resid[:-j] * resid[j:])[same],
+                                      minlength=len(ix))
+                sums[j] = np.sum(lag_sum / np.maximum(ngrp - j, 0))
+            return sums
+
+        dep_params = 0
+        for sums in self.model._map_clusters(partial_sums):
+            dep_params = dep_params + sums
 
         self.dep_params = dep_params[1:] / dep_params[0]
 
@@ -556,29 +813,36 @@ class Stationary(CovStruct):
         cached_means = self.model.cached_means
         varfunc = self.model.family.variance
 
-        dep_params = np.zeros(self.max_lag + 1)
-        dn = np.zeros(self.max_lag + 1)
-        for i in range(self.model.num_group):
-
-            expval, _ = cached_means[i]
-            stdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / stdev
-
-            j1, j2 = np.tril_indices(len(expval))
-            dx = np.abs(self.time[i][j1] - self.time[i][j2])
-            ii = np.flatnonzero(dx <= self.max_lag)
-            j1 = j1[ii]
-            j2 = j2[ii]
-            dx = dx[ii]
-
-            vs = np.bincount(dx, weights=resid[
-                             j1] * resid[j2], minlength=self.max_lag + 1)
-            vd = np.bincount(dx, minlength=self.max_lag + 1)
-
-            ii = np.flatnonzero(vd > 0)
-            dn[ii] += 1
-            if len(ii) > 0:
-                dep_params[ii] += vs[ii] / vd[ii]
+        def partial_sums(ix):
+            dep_params = np.zeros(self.max_lag + 1)
+            dn = np.zeros(self.max_lag + 1)
+            for i in ix:
+
+                expval, _ = cached_means[i]
+                stdev = np.sqrt(varfunc(expval))
+                resid = (endog[i] - expval) / stdev
+
+                j1, j2 = np.tril_indices(len(expval))
+                dx = np.abs(self.time[i][j1] - self.time[i][j2])
+                ii = np.flatnonzero(dx <= self.max_lag)
+                j1 = j1[ii]
+                j2 = j2[ii]
+                dx = dx[ii]
+
+                vs = np.bincount(dx, weights=resid[
+                                 j1] * resid[j2], minlength=self.max_lag + 1)
+                vd = np.bincount(dx, minlength=self.max_lag + 1)
+
+                ii = np.flatnonzero(vd > 0)
+                dn[ii] += 1
+                if len(ii) > 0:
+                    dep_params[ii] += vs[ii] / vd[ii]
+            return dep_params, dn
+
+        dep_params, dn = 0, 0
+        for dep_params_k, dn_k in self.model._map_clusters(partial_sums):
+            dep_params = dep_params + dep_params_k
+            dn = dn + dn_k
 
         dep_params /= dn
         self.dep_params = dep_params[1:] / dep_params[0]
@@ -614,14 +878,56 @@ class Stationary(CovStruct):
             return super(Stationary, self).covariance_matrix_solve(
                 expval, index, stdev, rhs)
 
-        from statsmodels.tools.linalg import stationary_solve
-        r = np.zeros(len(expval))
-        r[0:self.max_lag] = self.dep_params
-        return [stationary_solve(r, x) for x in rhs]
+        rslt = self.covariance_matrix_solve_batch(
+            expval[None], [index], stdev[None], [x[None] for x in rhs])
+        if rslt is None:
+            return None
+        return [y[0] for y in rslt]
+
+    def _banded_cholesky(self, m):
+        """
+        Cholesky factor of the m x m Toeplitz correlation matrix in the
+        banded storage of scipy.linalg, or None if it is not SPD.
+        """
+        q = min(self.max_lag, m - 1)
+        band = np.ones((q + 1, m))
+        for k in range(1, q + 1):
+            band[k] = self.dep_params[k - 1]
+        try:
+            return spl.cholesky_banded(band, lower=True)
+        except np.linalg.LinAlgError:
+            return None
+
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        # The correlation matrix on the grid is a banded Toeplitz matrix
+        # that is the same for all clusters of equal size.  Its banded
+        # Cholesky factor is computed once for each cluster size, the
+        # solves take O(m * max_lag) operations.
+        g, m = expval.shape
+        if self.grid:
+            chol = self._cached_factor(m, self._banded_cholesky)
+        if not self.grid or chol is None:
+            return self._covariance_matrix_solve_dense(expval, index, stdev,
+                                                       rhs)
+
+        soln = []
+        for x in rhs:
+            sd = stdev if x.ndim == 2 else stdev[:, :, None]
+            x = x / sd
+            # all clusters and columns are right hand sides of one solve
+            y = np.swapaxes(x, 0, 1).reshape(m, -1)
+            y = spl.cho_solve_banded((chol, True), y)
+            y = np.swapaxes(y.reshape((m, g) + x.shape[2:]), 0, 1)
+            soln.append(y / sd)
+
+        return soln
 
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
 
@@ -772,60 +1078,34 @@ class Autoregressive(CovStruct):
         return cmat, True
 
     def covariance_matrix_solve(self, expval, index, stdev, rhs):
-        # The inverse of an AR(1) covariance matrix is tri-diagonal.
+        rslt = self.covariance_matrix_solve_batch(
+            expval[None], [index], stdev[None], [x[None] for x in rhs])
+        return [y[0] for y in rslt]
+
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        # The inverse of an AR(1) correlation matrix is tri-diagonal,
+        # the solution is found in O(m) operations for clusters of size
+        # m.  c0 is on the diagonal, except for the first and last
+        # position, where it is c1.  c2 is on the sub/super diagonal.
+        m = expval.shape[1]
+        r = self.dep_params
+        c0 = (1. + r ** 2) / (1. - r ** 2)
+        c1 = 1. / (1. - r ** 2)
+        c2 = -r / (1. - r ** 2)
 
-        k = len(expval)
-        soln = []
-
-        # LHS has 1 column
-        if k == 1:
-            return [x / stdev ** 2 for x in rhs]
-
-        # LHS has 2 columns
-        if k == 2:
-            mat = np.array([[1, -self.dep_params], [-self.dep_params, 1]])
-            mat /= (1. - self.dep_params ** 2)
-            for x in rhs:
-                if x.ndim == 1:
-                    x1 = x / stdev
-                else:
-                    x1 = x / stdev[:, None]
-                x1 = np.dot(mat, x1)
-                if x.ndim == 1:
-                    x1 /= stdev
-                else:
-                    x1 /= stdev[:, None]
-                soln.append(x1)
-            return soln
-
-        # LHS has >= 3 columns: values c0, c1, c2 defined below give
-        # the inverse.  c0 is on the diagonal, except for the first
-        # and last position.  c1 is on the first and last position of
-        # the diagonal.  c2 is on the sub/super diagonal.
-        c0 = (1. + self.dep_params ** 2) / (1. - self.dep_params ** 2)
-        c1 = 1. / (1. - self.dep_params ** 2)
-        c2 = -self.dep_params / (1. - self.dep_params ** 2)
         soln = []
         for x in rhs:
-            flatten = False
-            if x.ndim == 1:
-                x = x[:, None]
-                flatten = True
-            x1 = x / stdev[:, None]
-
-            z0 = np.zeros((1, x.shape[1]))
-            rhs1 = np.concatenate((x[1:, :], z0), axis=0)
-            rhs2 = np.concatenate((z0, x[0:-1, :]), axis=0)
-
-            y = c0 * x + c2 * rhs1 + c2 * rhs2
-            y[0, :] = c1 * x[0, :] + c2 * x[1, :]
-            y[-1, :] = c1 * x[-1, :] + c2 * x[-2, :]
-
-            y /= stdev[:, None]
-
-            if flatten:
-                y = np.squeeze(y)
-
+            sd = stdev if x.ndim == 2 else stdev[:, :, None]
+            x = x / sd
+            if m == 1:
+                y = x
+            else:
+                y = c0 * x
+                y[:, 0] = c1 * x[:, 0]
+                y[:, -1] = c1 * x[:, -1]
+                y[:, 1:] += c2 * x[:, :-1]
+                y[:, :-1] += c2 * x[:, 1:]
+            y /= sd
             soln.append(y)
 
         return soln
@@ -833,6 +1113,8 @@ class Autoregressive(CovStruct):
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_batch.__doc__ = (
+        CovStruct.covariance_matrix_solve_batch.__doc__)
 
     def summary(self):
 
@@ -9,9 +9,16 @@ import numpy as np
 from scipy import special
 from . import links as L
 from . import varfuncs as V
+from statsmodels.genmod import _tweedie_compound_poisson as _tweedie
 FLOAT_EPS = np.finfo(float).eps
 
 
+def _irls_buffers(mu, out):
+    if out is None:
+        return np.empty_like(mu), np.empty_like(mu)
+    return out
+
+
 class Family(object):
     """
     The parent class for one-parameter exponential families.
@@ -123,6 +130,53 @@ class Family(object):
         """
         return 1. / (self.link.deriv(mu)**2 * self.variance(mu))
 
+    def irls_working(self, endog, mu, lin_pred, out=None):
+        r"""
+        Working weights and working response of an IRLS step
+
+        Parameters
+        ----------
+        endog : ndarray
+            The response variable
+        mu : ndarray
+            The current fitted mean response
+        lin_pred : ndarray
+            The linear predictor at `mu`, including offset and exposure
+        out : tuple of two ndarrays, optional
+            Arrays that are overwritten with the weights and the working
+            response.  If None, then new arrays are created.
+
+        Returns
+        -------
+        weights : ndarray
+            The weights for the IRLS step, see `weights`
+        wendog : ndarray
+            The working response
+
+        Notes
+        -----
+        .. math::
+
+           z = \eta + g'(\mu) (Y - \mu)
+
+        The families override this for their canonical link to avoid the
+        temporary arrays of the separate link and variance evaluations.
+        """
+        weights, wendog = _irls_buffers(mu, out)
+        deriv = self.link.deriv(mu)
+        np.subtract(endog, mu, out=wendog)
+        wendog *= deriv
+        wendog += lin_pred
+        np.multiply(deriv, deriv, out=weights)
+        weights *= self.variance(mu)
+        return np.reciprocal(weights, out=weights), wendog
+
+    def _deviance_inplace(self, endog, mu, freq_weights, out):
+        """
+        Deviance with scale 1, `out` is a scratch array of the shape of mu
+        """
+        return self.deviance(endog, mu, freq_weights)
+
     def deviance(self, endog, mu, freq_weights=1., scale=1.):
         r"""
         The deviance function evaluated at (endog,mu,freq_weights,mu).
@@ -310,6 +364,28 @@ class Poisson(Family):
         """
         return np.clip(x, FLOAT_EPS, np.inf)
 
+    def irls_working(self, endog, mu, lin_pred, out=None):
+        if not isinstance(self.link, L.Log):
+            return super(Poisson, self).irls_working(endog, mu, lin_pred,
+                                                     out=out)
+        # canonical link, 1 / g'(mu) = Var(mu) = mu
+        weights, wendog = _irls_buffers(mu, out)
+        np.clip(mu, FLOAT_EPS, np.inf, out=weights)
+        np.subtract(endog, mu, out=wendog)
+        wendog /= weights
+        wendog += lin_pred
+        return weights, wendog
+
+    irls_working.__doc__ = Family.irls_working.__doc__
+
+    def _deviance_inplace(self, endog, mu, freq_weights, out):
+        np.divide(endog, mu, out=out)
+        np.clip(out, FLOAT_EPS, np.inf, out=out)
+        np.log(out, out=out)
+        out *= endog
+        out *= freq_weights
+        return 2 * out.sum()
+
     def resid_dev(self, endog, mu, scale=1.):
         r"""Poisson deviance residual
 
@@ -461,6 +537,19 @@ class Gaussian(Family):
         self.variance = Gaussian.variance
         self.link = link()
 
+    def irls_working(self, endog, mu, lin_pred, out=None):
+        link = self.link
+        if not (isinstance(link, L.Power) and link.power == 1):
+            return super(Gaussian, self).irls_working(endog, mu, lin_pred,
+                                                      out=out)
+        weights, wendog = _irls_buffers(mu, out)
+        weights.fill(1.)
+        np.subtract(endog, mu, out=wendog)
+        wendog += lin_pred
+        return weights, wendog
+
+    irls_working.__doc__ = Family.irls_working.__doc__
+
     def resid_dev(self, endog, mu, scale=1.):
         r"""
         Gaussian deviance residuals
@@ -843,6 +932,32 @@ class Binomial(Family):
         else:
             return endog, np.ones(endog.shape[0])
 
+    def irls_working(self, endog, mu, lin_pred, out=None):
+        if type(self.link) not in (L.Logit, L.logit):
+            return super(Binomial, self).irls_working(endog, mu, lin_pred,
+                                                      out=out)
+        # canonical link, 1 / g'(mu) = Var(mu) = p * (1 - p)
+        weights, wendog = _irls_buffers(mu, out)
+        np.clip(mu, FLOAT_EPS, 1 - FLOAT_EPS, out=weights)
+        np.multiply(weights, weights, out=wendog)
+        weights -= wendog
+        np.subtract(endog, mu, out=wendog)
+        wendog /= weights
+        wendog += lin_pred
+        return weights, wendog
+
+    irls_working.__doc__ = Family.irls_working.__doc__
+
+    def _deviance_inplace(self, endog, mu, freq_weights, out):
+        if not (np.shape(self.n) == () and self.n == 1):
+            return self.deviance(endog, mu, freq_weights)
+        np.subtract(1, mu, out=out)
+        np.copyto(out, mu, where=np.equal(endog, 1))
+        out += 1e-200
+        np.log(out, out=out)
+        out *= freq_weights
+        return -2 * out.sum()
+
     def deviance(self, endog, mu, freq_weights=1, scale=1.):
         r'''
         Deviance function for either Bernoulli or Binomial data.
@@ -1470,10 +1585,10 @@ class Tweedie(Family):
 
     Notes
     -----
-    Logliklihood function not implemented because of the complexity of
-    calculating an infinite series of summations. The variance power can be
-    estimated using the `estimate_tweedie_power` function that is part of the
-    `GLM` class.
+    The loglikelihood is only available for 1 < var_power < 2, where it is
+    evaluated by a series expansion. The variance power can be estimated
+    using the `estimate_tweedie_power` function that is part of the `GLM`
+    class.
     """
     links = [L.log, L.Power]
     variance = V.Power
@@ -1660,10 +1775,19 @@ class Tweedie(Family):
 
         Notes
         -----
-        This is not implemented because of the complexity of calculating an
-        infinite series of sums.
+        The density is evaluated by the series expansion of Dunn and Smyth
+        for the compound Poisson-gamma case, 1 < var_power < 2.  For other
+        values of the variance power nan is returned.
+
+        .. math::
+
+           llf = \sum_i freq\_weights_i \log f(endog_i; \mu_i, p, scale)
         """
-        return np.nan
+        p = self.var_power
+        if not 1 < p < 2:
+            return np.nan
+        llf = _tweedie.log_density(endog, mu, p, scale)
+        return np.sum(freq_weights * llf)
 
     def resid_anscombe(self, endog, mu):
         """
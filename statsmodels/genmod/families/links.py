@@ -49,6 +49,30 @@ class Link(object):
         """
         return NotImplementedError
 
+    def inverse_into(self, z, out):
+        """
+        Inverse of the link function written into an existing array
+
+        Parameters
+        ----------
+        z : ndarray
+            The linear predictor.
+        out : ndarray
+            Array with the shape of `z` that is overwritten.
+
+        Returns
+        -------
+        out : ndarray
+            g^(-1)(z), the same object as `out`.
+
+        Notes
+        -----
+        This reference implementation creates a temporary array, subclasses
+        override it to compute the inverse in place.
+        """
+        out[...] = self.inverse(z)
+        return out
+
     def deriv(self, p):
         """
         Derivative of the link function g'(p).  Just a placeholder.
@@ -168,6 +192,12 @@ class Logit(Link):
         t = np.exp(-z)
         return 1. / (1. + t)
 
+    def inverse_into(self, z, out):
+        np.negative(z, out=out)
+        np.exp(out, out=out)
+        out += 1.
+        return np.reciprocal(out, out=out)
+
     def deriv(self, p):
 
         """
@@ -298,6 +328,12 @@ class Power(Link):
         p = np.power(z, 1. / self.power)
         return p
 
+    def inverse_into(self, z, out):
+        if self.power == 1:
+            np.copyto(out, z)
+            return out
+        return np.power(z, 1. / self.power, out=out)
+
     def deriv(self, p):
         """
         Derivative of the power transform
@@ -466,6 +502,9 @@ class Log(Link):
         """
         return np.exp(z)
 
+    def inverse_into(self, z, out):
+        return np.exp(z, out=out)
+
     def deriv(self, p):
         """
         Derivative of log transform link function
@@ -555,6 +594,9 @@ class CDFLink(Logit):
     The CDF link is untested.
     """
 
+    # only the _clean method is shared with Logit
+    inverse_into = Link.inverse_into
+
     def __init__(self, dbn=scipy.stats.norm):
         self.dbn = dbn
 
@@ -704,6 +746,8 @@ class CLogLog(Logit):
     -----
     CLogLog is untested.
     """
+    inverse_into = Link.inverse_into
+
     def __call__(self, p):
         """
         C-Log-Log transform link function
@@ -304,6 +304,9 @@ _gee_fit_doc = """
         scaled by this value.  Default is 1, Stata uses N / (N - g),
         where N is the total sample size and g is the average group
         size.
+    n_jobs : integer
+        The number of threads that process the clusters, -1 uses one
+        thread for each core.  The results do not depend on `n_jobs`.
 
     Returns
     -------
@@ -457,6 +460,21 @@ class GEE(base.Model):
 
     cached_means = None
 
+    # Clusters of equal size are stacked and their covariance equations
+    # are solved together, this requires that mean_deriv is computed
+    # row by row from exog and the linear predictor.  Batching is turned
+    # off in __init__ for subclasses that override mean_deriv.
+    _batch_clusters = True
+
+    # The clusters are processed in chunks of about this many
+    # observations.  The chunks do not depend on n_jobs and their partial
+    # sums are added in a fixed order, so that the results are identical
+    # for any number of threads.
+    _chunk_nobs = 2 ** 16
+
+    # Thread pool used during fit if n_jobs is not 1
+    _pool = None
+
     def __init__(self, endog, exog, groups, time=None, family=None,
                  cov_struct=None, missing='none', offset=None,
                  exposure=None, dep_data=None, constraint=None,
@@ -602,6 +620,23 @@ class GEE(base.Model):
         if maxgroup == 1:
             self.update_dep = False
 
+        # Indices of the clusters in the batches of equal size clusters
+        # and in the chunks of consecutive clusters
+        group_ns = np.asarray(group_ns)
+        self._batch_index = []
+        for size in np.unique(group_ns[group_ns > 0]):
+            ix = np.flatnonzero(group_ns == size)
+            n_batch = max(self._chunk_nobs // size, 1)
+            self._batch_index.extend(np.split(ix, np.arange(
+                n_batch, len(ix), n_batch)))
+        self._exog_batches = None
+        if cov_structs._defining_class(self, 'mean_deriv') is not GEE:
+            self._batch_clusters = False
+        bounds = np.searchsorted(np.cumsum(group_ns), np.arange(
+            self._chunk_nobs, self.nobs, self._chunk_nobs))
+        self._cluster_chunks = [ix for ix in np.split(
+            np.arange(self.num_group), np.unique(bounds + 1)) if len(ix)]
+
     # Override to allow groups and time to be passed as variable
     # names.
     @classmethod
@@ -699,6 +734,86 @@ class GEE(base.Model):
             return [np.array(array[self.group_indices[k], :])
                     for k in self.group_labels]
 
+    def _map_chunks(self, func, chunks):
+        """
+        Returns the list of func(chunk) for all chunks, in the order of
+        the chunks, using the thread pool of fit if n_jobs is not 1.
+        """
+        if self._pool is None or len(chunks) < 2:
+            return [func(chunk) for chunk in chunks]
+        return self._pool.map(func, chunks, chunksize=1)
+
+    def _map_clusters(self, func):
+        """
+        Applies func to chunks of consecutive clusters
+
+        Parameters
+        ----------
+        func : callable
+            Function of an array of cluster indices.
+
+        Returns
+        -------
+        The list of results of func, in the order of the chunks.
+        """
+        return self._map_chunks(func, self._cluster_chunks)
+
+    def _map_batches(self, func, rhs_resid=True):
+        """
+        Applies func to the solutions of the covariance equations for the
+        batches of equal-size clusters
+
+        Parameters
+        ----------
+        func : callable
+            Function of a tuple for a batch of g clusters with m
+            observations consisting of the indices of the clusters, the
+            stacked means and standard deviations (g x m), the weights of
+            the clusters (None without weights), the derivative of the
+            mean, `dmat` (g x m x p), the residuals (g x m), the solution
+            for dmat and, if `rhs_resid` is True, the solution for the
+            residuals.  It returns None if a solve fails.
+        rhs_resid : bool
+            If True, the residuals are a right hand side of the covariance
+            equations in addition to the derivative of the mean.
+
+        Returns
+        -------
+        The list of results of func in the order of the batches, None if
+        the covariance equations of a batch cannot be solved.
+        """
+        # exog_li is replaced temporarily when handling constraints
+        if (self._exog_batches is None or
+                self._exog_batches[0] is not self.exog_li):
+            self._exog_batches = (self.exog_li,
+                                  [np.array([self.exog_li[i] for i in ix])
+                                   for ix in self._batch_index])
+
+        varfunc = self.family.variance
+        inverse_deriv = self.family.link.inverse_deriv
+        cached_means = self.cached_means
+
+        def solve(k):
+            ix, exog = self._batch_index[k], self._exog_batches[1][k]
+            expval = np.array([cached_means[i][0] for i in ix])
+            lpr = np.array([cached_means[i][1] for i in ix])
+            resid = np.array([self.endog_li[i] for i in ix]) - expval
+            dmat = exog * inverse_deriv(lpr)[:, :, None]
+            sdev = np.sqrt(varfunc(expval))
+
+            rhs = (dmat, resid) if rhs_resid else (dmat,)
+            rslt = self.cov_struct.covariance_matrix_solve_batch(
+                expval, ix, sdev, rhs)
+            if rslt is None:
+                return None
+            f = self.weights_li[ix] if self.weights is not None else None
+            return func((ix, expval, sdev, f, dmat, resid) + tuple(rslt))
+
+        rslt = self._map_chunks(solve, list(range(len(self._batch_index))))
+        if any(r is None for r in rslt):
+            return None
+        return rslt
+
     def estimate_scale(self):
         """
         Returns an estimate of the scale parameter at the current
@@ -714,22 +829,21 @@ class GEE(base.Model):
         nobs = self.nobs
         varfunc = self.family.variance
 
+        def partial_sums(ix):
+            # the clusters in ix are concatenated
+            expval = np.concatenate([cached_means[i][0] for i in ix])
+            resid = np.concatenate([endog[i] for i in ix]) - expval
+            resid /= np.sqrt(varfunc(expval))
+            if self.weights is None:
+                return np.sum(resid ** 2), len(resid)
+            f = np.repeat(self.weights_li[ix], [len(endog[i]) for i in ix])
+            return np.dot(f, resid ** 2), f.sum()
+
         scale = 0.
         fsum = 0.
-        for i in range(self.num_group):
-
-            if len(endog[i]) == 0:
-                continue
-
-            expval, _ = cached_means[i]
-
-            f = self.weights_li[i] if self.weights is not None else 1.
-
-            sdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / sdev
-
-            scale += f * np.sum(resid ** 2)
-            fsum += f * len(endog[i])
+        for scale_k, fsum_k in self._map_clusters(partial_sums):
+            scale += scale_k
+            fsum += fsum_k
 
         scale /= (fsum * (nobs - self.ddof_scale) / float(nobs))
 
@@ -810,23 +924,41 @@ class GEE(base.Model):
         varfunc = self.family.variance
 
         bmat, score = 0, 0
-        for i in range(self.num_group):
-
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
-
-            rslt = self.cov_struct.covariance_matrix_solve(expval, i,
-                                                           sdev, (dmat, resid))
+        if self._batch_clusters:
+            # the batch sums are reduced in the threads and added in the
+            # order of the batches
+            def partial_sums(batch):
+                f, dmat, _, vinv_d, vinv_resid = batch[3:]
+                if f is not None:
+                    dmat = dmat * f[:, None, None]
+                dmat = dmat.reshape(-1, dmat.shape[2])
+                return (np.dot(dmat.T, vinv_d.reshape(dmat.shape)),
+                        np.dot(dmat.T, vinv_resid.ravel()))
+
+            rslt = self._map_batches(partial_sums)
             if rslt is None:
                 return None, None
-            vinv_d, vinv_resid = tuple(rslt)
+            for bmat_k, score_k in rslt:
+                bmat += bmat_k
+                score += score_k
+        else:
+            for i in range(self.num_group):
+
+                expval, lpr = cached_means[i]
+                resid = endog[i] - expval
+                dmat = self.mean_deriv(exog[i], lpr)
+                sdev = np.sqrt(varfunc(expval))
+
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (dmat, resid))
+                if rslt is None:
+                    return None, None
+                vinv_d, vinv_resid = tuple(rslt)
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+                f = self.weights_li[i] if self.weights is not None else 1.
 
-            bmat += f * np.dot(dmat.T, vinv_d)
-            score += f * np.dot(dmat.T, vinv_resid)
+                bmat += f * np.dot(dmat.T, vinv_d)
+                score += f * np.dot(dmat.T, vinv_resid)
 
         update = np.linalg.solve(bmat, score)
 
@@ -891,24 +1023,41 @@ class GEE(base.Model):
         # Calculate the naive (model-based) and robust (sandwich)
         # covariances.
         bmat, cmat = 0, 0
-        for i in range(self.num_group):
+        if self._batch_clusters:
+            def partial_sums(batch):
+                f, dmat, _, vinv_d, vinv_resid = batch[3:]
+                if f is not None:
+                    dmat = dmat * f[:, None, None]
+                dvinv_resid = (dmat * vinv_resid[:, :, None]).sum(1)
+                dmat = dmat.reshape(-1, dmat.shape[2])
+                return (np.dot(dmat.T, vinv_d.reshape(dmat.shape)),
+                        np.dot(dvinv_resid.T, dvinv_resid))
+
+            rslt = self._map_batches(partial_sums)
+            if rslt is None:
+                return None, None, None
+            for bmat_k, cmat_k in rslt:
+                bmat += bmat_k
+                cmat += cmat_k
+        else:
+            for i in range(self.num_group):
 
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+                expval, lpr = cached_means[i]
+                resid = endog[i] - expval
+                dmat = self.mean_deriv(exog[i], lpr)
+                sdev = np.sqrt(varfunc(expval))
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat, resid))
-            if rslt is None:
-                return None, None, None, None
-            vinv_d, vinv_resid = tuple(rslt)
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (dmat, resid))
+                if rslt is None:
+                    return None, None, None, None
+                vinv_d, vinv_resid = tuple(rslt)
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+                f = self.weights_li[i] if self.weights is not None else 1.
 
-            bmat += f * np.dot(dmat.T, vinv_d)
-            dvinv_resid = f * np.dot(dmat.T, vinv_resid)
-            cmat += np.outer(dvinv_resid, dvinv_resid)
+                bmat += f * np.dot(dmat.T, vinv_d)
+                dvinv_resid = f * np.dot(dmat.T, vinv_resid)
+                cmat += np.outer(dvinv_resid, dvinv_resid)
 
         scale = self.estimate_scale()
 
@@ -932,33 +1081,59 @@ class GEE(base.Model):
         scale = self.estimate_scale()
 
         bcm = 0
-        for i in range(self.num_group):
-
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+        if self._batch_clusters:
+            def partial_sums(batch):
+                ix, expval, sdev, f, dmat, resid, vinv_d = batch
+                vinv_d /= scale
+
+                hmat = np.dot(vinv_d, cov_naive)
+                hmat = np.matmul(dmat, hmat.transpose(0, 2, 1))
+
+                aresid = np.linalg.solve(np.eye(resid.shape[1]) - hmat,
+                                         resid[:, :, None])[:, :, 0]
+                rslt = self.cov_struct.covariance_matrix_solve_batch(
+                    expval, ix, sdev, (aresid,))
+                if rslt is None:
+                    return None
+                srt = rslt[0]
+                srt = (dmat * srt[:, :, None]).sum(1) / scale
+                if f is not None:
+                    srt *= f[:, None]
+                return np.dot(srt.T, srt)
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat,))
+            rslt = self._map_batches(partial_sums, rhs_resid=False)
             if rslt is None:
                 return None
-            vinv_d = rslt[0]
-            vinv_d /= scale
+            for bcm_k in rslt:
+                bcm += bcm_k
+        else:
+            for i in range(self.num_group):
 
-            hmat = np.dot(vinv_d, cov_naive)
-            hmat = np.dot(hmat, dmat.T).T
+                expval, lpr = cached_means[i]
+                resid = endog[i] - expval
+                dmat = self.mean_deriv(exog[i], lpr)
+                sdev = np.sqrt(varfunc(expval))
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (dmat,))
+                if rslt is None:
+                    return None
+                vinv_d = rslt[0]
+                vinv_d /= scale
 
-            aresid = np.linalg.solve(np.eye(len(resid)) - hmat, resid)
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (aresid,))
-            if rslt is None:
-                return None
-            srt = rslt[0]
-            srt = f * np.dot(dmat.T, srt) / scale
-            bcm += np.outer(srt, srt)
+                hmat = np.dot(vinv_d, cov_naive)
+                hmat = np.dot(hmat, dmat.T).T
+
+                f = self.weights_li[i] if self.weights is not None else 1.
+
+                aresid = np.linalg.solve(np.eye(len(resid)) - hmat, resid)
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (aresid,))
+                if rslt is None:
+                    return None
+                srt = rslt[0]
+                srt = f * np.dot(dmat.T, srt) / scale
+                bcm += np.outer(srt, srt)
 
         cov_robust_bc = np.dot(cov_naive, np.dot(bcm, cov_naive))
         cov_robust_bc *= self.scaling_factor
@@ -1059,9 +1234,29 @@ class GEE(base.Model):
 
     def fit(self, maxiter=60, ctol=1e-6, start_params=None,
             params_niter=1, first_dep_update=0,
-            cov_type='robust', ddof_scale=None, scaling_factor=1.):
+            cov_type='robust', ddof_scale=None, scaling_factor=1.,
+            n_jobs=1):
         # Docstring attached below
 
+        args = (maxiter, ctol, start_params, params_niter, first_dep_update,
+                cov_type, ddof_scale, scaling_factor)
+        if n_jobs == 1:
+            return self._fit(*args)
+
+        from multiprocessing.pool import ThreadPool
+        if n_jobs == -1:
+            import multiprocessing
+            n_jobs = multiprocessing.cpu_count()
+        self._pool = ThreadPool(n_jobs)
+        try:
+            return self._fit(*args)
+        finally:
+            self._pool.terminate()
+            self._pool = None
+
+    def _fit(self, maxiter, ctol, start_params, params_niter,
+             first_dep_update, cov_type, ddof_scale, scaling_factor):
+
         # Subtract this number from the total sample size when
         # normalizing the scale parameter estimate.
         if ddof_scale is None:
@@ -1976,11 +2171,11 @@ class OrdinalGEE(GEE):
 
     def fit(self, maxiter=60, ctol=1e-6, start_params=None,
             params_niter=1, first_dep_update=0,
-            cov_type='robust'):
+            cov_type='robust', n_jobs=1):
 
         rslt = super(OrdinalGEE, self).fit(maxiter, ctol, start_params,
                                            params_niter, first_dep_update,
-                                           cov_type=cov_type)
+                                           cov_type=cov_type, n_jobs=n_jobs)
 
         rslt = rslt._results   # use unwrapped instance
         res_kwds = dict(((k, getattr(rslt, k)) for k in rslt._props))
@@ -2308,11 +2503,11 @@ class NominalGEE(GEE):
 
     def fit(self, maxiter=60, ctol=1e-6, start_params=None,
             params_niter=1, first_dep_update=0,
-            cov_type='robust'):
+            cov_type='robust', n_jobs=1):
 
         rslt = super(NominalGEE, self).fit(maxiter, ctol, start_params,
                                            params_niter, first_dep_update,
-                                           cov_type=cov_type)
+                                           cov_type=cov_type, n_jobs=n_jobs)
         if rslt is None:
             warnings.warn("GEE updates did not converge",
                           ConvergenceWarning)
@@ -18,7 +18,10 @@ McCullagh, P. and Nelder, J.A.  1989.  "Generalized Linear Models." 2nd ed.
     Chapman & Hall, Boca Rotan.
 """
 
+import copy
+
 import numpy as np
+from scipy import sparse
 from . import families
 from statsmodels.tools.decorators import cache_readonly, resettable_cache
 
@@ -26,6 +29,8 @@ import statsmodels.base.model as base
 import statsmodels.regression.linear_model as lm
 import statsmodels.base.wrapper as wrap
 from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.tools.tools import _scale_rows, _crossprod, _pinv_crossprod
+from statsmodels.tools.grouputils import compress_rows
 
 from statsmodels.graphics._regressionplots_doc import (
     _plot_added_variable_doc,
@@ -46,6 +51,45 @@ def _check_convergence(criterion, iteration, atol, rtol):
                        atol=atol, rtol=rtol)
 
 
+def _wls_solve(exog, weights, wendog, wexog=None, max_cond=1e4):
+    """
+    Weighted least squares step of IRLS
+
+    The normal equations are solved after scaling the columns to unit
+    weighted norm.  If the scaled design has a condition number larger than
+    `max_cond` or is singular, then the pseudoinverse of the weighted
+    design is used instead, which is numerically stable but creates
+    temporary arrays of the size of exog.  `wexog` is an optional
+    preallocated array of the shape of a dense exog.
+
+    Returns the parameters and the normalized covariance matrix.
+    """
+    if sparse.issparse(exog):
+        xtwx = _crossprod(exog, weights)
+        xtwz = exog.T.dot(weights * wendog)
+    else:
+        if wexog is None:
+            wexog = np.empty(exog.shape)
+        np.multiply(exog, weights[:, None], out=wexog)
+        xtwx = np.dot(wexog.T, exog)
+        xtwz = np.dot(wexog.T, wendog)
+    col_scale = np.sqrt(np.diag(xtwx))
+    col_scale[col_scale == 0] = 1.
+    col_scale = np.outer(col_scale, col_scale)
+    pinv, singular_values, rank = _pinv_crossprod(xtwx / col_scale)
+    if (sparse.issparse(exog) or (rank == exog.shape[1] and
+            singular_values[0] < max_cond * singular_values[-1])):
+        normalized_cov_params = pinv / col_scale
+        return normalized_cov_params.dot(xtwz), normalized_cov_params
+
+    # ill-conditioned, the cross-product matrix loses too much precision
+    sqrt_weights = np.sqrt(weights)
+    np.multiply(exog, sqrt_weights[:, None], out=wexog)
+    pinv_wexog = np.linalg.pinv(wexog)
+    params = pinv_wexog.dot(sqrt_weights * wendog)
+    return params, np.dot(pinv_wexog, pinv_wexog.T)
+
+
 class GLM(base.LikelihoodModel):
     __doc__ = """
     Generalized Linear Models class
@@ -81,6 +125,12 @@ class GLM(base.LikelihoodModel):
         with length equal to the endog.
         WARNING: Using weights is not verified yet for all possible options
         and results, see Notes.
+    compress : bool
+        If True, then `fit` estimates the model on the unique rows of endog,
+        exog, offset, exposure and the number of binomial trials, with the
+        number of duplicates added to the frequency weights.  The results
+        are the same as without compression and refer to all observations.
+        This is faster for data with few distinct covariate patterns.
     %(extra_params)s
 
     Attributes
@@ -160,6 +210,11 @@ class GLM(base.LikelihoodModel):
     Endog and exog are references so that if the data they refer to are already
     arrays and these arrays are changed, endog and exog will change.
 
+    exog can be a scipy.sparse matrix, for example the indicator matrix
+    returned by `statsmodels.tools.grouputils.dummy_sparse`.  It is stored in
+    CSR format and the IRLS iterations only use sparse products with it, the
+    k x k cross-product matrices are dense.
+
     Using frequency weights: Frequency weights produce the same results as repeating
     observations by the frequencies (if those are integers). This is verified for all
     basic results with nonrobust or heteroscedasticity robust ``cov_type``. Other
@@ -235,7 +290,8 @@ class GLM(base.LikelihoodModel):
     """ % {'extra_params' : base._missing_param_doc}
 
     def __init__(self, endog, exog, family=None, offset=None,
-                 exposure=None, freq_weights=None, missing='none', **kwargs):
+                 exposure=None, freq_weights=None, missing='none',
+                 compress=False, **kwargs):
 
         if (family is not None) and not isinstance(family.link, tuple(family.safe_links)):
             import warnings
@@ -268,6 +324,12 @@ class GLM(base.LikelihoodModel):
         # register kwds for __init__, offset and exposure are added by super
         self._init_keys.append('family')
 
+        self.compress = compress
+        if compress:
+            if sparse.issparse(self.exog):
+                raise ValueError('compress is not available for sparse exog')
+            self._init_keys.append('compress')
+
         self._setup_binomial()
 
         # Construct a combined offset/exposure term.  Note that
@@ -291,11 +353,17 @@ class GLM(base.LikelihoodModel):
                         'params' : [np.inf],
                         'deviance' : [np.inf]}
 
-        self.pinv_wexog = np.linalg.pinv(self.exog)
-        self.normalized_cov_params = np.dot(self.pinv_wexog,
-                                            np.transpose(self.pinv_wexog))
-
-        self.df_model = np_matrix_rank(self.exog) - 1
+        if sparse.issparse(self.exog):
+            # the pseudoinverse of a sparse exog would be dense
+            self.pinv_wexog = None
+            self.normalized_cov_params, _, rank = _pinv_crossprod(
+                _crossprod(self.exog))
+            self.df_model = rank - 1
+        else:
+            self.pinv_wexog = np.linalg.pinv(self.exog)
+            self.normalized_cov_params = np.dot(self.pinv_wexog,
+                                                np.transpose(self.pinv_wexog))
+            self.df_model = np_matrix_rank(self.exog) - 1
 
 
         if (self.freq_weights is not None) and \
@@ -359,7 +427,7 @@ class GLM(base.LikelihoodModel):
         """
         Evaluate the log-likelihood for a generalized linear model.
         """
-        lin_pred = np.dot(self.exog, params) + self._offset_exposure
+        lin_pred = self.exog.dot(params) + self._offset_exposure
         expval = self.family.link.inverse(lin_pred)
         if scale is None:
             scale = self.estimate_scale(expval)
@@ -388,6 +456,8 @@ class GLM(base.LikelihoodModel):
         """
 
         score_factor = self.score_factor(params, scale=scale)
+        if sparse.issparse(self.exog):
+            return _scale_rows(self.exog, score_factor).toarray()
         return score_factor[:, None] * self.exog
 
 
@@ -493,8 +563,8 @@ class GLM(base.LikelihoodModel):
         tmp = self.family.variance(mu) * self.family.link.deriv2(mu)
         tmp += self.family.variance.deriv(mu) * self.family.link.deriv(mu)
 
-        tmp = score_factor * eim_factor * tmp
-        # correct for duplicatee freq_weights in oim_factor and score_factor
+        tmp = score_factor * tmp
+        # correct for duplicate freq_weights in oim_factor and score_factor
         tmp /= self.freq_weights
         oim_factor = eim_factor * (1 + tmp)
 
@@ -529,7 +599,7 @@ class GLM(base.LikelihoodModel):
         """
 
         factor = self.hessian_factor(params, scale=scale, observed=observed)
-        hess = -np.dot(self.exog.T * factor, self.exog)
+        hess = -_crossprod(self.exog, factor)
         return hess
 
     def information(self, params, scale=None):
@@ -686,8 +756,11 @@ class GLM(base.LikelihoodModel):
         mu : array-like
             Fitted mean response variable
         method : str, defaults to 'brentq'
-            Scipy optimizer used to solve the Pearson equation. Only brentq
-            currently supported.
+            'brentq' solves the Pearson estimating equation with scipy's
+            brentq.  'profile' maximizes the profile loglikelihood of the
+            compound Poisson-gamma distribution, the scale is the Pearson
+            estimate for each power, and the search is restricted to
+            1 < power < 2.
         low : float, optional
             Low end of the bracketing interval [a,b] to be used in the search
             for the power. Defaults to 1.01.
@@ -710,8 +783,21 @@ class GLM(base.LikelihoodModel):
                                (scale * (mu ** power)) - 1) *
                                np.log(mu)) / self.freq_weights.sum())
             power = brentq(psi_p, low, high, args=(mu))
+        elif method == 'profile':
+            from scipy.optimize import minimize_scalar
+            from ._tweedie_compound_poisson import log_density
+
+            def nllf(power):
+                scale = ((self.freq_weights * (self.endog - mu) ** 2 /
+                          (mu ** power)).sum() / self.df_resid)
+                return -np.sum(self.freq_weights *
+                               log_density(self.endog, mu, power, scale))
+            bounds = (max(low, 1 + 1e-4), min(high, 2 - 1e-4))
+            power = minimize_scalar(nllf, bounds=bounds, method='bounded',
+                                    options={'xatol': 1e-4}).x
         else:
-            raise NotImplementedError('Only brentq can currently be used')
+            raise NotImplementedError("method has to be 'brentq' or "
+                                      "'profile'")
         return power
 
     def predict(self, params, exog=None, exposure=None, offset=None,
@@ -771,7 +857,10 @@ class GLM(base.LikelihoodModel):
         if exog is None:
             exog = self.exog
 
-        linpred = np.dot(exog, params) + offset + exposure
+        if sparse.issparse(exog):
+            linpred = exog.dot(params) + offset + exposure
+        else:
+            linpred = np.dot(exog, params) + offset + exposure
         if linear:
             return linpred
         else:
@@ -897,6 +986,16 @@ class GLM(base.LikelihoodModel):
         """
         self.scaletype = scale
 
+        if self.compress:
+            return self._fit_compressed(start_params=start_params,
+                                        maxiter=maxiter, method=method,
+                                        tol=tol, scale=scale,
+                                        cov_type=cov_type, cov_kwds=cov_kwds,
+                                        use_t=use_t, full_output=full_output,
+                                        disp=disp,
+                                        max_start_irls=max_start_irls,
+                                        **kwargs)
+
         if method.lower() == "irls":
             return self._fit_irls(start_params=start_params, maxiter=maxiter,
                                   tol=tol, scale=scale, cov_type=cov_type,
@@ -912,6 +1011,59 @@ class GLM(base.LikelihoodModel):
                                       max_start_irls=max_start_irls,
                                       **kwargs)
 
+    def _compressed_model(self):
+        """
+        Copy of the model on the unique rows with aggregated freq_weights
+        """
+        offset_exposure = self._offset_exposure
+        if np.isscalar(offset_exposure):
+            offset_exposure = None
+        index, inverse, _ = compress_rows([self.endog, self.exog,
+                                           offset_exposure, self.n_trials])
+        freq_weights = np.bincount(inverse, weights=self.freq_weights)
+        endog = self.endog[index]
+        if isinstance(self.family, families.Binomial):
+            # keep the number of trials of each binomial observation
+            n_trials = self.n_trials[index]
+            endog = np.column_stack((endog * n_trials,
+                                     (1 - endog) * n_trials))
+        kwds = {}
+        if hasattr(self, 'offset'):
+            kwds['offset'] = self.offset[index]
+        if hasattr(self, 'exposure'):
+            kwds['exposure'] = np.exp(self.exposure[index])
+        # Binomial stores the number of trials of the data in the family
+        family = copy.copy(self.family)
+        return GLM(endog, self.exog[index], family=family,
+                   freq_weights=freq_weights, **kwds)
+
+    def _fit_compressed(self, start_params=None, scale=None,
+                        cov_type='nonrobust', cov_kwds=None, use_t=None,
+                        **kwargs):
+        """
+        Fit on the unique rows and attach the estimates to this model
+
+        The frequency weighted score and hessian of the compressed model are
+        the same as those of the full model, the residuals and robust
+        covariances of the results are based on all observations.
+        """
+        model = self._compressed_model()
+        res = model.fit(start_params=start_params, scale=scale, **kwargs)
+        self.mu = self.predict(res.params)
+        self.scale = res.scale
+        self.nobs_compressed = model.nobs
+
+        glm_results = GLMResults(self, res.params,
+                                 res.normalized_cov_params, res.scale,
+                                 cov_type=cov_type, cov_kwds=cov_kwds,
+                                 use_t=use_t)
+        glm_results.method = res.method
+        glm_results.fit_history = res.fit_history
+        for attr in ['converged', 'mle_retvals']:
+            if hasattr(res, attr):
+                setattr(glm_results, attr, getattr(res, attr))
+        return GLMResultsWrapper(glm_results)
+
     def _fit_gradient(self, start_params=None, method="newton",
                       maxiter=100, tol=1e-8, full_output=True,
                       disp=True, scale=None, cov_type='nonrobust',
@@ -965,16 +1117,21 @@ class GLM(base.LikelihoodModel):
         tol_criterion = kwargs.get('tol_criterion', 'deviance')
         atol = tol if atol is None else atol
 
+        family = self.family
         endog = self.endog
-        wlsexog = self.exog
-        if start_params is None:
+        exog = self.exog
+        offset_exposure = self._offset_exposure
+        is_sparse = sparse.issparse(exog)
+        has_params = start_params is not None
+        if not has_params:
             start_params = np.zeros(self.exog.shape[1], np.float)
-            mu = self.family.starting_mu(self.endog)
-            lin_pred = self.family.predict(mu)
+            mu = family.starting_mu(self.endog)
+            lin_pred = family.predict(mu)
         else:
-            lin_pred = np.dot(wlsexog, start_params) + self._offset_exposure
-            mu = self.family.fitted(lin_pred)
-        dev = self.family.deviance(self.endog, mu, self.freq_weights)
+            start_params = np.asarray(start_params, np.float64)
+            lin_pred = exog.dot(start_params) + offset_exposure
+            mu = family.fitted(lin_pred)
+        dev = family.deviance(self.endog, mu, self.freq_weights)
         if np.isnan(dev):
             raise ValueError("The first guess on the deviance function "
                              "returned a nan.  This could be a boundary "
@@ -987,32 +1144,59 @@ class GLM(base.LikelihoodModel):
         criterion = history[tol_criterion]
         # This special case is used to get the likelihood for a specific
         # params vector.
+        params, normalized_cov_params = start_params, None
+        iteration = 0
         if maxiter == 0:
-            mu = self.family.fitted(lin_pred)
-            self.scale = self.estimate_scale(mu)
-            wls_results = lm.RegressionResults(self, start_params, None)
-            iteration = 0
+            mu = family.fitted(lin_pred)
+
+        # the arrays of the loop are allocated once and updated in place
+        mu, lin_pred = np.array(mu, np.float64), np.array(lin_pred, np.float64)
+        weights, wendog, scratch = [np.empty_like(mu) for _ in range(3)]
+        wexog = None if is_sparse else np.empty(exog.shape)
+        prior_weights = self.freq_weights * self.n_trials
+        check_perfect = endog.squeeze().ndim == 1
+        # once lin_pred is exog * params + offset, the update of params is
+        # solved for, its rounding error shrinks with the size of the step
         for iteration in range(maxiter):
-            self.weights = (self.freq_weights * self.n_trials *
-                            self.family.weights(mu))
-            wlsendog = (lin_pred + self.family.link.deriv(mu) * (self.endog-mu)
-                        - self._offset_exposure)
-            wls_results = lm.WLS(wlsendog, wlsexog, self.weights).fit()
-            lin_pred = np.dot(self.exog, wls_results.params) + self._offset_exposure
-            mu = self.family.fitted(lin_pred)
-            history = self._update_history(wls_results, mu, history)
-            self.scale = self.estimate_scale(mu)
-            if endog.squeeze().ndim == 1 and np.allclose(mu - endog, 0):
-                msg = "Perfect separation detected, results not available"
-                raise PerfectSeparationError(msg)
+            family.irls_working(endog, mu, lin_pred, out=(weights, wendog))
+            weights *= prior_weights
+            if has_params:
+                wendog -= lin_pred
+                step, normalized_cov_params = _wls_solve(exog, weights,
+                                                         wendog, wexog)
+                params = params + step
+            else:
+                wendog -= offset_exposure
+                params, normalized_cov_params = _wls_solve(exog, weights,
+                                                           wendog, wexog)
+                has_params = True
+            if is_sparse:
+                lin_pred[:] = exog.dot(params)
+            else:
+                np.dot(exog, params, out=lin_pred)
+            lin_pred += offset_exposure
+            family.link.inverse_into(lin_pred, mu)
+            history['params'].append(params)
+            history['deviance'].append(
+                family._deviance_inplace(endog, mu, self.freq_weights,
+                                         scratch))
+            if check_perfect:
+                np.subtract(mu, endog, out=scratch)
+                if np.abs(scratch, out=scratch).max() <= 1e-8:
+                    msg = ("Perfect separation detected, results not "
+                           "available")
+                    raise PerfectSeparationError(msg)
             converged = _check_convergence(criterion, iteration + 1, atol,
                                            rtol)
             if converged:
                 break
+        if maxiter == 0:
+            weights = prior_weights * family.weights(mu)
+        self.weights = weights
         self.mu = mu
+        self.scale = self.estimate_scale(mu)
 
-        glm_results = GLMResults(self, wls_results.params,
-                                 wls_results.normalized_cov_params,
+        glm_results = GLMResults(self, params, normalized_cov_params,
                                  self.scale,
                                  cov_type=cov_type, cov_kwds=cov_kwds,
                                  use_t=use_t)
@@ -1095,6 +1279,89 @@ class GLM(base.LikelihoodModel):
 
         return result
 
+    def fit_regularized_path(self, alphas, L1_wt=1., **kwargs):
+        """
+        Return the elastic net coefficient path for a sequence of penalties.
+
+        Parameters
+        ----------
+        alphas : array-like
+            1d array of scalar penalty weights.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        kwargs
+            Additional keyword arguments for `fit_elasticnet_path`:
+            maxiter, cnvrg_tol, zero_tol and strong_rules.
+
+        Returns
+        -------
+        params : ndarray
+            len(alphas) x k array, row i contains the elastic net estimate
+            for alphas[i], see `fit_regularized`.
+
+        Notes
+        -----
+        The penalties are processed in decreasing order, each fit is warm
+        started at the previous solution, coefficients are screened with
+        the sequential strong rule and coordinate descent cycles over the
+        active set within proximal Newton steps.
+
+        See Also
+        --------
+        statsmodels.base.elastic_net.fit_elasticnet_path
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_path
+
+        defaults = {"maxiter" : 50, "cnvrg_tol" : 1e-10,
+                    "zero_tol" : 1e-10}
+        defaults.update(kwargs)
+
+        return fit_elasticnet_path(self, alphas, L1_wt=L1_wt, **defaults)
+
+    def fit_regularized_cv(self, alphas, L1_wt=1., cv=10, n_jobs=1,
+                           random_state=None, **kwargs):
+        """
+        Choose the elastic net penalty weight by K-fold cross-validation.
+
+        Parameters
+        ----------
+        alphas : array-like
+            1d array of scalar penalty weights.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        cv : int or iterable
+            The number of randomly assigned folds, or an iterable of
+            ``(train_index, test_index)`` pairs, see
+            `statsmodels.tools.cross_val`.
+        n_jobs : int
+            Number of folds that are evaluated in parallel, requires
+            joblib.
+        random_state : None, int or RandomState
+            Seed or random number generator for the assignment of the
+            observations to the folds if `cv` is an integer.
+        kwargs
+            Additional keyword arguments for `fit_regularized_path`.
+
+        Returns
+        -------
+        results : ElasticNetCVResults
+            Contains the mean and standard error of the held out
+            deviance for each alpha, `alpha_min`, the 1-SE choice
+            `alpha_1se` and the estimate for `alpha_1se` on all
+            observations.
+
+        See Also
+        --------
+        statsmodels.base.elastic_net.fit_elasticnet_cv
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_cv
+
+        return fit_elasticnet_cv(self, alphas, L1_wt=L1_wt, cv=cv,
+                                 n_jobs=n_jobs, random_state=random_state,
+                                 **kwargs)
+
 
     def fit_constrained(self, constraints, start_params=None, **fit_kwds):
         """fit the model subject to linear equality constraints
@@ -1250,7 +1517,7 @@ class GLMResults(base.LikelihoodModelResults):
                                          normalized_cov_params, scale=scale)
         self.family = model.family
         self._endog = model.endog
-        self.nobs = model.endog.shape[0]
+        self.nobs = model.nobs
         self._freq_weights = model.freq_weights
         if isinstance(self.family, families.Binomial):
             self._n_trials = self.model.n_trials
@@ -1348,7 +1615,8 @@ class GLMResults(base.LikelihoodModelResults):
         if hasattr(model, 'offset'):
             kwargs['offset'] = model.offset
         if hasattr(model, 'exposure'):
-            kwargs['exposure'] = model.exposure
+            # exposure is stored as log(exposure)
+            kwargs['exposure'] = np.exp(model.exposure)
         if len(kwargs) > 0:
             return GLM(endog, exog, family=self.family, **kwargs).fit().fittedvalues
         else:
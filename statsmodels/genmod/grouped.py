@@ -0,0 +1,273 @@
+"""
+Fitting a separate generalized linear model for each group of the data
+
+The formula is evaluated once on the full data.  The rows are sorted by
+group, so that the design of each group is a contiguous slice, and the
+models of the groups are created from the array slices, which avoids the
+per-model cost of formula parsing and pandas handling.
+"""
+from __future__ import division
+
+import copy
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from statsmodels.compat.python import string_types
+from statsmodels.formula.formulatools import handle_formula_data
+from statsmodels.tools.parallel import parallel_func
+from statsmodels.tools.sm_exceptions import (MissingDataError,
+                                             PerfectSeparationError)
+from .generalized_linear_model import GLM
+
+__all__ = ['fit_by_group', 'GroupedGLMResults']
+
+
+def _fit_groups(endog, exog, extra, bounds, family, fit_kwds, keep_results,
+                raise_errors, ynames, xnames):
+    """
+    Fit the models for consecutive groups of rows
+
+    bounds are the row boundaries of the groups within endog and exog, the
+    arrays in the dict extra are sliced like endog.
+    """
+    k = exog.shape[1]
+    n_groups = len(bounds) - 1
+    params = np.empty((n_groups, k))
+    bse = np.empty((n_groups, k))
+    stats = np.empty((n_groups, 4))
+    params.fill(np.nan)
+    bse.fill(np.nan)
+    stats.fill(np.nan)
+    converged = np.zeros(n_groups, bool)
+    results = [None] * n_groups
+    errors = [None] * n_groups
+    for i in range(n_groups):
+        sl = slice(bounds[i], bounds[i + 1])
+        kwds = dict((key, val[sl]) for key, val in extra.items())
+        try:
+            mod = GLM(endog[sl], exog[sl], family=copy.copy(family), **kwds)
+            res = mod.fit(**fit_kwds)
+        except (PerfectSeparationError, np.linalg.LinAlgError,
+                ValueError) as err:
+            if raise_errors:
+                raise
+            errors[i] = str(err)
+            continue
+        params[i] = res.params
+        bse[i] = res.bse
+        stats[i] = res.llf, res.deviance, res.scale, res.nobs
+        converged[i] = res.converged
+        if keep_results:
+            mod.data.ynames = ynames
+            mod.data.xnames = xnames
+            results[i] = res
+    return params, bse, stats, converged, results, errors
+
+
+def fit_by_group(formula, data, groups, family=None, n_jobs=1,
+                 return_results=False, raise_errors=True, fit_kwds=None,
+                 **kwargs):
+    """
+    Fit a generalized linear model separately for each group
+
+    Parameters
+    ----------
+    formula : str
+        Patsy formula of the model, the same for all groups.
+    data : DataFrame
+        The data of all groups.
+    groups : str or array-like
+        Group labels, either the name of a column of `data` or an array
+        with one label for each row of `data`.  Rows with a missing label
+        are dropped, or raise an exception if `missing` is 'raise'.
+    family : family class instance
+        The family of the models, the default is Gaussian.  A copy is
+        used for each group.
+    n_jobs : int
+        Number of processes for fitting the groups, requires joblib.  -1
+        uses all cores.  The groups are sent to the workers in batches of
+        consecutive groups.
+    return_results : bool
+        If True, then the results instances of all groups are kept, which
+        needs much more memory than the summary statistics.
+    raise_errors : bool
+        If True, then an exception in the estimation of a group is raised.
+        If False, then the statistics of the group are nan, the error
+        message is stored in `errors` and a warning is issued.
+    fit_kwds : dict, optional
+        Keyword arguments for GLM.fit.
+    kwargs : optional
+        `offset`, `exposure` and `freq_weights` can be given as arrays
+        with one value for each row of `data`.  `missing` and `eval_env`
+        are used as in `GLM.from_formula`.
+
+    Returns
+    -------
+    results : GroupedGLMResults
+        Parameters, standard errors and fit statistics of all groups.
+
+    Notes
+    -----
+    The design matrix is built once for the full data.  All groups share
+    the columns of the full design, for example the dummy variables of all
+    levels of a categorical variable.  If a level does not occur in a
+    group, then the design of that group is singular and the parameters
+    are estimated with the generalized inverse.
+
+    Examples
+    --------
+    >>> res = fit_by_group('sales ~ price + promo', df, 'store',
+    ...                    family=sm.families.Poisson())
+    >>> res.params.head()
+    >>> res.summary_frame()
+    """
+    if family is None:
+        from . import families
+        family = families.Gaussian()
+    fit_kwds = {} if fit_kwds is None else fit_kwds
+    eval_env = kwargs.pop('eval_env', None)
+    if eval_env is None:
+        eval_env = 2
+    elif eval_env == -1:
+        from patsy import EvalEnvironment
+        eval_env = EvalEnvironment({})
+    else:
+        eval_env += 1
+    missing = kwargs.pop('missing', 'drop')
+    if missing == 'none':
+        missing = 'raise'
+    extra = dict((key, np.asarray(val)) for key, val in kwargs.items()
+                 if val is not None)
+
+    if isinstance(groups, string_types):
+        groups = data[groups]
+    groups = np.asarray(groups)
+    if len(groups) != len(data):
+        raise ValueError('groups needs to have one label for each row')
+    for key, val in extra.items():
+        if len(val) != len(data):
+            raise ValueError('%s needs to have one value for each row' % key)
+    null_groups = pd.isnull(groups)
+    if missing == 'raise' and null_groups.any():
+        raise MissingDataError('missing values in groups')
+
+    (endog, exog), missing_mask, design_info = handle_formula_data(
+        data, None, formula, depth=eval_env, missing=missing)
+    ynames = endog.columns.tolist()
+    ynames = ynames[0] if len(ynames) == 1 else ynames
+    xnames = exog.columns.tolist()
+    endog = np.asarray(endog, dtype=np.float64)
+    if endog.shape[1] == 1:
+        endog = endog[:, 0]
+    exog = np.asarray(exog, dtype=np.float64)
+    if missing_mask is not None:
+        groups = groups[~missing_mask]
+        null_groups = null_groups[~missing_mask]
+        extra = dict((key, val[~missing_mask]) for key, val in extra.items())
+    if null_groups.any():
+        # rows without a group label are dropped like missing data
+        groups = groups[~null_groups]
+        endog, exog = endog[~null_groups], exog[~null_groups]
+        extra = dict((key, val[~null_groups]) for key, val in extra.items())
+
+    # sort once so that each group is a contiguous block of rows
+    codes, labels = pd.factorize(groups, sort=True)
+    order = np.argsort(codes, kind='mergesort')
+    endog, exog = endog[order], exog[order]
+    extra = dict((key, val[order]) for key, val in extra.items())
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(codes))))
+
+    fit_args = (family, fit_kwds, return_results, raise_errors, ynames,
+                xnames)
+    if n_jobs == 1:
+        res = [_fit_groups(endog, exog, extra, bounds, *fit_args)]
+    else:
+        parallel, p_func, n_jobs = parallel_func(_fit_groups, n_jobs,
+                                                 verbose=0)
+        # several batches per process balance groups of different sizes
+        n_batches = min(4 * max(n_jobs, 1), len(labels))
+        splits = np.searchsorted(bounds, np.linspace(0, bounds[-1],
+                                                     n_batches + 1))
+        splits = np.unique(np.concatenate(([0], splits[1:-1],
+                                           [len(bounds) - 1])))
+        batches = []
+        for start, stop in zip(splits[:-1], splits[1:]):
+            sl = slice(bounds[start], bounds[stop])
+            batch_extra = dict((key, val[sl]) for key, val in extra.items())
+            batches.append((endog[sl], exog[sl], batch_extra,
+                            bounds[start:stop + 1] - bounds[start]))
+        res = parallel(p_func(*(batch + fit_args)) for batch in batches)
+
+    params, bse, stats, converged = [np.concatenate(arrs)
+                                     for arrs in list(zip(*res))[:4]]
+    results = [r for batch in res for r in batch[4]]
+    errors = [err for batch in res for err in batch[5]]
+    n_failed = sum(err is not None for err in errors)
+    if n_failed:
+        warnings.warn('the estimation failed in %d groups' % n_failed)
+    results = dict(zip(labels, results)) if return_results else None
+    errors = dict((label, err) for label, err in zip(labels, errors)
+                  if err is not None)
+    return GroupedGLMResults(labels, xnames, params, bse, stats, converged,
+                             results, errors)
+
+
+class GroupedGLMResults(object):
+    """
+    Results of generalized linear models fitted separately for each group
+
+    The attributes are indexed by the group labels.
+
+    Attributes
+    ----------
+    params : DataFrame
+        Parameter estimates, one row for each group
+    bse : DataFrame
+        Standard errors of the parameter estimates
+    llf : Series
+        Loglikelihood of each model
+    deviance : Series
+        Deviance of each model
+    scale : Series
+        Estimated scale of each model
+    nobs : Series
+        Number of observations in each group
+    converged : Series
+        Whether the estimation converged
+    results : dict or None
+        Results instances for each group label if `return_results` was True
+    errors : dict
+        Error messages of the groups for which the estimation failed
+    """
+
+    def __init__(self, labels, names, params, bse, stats, converged,
+                 results, errors):
+        index = pd.Index(labels, name='group')
+        self.params = pd.DataFrame(params, index=index, columns=names)
+        self.bse = pd.DataFrame(bse, index=index, columns=names)
+        self.llf = pd.Series(stats[:, 0], index=index)
+        self.deviance = pd.Series(stats[:, 1], index=index)
+        self.scale = pd.Series(stats[:, 2], index=index)
+        self.nobs = pd.Series(stats[:, 3], index=index)
+        self.converged = pd.Series(converged, index=index)
+        self.results = results
+        self.errors = errors
+
+    def summary_frame(self):
+        """
+        Table of parameters, standard errors and fit statistics
+
+        Returns
+        -------
+        frame : DataFrame
+            One row for each group, the columns have two levels, the first
+            level is the statistic.
+        """
+        frames = [self.params, self.bse]
+        for name in ['llf', 'deviance', 'scale', 'nobs', 'converged']:
+            frames.append(getattr(self, name).to_frame(''))
+        keys = ['params', 'bse', 'llf', 'deviance', 'scale', 'nobs',
+                'converged']
+        return pd.concat(frames, axis=1, keys=keys)
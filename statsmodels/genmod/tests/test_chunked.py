@@ -0,0 +1,123 @@
+"""
+Tests for GLM estimated on chunks of data
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+import statsmodels.api as sm
+from statsmodels.genmod.generalized_linear_model import GLM
+from statsmodels.genmod.chunked import ChunkedGLM
+
+
+def _split(arrays, size):
+    nobs = len(arrays[0])
+    return [tuple(None if arr is None else arr[start:start + size]
+                  for arr in arrays) for start in range(0, nobs, size)]
+
+
+class CheckChunkedGLM(object):
+
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(4321)
+        nobs = 1000
+        cls.exog = sm.add_constant(np.random.randn(nobs, 2))
+        cls.linpred = cls.exog.dot([0.2, 0.3, -0.2])
+        cls.setup_data()
+        arrays = (cls.endog, cls.exog, cls.offset, cls.exposure)
+        cls.res1 = ChunkedGLM(_split(arrays, 137),
+                              family=cls.family).fit(tol=1e-12)
+        cls.res2 = GLM(cls.endog, cls.exog, family=cls.family,
+                       offset=cls.offset, exposure=cls.exposure
+                       ).fit(tol=1e-12)
+
+    def test_params(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.params, res2.params, rtol=1e-9)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-8)
+        assert_allclose(res1.scale, res2.scale, rtol=1e-9)
+        assert_equal(res1.nobs, res2.nobs)
+        assert_equal(res1.df_resid, res2.df_resid)
+        assert_equal(res1.df_model, res2.df_model)
+
+    def test_fit_statistics(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.deviance, res2.deviance, rtol=1e-9)
+        assert_allclose(res1.pearson_chi2, res2.pearson_chi2, rtol=1e-9)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-9)
+        assert_allclose(res1.aic, res2.aic, rtol=1e-9)
+        assert_allclose(res1.bic, res2.bic, rtol=1e-9)
+        assert_allclose(res1.null_deviance, res2.null_deviance, rtol=1e-8)
+        assert_allclose(res1.llnull, res2.llnull, rtol=1e-8)
+        res1.summary()
+
+    def test_predict(self):
+        exog = self.exog[:10]
+        assert_allclose(self.res1.predict(exog), self.res2.predict(exog),
+                        rtol=1e-9)
+        assert_raises(NotImplementedError, lambda: self.res1.resid_pearson)
+
+
+class TestChunkedPoisson(CheckChunkedGLM):
+
+    @classmethod
+    def setup_data(cls):
+        cls.family = sm.families.Poisson()
+        nobs = cls.exog.shape[0]
+        cls.offset = np.random.uniform(0, 0.1, size=nobs)
+        cls.exposure = np.random.randint(1, 4, size=nobs)
+        cls.endog = np.random.poisson(np.exp(cls.linpred) * cls.exposure)
+
+
+class TestChunkedGamma(CheckChunkedGLM):
+
+    @classmethod
+    def setup_data(cls):
+        cls.family = sm.families.Gamma(sm.families.links.log)
+        cls.offset = cls.exposure = None
+        cls.endog = np.random.gamma(2, np.exp(cls.linpred) / 2)
+
+
+class TestChunkedBinomial(CheckChunkedGLM):
+
+    @classmethod
+    def setup_data(cls):
+        cls.family = sm.families.Binomial()
+        cls.offset = cls.exposure = None
+        n_trials = np.random.randint(1, 5, size=cls.exog.shape[0])
+        success = np.random.binomial(n_trials,
+                                     1 / (1 + np.exp(-cls.linpred)))
+        cls.endog = np.column_stack((success, n_trials - success))
+
+
+class TestChunkedGaussian(CheckChunkedGLM):
+
+    @classmethod
+    def setup_data(cls):
+        cls.family = sm.families.Gaussian()
+        cls.offset = cls.exposure = None
+        cls.endog = cls.linpred + np.random.randn(cls.exog.shape[0])
+
+
+def test_chunked_pandas_callable():
+    np.random.seed(765)
+    exog = pd.DataFrame(np.random.randn(300, 2), columns=['a', 'b'])
+    exog['const'] = 1.
+    endog = pd.Series(np.random.poisson(np.exp(0.3 * exog['a'])), name='y')
+
+    def chunks():
+        for start in range(0, 300, 64):
+            yield endog.iloc[start:start + 64], exog.iloc[start:start + 64]
+
+    family = sm.families.Poisson()
+    mod1 = ChunkedGLM(chunks, family=family)
+    res1 = mod1.fit(scale='dev')
+    res2 = GLM(endog, exog, family=family).fit(scale='dev')
+    assert_equal(mod1.n_chunks, 5)
+    assert_equal(res1.params.index.tolist(), ['a', 'b', 'const'])
+    assert_allclose(res1.params, res2.params, rtol=1e-8)
+    assert_allclose(res1.bse, res2.bse, rtol=1e-7)
+
+    assert_raises(ValueError, ChunkedGLM, chunks())
+    assert_raises(ValueError, mod1.fit, cov_type='HC0')
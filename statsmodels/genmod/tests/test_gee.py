@@ -10,6 +10,7 @@ exactly.
 """
 
 from statsmodels.compat import lrange
+import copy
 import numpy as np
 import os
 
@@ -19,9 +20,9 @@ from statsmodels.genmod.generalized_estimating_equations import (
     GEE, OrdinalGEE, NominalGEE, NominalGEEResults, OrdinalGEEResults,
     NominalGEEResultsWrapper, OrdinalGEEResultsWrapper)
 from statsmodels.genmod.families import Gaussian, Binomial, Poisson
-from statsmodels.genmod.cov_struct import (Exchangeable, Independence,
-                                           GlobalOddsRatio, Autoregressive,
-                                           Nested, Stationary)
+from statsmodels.genmod.cov_struct import (CovStruct, Exchangeable,
+                                           Independence, GlobalOddsRatio,
+                                           Autoregressive, Nested, Stationary)
 import pandas as pd
 import statsmodels.formula.api as smf
 import statsmodels.api as sm
@@ -1616,6 +1617,181 @@ def test_missing():
     assert_almost_equal(res.params.values, res2.params.values)
 
 
+def test_batched_clusters():
+    # The solves for clusters of equal size are batched, compare to
+    # solving the clusters one at a time.
+
+    np.random.seed(3423)
+    sizes = np.random.randint(1, 6, size=120)
+    groups = np.repeat(np.arange(len(sizes)), sizes)
+    n = len(groups)
+    exog = np.column_stack((np.ones(n), np.random.normal(size=(n, 2))))
+    offset = np.random.uniform(-0.2, 0.2, size=n)
+    weights = np.repeat(np.random.uniform(1, 2, size=len(sizes)), sizes)
+    dep_data = np.random.randint(0, 2, size=n)
+    cluster_effect = np.random.normal(size=len(sizes))[groups]
+    lin_pred = exog.dot([0.2, -0.3, 0.1]) + 0.3 * cluster_effect
+
+    endog_gaussian = lin_pred + np.random.normal(size=n)
+    endog_poisson = np.random.poisson(np.exp(lin_pred))
+    endog_ordinal = np.digitize(lin_pred + np.random.logistic(size=n),
+                                [-0.5, 0.5])
+
+    models = [
+        (GEE, endog_gaussian, Gaussian(), Independence(), {}),
+        (GEE, endog_gaussian, Gaussian(), Exchangeable(),
+         {'weights': weights}),
+        (GEE, endog_poisson, Poisson(), Exchangeable(), {'offset': offset}),
+        (GEE, endog_poisson, Poisson(), Autoregressive(), {}),
+        (GEE, endog_gaussian, Gaussian(), Nested(), {'dep_data': dep_data}),
+        (OrdinalGEE, endog_ordinal, None, GlobalOddsRatio("ordinal"), {})]
+
+    for model_class, endog, family, cov_struct, kwds in models:
+        results = []
+        for batch in True, False:
+            # OrdinalGEE adds the intercepts of the thresholds
+            x = exog if model_class is GEE else exog[:, 1:]
+            mod = model_class(endog, x, groups, family=family,
+                              cov_struct=copy.deepcopy(cov_struct), **kwds)
+            mod._batch_clusters = batch
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                # the rounding differs, compare at a fixed number of
+                # iterations
+                results.append(mod.fit(maxiter=20, ctol=0,
+                                       cov_type="bias_reduced"))
+        res1, res2 = results
+        assert_equal(len(res1.fit_history["params"]), 20)
+        assert_equal(len(res2.fit_history["params"]), 20)
+        assert_allclose(res1.params, res2.params, rtol=1e-8)
+        assert_allclose(res1.cov_robust, res2.cov_robust, rtol=1e-6)
+        assert_allclose(res1.cov_naive, res2.cov_naive, rtol=1e-6)
+        assert_allclose(res1.cov_robust_bc, res2.cov_robust_bc, rtol=1e-6)
+        if res1.cov_struct.dep_params is not None:
+            assert_allclose(res1.cov_struct.dep_params,
+                            res2.cov_struct.dep_params, rtol=1e-6)
+        assert_equal(len(res1.fit_history["cov_adjust"][-1]),
+                     len(res2.fit_history["cov_adjust"][-1]))
+
+
+class ScaledDerivGEE(GEE):
+    # overrides mean_deriv, the clusters are not batched
+
+    def mean_deriv(self, exog, lin_pred):
+        return 2 * GEE.mean_deriv(self, exog, lin_pred)
+
+
+def test_batched_clusters_mean_deriv():
+
+    np.random.seed(8342)
+    groups = np.repeat(np.arange(40), 3)
+    exog = np.random.normal(size=(120, 2))
+    endog = exog.sum(1) + np.random.normal(size=120)
+
+    model = GEE(endog, exog, groups, cov_struct=Exchangeable())
+    assert_(model._batch_clusters)
+    model = ScaledDerivGEE(endog, exog, groups, cov_struct=Exchangeable())
+    assert_(not model._batch_clusters)
+    model = NominalGEE(np.digitize(endog, [-1, 1]), exog, groups)
+    assert_(not model._batch_clusters)
+    model = OrdinalGEE(np.digitize(endog, [-1, 1]), exog, groups)
+    assert_(model._batch_clusters)
+
+
+def test_structured_solve():
+    # Compare the closed form solves of the covariance structures to the
+    # solve with the dense covariance matrix.
+
+    np.random.seed(3132)
+    n, m = 50, 6
+    groups = np.repeat(np.arange(n), m)
+    exog = np.random.normal(size=(n * m, 2))
+    dep_data = np.column_stack((np.tile([0, 0, 0, 1, 1, 1], n),
+                                np.tile([0, 0, 1, 2, 3, 3], n)))
+    effects = (np.random.normal(size=n)[groups] +
+               np.random.normal(size=2 * n)[np.repeat(np.arange(2 * n), 3)])
+    endog = np.random.poisson(np.exp(0.5 * exog.sum(1) + 0.5 * effects))
+
+    for cov_struct in [Autoregressive(), Nested(),
+                       Stationary(max_lag=2, grid=True)]:
+        model = GEE(endog, exog, groups, family=Poisson(),
+                    cov_struct=cov_struct, dep_data=dep_data)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model.fit(maxiter=10)
+
+        for i in range(3):
+            expval, lpr = model.cached_means[i]
+            sdev = np.sqrt(model.family.variance(expval))
+            rhs = [model.exog_li[i], model.endog_li[i] - expval]
+            soln1 = cov_struct.covariance_matrix_solve(expval, i, sdev, rhs)
+            soln2 = CovStruct.covariance_matrix_solve(cov_struct, expval, i,
+                                                      sdev, rhs)
+            for y1, y2 in zip(soln1, soln2):
+                assert_equal(y1.shape, y2.shape)
+                assert_allclose(y1, y2, rtol=1e-10)
+
+        if isinstance(cov_struct, Nested):
+            assert_(cov_struct._block_labels is not None)
+        if isinstance(cov_struct, Stationary):
+            # one factorization for all clusters of the same size
+            assert_equal(list(cov_struct._factor_cache.keys()), [m])
+            assert_(cov_struct._factor_cache[m] is not None)
+
+    # The closed form requires that the subgroups are nested.
+    model = GEE(endog, exog, groups, family=Poisson(), cov_struct=Nested(),
+                dep_data=dep_data[:, ::-1])
+    assert_(model.cov_struct._block_labels is None)
+
+
+class ChunkedGEE(GEE):
+    # small chunks so that the threads process many chunks
+    _chunk_nobs = 40
+
+
+def test_n_jobs():
+    # The results with threads are identical to the serial results.
+
+    np.random.seed(4321)
+    sizes = np.random.randint(2, 8, size=100)
+    groups = np.repeat(np.arange(len(sizes)), sizes)
+    n = len(groups)
+    exog = np.column_stack((np.ones(n), np.random.normal(size=(n, 2))))
+    time = np.concatenate([np.arange(k) for k in sizes])
+    dep_data = np.concatenate([np.arange(k) // 2 for k in sizes])
+    weights = np.repeat(np.random.uniform(1, 2, size=len(sizes)), sizes)
+    endog = (exog.sum(1) + np.random.normal(size=len(sizes))[groups] +
+             np.random.normal(size=n))
+
+    models = [(Exchangeable(), {'weights': weights}),
+              (Stationary(max_lag=1, grid=True), {}),
+              (Stationary(max_lag=2), {'time': time}),
+              (Nested(), {'dep_data': dep_data})]
+
+    for cov_struct, kwds in models:
+        results = []
+        for n_jobs in 1, 3:
+            model = ChunkedGEE(endog, exog, groups,
+                               cov_struct=copy.deepcopy(cov_struct), **kwds)
+            assert_(len(model._cluster_chunks) > 1)
+            assert_(len(model._batch_index) > len(np.unique(sizes)))
+            results.append(model.fit(cov_type='bias_reduced',
+                                     n_jobs=n_jobs))
+        res1, res2 = results
+        assert_equal(res1.params, res2.params)
+        assert_equal(res1.cov_robust, res2.cov_robust)
+        assert_equal(res1.cov_robust_bc, res2.cov_robust_bc)
+        assert_equal(res1.cov_struct.dep_params, res2.cov_struct.dep_params)
+        assert_(res2.model._pool is None)
+
+        # the chunks change the results only by rounding
+        model = GEE(endog, exog, groups, cov_struct=copy.deepcopy(cov_struct),
+                    **kwds)
+        res3 = model.fit(cov_type='bias_reduced')
+        assert_allclose(res3.params, res1.params, rtol=1e-10)
+        assert_allclose(res3.cov_robust_bc, res1.cov_robust_bc, rtol=1e-8)
+
+
 if __name__ == "__main__":
 
     import nose
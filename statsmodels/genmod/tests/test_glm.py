@@ -1648,6 +1648,69 @@ def testTweediePowerEstimate():
     p = model1.estimate_tweedie_power(res1.mu)
     assert_allclose(p, res2.params[1], rtol=0.25)
 
+
+def test_tweedie_density():
+    from statsmodels.genmod import _tweedie_compound_poisson as tw
+    np.random.seed(5432)
+    y = np.concatenate(([0, 0, 1e-3, 0.5, 1, 20, 1e3, 1e5],
+                        np.random.gamma(1, 5, size=20)))
+    mu = np.random.gamma(5, 2, size=len(y))
+    for p, phi in [(1.5, 2.), (1.1, 0.5), (1.9, 5.), (1.3, 0.01)]:
+        # density of the compound Poisson-gamma sum
+        lam = mu**(2 - p) / (phi * (2 - p))
+        shape = (2 - p) / (p - 1)
+        scale = phi * (p - 1) * mu**(p - 1)
+        n = np.arange(1, 3000)[:, None]
+        dens = np.exp(stats.poisson.logpmf(n, lam) +
+                      stats.gamma.logpdf(y, n * shape, scale=scale)).sum(0)
+        dens[y == 0] = np.exp(-lam[y == 0])
+        mask = dens > 1e-300
+        assert_allclose(tw.series_density(y, mu, p, phi)[mask], dens[mask],
+                        rtol=1e-10)
+
+    # arrays of p and phi
+    p = np.random.uniform(1.1, 1.9, size=len(y))
+    phi = np.random.uniform(0.5, 3, size=len(y))
+    logpdf = tw.log_density(y, mu, p, phi)
+    logpdf2 = [tw.log_density(y[i], mu[i], p[i], phi[i])
+               for i in range(len(y))]
+    assert_allclose(logpdf, logpdf2, rtol=1e-13)
+    # the saddlepoint approximation is only close to the series, and not
+    # close to zero
+    mask = y > 2
+    assert_allclose(tw.log_density(y[mask], mu[mask], 1.5, 2.,
+                                   method='saddlepoint'),
+                    tw.log_density(y[mask], mu[mask], 1.5, 2.), atol=0.3)
+    assert_raises(ValueError, tw.log_density, y, mu, 2.5, 2.)
+
+
+def test_tweedie_loglike_profile():
+    np.random.seed(3241)
+    nobs = 2000
+    exog = add_constant(np.random.randn(nobs, 2))
+    mu = np.exp(exog.dot([1., 0.3, -0.2]))
+    p, phi = 1.6, 2.
+    n = np.random.poisson(mu**(2 - p) / (phi * (2 - p)))
+    endog = np.random.gamma(np.maximum(n, 1) * (2 - p) / (p - 1),
+                            phi * (p - 1) * mu**(p - 1)) * (n > 0)
+    family = sm.families.Tweedie(var_power=p)
+    res = GLM(endog, exog, family=family).fit()
+    from statsmodels.genmod._tweedie_compound_poisson import log_density
+    assert_allclose(res.llf, log_density(endog, res.mu, p, res.scale).sum(),
+                    rtol=1e-12)
+    assert_(np.isnan(sm.families.Tweedie(var_power=2.5).loglike(
+        endog, res.mu, scale=res.scale)))
+
+    power = res.model.estimate_tweedie_power(res.mu, method='profile')
+    assert_allclose(power, p, atol=0.05)
+    # maximum of the profile loglikelihood on a grid
+    grid = np.linspace(1.05, 1.95, 19)
+    llf = []
+    for power_ in grid:
+        scale = ((endog - res.mu)**2 / res.mu**power_).sum() / res.df_resid
+        llf.append(log_density(endog, res.mu, power_, scale).sum())
+    assert_allclose(power, grid[np.argmax(llf)], atol=0.05)
+
 class TestRegularized(object):
 
     def test_regularized(self):
@@ -1694,6 +1757,149 @@ class TestRegularized(object):
                 assert_equal(np.sign(llf_sm - llf_r), 1)
 
 
+def test_regularized_path():
+
+    np.random.seed(3421)
+    n, k = 300, 15
+    exog = np.random.normal(size=(n, k))
+    lin_pred = 0.5 * exog[:, :3].sum(1)
+    alphas = [0.1, 0.03, 0.01, 0.003]
+
+    for fam, endog in [
+            (sm.families.Binomial(),
+             (np.random.uniform(size=n) < 1 / (1 + np.exp(-lin_pred)))),
+            (sm.families.Poisson(), np.random.poisson(np.exp(lin_pred)))]:
+
+        model = GLM(endog.astype(np.float64), exog, family=fam)
+        path = model.fit_regularized_path(alphas, L1_wt=0.5)
+
+        def plf(params, alpha):
+            llf = model.loglike(params) / n
+            return llf - alpha * (0.5 * np.sum(params**2) / 2 +
+                                  0.5 * np.sum(np.abs(params)))
+
+        for alpha, params in zip(alphas, path):
+            result = model.fit_regularized(alpha=alpha, L1_wt=0.5)
+            # fit_regularized can stop early after dropping a variable
+            assert_allclose(params, result.params, rtol=1e-2, atol=1e-2)
+            assert_(plf(params, alpha) >= plf(result.params, alpha) - 1e-10)
+
+
+def test_regularized_cv():
+
+    np.random.seed(9321)
+    n, k = 200, 6
+    exog = np.random.normal(size=(n, k))
+    offset = np.random.uniform(size=n)
+    endog = np.random.poisson(np.exp(0.5 * exog[:, 0] + offset))
+    alphas = [0.1, 0.03, 0.01]
+    fam = sm.families.Poisson()
+    model = GLM(endog, exog, family=fam, offset=offset)
+
+    groups = np.arange(n) % 5
+    folds = [(groups != g, groups == g) for g in range(5)]
+    res = model.fit_regularized_cv(alphas, L1_wt=1, cv=folds)
+    assert_equal(res.cv_deviance.shape, (5, 3))
+
+    train, test = folds[2]
+    path = GLM(endog[train], exog[train], family=fam,
+               offset=offset[train]).fit_regularized_path(alphas)
+    mu = np.exp(np.dot(exog[test], path.T) + offset[test][:, None])
+    deviance = [fam.deviance(endog[test], m) / test.sum() for m in mu.T]
+    assert_allclose(res.cv_deviance[2], deviance, rtol=1e-8)
+    assert_(res.alpha_1se >= res.alpha_min)
+
+    # random folds are reproducible with random_state
+    res1 = model.fit_regularized_cv(alphas, L1_wt=1, cv=5, random_state=3)
+    res2 = model.fit_regularized_cv(alphas, L1_wt=1, cv=5, random_state=3)
+    assert_equal(res1.cv_deviance, res2.cv_deviance)
+
+
+def test_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(3145)
+    n = 300
+    groups = np.random.randint(0, 12, size=n)
+    x = np.random.randn(n)
+    exog = sparse.hstack((dummy_sparse(groups), x[:, None])).tocsr()
+    exog_dense = exog.toarray()
+    endog = np.random.poisson(np.exp(0.1 * groups + 0.3 * x))
+    offset = np.random.uniform(size=n)
+    fam = sm.families.Poisson()
+
+    res1 = GLM(endog, exog, family=fam, offset=offset).fit()
+    res2 = GLM(endog, exog_dense, family=fam, offset=offset).fit()
+    assert_allclose(res1.params, res2.params, rtol=1e-10)
+    assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+    assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+    assert_equal(res1.df_model, res2.df_model)
+    assert_allclose(res1.predict(exog[:5], offset=offset[:5]),
+                    res2.predict(exog_dense[:5], offset=offset[:5]),
+                    rtol=1e-10)
+
+    res1 = GLM(endog, exog, family=fam).fit(cov_type='HC0')
+    res2 = GLM(endog, exog_dense, family=fam).fit(cov_type='HC0')
+    assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+
+    res1 = GLM(endog, exog, family=fam).fit(method='newton')
+    assert_allclose(res1.params, res2.params, rtol=1e-8)
+
+
+def test_compress():
+    np.random.seed(2718)
+    n = 500
+    exog = add_constant(np.random.randint(0, 3, size=(n, 2)).astype(float))
+    n_trials = np.random.randint(1, 4, size=n)
+    success = np.random.binomial(n_trials, 0.4)
+    exposure = np.random.randint(1, 3, size=n)
+    endog_count = np.random.poisson(np.exp(exog.dot([0.2, 0.3, -0.2])))
+    endog_gamma = np.random.randint(1, 4, size=n).astype(float)
+    cases = [(endog_count, sm.families.Poisson(), {'exposure': exposure}),
+             (np.column_stack((success, n_trials - success)),
+              sm.families.Binomial(), {}),
+             (endog_gamma, sm.families.Gamma(sm.families.links.log),
+              {'freq_weights': np.random.randint(1, 3, size=n).astype(float)})]
+
+    for endog, family, kwds in cases:
+        for method in ['IRLS', 'newton']:
+            mod1 = GLM(endog, exog, family=family, **kwds)
+            mod2 = GLM(endog, exog, family=family, compress=True, **kwds)
+            res1 = mod1.fit(method=method, tol=1e-10)
+            res2 = mod2.fit(method=method, tol=1e-10)
+            assert_(mod2.nobs_compressed < n)
+            assert_allclose(res2.params, res1.params, rtol=1e-8)
+            assert_allclose(res2.bse, res1.bse, rtol=1e-7)
+            assert_allclose(res2.llf, res1.llf, rtol=1e-10)
+            assert_allclose(res2.deviance, res1.deviance, rtol=1e-10)
+            assert_allclose(res2.pearson_chi2, res1.pearson_chi2, rtol=1e-8)
+            assert_allclose(res2.resid_deviance, res1.resid_deviance,
+                            rtol=1e-7, atol=1e-10)
+
+    res1 = GLM(endog_count, exog, family=sm.families.Poisson()).fit(
+        cov_type='HC0')
+    res2 = GLM(endog_count, exog, family=sm.families.Poisson(),
+               compress=True).fit(cov_type='HC0')
+    assert_allclose(res2.bse, res1.bse, rtol=1e-10)
+
+
+def test_hessian_freq_weights():
+    # observed information with freq_weights equals that of repeated rows
+    from statsmodels.tools.numdiff import approx_hess
+    np.random.seed(987)
+    n = 100
+    exog = add_constant(np.random.randn(n, 2))
+    endog = np.random.gamma(2, np.exp(exog.dot([0.2, 0.3, -0.2])) / 2)
+    freq_weights = np.random.randint(1, 4, size=n).astype(float)
+    for link in [sm.families.links.log, sm.families.links.identity]:
+        family = sm.families.Gamma(link)
+        mod = GLM(endog, exog, family=family, freq_weights=freq_weights)
+        params = mod.fit().params + 0.01
+        hess = mod.hessian(params, scale=1.)
+        hess_num = approx_hess(params, lambda p: mod.loglike(p, scale=1.))
+        assert_allclose(hess, hess_num, rtol=1e-5)
+
+
 class TestConvergence(object):
     def __init__(self):
         '''
@@ -1801,6 +2007,55 @@ class TestConvergence(object):
                      actual_iterations)
 
 
+def test_irls_working():
+    # fused working weights and response agree with the separate functions
+    np.random.seed(4321)
+    L = sm.families.links
+    cases = [(sm.families.Poisson(), np.random.poisson(3, 50)),
+             (sm.families.Poisson(L.sqrt), np.random.poisson(3, 50)),
+             (sm.families.Binomial(), np.random.randint(0, 2, 50)),
+             (sm.families.Binomial(L.probit), np.random.randint(0, 2, 50)),
+             (sm.families.Gaussian(), np.random.randn(50)),
+             (sm.families.Gaussian(L.log), np.random.rand(50) + 1),
+             (sm.families.Gamma(), np.random.rand(50) + 1),
+             (sm.families.InverseGaussian(L.log), np.random.rand(50) + 1)]
+    for family, endog in cases:
+        endog = endog.astype(np.float64)
+        mu = family.starting_mu(endog)
+        lin_pred = family.predict(mu)
+        weights, wendog = family.irls_working(endog, mu, lin_pred)
+        assert_allclose(weights, family.weights(mu), rtol=1e-12)
+        assert_allclose(wendog,
+                        lin_pred + family.link.deriv(mu) * (endog - mu),
+                        rtol=1e-12)
+        out = (np.empty(50), np.empty(50))
+        res = family.irls_working(endog, mu, lin_pred, out=out)
+        assert_(res[0] is out[0] and res[1] is out[1])
+        assert_allclose(res[1], wendog, rtol=1e-15)
+        dev = family._deviance_inplace(endog, mu, 1., np.empty(50))
+        assert_allclose(dev, family.deviance(endog, mu), rtol=1e-12)
+
+
+def test_inverse_into():
+    L = sm.families.links
+    z = np.linspace(-2, 0.5, 11)
+    for link in [L.logit(), L.probit(), L.cloglog(), L.log(), L.identity(),
+                 L.sqrt(), L.inverse_power(), L.Power(power=-2)]:
+        out = np.empty_like(z)
+        link.inverse_into(z, out)
+        assert_allclose(out, link.inverse(z), rtol=1e-14)
+
+
+def test_irls_ill_conditioned():
+    # Longley-type scaling needs the stable least squares fallback
+    data = sm.datasets.longley.load()
+    exog = add_constant(data.exog, prepend=False)
+    res1 = GLM(data.endog, exog).fit()
+    res2 = sm.OLS(data.endog, exog).fit()
+    assert_allclose(res1.params, res2.params, rtol=1e-7)
+    assert_allclose(res1.bse, res2.bse, rtol=1e-7)
+
+
 if __name__ == "__main__":
     # run_module_suite()
     # taken from Fernando Perez:
@@ -0,0 +1,122 @@
+"""
+Tests for fitting a GLM separately for each group
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.testing import (assert_allclose, assert_equal, assert_raises,
+                           assert_)
+
+import statsmodels.api as sm
+from statsmodels.genmod.generalized_linear_model import GLM
+from statsmodels.genmod.grouped import fit_by_group
+from statsmodels.tools.sm_exceptions import (MissingDataError,
+                                             PerfectSeparationError)
+
+
+class TestFitByGroup(object):
+
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(8765)
+        n_groups, nobs = 12, 600
+        df = pd.DataFrame({'x': np.random.randn(nobs),
+                           'c': np.random.choice(['a', 'b', 'c'], nobs),
+                           'store': np.random.choice(
+                               ['s%d' % i for i in range(n_groups)], nobs)})
+        df['y'] = np.random.poisson(np.exp(0.5 + 0.3 * df['x']))
+        df.loc[[3, 50], 'x'] = np.nan
+        cls.exposure = np.random.uniform(1, 2, nobs)
+        cls.df = df
+        cls.family = sm.families.Poisson()
+        cls.res = fit_by_group('y ~ x + C(c)', df, 'store',
+                               family=cls.family, exposure=cls.exposure,
+                               return_results=True)
+
+    def test_params(self):
+        res = self.res
+        df = self.df
+        assert_equal(res.params.index.tolist(),
+                     sorted(df['store'].unique()))
+        for label in res.params.index:
+            mask = (df['store'] == label).values
+            res2 = GLM.from_formula('y ~ x + C(c)', df[mask],
+                                    family=self.family,
+                                    exposure=self.exposure[mask]).fit()
+            assert_allclose(res.params.loc[label], res2.params, rtol=1e-10)
+            assert_allclose(res.bse.loc[label], res2.bse, rtol=1e-10)
+            assert_allclose(res.llf[label], res2.llf, rtol=1e-10)
+            assert_allclose(res.deviance[label], res2.deviance, rtol=1e-10)
+            assert_equal(res.nobs[label], res2.nobs)
+            assert_(res.converged[label])
+            assert_allclose(res.results[label].params, res2.params.values,
+                            rtol=1e-10)
+            assert_equal(res.results[label].model.exog_names,
+                         res2.model.exog_names)
+
+    def test_summary_frame(self):
+        frame = self.res.summary_frame()
+        assert_allclose(frame['params'], self.res.params)
+        assert_allclose(np.squeeze(frame['llf']), self.res.llf)
+        self.res.results[self.res.params.index[0]].summary()
+
+    def test_n_jobs(self):
+        with warnings.catch_warnings():
+            # joblib might not be available
+            warnings.simplefilter('ignore')
+            res = fit_by_group('y ~ x + C(c)', self.df, self.df['store'],
+                               family=self.family, exposure=self.exposure,
+                               n_jobs=2)
+        assert_allclose(res.params, self.res.params, rtol=1e-13)
+        assert_allclose(res.bse, self.res.bse, rtol=1e-13)
+        assert_(res.results is None)
+
+
+def test_fit_by_group_errors():
+    df = pd.DataFrame({'x': np.arange(20.),
+                       'g': np.repeat([0, 1], 10)})
+    np.random.seed(123)
+    # separated in group 0
+    df['y'] = np.where(df['g'] == 0, df['x'] > 4,
+                       np.random.randint(0, 2, 20))
+    family = sm.families.Binomial()
+    assert_raises(PerfectSeparationError, fit_by_group, 'y ~ x', df, 'g',
+                  family=family)
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        res = fit_by_group('y ~ x', df, 'g', family=family,
+                           raise_errors=False)
+    # other warnings, e.g. from the separated fit, are not counted
+    failed = [x for x in w
+              if str(x.message).startswith('the estimation failed')]
+    assert_equal(len(failed), 1)
+    assert_equal(str(failed[0].message), 'the estimation failed in 1 groups')
+    assert_(np.isnan(res.params.loc[0]).all())
+    assert_(np.isfinite(res.params.loc[1]).all())
+    assert_equal(list(res.errors.keys()), [0])
+    assert_raises(ValueError, fit_by_group, 'y ~ x', df, df['g'][:-1])
+
+
+def test_fit_by_group_missing_groups():
+    np.random.seed(4321)
+    nobs = 60
+    df = pd.DataFrame({'x': np.random.randn(nobs),
+                       'g': np.random.choice(['a', 'b'], nobs)})
+    df['y'] = np.random.poisson(np.exp(0.3 * df['x']))
+    df.loc[[2, 9], 'g'] = None
+    df.loc[[5, 9], 'x'] = np.nan
+    exposure = np.random.uniform(1, 2, nobs)
+    family = sm.families.Poisson()
+    res = fit_by_group('y ~ x', df, 'g', family=family, exposure=exposure)
+
+    keep = (df['g'].notnull() & df['x'].notnull()).values
+    res2 = fit_by_group('y ~ x', df[keep], 'g', family=family,
+                        exposure=exposure[keep])
+    assert_equal(res.params.index.tolist(), ['a', 'b'])
+    assert_allclose(res.params, res2.params, rtol=1e-12)
+    assert_allclose(res.nobs, res2.nobs)
+    assert_equal(res.nobs.sum(), nobs - 3)
+
+    assert_raises(MissingDataError, fit_by_group, 'y ~ x',
+                  df[df['x'].notnull()], 'g', family=family, missing='raise')
@@ -0,0 +1,182 @@
+"""
+Absorbing high-dimensional fixed effects by alternating projections
+
+The dummy variables of one or more categorical factors are swept out of
+endog and exog by repeatedly subtracting weighted group means, one factor
+at a time, until the data are orthogonal to all factors.  By the
+Frisch-Waugh-Lovell theorem the least squares estimates on the demeaned
+data are the same as those of the regression that includes all dummy
+variables, but the dummy columns are never created.
+
+References
+----------
+Guimaraes, P. and Portugal, P. (2010). A simple feasible procedure to fit
+models with high-dimensional fixed effects. The Stata Journal, 10(4).
+
+Gaure, S. (2013). OLS with multiple high dimensional category variables.
+Computational Statistics & Data Analysis, 66, 8-18.
+"""
+from __future__ import division
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.grouputils import Grouping
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
+
+__all__ = ['AbsorbedFactors']
+
+
+def _as_factor_list(absorb):
+    """
+    Split the absorb argument into a list of 1d factors
+    """
+    if isinstance(absorb, pd.DataFrame):
+        return [absorb[col].values for col in absorb.columns]
+    if isinstance(absorb, (list, tuple)) and len(absorb) > 0 and \
+            np.ndim(absorb[0]) == 1:
+        return [np.asarray(factor) for factor in absorb]
+    absorb = np.asarray(absorb)
+    if absorb.ndim == 1:
+        return [absorb]
+    elif absorb.ndim == 2:
+        return [absorb[:, i] for i in range(absorb.shape[1])]
+    raise ValueError('absorb has to be 1 or 2 dimensional')
+
+
+class AbsorbedFactors(object):
+    """
+    Categorical factors that are absorbed in a least squares regression
+
+    Parameters
+    ----------
+    factors : array-like, DataFrame or list of array-like
+        The categorical variables.  A 1d array is a single factor, the
+        columns of a 2d array or DataFrame and the elements of a list are
+        separate factors.  The categories can have any type that pandas can
+        factorize, missing values are not allowed.
+    weights : array-like or None
+        Observation weights, the weighted group means are subtracted.
+    tol : float
+        Convergence tolerance for the alternating projections.  Iterations
+        stop when the largest change in a column is smaller than `tol` times
+        the largest absolute value of that column.
+    maxiter : int
+        Maximum number of sweeps over all factors.
+
+    Attributes
+    ----------
+    codes : ndarray
+        k_factors x nobs array of integer codes of the levels
+    n_levels : tuple
+        Number of levels of each factor
+    df_absorbed : int
+        Rank of the matrix of all dummy variables, i.e. the number of
+        degrees of freedom used up by the fixed effects.
+
+    Notes
+    -----
+    With a single factor one sweep is exact.  With several factors the
+    projections converge linearly, the rate depends on how well the
+    factors are connected.  The degrees of freedom of the first two factors
+    are corrected for the number of connected components of their
+    bipartite graph, which is exact.  Each additional factor is counted
+    with all but one of its levels, which can overstate the number of
+    absorbed parameters if the factors are nested or otherwise redundant.
+    """
+
+    def __init__(self, factors, weights=None, tol=1e-10, maxiter=1000):
+        factors = _as_factor_list(factors)
+        nobs = len(factors[0])
+        if any(len(factor) != nobs for factor in factors):
+            raise ValueError('absorbed factors need to have the same length')
+        if len(factors) == 1:
+            index = pd.Index(factors[0])
+        else:
+            index = pd.MultiIndex.from_arrays(factors)
+        grouping = Grouping(index)
+        codes = np.asarray(grouping.labels, dtype=np.intp)
+        if (codes < 0).any():
+            raise ValueError('absorbed factors cannot contain missing values')
+
+        self.codes = codes
+        self.nobs = nobs
+        self.k_factors = codes.shape[0]
+        self.n_levels = tuple(int(c.max()) + 1 for c in codes)
+        if weights is None:
+            weights = np.ones(nobs)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.tol = tol
+        self.maxiter = maxiter
+
+        # weighted indicator matrices, n_levels x nobs
+        rows = np.arange(nobs)
+        self._indicators = []
+        self._wsums = []
+        for c, n_levels in zip(codes, self.n_levels):
+            ind = sparse.csr_matrix((self.weights, (c, rows)),
+                                    shape=(n_levels, nobs))
+            wsum = np.asarray(ind.sum(1)).ravel()
+            wsum[wsum == 0] = 1.
+            self._indicators.append(ind)
+            self._wsums.append(wsum)
+
+    @cache_readonly
+    def df_absorbed(self):
+        n_levels = self.n_levels
+        if self.k_factors == 1:
+            return n_levels[0]
+        g1, g2 = n_levels[:2]
+        edges = sparse.csr_matrix(
+            (np.ones(self.nobs), (self.codes[0], self.codes[1] + g1)),
+            shape=(g1 + g2, g1 + g2))
+        n_components = connected_components(edges, directed=False)[0]
+        return g1 + g2 - n_components + sum(g - 1 for g in n_levels[2:])
+
+    def demean(self, x):
+        """
+        Sweep the absorbed factors out of x
+
+        Parameters
+        ----------
+        x : array-like
+            1d or 2d array with nobs rows
+
+        Returns
+        -------
+        resid : ndarray
+            Residuals of the weighted projection of x on the dummy variables
+            of all factors, same shape as x.
+        """
+        x = np.array(x, dtype=np.float64)
+        is_1d = x.ndim == 1
+        if is_1d:
+            x = x[:, None]
+        if x.shape[0] != self.nobs:
+            raise ValueError('x needs to have nobs rows')
+        scale = np.abs(x).max(0)
+        scale[scale == 0] = 1.
+
+        converged = self.k_factors == 1
+        for it in range(self.maxiter):
+            change = np.zeros(x.shape[1])
+            for codes, ind, wsum in zip(self.codes, self._indicators,
+                                        self._wsums):
+                means = ind.dot(x) / wsum[:, None]
+                x -= means[codes]
+                change = np.maximum(change, np.abs(means).max(0))
+            if converged or (change <= self.tol * scale).all():
+                converged = True
+                break
+
+        self.iterations = it + 1
+        self.converged = converged
+        if not converged:
+            warnings.warn('Alternating projections did not converge in %d '
+                          'iterations' % self.maxiter, ConvergenceWarning)
+        return x[:, 0] if is_1d else x
@@ -0,0 +1,486 @@
+"""
+Out-of-core least squares based on accumulated sufficient statistics
+
+The data are processed in chunks.  For each chunk only the weighted means
+and the centered cross-product matrix of the combined array ``[exog, endog]``
+are computed, and merged into the running totals with the pairwise update
+formulas of Chan, Golub and LeVeque.  Memory use is therefore O(k**2) and
+does not depend on the number of observations.
+
+References
+----------
+Chan, T.F., Golub, G.H. and LeVeque, R.J. (1983). Algorithms for computing
+    the sample variance: analysis and recommendations. The American
+    Statistician 37(3), 242-247.
+Lumley, T. (2013). biglm: bounded memory linear and generalized linear
+    models. R package.
+"""
+from __future__ import division
+
+import copy
+
+import numpy as np
+
+from statsmodels.base.data import handle_data
+from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.tools.decorators import (cache_readonly, cache_writable,
+                                          resettable_cache)
+from statsmodels.tools.tools import Bunch
+from statsmodels.regression.linear_model import (RegressionResults,
+                                                 RegressionResultsWrapper)
+
+__all__ = ['IncrementalLS', 'IncrementalLSResults']
+
+
+class IncrementalLS(object):
+    """
+    Least squares regression fit from chunks of data
+
+    The ordinary or weighted least squares estimate is computed from
+    sufficient statistics that are accumulated chunk by chunk with
+    `partial_fit`.  The observations themselves are never stored.
+
+    Parameters
+    ----------
+    hasconst : None or bool
+        Indicates whether the design includes a user-supplied constant.  If
+        None, a column that is constant and nonzero across all chunks is
+        treated as the constant.  Implicit constants, e.g. a full set of
+        dummy variables, are only recognized if ``hasconst=True``.
+    sandwich : bool
+        If True, then the fourth order moments that are required for the
+        heteroscedasticity robust covariances HC0 and HC1 are accumulated.
+        This requires O(k**4) memory and computation per observation.
+
+    Attributes
+    ----------
+    nobs : int
+        Number of observations accumulated so far.
+    k_exog : int
+        Number of columns of exog.
+
+    Examples
+    --------
+    >>> mod = IncrementalLS()
+    >>> for endog_chunk, exog_chunk in chunks:
+    ...     mod.partial_fit(endog_chunk, exog_chunk)
+    >>> res = mod.finalize()
+
+    Notes
+    -----
+    The results instance has the same statistics as the results of `OLS` and
+    `WLS` that depend only on the sufficient statistics, e.g. params, bse,
+    rsquared, fvalue and llf.  Attributes that require the observations, like
+    resid, fittedvalues or HC2 and HC3 robust covariances, are not available.
+
+    The weights have the same interpretation as in `WLS`, that is they are
+    the inverse of the variance of an observation.
+    """
+
+    def __init__(self, hasconst=None, sandwich=False):
+        self.hasconst = hasconst
+        self.sandwich = sandwich
+        self.nobs = 0
+        self.k_exog = None
+        self.data = None
+
+    def _init_stats(self, k_exog):
+        k = k_exog + 1
+        self.k_exog = k_exog
+        self._sum_weights = 0.
+        self._sum_log_weights = 0.
+        self._mean = np.zeros(k)
+        self._comoment = np.zeros((k, k))
+        self._exog_min = np.empty(k_exog)
+        self._exog_min.fill(np.inf)
+        self._exog_max = np.empty(k_exog)
+        self._exog_max.fill(-np.inf)
+        if self.sandwich:
+            self._moment4 = np.zeros((k_exog * k, k_exog * k))
+
+    def partial_fit(self, endog, exog, weights=None):
+        """
+        Add a chunk of observations to the sufficient statistics
+
+        Parameters
+        ----------
+        endog : array-like
+            1-d endogenous response variable for the chunk.
+        exog : array-like
+            nobs_chunk x k array of the explanatory variables for the chunk.
+            The columns have to be the same in all chunks.
+        weights : array-like, optional
+            1d array of weights for the chunk, see `WLS`.  If None, then all
+            weights are one.
+
+        Returns
+        -------
+        self
+        """
+        if self.data is None:
+            # keep only the metadata, e.g. names, of the first chunk
+            self.data = handle_data(endog[:0], exog[:0],
+                                    hasconst=bool(self.hasconst))
+
+        endog = np.asarray(endog, dtype=np.float64)
+        exog = np.asarray(exog, dtype=np.float64)
+        if exog.ndim == 1:
+            exog = exog[:, None]
+        if endog.ndim == 2 and endog.shape[1] == 1:
+            endog = endog[:, 0]
+        if endog.ndim != 1 or exog.ndim != 2:
+            raise ValueError("endog has to be 1-d and exog 2-d")
+        nobs_chunk = exog.shape[0]
+        if endog.shape[0] != nobs_chunk:
+            raise ValueError("endog and exog matrices are different sizes")
+        if self.k_exog is None:
+            self._init_stats(exog.shape[1])
+        elif exog.shape[1] != self.k_exog:
+            raise ValueError("exog has %d columns, expected %d" %
+                             (exog.shape[1], self.k_exog))
+        if nobs_chunk == 0:
+            return self
+
+        if weights is None:
+            weights = np.ones(nobs_chunk)
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.ndim == 0:
+                weights = np.repeat(weights, nobs_chunk)
+            if weights.shape != (nobs_chunk,):
+                raise ValueError('Weights must be scalar or same length as '
+                                 'design')
+
+        data = np.column_stack((exog, endog))
+        w_chunk = weights.sum()
+        if w_chunk > 0:
+            mean_chunk = np.dot(weights, data) / w_chunk
+            data_c = data - mean_chunk
+            comoment_chunk = np.dot(data_c.T, weights[:, None] * data_c)
+
+            # pairwise update of mean and centered cross-products
+            w_total = self._sum_weights + w_chunk
+            delta = mean_chunk - self._mean
+            self._comoment += comoment_chunk
+            self._comoment += (np.outer(delta, delta) *
+                               (self._sum_weights * w_chunk / w_total))
+            self._mean += delta * (w_chunk / w_total)
+            self._sum_weights = w_total
+        # rows with zero weight do not change the moments, but they are
+        # counted in nobs as in WLS
+        self._sum_log_weights += np.log(weights).sum()
+
+        self._exog_min = np.minimum(self._exog_min, exog.min(0))
+        self._exog_max = np.maximum(self._exog_max, exog.max(0))
+
+        if self.sandwich:
+            # rows are vec(x_i [x_i, y_i]'), the meat of the sandwich is a
+            # quadratic form in these
+            v = (exog[:, :, None] * data[:, None, :]).reshape(nobs_chunk, -1)
+            self._moment4 += np.dot(v.T, (weights**2)[:, None] * v)
+
+        self.nobs += nobs_chunk
+        return self
+
+    def _get_k_constant(self):
+        """number of constants and index of constant column"""
+        if self.hasconst is not None:
+            return int(bool(self.hasconst)), None
+        const = np.nonzero((self._exog_min == self._exog_max) &
+                           (self._exog_max != 0))[0]
+        if len(const) == 0:
+            return 0, None
+        return 1, const[0]
+
+    def _snapshot(self):
+        """copy of the current sufficient statistics as raw moments"""
+        k = self.k_exog
+        mean = self._mean
+        xwx_full = self._comoment + self._sum_weights * np.outer(mean, mean)
+        stats_ = Bunch(nobs=self.nobs,
+                       sum_weights=self._sum_weights,
+                       sum_log_weights=self._sum_log_weights,
+                       mean=mean.copy(),
+                       comoment=self._comoment.copy(),
+                       xwx=xwx_full[:k, :k],
+                       xwy=xwx_full[:k, k],
+                       ywy=xwx_full[k, k])
+        if self.sandwich:
+            stats_.moment4 = self._moment4.copy()
+        return stats_
+
+    @property
+    def endog_names(self):
+        return self.data.ynames
+
+    @property
+    def exog_names(self):
+        return self.data.xnames
+
+    def predict(self, params, exog=None):
+        """
+        Return linear predicted values from a design matrix.
+
+        Parameters
+        ----------
+        params : array-like
+            Parameters of a linear model
+        exog : array-like
+            Design / exogenous data.  It is required because the data of the
+            model are not stored.
+
+        Returns
+        -------
+        An array of fitted values
+        """
+        if exog is None:
+            raise ValueError('exog is required, data is not stored in '
+                             'IncrementalLS')
+        return np.dot(exog, params)
+
+    def finalize(self, cov_type='nonrobust', cov_kwds=None, use_t=None):
+        """
+        Estimate the regression from the accumulated statistics
+
+        Parameters
+        ----------
+        cov_type : str
+            'nonrobust' or, if the model was created with ``sandwich=True``,
+            'HC0' or 'HC1'.
+        cov_kwds : None
+            Not used, for compatibility with `RegressionModel.fit`.
+        use_t : bool, optional
+            Flag indicating to use the Student's t distribution when
+            computing p-values.
+
+        Returns
+        -------
+        results : IncrementalLSResults instance
+
+        Notes
+        -----
+        The statistics are copied and the results refer to a copy of the
+        model, so that `partial_fit` can be called again to add more data
+        without changing the returned results.
+        """
+        if self.nobs == 0:
+            raise ValueError('no data has been added with partial_fit')
+
+        suff = self._snapshot()
+        model = copy.copy(self)
+        model.data = data = copy.copy(self.data)
+        data._cache = resettable_cache()
+        model.k_constant, const_idx = self._get_k_constant()
+        data.k_constant = model.k_constant
+        data.const_idx = const_idx
+        if data._get_names(data.orig_exog) is None:
+            # default names as in ModelData, without the data
+            k = self.k_exog
+            if const_idx is None:
+                xnames = ['x%d' % i for i in range(1, k + 1)]
+            else:
+                xnames = ['x%d' % i for i in range(1, k)]
+                xnames.insert(const_idx, 'const')
+            data.xnames = xnames
+
+        normalized_cov_params = np.linalg.pinv(suff.xwx)
+        params = np.dot(normalized_cov_params, suff.xwy)
+        eigvals = np.linalg.eigvalsh(suff.xwx)
+        model.wexog_singular_values = np.sqrt(np.clip(eigvals, 0, np.inf))
+        model.rank = np_matrix_rank(suff.xwx)
+        model.df_model = float(model.rank - model.k_constant)
+        model.df_resid = self.nobs - model.rank
+
+        res = IncrementalLSResults(model, params, suff,
+                                   normalized_cov_params=normalized_cov_params,
+                                   cov_type=cov_type, cov_kwds=cov_kwds,
+                                   use_t=use_t)
+        return RegressionResultsWrapper(res)
+
+
+class IncrementalLSResults(RegressionResults):
+    """
+    Results class for a least squares model fit with `IncrementalLS`
+
+    Statistics are computed from the sufficient statistics stored in
+    `suffstats`.  See `RegressionResults` for the available attributes.
+    Residuals, fitted values and statistics that need the observations are
+    not available.
+    """
+
+    def __init__(self, model, params, suffstats, normalized_cov_params=None,
+                 scale=1., cov_type='nonrobust', cov_kwds=None, use_t=None,
+                 **kwargs):
+        self.suffstats = suffstats
+        super(IncrementalLSResults, self).__init__(
+            model, params, normalized_cov_params=normalized_cov_params,
+            scale=scale, cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
+            **kwargs)
+
+    def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
+        if cov_type not in ('nonrobust', 'fixed scale', 'fixed_scale', 'HC0',
+                            'HC1'):
+            raise ValueError('cov_type %s is not available for '
+                             'IncrementalLS' % cov_type)
+        if kwds.get('use_self', False):
+            return super(IncrementalLSResults, self).get_robustcov_results(
+                cov_type=cov_type, use_t=use_t, **kwds)
+        res = self.__class__(self.model, self.params, self.suffstats,
+                             normalized_cov_params=self.normalized_cov_params,
+                             scale=self.scale)
+        kwds['use_self'] = True
+        if use_t is None:
+            use_t = self.use_t
+        return res.get_robustcov_results(cov_type=cov_type, use_t=use_t,
+                                         **kwds)
+
+    get_robustcov_results.__doc__ = RegressionResults.get_robustcov_results.__doc__
+
+    def _not_available(self, name):
+        raise ValueError('%s is not available, the data is not stored by '
+                         'IncrementalLS' % name)
+
+    @cache_readonly
+    def nobs(self):
+        return float(self.suffstats.nobs)
+
+    @property
+    def fittedvalues(self):
+        self._not_available('fittedvalues')
+
+    @property
+    def resid(self):
+        self._not_available('resid')
+
+    @property
+    def wresid(self):
+        self._not_available('wresid')
+
+    @cache_readonly
+    def ssr(self):
+        suff = self.suffstats
+        k = len(self.params)
+        comoment = suff.comoment
+        b = self.params
+        if self.k_constant:
+            # with a constant, residuals have weighted mean zero and the
+            # centered moments avoid the cancellation of the raw moments
+            ssr = (comoment[k, k] - 2 * np.dot(b, comoment[:k, k]) +
+                   np.dot(b, np.dot(comoment[:k, :k], b)))
+        else:
+            ssr = (suff.ywy - 2 * np.dot(b, suff.xwy) +
+                   np.dot(b, np.dot(suff.xwx, b)))
+        return max(ssr, 0.)
+
+    @cache_writable()
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def centered_tss(self):
+        comoment = self.suffstats.comoment
+        return comoment[-1, -1]
+
+    @cache_readonly
+    def uncentered_tss(self):
+        return self.suffstats.ywy
+
+    @cache_readonly
+    def llf(self):
+        nobs2 = self.nobs / 2.0
+        llf = -np.log(self.ssr) * nobs2
+        llf -= (1 + np.log(np.pi / nobs2)) * nobs2
+        llf += 0.5 * self.suffstats.sum_log_weights
+        return llf
+
+    def _meat(self):
+        """sum of squared whitened residuals times outer product of wexog"""
+        suff = self.suffstats
+        if 'moment4' not in suff:
+            raise ValueError('robust covariance requires '
+                             'IncrementalLS(sandwich=True)')
+        k = len(self.params)
+        c = np.concatenate((-self.params, [1.]))
+        m4 = suff.moment4.reshape(k, k + 1, k, k + 1)
+        return np.einsum('iajb,a,b->ij', m4, c, c)
+
+    @cache_readonly
+    def cov_HC0(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        ncp = self.normalized_cov_params
+        return np.dot(ncp, np.dot(self._meat(), ncp))
+
+    @cache_readonly
+    def cov_HC1(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self.nobs / self.df_resid * self.cov_HC0
+
+    @property
+    def cov_HC2(self):
+        self._not_available('cov_HC2')
+
+    @property
+    def cov_HC3(self):
+        self._not_available('cov_HC3')
+
+    def summary(self, yname=None, xname=None, title=None, alpha=.05):
+        """Summarize the Regression Results
+
+        Parameters
+        -----------
+        yname : string, optional
+            Default is `y`
+        xname : list of strings, optional
+            Default is `var_##` for ## in p the number of regressors
+        title : string, optional
+            Title for the top table. If not None, then this replaces the
+            default title
+        alpha : float
+            significance level for the confidence intervals
+
+        Returns
+        -------
+        smry : Summary instance
+            this holds the summary tables and text, which can be printed or
+            converted to various output formats.
+
+        Notes
+        -----
+        Residual diagnostics are not included because the residuals are not
+        available.
+        """
+        top_left = [('Dep. Variable:', None),
+                    ('Model:', None),
+                    ('Method:', ['Least Squares']),
+                    ('Date:', None),
+                    ('Time:', None),
+                    ('No. Observations:', None),
+                    ('Df Residuals:', None),
+                    ('Df Model:', None),
+                    ('Covariance Type:', [self.cov_type])
+                    ]
+
+        top_right = [('R-squared:', ["%#8.3f" % self.rsquared]),
+                     ('Adj. R-squared:', ["%#8.3f" % self.rsquared_adj]),
+                     ('F-statistic:', ["%#8.4g" % self.fvalue]),
+                     ('Prob (F-statistic):', ["%#6.3g" % self.f_pvalue]),
+                     ('Log-Likelihood:', None),
+                     ('AIC:', ["%#8.4g" % self.aic]),
+                     ('BIC:', ["%#8.4g" % self.bic])
+                     ]
+
+        if title is None:
+            title = self.model.__class__.__name__ + ' ' + "Regression Results"
+
+        from statsmodels.iolib.summary import Summary
+        smry = Summary()
+        smry.add_table_2cols(self, gleft=top_left, gright=top_right,
+                             yname=yname, xname=xname, title=title)
+        smry.add_table_params(self, yname=yname, xname=xname, alpha=alpha,
+                              use_t=self.use_t)
+        smry.add_extra_txt([self.cov_kwds['description']])
+        return smry
@@ -36,17 +36,20 @@ from __future__ import print_function
 from statsmodels.compat.python import lrange, lzip, range
 __docformat__ = 'restructuredtext en'
 
-__all__ = ['GLS', 'WLS', 'OLS', 'GLSAR']
+__all__ = ['GLS', 'WLS', 'OLS', 'GLSAR', 'MultiOLS']
 
 import numpy as np
 import pandas as pd
-from scipy.linalg import toeplitz
+from scipy.linalg import toeplitz, cho_factor, cho_solve
 from scipy import stats
 from scipy import optimize
+from scipy import sparse
+from scipy.sparse.linalg import lsqr
 
 from statsmodels.compat.numpy import np_matrix_rank
 from statsmodels.tools.data import _is_using_pandas
-from statsmodels.tools.tools import add_constant, chain_dot, pinv_extended
+from statsmodels.tools.tools import (add_constant, chain_dot, pinv_extended,
+                                     _scale_rows, _crossprod, _pinv_crossprod)
 from statsmodels.tools.decorators import (resettable_cache,
                                           cache_readonly,
                                           cache_writable)
@@ -58,16 +61,34 @@ from statsmodels.tools.sm_exceptions import InvalidTestWarning
 
 # need import in module instead of lazily to copy `__doc__`
 from . import _prediction as pred
+from .absorb import AbsorbedFactors, _as_factor_list
+
+def _matrix_rank(exog):
+    # rank of a dense or sparse exog
+    if sparse.issparse(exog):
+        return _pinv_crossprod(_crossprod(exog))[2]
+    return np_matrix_rank(exog)
+
+
+def _is_structured_sigma(sigma):
+    return hasattr(sigma, 'whiten') and hasattr(sigma, 'logdet')
+
 
 def _get_sigma(sigma, nobs):
     """
     Returns sigma (matrix, nobs by nobs) for GLS and the inverse of its
     Cholesky decomposition.  Handles dimensions and checks integrity.
     If sigma is None, returns None, None. Otherwise returns sigma,
-    cholsigmainv.
+    cholsigmainv.  Structured covariance objects that define ``whiten`` and
+    ``logdet`` are returned unchanged with cholsigmainv None.
     """
     if sigma is None:
         return None, None
+    if _is_structured_sigma(sigma):
+        if sigma.nobs != nobs:
+            raise ValueError("Sigma is for %s observations, but there are "
+                             "%s" % (sigma.nobs, nobs))
+        return sigma, None
     sigma = np.asarray(sigma).squeeze()
     if sigma.ndim == 0:
         sigma = np.repeat(sigma, nobs)
@@ -91,6 +112,9 @@ class RegressionModel(base.LikelihoodModel):
 
     Intended for subclassing.
     """
+    # degrees of freedom used by absorbed fixed effects, see WLS
+    df_absorb = 0
+
     def __init__(self, endog, exog, **kwargs):
         super(RegressionModel, self).__init__(endog, exog, **kwargs)
         self._data_attr.extend(['pinv_wexog', 'wendog', 'wexog', 'weights'])
@@ -113,7 +137,7 @@ class RegressionModel(base.LikelihoodModel):
         """
         if self._df_model is None:
             if self.rank is None:
-                self.rank = np_matrix_rank(self.exog)
+                self.rank = _matrix_rank(self.exog)
             self._df_model = float(self.rank - self.k_constant)
         return self._df_model
 
@@ -130,8 +154,8 @@ class RegressionModel(base.LikelihoodModel):
 
         if self._df_resid is None:
             if self.rank is None:
-                self.rank = np_matrix_rank(self.exog)
-            self._df_resid = self.nobs - self.rank
+                self.rank = _matrix_rank(self.exog)
+            self._df_resid = self.nobs - self.rank - self.df_absorb
         return self._df_resid
 
     @df_resid.setter
@@ -143,7 +167,7 @@ class RegressionModel(base.LikelihoodModel):
         raise NotImplementedError("Subclasses should implement.")
 
     def fit(self, method="pinv", cov_type='nonrobust', cov_kwds=None,
-            use_t=None, **kwargs):
+            use_t=None, store='full', **kwargs):
         """
         Full fit of the model.
 
@@ -153,9 +177,17 @@ class RegressionModel(base.LikelihoodModel):
         Parameters
         ----------
         method : str, optional
-            Can be "pinv", "qr".  "pinv" uses the Moore-Penrose pseudoinverse
-            to solve the least squares problem. "qr" uses the QR
-            factorization.
+            Can be "pinv", "qr", "cholesky" or "lsqr".  "pinv" uses the
+            Moore-Penrose pseudoinverse to solve the least squares problem.
+            "qr" uses the QR factorization. "cholesky" solves the normal
+            equations with the Cholesky factorization of the k x k
+            cross-product matrix, it requires that `wexog` has full column
+            rank. "lsqr" solves the least squares problem iteratively with
+            `scipy.sparse.linalg.lsqr` and uses the pseudoinverse of the
+            cross-product matrix for the covariance.  If exog is a
+            scipy.sparse matrix, then "qr" is not available and "pinv" uses
+            the pseudoinverse of the cross-product matrix, which is assembled
+            with sparse products.
         cov_type : str, optional
             See `regression.linear_model.RegressionResults` for a description
             of the available covariance estimators
@@ -167,6 +199,13 @@ class RegressionModel(base.LikelihoodModel):
             p-values.  Default behavior depends on cov_type. See
             `linear_model.RegressionResults.get_robustcov_results` for
             implementation details.
+        store : str, optional
+            Can be "full" or "minimal". If "minimal", then no arrays with
+            nobs elements are kept in addition to the data. The model does
+            not store the pseudoinverse or the Q factor of `wexog`, and the
+            results instance recomputes residuals and fitted values each time
+            they are accessed instead of caching them. Combined with
+            ``method="cholesky"`` this has the smallest memory footprint.
 
         Returns
         -------
@@ -182,20 +221,42 @@ class RegressionModel(base.LikelihoodModel):
         The fit method uses the pseudoinverse of the design/exogenous variables
         to solve the least squares minimization.
         """
-        if method == "pinv":
+        if store not in ('full', 'minimal'):
+            raise ValueError('store has to be "full" or "minimal"')
+        minimal = store == 'minimal'
+        is_sparse = sparse.issparse(self.wexog)
+        if is_sparse and method == "qr":
+            raise ValueError('method "qr" is not available for sparse exog')
+
+        if method == "pinv" and is_sparse:
+            # the p x n pseudoinverse of wexog would be dense
+            if ((not hasattr(self, 'normalized_cov_params')) or
+                    (getattr(self, 'rank', None) is None)):
+                (self.normalized_cov_params, self.wexog_singular_values,
+                 self.rank) = _pinv_crossprod(_crossprod(self.wexog))
+            beta = np.dot(self.normalized_cov_params,
+                          self.wexog.T.dot(self.wendog))
+
+        elif method == "pinv":
             if ((not hasattr(self, 'pinv_wexog')) or
                 (not hasattr(self, 'normalized_cov_params')) or
                 (not hasattr(self, 'rank'))):
 
-                self.pinv_wexog, singular_values = pinv_extended(self.wexog)
-                self.normalized_cov_params = np.dot(self.pinv_wexog,
-                                        np.transpose(self.pinv_wexog))
+                pinv_wexog, singular_values = pinv_extended(self.wexog)
+                self.normalized_cov_params = np.dot(pinv_wexog,
+                                        np.transpose(pinv_wexog))
 
                 # Cache these singular values for use later.
                 self.wexog_singular_values = singular_values
                 self.rank = np_matrix_rank(np.diag(singular_values))
+            else:
+                pinv_wexog = self.pinv_wexog
 
-            beta = np.dot(self.pinv_wexog, self.wendog)
+            beta = np.dot(pinv_wexog, self.wendog)
+            if not minimal:
+                self.pinv_wexog = pinv_wexog
+            elif hasattr(self, 'pinv_wexog'):
+                del self.pinv_wexog
 
         elif method == "qr":
             if ((not hasattr(self, 'exog_Q')) or
@@ -203,7 +264,7 @@ class RegressionModel(base.LikelihoodModel):
                 (not hasattr(self, 'normalized_cov_params')) or
                 (getattr(self, 'rank', None) is None)):
                 Q, R = np.linalg.qr(self.wexog)
-                self.exog_Q, self.exog_R = Q, R
+                self.exog_R = R
                 self.normalized_cov_params = np.linalg.inv(np.dot(R.T, R))
 
                 # Cache singular values from R.
@@ -215,21 +276,55 @@ class RegressionModel(base.LikelihoodModel):
             # used in ANOVA
             self.effects = effects = np.dot(Q.T, self.wendog)
             beta = np.linalg.solve(R, effects)
+            if not minimal:
+                self.exog_Q = Q
+            elif hasattr(self, 'exog_Q'):
+                del self.exog_Q
+
+        elif method == "cholesky":
+            wexog = self.wexog
+            xtx = _crossprod(wexog)
+            eigvals = np.clip(np.linalg.eigvalsh(xtx), 0, np.inf)
+            tol = eigvals[-1] * xtx.shape[0] * np.finfo(float).eps
+            msg = ('wexog does not have full column rank, '
+                   'use method "pinv" or "qr"')
+            if eigvals[0] <= tol:
+                raise ValueError(msg)
+            try:
+                cho = cho_factor(xtx, lower=True)
+            except np.linalg.LinAlgError:
+                raise ValueError(msg)
+            self.normalized_cov_params = cho_solve(cho, np.eye(xtx.shape[0]))
+            beta = cho_solve(cho, wexog.T.dot(self.wendog))
+            self.wexog_singular_values = np.sqrt(eigvals)[::-1]
+            self.rank = xtx.shape[0]
+
+        elif method == "lsqr":
+            wexog = self.wexog
+            (self.normalized_cov_params, self.wexog_singular_values,
+             self.rank) = _pinv_crossprod(_crossprod(wexog))
+            beta = lsqr(wexog, self.wendog, atol=1e-14, btol=1e-14,
+                        iter_lim=10 * max(wexog.shape))[0]
+
+        else:
+            raise ValueError('method has to be "pinv", "qr", "cholesky" or '
+                             '"lsqr"')
 
         if self._df_model is None:
             self._df_model = float(self.rank - self.k_constant)
         if self._df_resid is None:
-            self.df_resid = self.nobs - self.rank
+            self.df_resid = self.nobs - self.rank - self.df_absorb
 
         if isinstance(self, OLS):
             lfit = OLSResults(self, beta,
                        normalized_cov_params=self.normalized_cov_params,
-                       cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t)
+                       cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
+                       store=store)
         else:
             lfit = RegressionResults(self, beta,
                        normalized_cov_params=self.normalized_cov_params,
                        cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
-                       **kwargs)
+                       store=store, **kwargs)
         return RegressionResultsWrapper(lfit)
 
 
@@ -257,6 +352,8 @@ class RegressionModel(base.LikelihoodModel):
 
         if exog is None:
             exog = self.exog
+        if sparse.issparse(exog):
+            return exog.dot(params)
 
         return np.dot(exog, params)
 
@@ -310,7 +407,9 @@ class GLS(RegressionModel):
         scalar, `sigma` as the value of each diagonal element.  If `sigma`
         is an n-length vector, then `sigma` is assumed to be a diagonal
         matrix with the given `sigma` on the diagonal.  This should be the
-        same as WLS.
+        same as WLS.  `sigma` can also be one of the structured covariance
+        classes in `statsmodels.regression.structured_sigma`, which whiten
+        the data without forming an n x n matrix.
     %(extra_params)s
 
     **Attributes**
@@ -379,9 +478,18 @@ class GLS(RegressionModel):
     #TODO: default if sigma is none should be two-step GLS
         sigma, cholsigmainv = _get_sigma(sigma, len(endog))
 
-        super(GLS, self).__init__(endog, exog, missing=missing,
-                                  hasconst=hasconst, sigma=sigma,
-                                  cholsigmainv=cholsigmainv, **kwargs)
+        if _is_structured_sigma(sigma):
+            # structured sigma is not an array and cannot go through the
+            # missing data handling, it has to be available for `whiten`
+            self.sigma = sigma
+            self.cholsigmainv = None
+            super(GLS, self).__init__(endog, exog, missing=missing,
+                                      hasconst=hasconst, **kwargs)
+            self._init_keys.append('sigma')
+        else:
+            super(GLS, self).__init__(endog, exog, missing=missing,
+                                      hasconst=hasconst, sigma=sigma,
+                                      cholsigmainv=cholsigmainv, **kwargs)
 
         #store attribute names for data arrays
         self._data_attr.extend(['sigma', 'cholsigmainv'])
@@ -404,6 +512,8 @@ class GLS(RegressionModel):
         --------
         regression.GLS
         """
+        if _is_structured_sigma(self.sigma):
+            return self.sigma.whiten(X)
         X = np.asarray(X)
         if self.sigma is None or self.sigma.shape == ():
             return X
@@ -449,7 +559,9 @@ class GLS(RegressionModel):
         SSR = np.sum((self.wendog - np.dot(self.wexog, params))**2, axis=0)
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with likelihood constant
-        if np.any(self.sigma):
+        if _is_structured_sigma(self.sigma):
+            llf -= .5*self.sigma.logdet()
+        elif np.any(self.sigma):
         #FIXME: robust-enough check?  unneeded if _det_sigma gets defined
             if self.sigma.ndim==2:
                 det = np.linalg.slogdet(self.sigma)
@@ -472,12 +584,18 @@ class WLS(RegressionModel):
         1d array of weights.  If you supply 1/W then the variables are pre-
         multiplied by 1/sqrt(W).  If no weights are supplied the default value
         is 1 and WLS reults are the same as OLS.
+    absorb : array-like, DataFrame or list of array-like, optional
+        Categorical variables whose fixed effects are absorbed.  A 1d array
+        is a single factor, the columns of a 2d array or DataFrame and the
+        elements of a list are separate factors.  See Notes.
     %(extra_params)s
 
     Attributes
     ----------
     weights : array
         The stored weights supplied as an argument.
+    absorbed : AbsorbedFactors
+        Only available if `absorb` is not None.
 
     See regression.GLS
 
@@ -504,11 +622,29 @@ class WLS(RegressionModel):
     If the weights are a function of the data, then the post estimation
     statistics such as fvalue and mse_model might not be correct, as the
     package does not yet support no-constant regression.
+
+    exog can be a scipy.sparse matrix, for example the indicator matrix
+    returned by `statsmodels.tools.grouputils.dummy_sparse`.  Whitening and
+    the k x k cross-product matrix use sparse products, see `fit` for the
+    available methods.
+
+    If `absorb` is given, then the weighted group means of all factors are
+    swept out of endog and exog by alternating projections, see
+    `statsmodels.regression.absorb.AbsorbedFactors`.  The parameters are the
+    same as in the regression that includes dummy variables for all levels,
+    but the dummy columns are never created.  The `endog` and `exog`
+    attributes of the model hold the demeaned data, so that residuals,
+    fitted values and rsquared refer to the within transformed regression.
+    `df_resid` is reduced by the rank of the dummy variables.  exog cannot
+    include a constant because it is absorbed.  Cluster robust standard
+    errors, ``fit(cov_type='cluster')``, do not count the fixed effects in
+    the small sample correction, which is appropriate when the absorbed
+    factors are nested within the clusters.
     """ % {'params' : base._model_params_doc,
            'extra_params' : base._missing_param_doc + base._extra_param_doc}
 
     def __init__(self, endog, exog, weights=1., missing='none', hasconst=None,
-                 **kwargs):
+                 absorb=None, **kwargs):
         weights = np.array(weights)
         if weights.shape == ():
             if (missing == 'drop' and 'missing_idx' in kwargs and
@@ -522,8 +658,12 @@ class WLS(RegressionModel):
             weights = np.array([weights.squeeze()])
         else:
             weights = weights.squeeze()
+        # needed in initialize, which is called by super
+        self.absorb = absorb
         super(WLS, self).__init__(endog, exog, missing=missing,
                                   weights=weights, hasconst=hasconst, **kwargs)
+        if absorb is not None:
+            self._init_keys.append('absorb')
         nobs = self.exog.shape[0]
         weights = self.weights
         # Experimental normalization of weights
@@ -531,6 +671,31 @@ class WLS(RegressionModel):
         if weights.size != nobs and weights.shape[0] != nobs:
             raise ValueError('Weights must be scalar or same length as design')
 
+    def initialize(self):
+        if self.absorb is None:
+            return super(WLS, self).initialize()
+
+        if self.k_constant > 0:
+            raise ValueError('exog cannot include a constant if fixed '
+                             'effects are absorbed')
+        if sparse.issparse(self.exog):
+            raise ValueError('absorb is not available for sparse exog')
+        factors = _as_factor_list(self.absorb)
+        # rows dropped by missing='drop'
+        missing_idx = getattr(self.data, 'missing_row_idx', None)
+        if missing_idx and (len(factors[0]) ==
+                            self.endog.shape[0] + len(missing_idx)):
+            factors = [np.delete(f, missing_idx) for f in factors]
+        if len(factors[0]) != self.endog.shape[0]:
+            raise ValueError('absorb needs to have the same length as endog')
+        self.absorbed = AbsorbedFactors(factors, weights=self.weights)
+        endog_exog = self.absorbed.demean(np.column_stack((self.endog,
+                                                           self.exog)))
+        self.endog = endog_exog[:, 0]
+        self.exog = endog_exog[:, 1:]
+        super(WLS, self).initialize()
+        self.df_absorb = self.absorbed.df_absorbed
+
     def whiten(self, X):
         """
         Whitener for WLS model, multiplies each column by sqrt(self.weights)
@@ -545,6 +710,8 @@ class WLS(RegressionModel):
         sqrt(weights)*X
         """
         #print(self.weights.var()))
+        if sparse.issparse(X):
+            return _scale_rows(X, np.sqrt(self.weights))
         X = np.asarray(X)
         if X.ndim == 1:
             return X * np.sqrt(self.weights)
@@ -575,7 +742,7 @@ class WLS(RegressionModel):
         where :math:`W` is a diagonal matrix
         """
         nobs2 = self.nobs / 2.0
-        SSR = np.sum((self.wendog - np.dot(self.wexog,params))**2, axis=0)
+        SSR = np.sum((self.wendog - self.wexog.dot(params))**2, axis=0)
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with constant
         llf += 0.5 * np.sum(np.log(self.weights))
@@ -622,6 +789,9 @@ class OLS(WLS):
     Notes
     -----
     No constant is added by the model unless you are using formulas.
+
+    exog can be a scipy.sparse matrix and fixed effects can be absorbed
+    with the `absorb` option, see WLS.
     """ % {'params' : base._model_params_doc,
            'extra_params' : base._missing_param_doc + base._extra_param_doc}
     #TODO: change example to use datasets.  This was the point of datasets!
@@ -651,7 +821,7 @@ class OLS(WLS):
         """
         nobs2 = self.nobs / 2.0
         nobs = float(self.nobs)
-        resid = self.endog - np.dot(self.exog, params)
+        resid = self.endog - self.exog.dot(params)
         if hasattr(self, 'offset'):
             resid -= self.offset
         ssr = np.sum(resid**2)
@@ -852,6 +1022,103 @@ class OLS(WLS):
                               refit=refit,
                               **defaults)
 
+    def fit_regularized_path(self, alphas, L1_wt=1., profile_scale=False,
+                             **kwargs):
+        """
+        Return the elastic net coefficient path for a sequence of penalties.
+
+        Parameters
+        ----------
+        alphas : array-like
+            1d array of scalar penalty weights.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        profile_scale : bool
+            If True the penalized fit is computed using the profile
+            (concentrated) log-likelihood for the Gaussian model.
+            Otherwise the fit uses the residual sum of squares.
+        kwargs
+            Additional keyword arguments for `fit_elasticnet_path`:
+            maxiter, cnvrg_tol, zero_tol and strong_rules.
+
+        Returns
+        -------
+        params : ndarray
+            len(alphas) x k array, row i contains the estimate that
+            ``fit_regularized(alpha=alphas[i], L1_wt=L1_wt)`` computes.
+
+        Notes
+        -----
+        The penalties are processed in decreasing order with warm starts
+        and strong rule screening.  Unless `profile_scale` is True, the
+        objective is quadratic and coordinate descent works on the cached
+        cross-product matrices, so that each sweep costs O(k**2)
+        operations independent of the number of observations.
+
+        See Also
+        --------
+        statsmodels.base.elastic_net.fit_elasticnet_path
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_path
+
+        defaults = {"maxiter" : 50, "cnvrg_tol" : 1e-10,
+                    "zero_tol" : 1e-10}
+        defaults.update(kwargs)
+
+        if profile_scale:
+            return fit_elasticnet_path(self, alphas, L1_wt=L1_wt, **defaults)
+
+        if not hasattr(self, "_wexog_xprod"):
+            self._setup_score_hess()
+        gram = (self._wexog_xprod / self.nobs,
+                self._wexog_x_wendog / self.nobs)
+        return fit_elasticnet_path(self, alphas, L1_wt=L1_wt, gram=gram,
+                                   **defaults)
+
+    def fit_regularized_cv(self, alphas, L1_wt=1., cv=10, n_jobs=1,
+                           random_state=None, **kwargs):
+        """
+        Choose the elastic net penalty weight by K-fold cross-validation.
+
+        Parameters
+        ----------
+        alphas : array-like
+            1d array of scalar penalty weights.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        cv : int or iterable
+            The number of randomly assigned folds, or an iterable of
+            ``(train_index, test_index)`` pairs, see
+            `statsmodels.tools.cross_val`.
+        n_jobs : int
+            Number of folds that are evaluated in parallel, requires
+            joblib.
+        random_state : None, int or RandomState
+            Seed or random number generator for the assignment of the
+            observations to the folds if `cv` is an integer.
+        kwargs
+            Additional keyword arguments for `fit_regularized_path`.
+
+        Returns
+        -------
+        results : ElasticNetCVResults
+            Contains the mean and standard error of the held out
+            sum of squared residuals for each alpha, `alpha_min`, the
+            1-SE choice `alpha_1se` and the estimate for `alpha_1se` on
+            all observations.
+
+        See Also
+        --------
+        statsmodels.base.elastic_net.fit_elasticnet_cv
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_cv
+
+        return fit_elasticnet_cv(self, alphas, L1_wt=L1_wt, cv=cv,
+                                 n_jobs=n_jobs, random_state=random_state,
+                                 **kwargs)
+
 
 class GLSAR(GLS):
     __doc__ = """
@@ -1013,6 +1280,132 @@ class GLSAR(GLS):
         return _X[self.order:]
 
 
+class MultiOLS(RegressionModel):
+    __doc__ = """
+    Ordinary least squares for several response variables with a common
+    design matrix.
+
+    Parameters
+    ----------
+    endog : array-like
+        nobs x k_endog array of response variables.  Each column is
+        regressed on the same `exog`.
+    exog : array-like
+        A nobs x k array where `nobs` is the number of observations and `k`
+        is the number of regressors. An intercept is not included by default
+        and should be added by the user. See
+        :func:`statsmodels.tools.add_constant`.
+    %(extra_params)s
+
+    Attributes
+    ----------
+    k_endog : int
+        The number of response variables.
+
+    See Also
+    --------
+    OLS
+
+    Notes
+    -----
+    The pseudoinverse of `exog` is computed only once and shared by all
+    response variables.  The results are vectorized, e.g. ``params`` and
+    ``bse`` are k x k_endog arrays and ``rsquared`` has length k_endog.
+    Results instances for individual response variables are created on
+    request with `MultiOLSResults.get_results`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import statsmodels.api as sm
+    >>> exog = sm.add_constant(np.random.randn(100, 2))
+    >>> endog = np.random.randn(100, 500)
+    >>> res = MultiOLS(endog, exog).fit()
+    >>> res.params.shape
+    (3, 500)
+    >>> print(res.get_results(0).summary())
+    """ % {'extra_params' : base._missing_param_doc + base._extra_param_doc}
+
+    def __init__(self, endog, exog, missing='none', hasconst=None, **kwargs):
+        super(MultiOLS, self).__init__(endog, exog, missing=missing,
+                                       hasconst=hasconst, **kwargs)
+        if self.endog.ndim == 1:
+            # ModelData squeezes a single column
+            self.endog = self.endog[:, None]
+            self.wendog = self.endog
+        self.k_endog = self.endog.shape[1]
+
+    def whiten(self, Y):
+        """
+        MultiOLS model whitener does nothing: returns Y.
+        """
+        return Y
+
+    def loglike(self, params):
+        """
+        The profile log-likelihood function for each response variable.
+
+        Parameters
+        ----------
+        params : array-like
+            k x k_endog array of coefficients.
+
+        Returns
+        -------
+        llf : ndarray
+            The profile (concentrated) log-likelihood of each response
+            variable, profiled over its scale parameter.
+        """
+        nobs2 = self.nobs / 2.0
+        resid = self.endog - np.dot(self.exog, params)
+        ssr = (resid**2).sum(0)
+        llf = -nobs2*np.log(2*np.pi) - nobs2*np.log(ssr / self.nobs) - nobs2
+        return llf
+
+    def fit(self, method="pinv"):
+        """
+        Fit all response variables by least squares.
+
+        Parameters
+        ----------
+        method : str, optional
+            Can be "pinv" or "qr", see `RegressionModel.fit`.  The
+            factorization of the design matrix is computed only once.
+
+        Returns
+        -------
+        results : MultiOLSResults instance
+        """
+        if method == "pinv":
+            if not hasattr(self, 'pinv_wexog'):
+                self.pinv_wexog, singular_values = pinv_extended(self.wexog)
+                self.normalized_cov_params = np.dot(self.pinv_wexog,
+                                                    self.pinv_wexog.T)
+                self.wexog_singular_values = singular_values
+                self.rank = np_matrix_rank(np.diag(singular_values))
+            params = np.dot(self.pinv_wexog, self.wendog)
+        elif method == "qr":
+            if not hasattr(self, 'exog_Q'):
+                Q, R = np.linalg.qr(self.wexog)
+                self.exog_Q, self.exog_R = Q, R
+                self.normalized_cov_params = np.linalg.inv(np.dot(R.T, R))
+                self.wexog_singular_values = np.linalg.svd(R, 0, 0)
+                self.rank = np_matrix_rank(R)
+            params = np.linalg.solve(self.exog_R,
+                                     np.dot(self.exog_Q.T, self.wendog))
+        else:
+            raise ValueError('method has to be "pinv" or "qr"')
+
+        if self._df_model is None:
+            self._df_model = float(self.rank - self.k_constant)
+        if self._df_resid is None:
+            self.df_resid = self.nobs - self.rank
+
+        res = MultiOLSResults(self, params,
+                              normalized_cov_params=self.normalized_cov_params)
+        return MultiOLSResultsWrapper(res)
+
+
 def yule_walker(X, order=1, method="unbiased", df=None, inv=False, demean=True):
     """
     Estimate AR(p) parameters from a sequence X using Yule-Walker equation.
@@ -1094,6 +1487,25 @@ def yule_walker(X, order=1, method="unbiased", df=None, inv=False, demean=True):
         return rho, np.sqrt(sigmasq)
 
 
+class _MinimalCache(resettable_cache):
+    """
+    Results cache that does not keep arrays with one element per observation
+
+    Used by ``fit(store="minimal")``. Attributes like `resid` are recomputed
+    on each access, while statistics derived from them are cached.
+    """
+
+    def __init__(self, nobs, **items):
+        self._nobs = nobs
+        super(_MinimalCache, self).__init__(**items)
+
+    def __setitem__(self, key, value):
+        if (isinstance(value, (np.ndarray, pd.Series, pd.DataFrame)) and
+                value.ndim > 0 and len(value) == self._nobs):
+            return
+        super(_MinimalCache, self).__setitem__(key, value)
+
+
 class RegressionResults(base.LikelihoodModelResults):
     """
     This class summarizes the fit of a linear regression model.
@@ -1148,7 +1560,8 @@ class RegressionResults(base.LikelihoodModelResults):
         The predicted the values for the original (unwhitened) design.
     het_scale
         adjusted squared residuals for heteroscedasticity robust standard
-        errors. Is only available after `HC#_se` or `cov_HC#` is called.
+        errors. Is only available after `HC#_se` or `cov_HC#` is called,
+        and is not stored if the model was fit with ``store="minimal"``.
         See HC#_se for more information.
     history
         Estimation history for iterative estimators
@@ -1234,12 +1647,17 @@ class RegressionResults(base.LikelihoodModelResults):
     _cache = {} # needs to be a class attribute for scale setter?
 
     def __init__(self, model, params, normalized_cov_params=None, scale=1.,
-                       cov_type='nonrobust', cov_kwds=None, use_t=None, **kwargs):
+                       cov_type='nonrobust', cov_kwds=None, use_t=None,
+                       store='full', **kwargs):
         super(RegressionResults, self).__init__(model, params,
                                                 normalized_cov_params,
                                                 scale)
 
-        self._cache = resettable_cache()
+        self._store = store
+        if store == 'minimal':
+            self._cache = _MinimalCache(model.wexog.shape[0])
+        else:
+            self._cache = resettable_cache()
         if hasattr(model, 'wexog_singular_values'):
             self._wexog_singular_values = model.wexog_singular_values
         else:
@@ -1424,7 +1842,7 @@ class RegressionResults(base.LikelihoodModelResults):
         if self._wexog_singular_values is not None:
             eigvals = self._wexog_singular_values ** 2
         else:
-            eigvals = np.linalg.linalg.eigvalsh(np.dot(self.model.wexog.T, self.model.wexog))
+            eigvals = np.linalg.linalg.eigvalsh(_crossprod(self.model.wexog))
         return np.sort(eigvals)[::-1]
 
     @cache_readonly
@@ -1439,19 +1857,40 @@ class RegressionResults(base.LikelihoodModelResults):
 
     #TODO: make these properties reset bse
     def _HCCM(self, scale):
-        H = np.dot(self.model.pinv_wexog,
-            scale[:,None]*self.model.pinv_wexog.T)
+        if hasattr(self.model, 'pinv_wexog'):
+            H = np.dot(self.model.pinv_wexog,
+                scale[:,None]*self.model.pinv_wexog.T)
+        else:
+            # pinv_wexog is not stored, e.g. with store="minimal"
+            wexog = self.model.wexog
+            ncp = self.normalized_cov_params
+            H = chain_dot(ncp, _crossprod(wexog, scale), ncp)
         return H
 
 
+    def _set_het_scale(self, het_scale):
+        # with store="minimal" no nobs-length arrays are kept on the results
+        if getattr(self, '_store', 'full') != 'minimal':
+            self.het_scale = het_scale
+
+
+    def _leverage(self):
+        # diagonal of the hat matrix of wexog
+        wexog = self.model.wexog
+        xc = wexog.dot(self.normalized_cov_params)
+        if sparse.issparse(wexog):
+            return np.asarray(wexog.multiply(xc).sum(1)).ravel()
+        return (xc * wexog).sum(1)
+
     @cache_readonly
     def cov_HC0(self):
         """
         See statsmodels.RegressionResults
         """
 
-        self.het_scale = self.wresid**2
-        cov_HC0 = self._HCCM(self.het_scale)
+        het_scale = self.wresid**2
+        self._set_het_scale(het_scale)
+        cov_HC0 = self._HCCM(het_scale)
         return cov_HC0
 
 
@@ -1461,8 +1900,9 @@ class RegressionResults(base.LikelihoodModelResults):
         See statsmodels.RegressionResults
         """
 
-        self.het_scale = self.nobs/(self.df_resid)*(self.wresid**2)
-        cov_HC1 = self._HCCM(self.het_scale)
+        het_scale = self.nobs/(self.df_resid)*(self.wresid**2)
+        self._set_het_scale(het_scale)
+        cov_HC1 = self._HCCM(het_scale)
         return cov_HC1
 
 
@@ -1472,12 +1912,10 @@ class RegressionResults(base.LikelihoodModelResults):
         See statsmodels.RegressionResults
         """
 
-        # probably could be optimized
-        h = np.diag(chain_dot(self.model.wexog,
-                              self.normalized_cov_params,
-                              self.model.wexog.T))
-        self.het_scale = self.wresid**2/(1-h)
-        cov_HC2 = self._HCCM(self.het_scale)
+        h = self._leverage()
+        het_scale = self.wresid**2/(1-h)
+        self._set_het_scale(het_scale)
+        cov_HC2 = self._HCCM(het_scale)
         return cov_HC2
 
 
@@ -1486,11 +1924,10 @@ class RegressionResults(base.LikelihoodModelResults):
         """
         See statsmodels.RegressionResults
         """
-        h = np.diag(chain_dot(self.model.wexog,
-                              self.normalized_cov_params,
-                              self.model.wexog.T))
-        self.het_scale=(self.wresid/(1-h))**2
-        cov_HC3 = self._HCCM(self.het_scale)
+        h = self._leverage()
+        het_scale = (self.wresid/(1-h))**2
+        self._set_het_scale(het_scale)
+        cov_HC3 = self._HCCM(het_scale)
         return cov_HC3
 
 
@@ -1856,15 +2293,26 @@ class RegressionResults(base.LikelihoodModelResults):
             heteroscedasticity robust covariance
         - 'HAC' and keywords
 
-            - `maxlag` integer (required) : number of lags to use
-            - `kernel` string (optional) : kernel, default is Bartlett
+            - `maxlags` integer (optional) : number of lags to use.  If None
+                  (default), the number of lags is chosen by `lag_selection`.
+            - `lag_selection` string (optional) : 'newey-west' (default) or
+                  'andrews' plug-in for the automatic number of lags, see
+                  `sandwich_covariance.hac_nlags`
+            - `weights_func` callable (optional) : kernel, default is Bartlett
             - `use_correction` bool (optional) : If true, use small sample
                   correction
+            - `chunk_size` int (optional) : If given, the covariance is
+                  accumulated over chunks of observations, see
+                  `sandwich_covariance.S_hac_stream`
 
         - 'cluster' and required keyword `groups`, integer group indicator
 
             - `groups` array_like, integer (required) :
-                  index of clusters or groups
+                  index of clusters or groups.
+                  If 2-dimensional, then each column is a cluster dimension and
+                  the multi-way cluster robust covariance of Cameron,
+                  Gelbach and Miller is used, see
+                  `sandwich_covariance.cov_cluster_multi`.
             - `use_correction` bool (optional) :
                   If True the sandwich covariance is calulated with a small
                   sample correction.
@@ -1940,7 +2388,8 @@ class RegressionResults(base.LikelihoodModelResults):
         else:
             res = self.__class__(self.model, self.params,
                        normalized_cov_params=self.normalized_cov_params,
-                       scale=self.scale)
+                       scale=self.scale,
+                       store=getattr(self, '_store', 'full'))
 
         res.cov_type = cov_type
         # use_t might already be defined by the class, and already set
@@ -1979,19 +2428,35 @@ class RegressionResults(base.LikelihoodModelResults):
             getattr(self, cov_type.upper() + '_se')
             res.cov_params_default = getattr(self, 'cov_' + cov_type.upper())
         elif cov_type == 'HAC':
-            maxlags = kwds['maxlags']   # required?, default in cov_hac_simple
-            res.cov_kwds['maxlags'] = maxlags
+            maxlags = kwds.get('maxlags', None)
             weights_func = kwds.get('weights_func', sw.weights_bartlett)
             res.cov_kwds['weights_func'] = weights_func
             use_correction = kwds.get('use_correction', False)
             res.cov_kwds['use_correction'] = use_correction
+            chunk_size = kwds.get('chunk_size', None)
+            res.cov_kwds['chunk_size'] = chunk_size
+            sandwich = self
+            if maxlags is None:
+                # automatic lag selection, ignores the constant
+                lag_selection = kwds.get('lag_selection', 'newey-west')
+                res.cov_kwds['lag_selection'] = lag_selection
+                sandwich = sw._get_sandwich_arrays(self)
+                weights = np.ones(sandwich[0].shape[1])
+                const_idx = getattr(self.model.data, 'const_idx', None)
+                if const_idx is not None and len(weights) > 1:
+                    weights[const_idx] = 0
+                maxlags = sw.hac_nlags(sandwich[0], method=lag_selection,
+                                       weights_func=weights_func,
+                                       weights=weights)
+            res.cov_kwds['maxlags'] = maxlags
             res.cov_kwds['description'] = ('Standard Errors are heteroscedasticity ' +
                  'and autocorrelation robust (HAC) using %d lags and %s small ' +
                  'sample correction') % (maxlags, ['without', 'with'][use_correction])
 
-            res.cov_params_default = sw.cov_hac_simple(self, nlags=maxlags,
+            res.cov_params_default = sw.cov_hac_simple(sandwich, nlags=maxlags,
                                                  weights_func=weights_func,
-                                                 use_correction=use_correction)
+                                                 use_correction=use_correction,
+                                                 chunk_size=chunk_size)
         elif cov_type == 'cluster':
             #cluster robust standard errors, one- or two-way
             groups = kwds['groups']
@@ -2008,7 +2473,7 @@ class RegressionResults(base.LikelihoodModelResults):
                 if adjust_df:
                     # need to find number of groups
                     # duplicate work
-                    self.n_groups = n_groups = len(np.unique(groups))
+                    self.n_groups = n_groups = sw._group_codes(groups)[1]
                 res.cov_params_default = sw.cov_cluster(self, groups,
                                                  use_correction=use_correction)
 
@@ -2019,16 +2484,15 @@ class RegressionResults(base.LikelihoodModelResults):
                 if adjust_df:
                     # need to find number of groups
                     # duplicate work
-                    n_groups0 = len(np.unique(groups[:,0]))
-                    n_groups1 = len(np.unique(groups[:, 1]))
-                    self.n_groups = (n_groups0, n_groups1)
-                    n_groups = min(n_groups0, n_groups1) # use for adjust_df
-
-                # Note: sw.cov_cluster_2groups has 3 returns
-                res.cov_params_default = sw.cov_cluster_2groups(self, groups,
-                                             use_correction=use_correction)[0]
+                    self.n_groups = tuple(sw._group_codes(groups[:, i])[1]
+                                          for i in range(groups.shape[1]))
+                    n_groups = min(self.n_groups) # use for adjust_df
+
+                # Cameron-Gelbach-Miller for two or more cluster dimensions
+                res.cov_params_default = sw.cov_cluster_multi(self, groups,
+                                             use_correction=use_correction)
             else:
-                raise ValueError('only two groups are supported')
+                raise ValueError('groups need to be 1 or 2 dimensional')
             res.cov_kwds['description'] = ('Standard Errors are robust to' +
                                 'cluster correlation ' + '(' + cov_type + ')')
 
@@ -2589,6 +3053,205 @@ wrap.populate_wrapper(RegressionResultsWrapper,
                       RegressionResults)
 
 
+class MultiOLSResults(base.Results):
+    """
+    Results for several response variables fit by `MultiOLS`.
+
+    Attributes that are defined per response variable are vectorized.
+    Arrays of parameter statistics like `params`, `bse`, `tvalues` and
+    `pvalues` have shape k x k_endog, arrays of observation statistics like
+    `resid` and `fittedvalues` have shape nobs x k_endog, and summary
+    statistics like `rsquared`, `ssr`, `scale` and `llf` have length k_endog.
+
+    The full `OLSResults` for a single response variable is available from
+    `get_results`.
+    """
+
+    def __init__(self, model, params, normalized_cov_params=None):
+        super(MultiOLSResults, self).__init__(model, params)
+        self.normalized_cov_params = normalized_cov_params
+        self.nobs = model.nobs
+        self.df_model = model.df_model
+        self.df_resid = model.df_resid
+        self.k_constant = model.k_constant
+        self._cache = resettable_cache()
+        self._results = {}
+
+    @cache_readonly
+    def fittedvalues(self):
+        return np.dot(self.model.exog, self.params)
+
+    @cache_readonly
+    def resid(self):
+        return self.model.endog - self.fittedvalues
+
+    @cache_readonly
+    def ssr(self):
+        resid = self.resid
+        return np.einsum('ij,ij->j', resid, resid)
+
+    @cache_readonly
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def centered_tss(self):
+        endog = self.model.endog
+        centered = endog - endog.mean(0)
+        return np.einsum('ij,ij->j', centered, centered)
+
+    @cache_readonly
+    def uncentered_tss(self):
+        endog = self.model.endog
+        return np.einsum('ij,ij->j', endog, endog)
+
+    @cache_readonly
+    def ess(self):
+        if self.k_constant:
+            return self.centered_tss - self.ssr
+        else:
+            return self.uncentered_tss - self.ssr
+
+    @cache_readonly
+    def rsquared(self):
+        if self.k_constant:
+            return 1 - self.ssr / self.centered_tss
+        else:
+            return 1 - self.ssr / self.uncentered_tss
+
+    @cache_readonly
+    def rsquared_adj(self):
+        return 1 - (np.divide(self.nobs - self.k_constant, self.df_resid) *
+                    (1 - self.rsquared))
+
+    @cache_readonly
+    def mse_model(self):
+        return self.ess / self.df_model
+
+    @cache_readonly
+    def mse_resid(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def fvalue(self):
+        return self.mse_model / self.mse_resid
+
+    @cache_readonly
+    def f_pvalue(self):
+        return stats.f.sf(self.fvalue, self.df_model, self.df_resid)
+
+    @cache_readonly
+    def bse(self):
+        bse_unscaled = np.sqrt(np.diag(self.normalized_cov_params))
+        return bse_unscaled[:, None] * np.sqrt(self.scale)
+
+    @cache_readonly
+    def tvalues(self):
+        return self.params / self.bse
+
+    @cache_readonly
+    def pvalues(self):
+        return stats.t.sf(np.abs(self.tvalues), self.df_resid) * 2
+
+    @cache_readonly
+    def llf(self):
+        return self.model.loglike(self.params)
+
+    @cache_readonly
+    def aic(self):
+        return -2 * self.llf + 2 * (self.df_model + self.k_constant)
+
+    @cache_readonly
+    def bic(self):
+        return (-2 * self.llf + np.log(self.nobs) * (self.df_model +
+                                                     self.k_constant))
+
+    def conf_int(self, alpha=.05):
+        """
+        Returns the confidence intervals of the fitted parameters.
+
+        Parameters
+        ----------
+        alpha : float, optional
+            The `alpha` level for the confidence interval.
+
+        Returns
+        -------
+        lower, upper : ndarray
+            k x k_endog arrays with the lower and upper confidence limits.
+        """
+        q = stats.t.ppf(1 - alpha / 2., self.df_resid)
+        return self.params - q * self.bse, self.params + q * self.bse
+
+    def get_results(self, idx):
+        """
+        Create the results instance of a single response variable.
+
+        Parameters
+        ----------
+        idx : int or str
+            Column index or name of the response variable.
+
+        Returns
+        -------
+        results : OLSResults instance
+            The results are the same as ``OLS(endog[:, idx], exog).fit()``,
+            but the factorization of exog is shared with the MultiOLS model.
+            Results instances are cached.
+        """
+        model = self.model
+        if not isinstance(idx, (int, np.integer)):
+            idx = model.data.ynames.index(idx)
+        if idx in self._results:
+            return self._results[idx]
+
+        data = model.data
+        if hasattr(data.orig_endog, 'iloc'):
+            endog = data.orig_endog.iloc[:, idx]
+            exog = data.orig_exog
+        else:
+            endog = model.endog[:, idx]
+            exog = model.exog
+        mod = OLS(endog, exog, hasconst=bool(model.k_constant))
+        if hasattr(model, 'pinv_wexog'):
+            for attr in ['pinv_wexog', 'normalized_cov_params',
+                         'wexog_singular_values', 'rank']:
+                setattr(mod, attr, getattr(model, attr))
+            res = mod.fit()
+        else:
+            for attr in ['exog_Q', 'exog_R', 'normalized_cov_params',
+                         'wexog_singular_values', 'rank']:
+                setattr(mod, attr, getattr(model, attr))
+            res = mod.fit(method='qr')
+        self._results[idx] = res
+        return res
+
+
+class MultiOLSResultsWrapper(wrap.ResultsWrapper):
+    _attrs = {
+        'params' : 'columns_eq',
+        'bse' : 'columns_eq',
+        'tvalues' : 'columns_eq',
+        'pvalues' : 'columns_eq',
+        'resid' : 'rows',
+        'fittedvalues' : 'rows',
+        'rsquared' : ('generic_columns', 'ynames'),
+        'rsquared_adj' : ('generic_columns', 'ynames'),
+        'ssr' : ('generic_columns', 'ynames'),
+        'scale' : ('generic_columns', 'ynames'),
+        'fvalue' : ('generic_columns', 'ynames'),
+        'f_pvalue' : ('generic_columns', 'ynames'),
+        'llf' : ('generic_columns', 'ynames'),
+        'aic' : ('generic_columns', 'ynames'),
+        'bic' : ('generic_columns', 'ynames'),
+    }
+    _wrap_attrs = _attrs
+    _wrap_methods = {}
+
+wrap.populate_wrapper(MultiOLSResultsWrapper,
+                      MultiOLSResults)
+
+
 if __name__ == "__main__":
     import statsmodels.api as sm
     data = sm.datasets.longley.load()
@@ -506,6 +506,94 @@ def _smw_logdet(s, A, AtA, BI, di, B_logdet):
     return B_logdet + ld + ld1
 
 
+class _GroupFactors(object):
+    """
+    Solves with the marginal covariance matrices of all groups.
+
+    The marginal covariance matrix of group i is V_i = I + Z_i B Z_i',
+    where Z_i is the augmented random effects design and B holds
+    `cov_re` and `vcomp`, with the scale profiled out.  The products
+    with V_i^{-1} that are needed by `loglike`, `score` and `hessian`
+    are computed once for each parameter value.
+
+    Attributes
+    ----------
+    vi_endex : list of ndarrays
+        V_i^{-1} [exog_i, endog_i] for each group
+    vi_exr : list of ndarrays
+        V_i^{-1} Z_i for each group
+    logdet : ndarray
+        log |V_i| for each group
+    batches : list
+        Tuples (batch, vi_endex, vi_exr) with the stacked solves of the
+        batches of groups of `MixedLM._batches`
+
+    Notes
+    -----
+    The endog column of [exog, endog] holds the residuals of endog from
+    OLS on exog with the coefficients `fe_shift`.  Quadratic forms in the
+    residuals are computed from these, so that they do not cancel if
+    endog has a large mean.
+    """
+
+    def __init__(self, n_groups, k_fe, fe_shift):
+        self.k_fe = k_fe
+        self.fe_shift = fe_shift
+        self.vi_endex = [None] * n_groups
+        self.vi_exr = [None] * n_groups
+        self.logdet = np.zeros(n_groups)
+        self.batches = []
+        # [exog, endog]' V^{-1} [exog, endog], summed over the groups
+        self._cross = np.zeros((k_fe + 1, k_fe + 1))
+
+    def add_batch(self, batch, vi_endex, vi_exr, logdet):
+        group_ix, endex = batch[0], batch[4]
+        for j, k in enumerate(group_ix):
+            self.vi_endex[k] = vi_endex[j]
+            self.vi_exr[k] = vi_exr[j]
+        self.logdet[group_ix] = logdet
+        self.batches.append((batch, vi_endex, vi_exr))
+        self._cross += np.tensordot(endex, vi_endex, axes=([0, 1], [0, 1]))
+
+    def add_group(self, group_ix, endex, vi_endex, vi_exr, logdet):
+        self.vi_endex[group_ix] = vi_endex
+        self.vi_exr[group_ix] = vi_exr
+        self.logdet[group_ix] = logdet
+        self._cross += np.dot(endex.T, vi_endex)
+
+    @property
+    def xtvix(self):
+        return self._cross[:self.k_fe, :self.k_fe]
+
+    @property
+    def xtviy(self):
+        return (self._cross[:self.k_fe, self.k_fe] +
+                np.dot(self.xtvix, self.fe_shift))
+
+    def _resid_coef(self, fe_params):
+        # [exog, endog] times this vector is the residual
+        return np.concatenate((self.fe_shift - np.asarray(fe_params), [1.]))
+
+    def qform(self, fe_params):
+        """
+        resid' V^{-1} resid, summed over the groups
+        """
+        coef = self._resid_coef(fe_params)
+        return np.dot(coef, np.dot(self._cross, coef))
+
+    def xtvir(self, fe_params):
+        """
+        exog' V^{-1} resid, summed over the groups
+        """
+        return np.dot(self._cross[:self.k_fe], self._resid_coef(fe_params))
+
+    def vi_resid(self, vi_endex, fe_params):
+        """
+        V^{-1} resid from V^{-1} [exog, endog] of a group or a batch
+        """
+        return np.dot(vi_endex, self._resid_coef(fe_params))
+
+
 class MixedLM(base.LikelihoodModel):
     """
     An object specifying a linear mixed effects model.  Use the `fit`
@@ -591,6 +679,9 @@ class MixedLM(base.LikelihoodModel):
     >>> result = model.fit()
     """
 
+    # stack the groups of equal size for the covariance solves
+    _batch_groups = True
+
     def __init__(self, endog, exog, groups, exog_re=None,
                  exog_vc=None, use_sqrt=True, missing='none',
                  **kwargs):
@@ -712,6 +803,15 @@ class MixedLM(base.LikelihoodModel):
             a = self._augment_exog(i)
             self._aex_r.append(a)
             self._aex_r2.append(_dot(a.T, a))
+        # OLS estimates of the fixed effects, the covariance solves use the
+        # residuals of endog from these, see _GroupFactors
+        if self.k_fe > 0:
+            self._fe_shift = np.linalg.lstsq(self.exog, self.endog,
+                                             rcond=-1)[0]
+        else:
+            self._fe_shift = np.zeros(0)
+        self._setup_batches()
+        self._factor_cache = None
 
         # Precompute this
         self._lin, self._quad = self._reparam()
@@ -727,6 +827,130 @@ class MixedLM(base.LikelihoodModel):
         self._vc_names = vc_names
 
 
+    def _vc_index(self, group):
+        """
+        The variance component of each variance component column of
+        the augmented random effects design of a group.
+        """
+        ix = [np.repeat(j, self.exog_vc[k][group].shape[1])
+              for j, k in enumerate(self._vc_names)
+              if group in self.exog_vc[k]]
+        if len(ix) == 0:
+            return np.zeros(0, dtype=np.intp)
+        return np.concatenate(ix).astype(np.intp)
+
+
+    def _setup_batches(self):
+        """
+        Stack the data of the groups for the covariance solves.
+
+        Groups with a dense random effects design are collected in
+        batches of groups that have the same number of observations
+        and the same variance component columns, the covariance
+        matrices of a batch are factored together with stacked linear
+        algebra.  The other groups are handled one at a time.
+        """
+        layouts = OrderedDict()
+        self._loop_groups = []
+        for group_ix, group in enumerate(self.group_labels):
+            ex_r = self._aex_r[group_ix]
+            if (not self._batch_groups or sparse.issparse(ex_r) or
+                    ex_r.shape[1] == 0):
+                self._loop_groups.append(group_ix)
+                continue
+            key = (ex_r.shape[0], tuple(self._vc_index(group)))
+            layouts.setdefault(key, []).append(group_ix)
+
+        self._batches = []
+        for (_, vc_ix), group_ix in layouts.items():
+            ex_r = np.array([self._aex_r[k] for k in group_ix])
+            ex2_r = np.array([self._aex_r2[k] for k in group_ix])
+            endex = np.array([self._endex(k) for k in group_ix])
+            self._batches.append((np.array(group_ix, dtype=np.intp),
+                                  np.array(vc_ix, dtype=np.intp),
+                                  ex_r, ex2_r, endex))
+
+
+    def _endex(self, group_ix):
+        """
+        [exog, endog - exog * _fe_shift] of a group.
+        """
+        exog = self.exog_li[group_ix]
+        resid = self.endog_li[group_ix] - np.dot(exog, self._fe_shift)
+        return np.column_stack((exog, resid))
+
+
+    def _get_factors(self, cov_re, vcomp):
+        """
+        Returns the covariance solves of all groups at a parameter value.
+
+        The last result is cached, so that `loglike`, `score` and
+        `hessian`, which the optimizers evaluate at the same parameter
+        value, share the factorizations.
+
+        Parameters
+        ----------
+        cov_re : 2d ndarray
+            The random effects covariance matrix, divided by the scale
+        vcomp : array-like
+            The variance components, divided by the scale
+
+        Returns
+        -------
+        factors : _GroupFactors
+        """
+        cov_re = np.asarray(cov_re, dtype=np.float64)
+        vcomp = np.asarray(vcomp, dtype=np.float64)
+        key = (cov_re.tobytes(), vcomp.tobytes())
+        if self._factor_cache is not None and self._factor_cache[0] == key:
+            return self._factor_cache[1]
+
+        if self.k_re > 0:
+            try:
+                cov_re_inv = np.linalg.inv(cov_re)
+            except np.linalg.LinAlgError:
+                cov_re_inv = None
+            _, cov_re_logdet = np.linalg.slogdet(cov_re)
+        else:
+            cov_re_inv = np.zeros((0, 0))
+            cov_re_logdet = 0
+
+        factors = _GroupFactors(self.n_groups, self.k_fe, self._fe_shift)
+        k_re = self.k_re
+        for batch in self._batches:
+            _, vc_ix, ex_r, ex2_r, endex = batch
+            vc_var = vcomp[vc_ix]
+            qmat = ex2_r.copy()
+            qmat[:, 0:k_re, 0:k_re] += cov_re_inv
+            ix = np.arange(k_re, ex_r.shape[2])
+            qmat[:, ix, ix] += 1 / vc_var
+
+            # SMW identity, stacked over the groups of the batch
+            rhs = np.concatenate((endex, ex_r), axis=2)
+            qrhs = np.linalg.solve(qmat, np.matmul(ex_r.transpose(0, 2, 1),
+                                                   rhs))
+            sol = rhs - np.matmul(ex_r, qrhs)
+            logdet = (cov_re_logdet + np.sum(np.log(vc_var)) +
+                      np.linalg.slogdet(qmat)[1])
+            factors.add_batch(batch, sol[:, :, 0:self.k_fe + 1],
+                              sol[:, :, self.k_fe + 1:], logdet)
+
+        for group_ix in self._loop_groups:
+            group = self.group_labels[group_ix]
+            vc_var = self._expand_vcomp(vcomp, group)
+            ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
+            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
+            cov_aug_logdet = cov_re_logdet + np.sum(np.log(vc_var))
+            logdet = _smw_logdet(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var,
+                                 cov_aug_logdet)
+            endex = self._endex(group_ix)
+            factors.add_group(group_ix, endex, solver(endex), solver(ex_r),
+                              logdet)
+
+        self._factor_cache = (key, factors)
+        return factors
+
+
     def _make_param_names(self, exog_re):
         """
         Returns the full parameter names list, just the exogenous random
@@ -1154,28 +1378,8 @@ class MixedLM(base.LikelihoodModel):
         if self.k_fe == 0:
             return np.array([])
 
-        if self.k_re == 0:
-            cov_re_inv = np.empty((0,0))
-        else:
-            cov_re_inv = np.linalg.inv(cov_re)
-
-        # Cache these quantities that don't change.
-        if not hasattr(self, "_endex_li"):
-            self._endex_li = []
-            for group_ix, _ in enumerate(self.group_labels):
-                mat = np.concatenate((self.exog_li[group_ix], self.endog_li[group_ix][:, None]), axis=1)
-                self._endex_li.append(mat)
-
-        xtxy = 0.
-        for group_ix, group in enumerate(self.group_labels):
-            vc_var = self._expand_vcomp(vcomp, group)
-            exog = self.exog_li[group_ix]
-            ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
-            u = solver(self._endex_li[group_ix])
-            xtxy += np.dot(exog.T, u)
-
-        fe_params = np.linalg.solve(xtxy[:, 0:-1], xtxy[:, -1])
+        factors = self._get_factors(cov_re, vcomp)
+        fe_params = np.linalg.solve(factors.xtvix, factors.xtviy)
 
         return fe_params
 
@@ -1343,14 +1547,10 @@ class MixedLM(base.LikelihoodModel):
                 cov_re_inv = np.linalg.inv(cov_re)
             except np.linalg.LinAlgError:
                 cov_re_inv = None
-            _, cov_re_logdet = np.linalg.slogdet(cov_re)
         else:
             cov_re_inv = np.zeros((0, 0))
-            cov_re_logdet = 0
 
-        # The residuals
-        expval = np.dot(self.exog, fe_params)
-        resid_all = self.endog - expval
+        factors = self._get_factors(cov_re, vcomp)
 
         likeval = 0.
 
@@ -1362,30 +1562,14 @@ class MixedLM(base.LikelihoodModel):
         if (self.fe_pen is not None):
             likeval -= self.fe_pen.func(fe_params)
 
-        xvx, qf = 0., 0.
-        for k, group in enumerate(self.group_labels):
-
-            vc_var = self._expand_vcomp(vcomp, group)
-            cov_aug_logdet = cov_re_logdet + np.sum(np.log(vc_var))
-
-            exog = self.exog_li[k]
-            ex_r, ex2_r = self._aex_r[k], self._aex_r2[k]
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
-
-            resid = resid_all[self.row_indices[group]]
-
-            # Part 1 of the log likelihood (for both ML and REML)
-            ld = _smw_logdet(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var, cov_aug_logdet)
-            likeval -= ld / 2.
+        # Part 1 of the log likelihood (for both ML and REML)
+        likeval -= factors.logdet.sum() / 2.
 
-            # Part 2 of the log likelihood (for both ML and REML)
-            u = solver(resid)
-            qf += np.dot(resid, u)
+        # Part 2 of the log likelihood (for both ML and REML)
+        qf = factors.qform(fe_params)
 
-            # Adjustment for REML
-            if self.reml:
-                mat = solver(exog)
-                xvx += np.dot(exog.T, mat)
+        # Adjustment for REML
+        xvx = factors.xtvix
 
         if self.reml:
             likeval -= (self.n_totobs - self.k_fe) * np.log(qf) / 2.
@@ -1404,7 +1588,7 @@ class MixedLM(base.LikelihoodModel):
         return likeval
 
 
-    def _gen_dV_dPar(self, ex_r, solver, group, max_ix=None):
+    def _gen_dV_dPar(self, ex_r, axr, group, max_ix=None):
         """
         A generator that yields the element-wise derivative of the
         marginal covariance matrix with respect to the random effects
@@ -1412,9 +1596,9 @@ class MixedLM(base.LikelihoodModel):
 
         ex_r : array-like
             The random effects design matrix
-        solver : function
-            A function that given x returns V^{-1}x, where V
-            is the group's marginal covariance matrix.
+        axr : ndarray
+            V^{-1} ex_r, where V is the group's marginal covariance
+            matrix.
         group : scalar
             The group label
         max_ix : integer or None
@@ -1422,8 +1606,6 @@ class MixedLM(base.LikelihoodModel):
             is reached.
         """
 
-        axr = solver(ex_r)
-
         # Regular random effects
         jj = 0
         for j1 in range(self.k_re):
@@ -1436,14 +1618,16 @@ class MixedLM(base.LikelihoodModel):
                 jj += 1
 
         # Variance components
+        ix = self.k_re
         for ky in self._vc_names:
             if group in self.exog_vc[ky]:
                 if max_ix is not None and jj > max_ix:
                     return
                 mat = self.exog_vc[ky][group]
-                axmat = solver(mat)
+                axmat = axr[:, ix:ix + mat.shape[1]]
+                ix += mat.shape[1]
                 yield jj, mat, mat, axmat, axmat, True
-                jj += 1
+            jj += 1
 
 
     def score(self, params, profile_fe=True):
@@ -1541,49 +1725,77 @@ class MixedLM(base.LikelihoodModel):
         if calc_fe and (self.fe_pen is not None):
             score_fe -= self.fe_pen.grad(fe_params)
 
+        factors = self._get_factors(cov_re, vcomp)
+
         # resid' V^{-1} resid, summed over the groups (a scalar)
-        rvir = 0.
+        rvir = factors.qform(fe_params)
 
         # exog' V^{-1} resid, summed over the groups (a k_fe
         # dimensional vector)
-        xtvir = 0.
+        xtvir = factors.xtvir(fe_params)
 
         # exog' V^{_1} exog, summed over the groups (a k_fe x k_fe
         # matrix)
-        xtvix = 0.
+        xtvix = factors.xtvix
 
         # V^{-1} exog' dV/dQ_jj exog V^{-1}, where Q_jj is the jj^th
         # covariance parameter.
         xtax = [0.,] * (self.k_re2 + self.k_vc)
 
-        # Temporary related to the gradient of log |V|
+        # The gradient of log |V|, summed over the groups
         dlv = np.zeros(self.k_re2 + self.k_vc)
 
         # resid' V^{-1} dV/dQ_jj V^{-1} resid (a scalar)
         rvavr = np.zeros(self.k_re2 + self.k_vc)
 
-        for group_ix, group in enumerate(self.group_labels):
+        # The derivatives of V are products of columns of ex_r, the
+        # contributions of a batch of groups are obtained from the
+        # cross products of the columns summed over the groups.
+        for batch, vi_endex, vi_exr in factors.batches:
+            _, vc_ix, ex_r, _, _ = batch
+            vir = factors.vi_resid(vi_endex, fe_params)
+            # ex_r' V^{-1} resid for each group
+            rex = np.matmul(vir[:, None, :], ex_r)[:, 0, :]
+            tmat = np.tensordot(vi_exr, ex_r, axes=([0, 1], [0, 1]))
+            rmat = np.dot(rex.T, rex)
+            if self.reml:
+                xax = np.matmul(vi_endex[:, :, 0:self.k_fe].transpose(0, 2, 1),
+                                ex_r)
 
-            vc_var = self._expand_vcomp(vcomp, group)
+            jj = 0
+            for j1 in range(self.k_re):
+                for j2 in range(j1 + 1):
+                    sym = j1 == j2
+                    dlv[jj] += tmat[j1, j2] + (0 if sym else tmat[j2, j1])
+                    rvavr[jj] += rmat[j1, j2] * (1 if sym else 2)
+                    if self.reml:
+                        ulr = np.dot(xax[:, :, j1].T, xax[:, :, j2])
+                        xtax[jj] += ulr if sym else ulr + ulr.T
+                    jj += 1
 
-            exog = self.exog_li[group_ix]
-            ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
+            for j in range(self.k_vc):
+                ix = self.k_re + np.flatnonzero(vc_ix == j)
+                if len(ix) > 0:
+                    dlv[jj] += tmat[ix, ix].sum()
+                    rvavr[jj] += rmat[ix, ix].sum()
+                    if self.reml:
+                        xtax[jj] += np.tensordot(xax[:, :, ix],
+                                                 xax[:, :, ix],
+                                                 axes=([0, 2], [0, 2]))
+                jj += 1
 
-            # The residuals
-            resid = self.endog_li[group_ix]
-            if self.k_fe > 0:
-                expval = np.dot(exog, fe_params)
-                resid = resid - expval
+        for group_ix in self._loop_groups:
 
-            if self.reml:
-                viexog = solver(exog)
-                xtvix += np.dot(exog.T, viexog)
+            group = self.group_labels[group_ix]
+            ex_r = self._aex_r[group_ix]
+            vi_endex = factors.vi_endex[group_ix]
+            viexog = vi_endex[:, 0:self.k_fe]
 
             # Contributions to the covariance parameter gradient
-            vir = solver(resid)
-            for jj, matl, matr, vsl, vsr, sym in self._gen_dV_dPar(ex_r, solver, group):
-                dlv[jj] = _dotsum(matr, vsl)
+            vir = factors.vi_resid(vi_endex, fe_params)
+            for jj, matl, matr, vsl, vsr, sym in self._gen_dV_dPar(
+                    ex_r, factors.vi_exr[group_ix], group):
+                dlv[jj] += _dotsum(matr, vsl)
                 if not sym:
                     dlv[jj] += _dotsum(matl, vsr)
 
@@ -1602,17 +1814,12 @@ class MixedLM(base.LikelihoodModel):
                     if not sym:
                         xtax[jj] += ulr.T
 
-            # Contribution of log|V| to the covariance parameter
-            # gradient.
-            if self.k_re > 0:
-                score_re -= 0.5 * dlv[0:self.k_re2]
-            if self.k_vc > 0:
-                score_vc -= 0.5 * dlv[self.k_re2:]
-
-            rvir += np.dot(resid, vir)
-
-            if calc_fe:
-                xtvir += np.dot(exog.T, vir)
+        # Contribution of log|V| to the covariance parameter
+        # gradient.
+        if self.k_re > 0:
+            score_re -= 0.5 * dlv[0:self.k_re2]
+        if self.k_vc > 0:
+            score_vc -= 0.5 * dlv[self.k_re2:]
 
         fac = self.n_totobs
         if self.reml:
@@ -1712,10 +1919,7 @@ class MixedLM(base.LikelihoodModel):
         fe_params = params.fe_params
         vcomp = params.vcomp
         cov_re = params.cov_re
-        if self.k_re > 0:
-            cov_re_inv = np.linalg.inv(cov_re)
-        else:
-            cov_re_inv = np.empty((0, 0))
+        factors = self._get_factors(cov_re, vcomp)
 
         # Blocks for the fixed and random effects parameters.
         hess_fe = 0.
@@ -1726,8 +1930,8 @@ class MixedLM(base.LikelihoodModel):
         if self.reml:
             fac -= self.exog.shape[1]
 
-        rvir = 0.
-        xtvix = 0.
+        rvir = factors.qform(fe_params)
+        xtvix = factors.xtvix
         xtax = [0.,] * (self.k_re2 + self.k_vc)
         m = self.k_re2 + self.k_vc
         B = np.zeros(m)
@@ -1735,24 +1939,12 @@ class MixedLM(base.LikelihoodModel):
         F = [[0.] * m for k in range(m)]
         for k, group in enumerate(self.group_labels):
 
-            vc_var = self._expand_vcomp(vcomp, group)
-
-            exog = self.exog_li[k]
-            ex_r, ex2_r = self._aex_r[k], self._aex_r2[k]
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
-
-            # The residuals
-            resid = self.endog_li[k]
-            if self.k_fe > 0:
-                expval = np.dot(exog, fe_params)
-                resid = resid - expval
-
-            viexog = solver(exog)
-            xtvix += np.dot(exog.T, viexog)
-            vir = solver(resid)
-            rvir += np.dot(resid, vir)
+            ex_r = self._aex_r[k]
+            vi_exr = factors.vi_exr[k]
+            viexog = factors.vi_endex[k][:, 0:self.k_fe]
+            vir = factors.vi_resid(factors.vi_endex[k], fe_params)
 
-            for jj1, matl1, matr1, vsl1, vsr1, sym1 in self._gen_dV_dPar(ex_r, solver, group):
+            for jj1, matl1, matr1, vsl1, vsr1, sym1 in self._gen_dV_dPar(ex_r, vi_exr, group):
 
                 ul = _dot(viexog.T, matl1)
                 ur = _dot(matr1.T, vir)
@@ -1779,7 +1971,7 @@ class MixedLM(base.LikelihoodModel):
                 if not sym1:
                     E.append((vsr1, matl1))
 
-                for jj2, matl2, matr2, vsl2, vsr2, sym2 in self._gen_dV_dPar(ex_r, solver, group, jj1):
+                for jj2, matl2, matr2, vsl2, vsr2, sym2 in self._gen_dV_dPar(ex_r, vi_exr, group, jj1):
 
                     re = sum([_multi_dot_three(matr2.T, x[0], x[1].T) for x in E])
                     vt = 2 * _dot(_multi_dot_three(vir[None, :], matl2, re), vir[:, None])
@@ -1858,29 +2050,7 @@ class MixedLM(base.LikelihoodModel):
             The estimated error variance.
         """
 
-        try:
-            cov_re_inv = np.linalg.inv(cov_re)
-        except np.linalg.LinAlgError:
-            cov_re_inv = None
-
-        qf = 0.
-        for group_ix, group in enumerate(self.group_labels):
-
-            vc_var = self._expand_vcomp(vcomp, group)
-
-            exog = self.exog_li[group_ix]
-            ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
-
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
-
-            # The residuals
-            resid = self.endog_li[group_ix]
-            if self.k_fe > 0:
-                expval = np.dot(exog, fe_params)
-                resid = resid - expval
-
-            mat = solver(resid)
-            qf += np.dot(resid, mat)
+        qf = self._get_factors(cov_re, vcomp).qform(fe_params)
 
         if self.reml:
             qf /= (self.n_totobs - self.k_fe)
@@ -2024,6 +2194,8 @@ class MixedLM(base.LikelihoodModel):
         # errors, not for optimization.
         hess = self.hessian(params)
         hess_diag = np.diag(hess)
+        # release the solves of the last parameter value
+        self._factor_cache = None
         if free is not None:
             pcov = np.zeros_like(hess)
             pat = self._freepat.get_packed(use_sqrt=False, has_fe=True)
@@ -3,8 +3,9 @@
 '''
 Quantile regression model
 
-Model parameters are estimated using iterated reweighted least squares. The
-asymptotic covariance matrix estimated using kernel density estimation.
+Model parameters are estimated using iterated reweighted least squares or
+the Frisch-Newton interior point algorithm. The asymptotic covariance matrix
+estimated using kernel density estimation.
 
 Author: Vincent Arel-Bundock
 License: BSD-3
@@ -73,6 +74,11 @@ class QuantReg(RegressionModel):
     * Chamberlain, G. (1994). Quantile regression, censoring, and the structure of wages. In Advances in Econometrics, Vol. 1: Sixth World Congress, ed. C. A. Sims, 171-209. Cambridge: Cambridge University Press.
     * Hall, P., and S. Sheather. (1988). On the distribution of the Studentized quantile. Journal of the Royal Statistical Society, Series B 50: 381-391.
 
+    Interior point algorithm (used by the fit method with
+    method='interior-point' and by fit_many):
+
+    * Portnoy, S. and R. Koenker (1997). The Gaussian hare and the Laplacian tortoise: computability of squared-error versus absolute-error estimators. Statistical Science 12(4): 279-300.
+
     Keywords: Least Absolute Deviation(LAD) Regression, Quantile Regression,
     Regression, Robust Estimation.
     '''
@@ -87,8 +93,8 @@ class QuantReg(RegressionModel):
         return data
 
     def fit(self, q=.5, vcov='robust', kernel='epa', bandwidth='hsheather',
-            max_iter=1000, p_tol=1e-6, **kwargs):
-        '''Solve by Iterative Weighted Least Squares
+            max_iter=1000, p_tol=None, method='irls', **kwargs):
+        '''Solve by Iterative Weighted Least Squares or interior point
 
         Parameters
         ----------
@@ -116,37 +122,124 @@ class QuantReg(RegressionModel):
             - hsheather: Hall-Sheather (1988)
             - bofinger: Bofinger (1975)
             - chamberlain: Chamberlain (1994)
+
+        max_iter : int
+            maximum number of iterations
+        p_tol : float or None
+            convergence tolerance, for IRLS on the change in the parameters,
+            default 1e-6, for the interior point algorithm on the duality
+            gap relative to the objective function, default 1e-10
+        method : string
+
+            - irls : iteratively reweighted least squares
+            - interior-point : Frisch-Newton primal-dual interior point
+              algorithm for the linear program of Portnoy and Koenker (1997).
+              This needs far fewer iterations than IRLS and is the better
+              choice for large nobs. exog needs to have full column rank.
         '''
 
         if q < 0 or q > 1:
             raise Exception('p must be between 0 and 1')
 
-        kern_names = ['biw', 'cos', 'epa', 'gau', 'par']
-        if kernel not in kern_names:
-            raise Exception("kernel must be one of " + ', '.join(kern_names))
-        else:
-            kernel = kernels[kernel]
-
-        if bandwidth == 'hsheather':
-            bandwidth = hall_sheather
-        elif bandwidth == 'bofinger':
-            bandwidth = bofinger
-        elif bandwidth == 'chamberlain':
-            bandwidth = chamberlain
-        else:
-            raise Exception("bandwidth must be in 'hsheather', 'bofinger', 'chamberlain'")
+        kernel, bandwidth = _get_kernel_bandwidth(kernel, bandwidth)
 
         endog = self.endog
         exog = self.exog
-        nobs = self.nobs
         exog_rank = np_matrix_rank(self.exog)
         self.rank = exog_rank
         self.df_model = float(self.rank - self.k_constant)
         self.df_resid = self.nobs - self.rank
+
+        if method == 'irls':
+            if p_tol is None:
+                p_tol = 1e-6
+            beta, n_iter, history = self._fit_irls(q, max_iter, p_tol)
+        elif method == 'interior-point':
+            if exog_rank < exog.shape[1]:
+                raise ValueError("exog does not have full column rank, "
+                                 "use method='irls'")
+            if p_tol is None:
+                p_tol = 1e-10
+            beta, n_iter = _frisch_newton(endog, exog, q, max_iter=max_iter,
+                                          p_tol=p_tol)
+            history = None
+        else:
+            raise ValueError("method must be 'irls' or 'interior-point'")
+
+        return self._make_results(beta, q, vcov, kernel, bandwidth, n_iter,
+                                  history)
+
+    def fit_many(self, q, vcov='robust', kernel='epa', bandwidth='hsheather',
+                 max_iter=1000, p_tol=1e-10):
+        '''Fit the model for several quantiles
+
+        The quantiles are estimated in increasing order with the interior
+        point algorithm.  Each estimate after the first is warm started from
+        the estimate at the adjacent quantile:  observations with large
+        residuals at the previous estimate are aggregated into two pseudo
+        observations, so that the linear program only includes the
+        observations close to the new quantile (preprocessing of Portnoy
+        and Koenker 1997).  The solution is exact, observations whose
+        residual sign is not confirmed are added back and the problem is
+        solved again.
+
+        The cross-product of exog and its inverse that are used for the
+        kernel density based covariance estimate are computed only once.
+
+        Parameters
+        ----------
+        q : array-like
+            quantiles, each between 0 and 1
+        vcov, kernel, bandwidth, max_iter :
+            see fit
+        p_tol : float
+            convergence tolerance for the relative duality gap of the
+            interior point algorithm
+
+        Returns
+        -------
+        results : list
+            list of QuantRegResults instances in the order of `q`
+        '''
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if np.any(q <= 0) or np.any(q >= 1):
+            raise ValueError('quantiles must be strictly between 0 and 1')
+
+        kernel, bandwidth = _get_kernel_bandwidth(kernel, bandwidth)
+
+        endog = self.endog
+        exog = self.exog
+        self.rank = np_matrix_rank(exog)
+        if self.rank < exog.shape[1]:
+            raise ValueError("exog does not have full column rank")
+        self.df_model = float(self.rank - self.k_constant)
+        self.df_resid = self.nobs - self.rank
+
+        xtx = np.dot(exog.T, exog)
+        shared = dict(xtx=xtx, xtxi=pinv(xtx), endog_std=np.std(endog))
+
+        results = [None] * len(q)
+        beta = None
+        for idx in np.argsort(q):
+            qi = q[idx]
+            if beta is None:
+                beta, n_iter = _frisch_newton(endog, exog, qi,
+                                              max_iter=max_iter, p_tol=p_tol)
+            else:
+                beta, n_iter = _frisch_newton_preprocessed(
+                    endog, exog, qi, beta, max_iter=max_iter, p_tol=p_tol)
+            results[idx] = self._make_results(beta, qi, vcov, kernel,
+                                              bandwidth, n_iter, None,
+                                              shared=shared)
+        return results
+
+    def _fit_irls(self, q, max_iter, p_tol):
+        endog = self.endog
+        exog = self.exog
         n_iter = 0
         xstar = exog
 
-        beta = np.ones(exog_rank)
+        beta = np.ones(self.rank)
         # TODO: better start, initial beta is used only for convergence check
 
         # Note the following doesn't work yet,
@@ -192,24 +285,56 @@ class QuantReg(RegressionModel):
             warnings.warn("Maximum number of iterations (" + str(max_iter) + 
                           ") reached.", IterationLimitWarning)
 
+        return beta, n_iter, history
+
+    def _make_results(self, beta, q, vcov, kernel, bandwidth, n_iter,
+                      history, shared=None):
+        """
+        Kernel density based covariance and results instance
+
+        `shared` can hold the precomputed `xtx`, `xtxi` and `endog_std`
+        that do not depend on the quantile.
+        """
+        if shared is None:
+            shared = {}
+        endog = self.endog
+        exog = self.exog
+        nobs = self.nobs
+
         e = endog - np.dot(exog, beta)
         # Greene (2008, p.407) writes that Stata 6 uses this bandwidth:
         # h = 0.9 * np.std(e) / (nobs**0.2)
         # Instead, we calculate bandwidth as in Stata 12
         iqre = stats.scoreatpercentile(e, 75) - stats.scoreatpercentile(e, 25)
         h = bandwidth(nobs, q)
-        h = min(np.std(endog),
+        endog_std = shared.get('endog_std')
+        if endog_std is None:
+            endog_std = np.std(endog)
+        h = min(endog_std,
                 iqre / 1.34) * (norm.ppf(q + h) - norm.ppf(q - h))
 
         fhat0 = 1. / (nobs * h) * np.sum(kernel(e / h))
 
+        xtx = shared.get('xtx')
+        if xtx is None:
+            xtx = np.dot(exog.T, exog)
+        xtxi = shared.get('xtxi')
+        if xtxi is None:
+            xtxi = pinv(xtx)
+
         if vcov == 'robust':
-            d = np.where(e > 0, (q/fhat0)**2, ((1-q)/fhat0)**2)
-            xtxi = pinv(np.dot(exog.T, exog))
-            xtdx = np.dot(exog.T * d[np.newaxis, :], exog)
+            # d takes only two values, use the smaller group of observations
+            d_pos, d_neg = (q/fhat0)**2, ((1-q)/fhat0)**2
+            mask = e > 0
+            if mask.sum() < nobs / 2:
+                ex = exog[mask]
+                xtdx = d_neg * xtx + (d_pos - d_neg) * np.dot(ex.T, ex)
+            else:
+                ex = exog[~mask]
+                xtdx = d_pos * xtx + (d_neg - d_pos) * np.dot(ex.T, ex)
             vcov = chain_dot(xtxi, xtdx, xtxi)
         elif vcov == 'iid':
-            vcov = (1. / fhat0)**2 * q * (1 - q) * pinv(np.dot(exog.T, exog))
+            vcov = (1. / fhat0)**2 * q * (1 - q) * xtxi
         else:
             raise Exception("vcov must be 'robust' or 'iid'")
 
@@ -224,6 +349,185 @@ class QuantReg(RegressionModel):
         return RegressionResultsWrapper(lfit)
 
 
+def _get_kernel_bandwidth(kernel, bandwidth):
+    kern_names = ['biw', 'cos', 'epa', 'gau', 'par']
+    if kernel not in kern_names:
+        raise Exception("kernel must be one of " + ', '.join(kern_names))
+    else:
+        kernel = kernels[kernel]
+
+    if bandwidth == 'hsheather':
+        bandwidth = hall_sheather
+    elif bandwidth == 'bofinger':
+        bandwidth = bofinger
+    elif bandwidth == 'chamberlain':
+        bandwidth = chamberlain
+    else:
+        raise Exception("bandwidth must be in 'hsheather', 'bofinger', 'chamberlain'")
+    return kernel, bandwidth
+
+
+def _step_length(x, dx):
+    # largest step in (0, inf) that keeps x + step * dx nonnegative
+    mask = dx < 0
+    if not mask.any():
+        return np.inf
+    return np.min(-x[mask] / dx[mask])
+
+
+def _solve_normal(a, weights, rhs):
+    # solve (a diag(weights) a') dy = a rhs for the k x k system
+    ata = np.dot(a * weights, a.T)
+    try:
+        return np.linalg.solve(ata, np.dot(a, rhs))
+    except np.linalg.LinAlgError:
+        return np.dot(pinv(ata), np.dot(a, rhs))
+
+
+def _frisch_newton(endog, exog, q, max_iter=1000, p_tol=1e-10):
+    """
+    Quantile regression with the Frisch-Newton interior point algorithm
+
+    Solves the dual linear program
+
+        max endog' a  subject to  exog' a = (1 - q) exog' 1,  0 <= a <= 1
+
+    with the Mehrotra predictor-corrector primal-dual log barrier method.
+    The parameters are minus the Lagrange multipliers of the equality
+    constraint.  This follows `rq.fit.fnb` in the R package quantreg.
+
+    Returns
+    -------
+    params : ndarray
+    n_iter : int
+    """
+    a = exog.T
+    c = -endog
+    nobs = len(endog)
+    x = np.empty(nobs)
+    x.fill(1 - q)
+    b = np.dot(a, x)
+    u = np.ones(nobs)
+    beta = .99995
+
+    s = u - x
+    y = np.linalg.lstsq(a.T, c, rcond=-1)[0]
+    r = c - np.dot(a.T, y)
+    r += 0.001 * (r == 0)
+    z = np.where(r > 0, r, 0.)
+    w = z - r
+    gap = np.dot(c, x) - np.dot(y, b) + np.dot(w, u)
+    n_iter = 0
+    while n_iter < max_iter:
+        if gap <= p_tol * max(1., np.abs(np.dot(c, x))):
+            break
+        n_iter += 1
+
+        # affine scaling step
+        qw = 1 / (z / x + w / s)
+        r = z - w
+        dy = _solve_normal(a, qw, qw * r)
+        dx = qw * (np.dot(a.T, dy) - r)
+        ds = -dx
+        dz = -z * (dx / x + 1)
+        dw = -w * (ds / s + 1)
+        fp = min(beta * min(_step_length(x, dx), _step_length(s, ds)), 1)
+        fd = min(beta * min(_step_length(w, dw), _step_length(z, dz)), 1)
+
+        if min(fp, fd) < 1:
+            # centering and corrector step
+            mu = np.dot(z, x) + np.dot(w, s)
+            g = (np.dot(z + fd * dz, x + fp * dx) +
+                 np.dot(w + fd * dw, s + fp * ds))
+            mu = mu * (g / mu)**3 / (2 * nobs)
+            dxdz = dx * dz
+            dsdw = ds * dw
+            xinv = 1 / x
+            sinv = 1 / s
+            xi = mu * (xinv - sinv)
+            rhs = qw * (r + dxdz - dsdw - xi)
+            dy = _solve_normal(a, qw, rhs)
+            dx = qw * (np.dot(a.T, dy) + xi - r - dxdz + dsdw)
+            ds = -dx
+            dz = mu * xinv - z - xinv * z * dx - dxdz
+            dw = mu * sinv - w - sinv * w * ds - dsdw
+            fp = min(beta * min(_step_length(x, dx), _step_length(s, ds)), 1)
+            fd = min(beta * min(_step_length(w, dw), _step_length(z, dz)), 1)
+
+        x += fp * dx
+        s += fp * ds
+        y += fd * dy
+        w += fd * dw
+        z += fd * dz
+        gap = np.dot(c, x) - np.dot(y, b) + np.dot(w, u)
+
+    if n_iter == max_iter:
+        warnings.warn("Maximum number of iterations (" + str(max_iter) +
+                      ") reached.", IterationLimitWarning)
+
+    return -y, n_iter
+
+
+def _frisch_newton_preprocessed(endog, exog, q, start_params, max_iter=1000,
+                                p_tol=1e-10, m_factor=2.):
+    """
+    Interior point algorithm warm started from a preliminary estimate
+
+    Observations with residuals far from zero at `start_params` are replaced
+    by their sums, one pseudo observation each for residuals above and
+    below the band around the quantile.  If the signs of their residuals
+    at the solution agree with the assumed signs, then the solution is the
+    same as for the full problem.  Otherwise misclassified observations are
+    added back to the band, or the band is widened.
+
+    Returns
+    -------
+    params : ndarray
+    n_iter : int
+        total number of interior point iterations
+    """
+    nobs, k_vars = exog.shape
+    resid = endog - np.dot(exog, start_params)
+    m = int(m_factor * np.sqrt(nobs * k_vars))
+    n_iter = 0
+    for _ in range(10):
+        if 2 * m >= nobs:
+            break
+        idx_q = min(max(int(nobs * q), m), nobs - m - 1)
+        lo, hi = np.partition(resid, [idx_q - m, idx_q + m])[[idx_q - m,
+                                                             idx_q + m]]
+        below = resid < lo
+        above = resid > hi
+        while True:
+            mid = ~(below | above)
+            # the residual of a pseudo observation is the sum of the
+            # residuals, it has the assumed sign if the individual ones have
+            exog_glob = np.vstack((exog[below].sum(0), exog[above].sum(0)))
+            endog_glob = np.array([endog[below].sum(), endog[above].sum()])
+            params, it = _frisch_newton(
+                np.concatenate((endog[mid], endog_glob)),
+                np.vstack((exog[mid], exog_glob)), q, max_iter=max_iter,
+                p_tol=p_tol)
+            n_iter += it
+            resid_new = endog - np.dot(exog, params)
+            wrong_below = below & (resid_new > 0)
+            wrong_above = above & (resid_new < 0)
+            n_wrong = wrong_below.sum() + wrong_above.sum()
+            if n_wrong == 0:
+                return params, n_iter
+            if n_wrong > 0.1 * m:
+                break
+            below &= ~wrong_below
+            above &= ~wrong_above
+        # too many misclassified observations, widen the band
+        resid = resid_new
+        m *= 2
+
+    params, it = _frisch_newton(endog, exog, q, max_iter=max_iter,
+                                p_tol=p_tol)
+    return params, n_iter + it
+
+
 def _parzen(u):
     z = np.where(np.abs(u) <= .5, 4./3 - 8. * u**2 + 8. * np.abs(u)**3,
                  8. * (1 - np.abs(u))**3 / 3.)
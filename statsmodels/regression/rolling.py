@@ -0,0 +1,352 @@
+"""
+Rolling and expanding window least squares
+
+The cross-product matrix of ``[1, exog, endog]`` is updated as observations
+enter and leave the window, so that each window costs O(k**2) operations
+instead of a new fit.  Windows are processed in blocks, the cross-product
+matrix is computed directly at the start of every block, which bounds the
+accumulation of rounding errors, and blocks can be evaluated in parallel.
+"""
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from statsmodels.base.data import handle_data
+from statsmodels.tools.data import _is_using_pandas
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.parallel import parallel_func
+
+__all__ = ['RollingOLS', 'RollingRegressionResults']
+
+
+def _window_moments(z, window, start, stop):
+    """
+    Cross-product matrices of z for the windows ending at start, ..., stop-1
+    """
+    lower = 0 if window is None else max(start - window + 1, 0)
+    zs = z[lower:start + 1]
+    moments = np.empty((stop - start, z.shape[1], z.shape[1]))
+    moments[0] = np.dot(zs.T, zs)
+    if stop - start > 1:
+        z_in = z[start + 1:stop]
+        change = z_in[:, :, None] * z_in[:, None, :]
+        if window is not None:
+            idx_out = np.arange(start + 1, stop) - window
+            keep = idx_out >= 0
+            z_out = z[idx_out[keep]]
+            change[keep] -= z_out[:, :, None] * z_out[:, None, :]
+        moments[1:] = moments[0] + np.cumsum(change, axis=0)
+    return moments
+
+
+def _fit_block(z, window, min_nobs, start, stop):
+    """
+    Estimate the regression for the windows ending at start, ..., stop-1
+
+    The first column of z is the indicator of non-missing rows, the last
+    column is endog.
+    """
+    moments = _window_moments(z, window, start, stop)
+    k = z.shape[1] - 2
+    nblock = stop - start
+    nobs = np.round(moments[:, 0, 0]).astype(int)
+    params = np.empty((nblock, k))
+    normalized_cov = np.empty((nblock, k, k))
+    ssr = np.empty(nblock)
+    tss = np.empty(nblock)
+    params.fill(np.nan)
+    normalized_cov.fill(np.nan)
+    ssr.fill(np.nan)
+    tss.fill(np.nan)
+
+    valid = nobs >= min_nobs
+    if not valid.any():
+        return nobs, params, normalized_cov, ssr, tss, moments[:, 0, -1]
+    mom = moments[valid]
+    xtx = mom[:, 1:-1, 1:-1]
+    xty = mom[:, 1:-1, -1]
+    try:
+        xtx_inv = np.linalg.inv(xtx)
+    except np.linalg.LinAlgError:
+        # some window is singular
+        xtx_inv = np.array([np.linalg.pinv(m) for m in xtx])
+    beta = np.einsum('tij,tj->ti', xtx_inv, xty)
+    params[valid] = beta
+    normalized_cov[valid] = xtx_inv
+    ssr[valid] = np.maximum(mom[:, -1, -1] - (beta * xty).sum(1), 0)
+    tss[valid] = mom[:, -1, -1]
+    return nobs, params, normalized_cov, ssr, tss, moments[:, 0, -1]
+
+
+class RollingOLS(object):
+    """
+    Rolling or expanding window ordinary least squares
+
+    Parameters
+    ----------
+    endog : array-like
+        1d endogenous response variable.
+    exog : array-like
+        A nobs x k array of regressors.  An intercept is not included by
+        default and should be added by the user.
+    window : int or None
+        Number of observations in each window.  If None, then an expanding
+        window is used that starts with the first observation.
+    min_nobs : int or None
+        Minimum number of non-missing observations in a window for the
+        regression to be estimated, results are nan otherwise.  The default
+        is `window` for rolling windows and k + 1 for expanding windows.
+    missing : str
+        'drop' (default) skips rows with missing values, the windows are
+        still defined by the position in the original data and the number
+        of observations per window can differ.  'raise' raises if there are
+        missing values.
+    hasconst : None or bool
+        Indicates whether exog includes a user-supplied constant, see OLS.
+
+    Notes
+    -----
+    Only the k + 2 by k + 2 cross-product matrix of ``[1, exog, endog]`` is
+    kept per window.  If exog contains a constant, then the data are
+    centered at the full-sample means before accumulating, which reduces
+    the loss of precision in the sums of squares, and the estimates are
+    transformed back.
+
+    Examples
+    --------
+    >>> mod = RollingOLS(endog, sm.add_constant(exog), window=60)
+    >>> res = mod.fit()
+    >>> res.params[-5:]
+    """
+
+    def __init__(self, endog, exog, window=None, min_nobs=None,
+                 missing='drop', hasconst=None):
+        if missing not in ['drop', 'raise']:
+            raise ValueError("missing has to be 'drop' or 'raise'")
+        self.data = handle_data(endog, exog, missing='none',
+                                hasconst=hasconst)
+        self.endog = self.data.endog
+        self.exog = self.data.exog
+        if self.endog.ndim != 1:
+            raise ValueError("endog has to be 1d")
+        self.nobs, self.k_exog = self.exog.shape
+        self.k_constant = self.data.k_constant
+
+        if window is not None:
+            window = int(window)
+            if window < 1:
+                raise ValueError("window has to be a positive integer")
+        self.window = window
+        if min_nobs is None:
+            min_nobs = self.k_exog + 1 if window is None else window
+        if min_nobs < self.k_exog:
+            raise ValueError("min_nobs has to be at least the number of "
+                             "regressors")
+        self.min_nobs = int(min_nobs)
+
+        self._valid = np.isfinite(self.endog) & np.isfinite(self.exog).all(1)
+        if missing == 'raise' and not self._valid.all():
+            raise ValueError("endog or exog contain missing values")
+
+    @property
+    def endog_names(self):
+        return self.data.ynames
+
+    @property
+    def exog_names(self):
+        return self.data.xnames
+
+    def _prepare(self):
+        """
+        Data with the row indicator, centered if there is a constant
+        """
+        valid = self._valid
+        exog = np.where(valid[:, None], self.exog, 0.)
+        endog = np.where(valid, self.endog, 0.)
+        const_idx = self.data.const_idx
+        shift_exog = np.zeros(self.k_exog)
+        shift_endog = 0.
+        if const_idx is not None and valid.any():
+            shift_exog = exog[valid].mean(0)
+            shift_exog[const_idx] = 0
+            shift_endog = endog[valid].mean()
+            exog = (exog - shift_exog) * valid[:, None]
+            endog = (endog - shift_endog) * valid
+        z = np.column_stack((valid.astype(np.float64), exog, endog))
+        return z, shift_exog, shift_endog
+
+    def fit(self, block_size=1000, n_jobs=1):
+        """
+        Estimate the regression for all windows
+
+        Parameters
+        ----------
+        block_size : int
+            Number of consecutive windows that are computed from one
+            directly computed cross-product matrix.  Smaller blocks reduce
+            the accumulation of rounding errors and the memory used, which
+            is of order block_size * k**2.
+        n_jobs : int
+            Number of blocks to evaluate in parallel, requires joblib.
+            -1 uses all available cores.
+
+        Returns
+        -------
+        results : RollingRegressionResults
+        """
+        z, shift_exog, shift_endog = self._prepare()
+        nobs, k = self.nobs, self.k_exog
+        bounds = list(range(0, nobs, int(block_size))) + [nobs]
+        blocks = zip(bounds[:-1], bounds[1:])
+        if n_jobs == 1:
+            res = [_fit_block(z, self.window, self.min_nobs, start, stop)
+                   for start, stop in blocks]
+        else:
+            parallel, p_func, n_jobs = parallel_func(_fit_block, n_jobs,
+                                                     verbose=0)
+            res = parallel(p_func(z, self.window, self.min_nobs, start, stop)
+                           for start, stop in blocks)
+
+        nobs_w, params, normalized_cov, ssr, tss, sum_endog = [
+            np.concatenate(arrs) for arrs in zip(*res)]
+
+        const_idx = self.data.const_idx
+        if const_idx is not None:
+            # transform back to uncentered exog and endog
+            const = self.exog[self._valid, const_idx][0] if \
+                self._valid.any() else 1.
+            tmat = np.eye(k)
+            tmat[const_idx] -= shift_exog / const
+            params = params.dot(tmat.T)
+            params[:, const_idx] += shift_endog / const
+            normalized_cov = np.einsum('ij,tjk,lk->til', tmat,
+                                       normalized_cov, tmat)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                tss = tss - sum_endog**2 / nobs_w
+
+        return RollingRegressionResults(self, params, normalized_cov, ssr,
+                                        tss, nobs_w)
+
+
+class RollingRegressionResults(object):
+    """
+    Results of rolling or expanding window regressions
+
+    All attributes are arrays with one row for each window.  The row refers
+    to the window ending at that observation.  Windows with fewer than
+    min_nobs observations are nan.  If the data are pandas objects, then the
+    attributes are Series or DataFrames with the index of the data.
+
+    Attributes
+    ----------
+    params : array
+        nobs x k array of parameter estimates
+    bse : array
+        Standard errors of the parameter estimates
+    nobs : array
+        Number of observations in each window
+    ssr : array
+        Sum of squared residuals
+    mse_resid : array
+        Residual variance, ssr / df_resid
+    rsquared : array
+        R-squared, centered if the model has a constant
+    rsquared_adj : array
+        Adjusted R-squared
+    """
+
+    def __init__(self, model, params, normalized_cov_params, ssr, tss, nobs):
+        self.model = model
+        self.k_constant = model.k_constant
+        self._params = params
+        self._normalized_cov_params = normalized_cov_params
+        self._ssr = ssr
+        self._tss = tss
+        self._nobs = nobs
+        self._use_pandas = _is_using_pandas(model.data.orig_endog,
+                                            model.data.orig_exog)
+
+    def _wrap(self, arr):
+        if not self._use_pandas:
+            return arr
+        index = self.model.data.row_labels
+        if arr.ndim == 1:
+            return pd.Series(arr, index=index)
+        return pd.DataFrame(arr, index=index, columns=self.model.exog_names)
+
+    @cache_readonly
+    def _df_resid(self):
+        return (self._nobs - self.model.k_exog).astype(np.float64)
+
+    @cache_readonly
+    def _mse_resid(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._ssr / self._df_resid
+
+    @cache_readonly
+    def _bse(self):
+        variances = np.diagonal(self._normalized_cov_params, axis1=1, axis2=2)
+        with np.errstate(invalid='ignore'):
+            return np.sqrt(variances * self._mse_resid[:, None])
+
+    @cache_readonly
+    def params(self):
+        return self._wrap(self._params)
+
+    @cache_readonly
+    def bse(self):
+        return self._wrap(self._bse)
+
+    @cache_readonly
+    def tvalues(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._wrap(self._params / self._bse)
+
+    @cache_readonly
+    def pvalues(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tvalues = self._params / self._bse
+            pvalues = stats.t.sf(np.abs(tvalues),
+                                 self._df_resid[:, None]) * 2
+        return self._wrap(pvalues)
+
+    @cache_readonly
+    def nobs(self):
+        return self._wrap(self._nobs)
+
+    @cache_readonly
+    def df_resid(self):
+        return self._wrap(self._df_resid)
+
+    @cache_readonly
+    def ssr(self):
+        return self._wrap(self._ssr)
+
+    @cache_readonly
+    def mse_resid(self):
+        return self._wrap(self._mse_resid)
+
+    @cache_readonly
+    def rsquared(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._wrap(1 - self._ssr / self._tss)
+
+    @cache_readonly
+    def rsquared_adj(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rsquared = 1 - self._ssr / self._tss
+            factor = (self._nobs - self.k_constant) / self._df_resid
+        return self._wrap(1 - factor * (1 - rsquared))
+
+    def cov_params(self):
+        """
+        Covariance matrices of the parameter estimates
+
+        Returns
+        -------
+        cov : ndarray
+            nobs x k x k array
+        """
+        return self._normalized_cov_params * self._mse_resid[:, None, None]
@@ -0,0 +1,625 @@
+"""
+Linear mixed models with crossed or nested variance components
+
+The random effects of all factors are collected in one global sparse
+design matrix Z with one column for each level of each factor, so that
+crossed designs, for example students and schools or users and items, and
+nested designs are handled in the same way and without loops over groups.
+The random effects are independent with a common variance within each
+variance component.
+
+The profiled deviance is evaluated by penalized least squares as in lme4.
+With the relative standard deviations theta of the variance components and
+the diagonal matrix Lambda = diag(theta) expanded to the columns of Z, the
+spherical random effects u solve the sparse system
+
+    (Lambda Z'Z Lambda + I) u = Lambda Z'(y - X beta)
+
+The fixed effects are profiled out by a block elimination, and the scale is
+profiled out in closed form.  Only the sparse factorization of
+Lambda Z'Z Lambda + I, of dimension equal to the total number of random
+effects, is computed for each value of theta, the observations enter only
+through Z'Z, Z'X, Z'y, X'X and X'y, which are computed once.  The
+fill-reducing ordering of the factorization is also computed only once.
+SuperLU is used for the factorization, the matrix is positive definite and
+no pivoting is done, so that it is equivalent to a sparse Cholesky
+factorization.
+
+References
+----------
+Bates, D., Maechler, M., Bolker, B. and Walker, S. (2015). Fitting linear
+mixed-effects models using lme4. Journal of Statistical Software, 67(1).
+
+Bates, D. and DebRoy, S. (2004). Linear mixed models and penalized least
+squares. Journal of Multivariate Analysis, 91(1), 1-17.
+"""
+from __future__ import division
+
+from collections import OrderedDict
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import optimize, sparse
+from scipy.sparse import linalg as splinalg
+from scipy.stats import norm
+
+import statsmodels.base.model as base
+import statsmodels.base.wrapper as wrap
+from statsmodels.formula.formulatools import handle_formula_data
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
+
+__all__ = ['SparseMixedLM', 'SparseMixedLMResults']
+
+# symmetric mode without row pivoting, the diagonal of the positive
+# definite matrices is always an acceptable pivot
+_SPLU_OPTIONS = dict(diag_pivot_thresh=0., options=dict(SymmetricMode=True))
+
+
+def _parse_vc_formula(vc_formula):
+    """
+    Split a variance component formula 'x | a:b' into 'x' and ['a', 'b']
+    """
+    parts = vc_formula.split('|')
+    if len(parts) != 2:
+        raise ValueError("variance component formula '%s' has to be of the "
+                         "form 'covariate | factor'" % vc_formula)
+    covariate = parts[0].strip()
+    factors = [name.strip() for name in parts[1].split(':')]
+    if not covariate or not all(factors):
+        raise ValueError("variance component formula '%s' has to be of the "
+                         "form 'covariate | factor'" % vc_formula)
+    return covariate, factors
+
+
+def _factor_codes(frame):
+    """
+    Integer codes and level labels of the interaction of the columns
+    """
+    if frame.shape[1] == 1:
+        codes, levels = pd.factorize(frame.iloc[:, 0], sort=True)
+        return codes, [str(level) for level in levels]
+    codes = frame.groupby(list(frame.columns), sort=True).ngroup().values
+    first = np.unique(codes, return_index=True)[1]
+    levels = [':'.join(str(val) for val in row)
+              for row in frame.values[first]]
+    return codes, levels
+
+
+class SparseMixedLM(base.LikelihoodModel):
+    """
+    Linear mixed model with independent variance components
+
+    Parameters
+    ----------
+    endog : array-like
+        The dependent variable
+    exog : array-like
+        The design of the fixed effects
+    exog_vc : array-like or scipy sparse matrix
+        The design of the random effects, nobs x q.  Each column belongs
+        to one random effect, usually it is the indicator, or the value of
+        a covariate, for one level of a grouping factor.
+    ident : array-like of int
+        The variance component of each column of `exog_vc`, the labels
+        are 0, ..., k_vc - 1.  All random effects of a variance component
+        have the same variance.
+    vc_names : list of str, optional
+        Names of the variance components
+    exog_vc_names : list of str, optional
+        Names of the columns of `exog_vc`, used as the index of the
+        predicted random effects.
+    missing : str
+        'none' or 'raise', missing values are not dropped.  Use
+        `from_formula` to drop rows with missing values.
+
+    Notes
+    -----
+    The model is
+
+        y = X beta + Z b + e
+
+    where b and e are independent and normally distributed with mean zero,
+    the covariance of e is scale * I and the covariance of b is diagonal
+    with the variance vcomp[ident[j]] for the random effect j.  Random
+    intercepts of crossed and nested factors, and independent random
+    slopes, are variance components of this form.  Correlated random
+    intercepts and slopes within a group are not covered, use `MixedLM`
+    for these models.
+
+    The parameters of the optimization are the relative standard
+    deviations theta = sqrt(vcomp / scale), the fixed effects and the
+    scale are profiled out by penalized least squares.  See the module
+    docstring for details.
+
+    Examples
+    --------
+    Random intercepts for the crossed factors student and item:
+
+    >>> model = SparseMixedLM.from_formula(
+    ...     'score ~ x', {'student': '1 | student', 'item': '1 | item'},
+    ...     data)
+    >>> result = model.fit()
+    """
+
+    def __init__(self, endog, exog, exog_vc, ident, vc_names=None,
+                 exog_vc_names=None, missing='none', **kwargs):
+        if missing not in ('none', 'raise'):
+            raise ValueError("missing has to be 'none' or 'raise', use "
+                             "from_formula to drop missing values")
+        super(SparseMixedLM, self).__init__(endog, exog, missing=missing,
+                                            **kwargs)
+        exog_vc = sparse.csc_matrix(exog_vc, dtype=np.float64)
+        ident = np.asarray(ident, dtype=np.intp)
+        if exog_vc.shape[0] != self.endog.shape[0]:
+            raise ValueError('exog_vc and endog need to have the same '
+                             'number of rows')
+        if ident.shape != (exog_vc.shape[1],):
+            raise ValueError('ident needs one label for each column of '
+                             'exog_vc')
+        k_vc = ident.max() + 1 if ident.size else 0
+        if ident.size and (ident.min() < 0 or
+                           len(np.unique(ident)) != k_vc):
+            raise ValueError('the labels in ident have to be 0, ..., '
+                             'k_vc - 1')
+        if missing == 'raise' and np.isnan(exog_vc.data).any():
+            raise ValueError('exog_vc contains missing values')
+        if vc_names is None:
+            vc_names = ['VC%d' % (k + 1) for k in range(k_vc)]
+        if len(vc_names) != k_vc:
+            raise ValueError('vc_names needs one name for each variance '
+                             'component')
+        if exog_vc_names is None:
+            exog_vc_names = ['Z%d' % (j + 1) for j in range(exog_vc.shape[1])]
+
+        self.exog_vc = exog_vc
+        self.ident = ident
+        self.k_vc = k_vc
+        self.vc_names = list(vc_names)
+        self.exog_vc_names = list(exog_vc_names)
+        self.k_fe = self.exog.shape[1]
+        self.n_totobs = self.endog.shape[0]
+
+        # the cross products are the only quantities of full length
+        endog, exog = self.endog, self.exog
+        # the cross products of endog are formed from its OLS residuals,
+        # otherwise the residual sum of squares from the normal equations
+        # cancels if endog has a large mean, the OLS estimates are added
+        # back to the fixed effects
+        self._fe_shift = np.linalg.lstsq(exog, endog, rcond=-1)[0]
+        resid = endog - np.dot(exog, self._fe_shift)
+        self._ztz = (exog_vc.T * exog_vc).tocsc()
+        self._ztx = np.asarray(exog_vc.T * exog)
+        self._zty = exog_vc.T * resid
+        self._xtx = np.dot(exog.T, exog)
+        self._xty = np.dot(exog.T, resid)
+        self._yty = np.dot(resid, resid)
+        self._order = None
+
+    @classmethod
+    def from_formula(cls, formula, vc_formulas, data, subset=None,
+                     missing='drop', *args, **kwargs):
+        """
+        Create a model from a formula and a dataframe
+
+        Parameters
+        ----------
+        formula : str
+            Patsy formula of the fixed effects
+        vc_formulas : dict-like
+            The variance components, the keys are the names and the values
+            are strings of the form 'covariate | factor'.  The covariate
+            is '1' for random intercepts or the name of a column of `data`
+            for random slopes.  The factor is the name of a column of
+            `data`, or names joined by ':' for the levels of the
+            interaction, which gives nested random effects, for example
+            '1 | school:class'.
+        data : DataFrame
+            The data for the model
+        subset : array-like, optional
+            Indices or boolean mask of the rows of `data` that are used
+        missing : str
+            'drop' (default) drops rows with missing values in any of the
+            variables of the model, 'raise' raises an error.
+
+        Returns
+        -------
+        model : SparseMixedLM instance
+
+        Notes
+        -----
+        The design of the random effects is built directly as a sparse
+        matrix from the integer codes of the factors, the dummy variables
+        are never created.
+        """
+        if subset is not None:
+            data = data.loc[subset]
+        eval_env = kwargs.pop('eval_env', None)
+        if eval_env is None:
+            eval_env = 2
+        elif eval_env == -1:
+            from patsy import EvalEnvironment
+            eval_env = EvalEnvironment({})
+        else:
+            eval_env += 1
+        if missing == 'none':
+            missing = 'raise'
+
+        specs = OrderedDict((name, _parse_vc_formula(vc_formulas[name]))
+                            for name in sorted(vc_formulas))
+        columns = set()
+        for covariate, factors in specs.values():
+            columns.update(factors)
+            if covariate != '1':
+                columns.add(covariate)
+        columns = sorted(columns)
+        notnull = data[columns].notnull().all(axis=1).values
+        if not notnull.all():
+            if missing == 'raise':
+                raise ValueError('the variance components contain missing '
+                                 'values')
+            data = data[notnull]
+
+        (endog, exog), missing_mask, design_info = handle_formula_data(
+            data, None, formula, depth=eval_env, missing=missing)
+        if missing_mask is not None and missing_mask.any():
+            data = data[~missing_mask]
+        nobs = len(endog)
+
+        rows, cols, vals, ident, exog_vc_names = [], [], [], [], []
+        offset = 0
+        for k, (name, (covariate, factors)) in enumerate(specs.items()):
+            codes, levels = _factor_codes(data[factors])
+            rows.append(np.arange(nobs))
+            cols.append(codes + offset)
+            if covariate == '1':
+                vals.append(np.ones(nobs))
+            else:
+                vals.append(np.asarray(data[covariate], dtype=np.float64))
+            ident.append(np.repeat(k, len(levels)))
+            exog_vc_names.extend('%s[%s]' % (name, level)
+                                 for level in levels)
+            offset += len(levels)
+        exog_vc = sparse.csc_matrix((np.concatenate(vals),
+                                     (np.concatenate(rows),
+                                      np.concatenate(cols))),
+                                    shape=(nobs, offset))
+
+        mod = cls(endog, exog, exog_vc, np.concatenate(ident),
+                  vc_names=list(specs.keys()), exog_vc_names=exog_vc_names,
+                  *args, **kwargs)
+        mod.formula = formula
+        mod.vc_formulas = vc_formulas
+        mod.data.frame = data
+        return mod
+
+    def _lambda(self, theta):
+        return np.asarray(theta, dtype=np.float64)[self.ident]
+
+    def _setup_order(self):
+        """
+        Fill-reducing ordering of the random effects, computed once
+
+        The sparsity pattern of Lambda Z'Z Lambda + I does not depend on
+        theta, so that the ordering of Z'Z + I is used for all
+        factorizations, which is the reuse of the symbolic analysis in
+        lme4.  The cross products are stored in the permuted order.
+        """
+        q = self._ztz.shape[0]
+        lu = splinalg.splu(self._ztz + sparse.identity(q, format='csc'),
+                           permc_spec='MMD_AT_PLUS_A', **_SPLU_OPTIONS)
+        order = np.argsort(lu.perm_c)
+        self._ztz_perm = self._ztz[order][:, order].tocsc()
+        self._ztx_perm = self._ztx[order]
+        self._zty_perm = self._zty[order]
+        self._order = order
+
+    def _pls(self, theta):
+        """
+        Penalized least squares solution for the relative standard
+        deviations theta
+
+        Returns a dict with the fixed effects, the spherical random effects,
+        the penalized residual sum of squares and the log determinants of
+        the two blocks of the Cholesky factor.
+        """
+        if self._order is None:
+            self._setup_order()
+        lam = self._lambda(theta)[self._order]
+        q = lam.shape[0]
+        dlam = sparse.diags(lam, 0, format='csc')
+        amat = (dlam * self._ztz_perm * dlam +
+                sparse.identity(q, format='csc'))
+        # amat is symmetric positive definite, so that SuperLU without row
+        # pivoting returns a Cholesky-like factorization, L has unit
+        # diagonal and U = D L'
+        lu = splinalg.splu(amat.tocsc(), permc_spec='NATURAL',
+                           **_SPLU_OPTIONS)
+        diag_u = lu.U.diagonal()
+        if np.any(diag_u <= 0):
+            raise np.linalg.LinAlgError('Lambda Z\'Z Lambda + I is not '
+                                        'positive definite')
+        logdet_a = np.log(diag_u).sum()
+
+        lztx = lam[:, None] * self._ztx_perm
+        lzty = lam * self._zty_perm
+        sol = lu.solve(np.column_stack((lzty, lztx)))
+        sol_y, sol_x = sol[:, 0], sol[:, 1:]
+
+        rxtrx = self._xtx - np.dot(lztx.T, sol_x)
+        cy = self._xty - np.dot(lztx.T, sol_y)
+        fe_params = np.linalg.solve(rxtrx, cy)
+        u = sol_y - np.dot(sol_x, fe_params)
+        # residual sum of squares of the augmented least squares problem
+        # from the normal equations, without a pass over the observations
+        pwrss = self._yty - np.dot(fe_params, self._xty) - np.dot(u, lzty)
+        pwrss = max(pwrss, 0.)
+        fe_params += self._fe_shift
+        logdet_rx = np.linalg.slogdet(rxtrx)[1]
+        u = u[np.argsort(self._order)]
+        return dict(fe_params=fe_params, u=u, pwrss=pwrss,
+                    logdet_a=logdet_a, logdet_rx=logdet_rx, rxtrx=rxtrx)
+
+    def _deviance(self, pls, reml):
+        if reml:
+            df = self.n_totobs - self.k_fe
+            return (pls['logdet_a'] + pls['logdet_rx'] +
+                    df * (1 + np.log(2 * np.pi * pls['pwrss'] / df)))
+        df = self.n_totobs
+        return pls['logdet_a'] + df * (1 + np.log(2 * np.pi *
+                                                  pls['pwrss'] / df))
+
+    def deviance(self, theta, reml=True):
+        """
+        Profiled deviance, minus twice the profile log-likelihood
+
+        Parameters
+        ----------
+        theta : array-like
+            The relative standard deviations of the variance components,
+            sqrt(vcomp / scale)
+        reml : bool
+            If True the REML criterion, otherwise the ML deviance
+
+        Returns
+        -------
+        deviance : float
+        """
+        return self._deviance(self._pls(theta), reml)
+
+    def loglike(self, theta, reml=True):
+        """
+        Profile log-likelihood at the relative standard deviations theta
+
+        The fixed effects and the scale are profiled out, see `deviance`.
+        """
+        return -self.deviance(theta, reml) / 2
+
+    def fit(self, reml=True, start_theta=None, maxiter=500, disp=False):
+        """
+        Fit the model by minimizing the profiled deviance
+
+        Parameters
+        ----------
+        reml : bool
+            If True the REML estimates, otherwise the ML estimates
+        start_theta : array-like, optional
+            Starting values of the relative standard deviations of the
+            variance components, the default is one for all components.
+        maxiter : int
+            Maximum number of iterations of the optimizer
+        disp : bool
+            If True, then the convergence information of the optimizer is
+            printed.
+
+        Returns
+        -------
+        results : SparseMixedLMResults
+
+        Notes
+        -----
+        The deviance is minimized with L-BFGS-B using numerical
+        derivatives with step size 1e-6, smaller steps are dominated by
+        rounding errors if the deviance is flat in theta.  Each
+        evaluation needs one sparse factorization, the cost does not
+        depend on the number of observations.  The deviance is an even
+        function of each component of theta, so that it is minimized
+        without bounds and the absolute values are the estimates.  With
+        the bound theta >= 0 the optimizer can stop at zero, where the
+        gradient of the deviance vanishes, even if it is not the minimum.
+        """
+        if start_theta is None:
+            start_theta = np.ones(self.k_vc)
+        start_theta = np.asarray(start_theta, dtype=np.float64)
+        if start_theta.shape != (self.k_vc,):
+            raise ValueError('start_theta needs one value for each variance '
+                             'component')
+
+        if self.k_vc > 0:
+            opt = optimize.minimize(
+                self.deviance, start_theta, args=(reml,),
+                method='L-BFGS-B', options=dict(maxiter=maxiter, disp=disp,
+                                                eps=1e-6))
+            theta, converged = np.abs(opt.x), opt.success
+            if not converged:
+                warnings.warn('the optimization of the deviance did not '
+                              'converge: %s' % opt.message,
+                              ConvergenceWarning)
+        else:
+            theta, converged, opt = start_theta, True, None
+
+        pls = self._pls(theta)
+        df = self.n_totobs - self.k_fe if reml else self.n_totobs
+        scale = pls['pwrss'] / df
+        results = SparseMixedLMResults(self, pls['fe_params'],
+                                       np.linalg.inv(pls['rxtrx']),
+                                       scale=scale)
+        results.theta = theta
+        results.vcomp = scale * theta ** 2
+        results.reml = reml
+        results.method = 'REML' if reml else 'ML'
+        results.converged = converged
+        results.optim_retvals = opt
+        results.deviance = self._deviance(pls, reml)
+        results.re_unscaled = self._lambda(theta) * pls['u']
+        return SparseMixedLMResultsWrapper(results)
+
+
+class SparseMixedLMResults(base.LikelihoodModelResults):
+    """
+    Results of a linear mixed model with sparse variance components
+
+    Attributes
+    ----------
+    params : ndarray
+        The fixed effects
+    theta : ndarray
+        The relative standard deviations of the variance components,
+        sqrt(vcomp / scale)
+    vcomp : ndarray
+        The estimated variances of the variance components
+    scale : float
+        The estimated residual variance
+    reml : bool
+        Whether the estimates are REML estimates
+    converged : bool
+        Whether the optimization of the deviance converged
+    deviance : float
+        The REML criterion or the ML deviance at the estimates
+    re_unscaled : ndarray
+        The predicted random effects, in the order of the columns of
+        `exog_vc`
+    """
+
+    def __init__(self, model, params, normalized_cov_params, scale):
+        super(SparseMixedLMResults, self).__init__(model, params,
+                                                   normalized_cov_params,
+                                                   scale)
+        self.nobs = model.n_totobs
+        self.k_fe = model.k_fe
+        self.k_vc = model.k_vc
+
+    @cache_readonly
+    def llf(self):
+        return -self.deviance / 2
+
+    @cache_readonly
+    def aic(self):
+        if self.reml:
+            return np.nan
+        df = self.k_fe + self.k_vc + 1
+        return -2 * (self.llf - df)
+
+    @cache_readonly
+    def bic(self):
+        if self.reml:
+            return np.nan
+        df = self.k_fe + self.k_vc + 1
+        return -2 * self.llf + np.log(self.nobs) * df
+
+    @cache_readonly
+    def random_effects(self):
+        """
+        The predicted random effects of each variance component
+
+        Returns
+        -------
+        random_effects : dict
+            Maps the names of the variance components to Series of the
+            conditional means of the random effects, indexed by the names
+            of the columns of `exog_vc`.
+        """
+        names = np.asarray(self.model.exog_vc_names, dtype=object)
+        ident = self.model.ident
+        return OrderedDict((name, pd.Series(self.re_unscaled[ident == k],
+                                            index=names[ident == k]))
+                           for k, name in enumerate(self.model.vc_names))
+
+    @cache_readonly
+    def fittedvalues(self):
+        """
+        The fitted values including the predicted random effects
+        """
+        return (np.dot(self.model.exog, self.params) +
+                self.model.exog_vc * self.re_unscaled)
+
+    @cache_readonly
+    def resid(self):
+        """
+        The residuals conditional on the predicted random effects
+        """
+        return self.model.endog - self.fittedvalues
+
+    def summary(self, yname=None, xname_fe=None, alpha=0.05):
+        """
+        Summarize the mixed model regression results
+
+        Parameters
+        ----------
+        yname : str, optional
+            Default is `y`
+        xname_fe : list of strings, optional
+            Fixed effects covariate names
+        alpha : float
+            significance level for the confidence intervals
+
+        Returns
+        -------
+        smry : Summary instance
+            this holds the summary tables and text, which can be
+            printed or converted to various output formats.
+        """
+        from statsmodels.iolib import summary2
+        smry = summary2.Summary()
+
+        info = OrderedDict()
+        info["Model:"] = "SparseMixedLM"
+        if yname is None:
+            yname = self.model.endog_names
+        info["No. Observations:"] = str(self.nobs)
+        info["No. Random Effects:"] = str(self.model.exog_vc.shape[1])
+        info["Dependent Variable:"] = yname
+        info["Method:"] = self.method
+        info["Scale:"] = self.scale
+        info["Likelihood:"] = self.llf
+        info["Converged:"] = "Yes" if self.converged else "No"
+        smry.add_dict(info)
+        smry.add_title("Mixed Linear Model Regression Results")
+
+        float_fmt = "%.3f"
+
+        sdf = np.nan * np.ones((self.k_fe + self.k_vc, 6))
+        sdf[:self.k_fe, 0] = self.params
+        sdf[:self.k_fe, 1] = self.bse
+        sdf[:self.k_fe, 2] = self.tvalues
+        sdf[:self.k_fe, 3] = self.pvalues
+        qm = -norm.ppf(alpha / 2)
+        sdf[:self.k_fe, 4] = self.params - qm * self.bse
+        sdf[:self.k_fe, 5] = self.params + qm * self.bse
+        sdf[self.k_fe:, 0] = self.vcomp
+
+        if xname_fe is None:
+            xname_fe = self.model.exog_names
+        index = list(xname_fe) + ['%s Var' % name
+                                  for name in self.model.vc_names]
+        sdf = pd.DataFrame(index=index, data=sdf)
+        sdf.columns = ['Coef.', 'Std.Err.', 'z', 'P>|z|',
+                       '[' + str(alpha/2), str(1-alpha/2) + ']']
+        for col in sdf.columns:
+            sdf[col] = [float_fmt % x if np.isfinite(x) else ""
+                        for x in sdf[col]]
+
+        smry.add_df(sdf, align='r')
+
+        return smry
+
+
+class SparseMixedLMResultsWrapper(base.LikelihoodResultsWrapper):
+    _attrs = {}
+    _wrap_attrs = wrap.union_dicts(
+        base.LikelihoodResultsWrapper._wrap_attrs, _attrs)
+    _methods = {}
+    _wrap_methods = wrap.union_dicts(
+        base.LikelihoodResultsWrapper._wrap_methods, _methods)
+wrap.populate_wrapper(SparseMixedLMResultsWrapper, SparseMixedLMResults)
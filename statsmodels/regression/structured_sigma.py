@@ -0,0 +1,396 @@
+"""
+Structured error covariance matrices for GLS
+
+The classes in this module represent an nobs x nobs covariance matrix
+``sigma`` without storing it.  Each of them provides a ``whiten`` method that
+maps the data into a space with identity covariance, and the log-determinant
+of ``sigma`` that is needed for the loglikelihood.  Instances can be used as
+the ``sigma`` argument of :class:`statsmodels.regression.linear_model.GLS`.
+
+Whitening only requires a matrix ``W`` with ``W sigma W' = I``.  For
+the banded, Toeplitz and block-diagonal structure this is the inverse of the
+lower Cholesky factor.  For low-rank plus diagonal ``W`` is the symmetric
+inverse square root, which gives identical parameter estimates, standard
+errors and loglikelihood.
+
+References
+----------
+Brockwell, P.J. and Davis, R.A. (1991). Time Series: Theory and Methods.
+    2nd edition, Springer. Section 5.2 (Durbin-Levinson algorithm).
+Golub, G.H. and Van Loan, C.F. (2013). Matrix Computations. 4th edition,
+    Johns Hopkins University Press. Section 4.3 (banded systems).
+"""
+from __future__ import division
+
+import numpy as np
+from scipy import linalg
+
+__all__ = ['StructuredSigma', 'BandedSigma', 'ToeplitzSigma',
+           'BlockDiagonalSigma', 'LowRankDiagonalSigma']
+
+
+class StructuredSigma(object):
+    """
+    Base class for structured covariance matrices used by GLS.
+
+    Subclasses need to define ``nobs`` and implement ``_whiten``, ``logdet``
+    and ``to_dense``.
+    """
+
+    def whiten(self, x):
+        """
+        Whiten data with the inverse square root of sigma.
+
+        Parameters
+        ----------
+        x : array-like
+            1d or 2d array with nobs rows.
+
+        Returns
+        -------
+        wx : ndarray
+            ``W x`` where ``W sigma W' = I``.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if x.shape[0] != self.nobs:
+            raise ValueError("x has %d rows, but sigma is for %d "
+                             "observations" % (x.shape[0], self.nobs))
+        return self._whiten(x)
+
+    def _whiten(self, x):
+        raise NotImplementedError
+
+    def logdet(self):
+        """
+        Log-determinant of sigma
+        """
+        raise NotImplementedError
+
+    def to_dense(self):
+        """
+        Return sigma as dense nobs x nobs array
+
+        This is intended for checking and for small problems only.
+        """
+        raise NotImplementedError
+
+
+class BandedSigma(StructuredSigma):
+    """
+    Banded covariance matrix
+
+    Parameters
+    ----------
+    bands : array-like
+        2d array of shape (bandwidth + 1, nobs) in lower form, ``bands[0]``
+        is the diagonal and ``bands[i, :nobs - i]`` is the i-th subdiagonal,
+        as used by ``scipy.linalg.cholesky_banded(bands, lower=True)``.
+
+    Notes
+    -----
+    The banded Cholesky factor is computed once.  ``whiten`` solves a banded
+    triangular system, which takes O(nobs * bandwidth) operations per column.
+    """
+
+    def __init__(self, bands):
+        bands = np.atleast_2d(np.asarray(bands, dtype=np.float64))
+        self.bands = bands
+        self.bandwidth = bands.shape[0] - 1
+        self.nobs = bands.shape[1]
+        try:
+            self.chol_bands = linalg.cholesky_banded(bands, lower=True)
+        except np.linalg.LinAlgError:
+            raise ValueError("sigma is not positive definite")
+
+    @classmethod
+    def from_dense(cls, sigma, bandwidth):
+        """
+        Create from the band of a dense covariance matrix
+
+        Elements outside of the band are ignored.
+        """
+        sigma = np.asarray(sigma)
+        nobs = sigma.shape[0]
+        bands = np.zeros((bandwidth + 1, nobs))
+        for i in range(bandwidth + 1):
+            bands[i, :nobs - i] = np.diagonal(sigma, -i)
+        return cls(bands)
+
+    def _whiten(self, x):
+        return linalg.solve_banded((self.bandwidth, 0), self.chol_bands, x)
+
+    def logdet(self):
+        return 2 * np.log(self.chol_bands[0]).sum()
+
+    def to_dense(self):
+        sigma = np.zeros((self.nobs, self.nobs))
+        for i in range(self.bandwidth + 1):
+            idx = np.arange(self.nobs - i)
+            sigma[idx + i, idx] = self.bands[i, :self.nobs - i]
+            sigma[idx, idx + i] = self.bands[i, :self.nobs - i]
+        return sigma
+
+
+class ToeplitzSigma(StructuredSigma):
+    """
+    Toeplitz covariance matrix of a stationary process
+
+    Parameters
+    ----------
+    acov : array-like
+        Autocovariances at lags 0, 1, ..., m.  Autocovariances at lags
+        larger than m are zero.
+    nobs : int
+        Number of observations.
+    order : int or None
+        If None, then whitening uses the full Durbin-Levinson recursion
+        and is exact.  If an integer, then the recursion is stopped after
+        `order` steps and the prediction coefficients are kept fixed for
+        the remaining observations.  This is exact if `acov` are the
+        autocovariances of an AR(order) process.
+
+    Notes
+    -----
+    Whitening uses the one-step prediction errors standardized by their
+    standard deviation, which is the inverse Cholesky factor of sigma
+    applied to the data.  With `order` the cost is O(nobs * order) per
+    column, without it the cost is O(nobs**2), but the nobs x nobs matrix is
+    never formed.  For moving average type covariances that vanish after a
+    few lags `BandedSigma` is cheaper.
+    """
+
+    def __init__(self, acov, nobs, order=None):
+        acov = np.atleast_1d(np.asarray(acov, dtype=np.float64))
+        self.nobs = nobs = int(nobs)
+        self.acov = np.zeros(nobs)
+        m = min(len(acov), nobs)
+        self.acov[:m] = acov[:m]
+        if order is None:
+            order = nobs - 1
+        self.order = min(int(order), nobs - 1)
+
+        # prediction coefficients and variances of the first steps are
+        # stored only if the recursion is truncated
+        if self.order < nobs - 1:
+            steps = list(self._levinson_steps())
+            self._phis = [phi for phi, v in steps]
+            self._variances = np.array([v for phi, v in steps])
+        else:
+            self._phis = None
+            self._variances = None
+
+    @classmethod
+    def from_ar(cls, rho, nobs, scale=1.):
+        """
+        Create the covariance matrix of a stationary AR(p) process
+
+        Parameters
+        ----------
+        rho : array-like
+            Autoregressive coefficients, ``u_t = sum_j rho_j u_{t-j} + e_t``,
+            using the same convention as GLSAR.
+        nobs : int
+            Number of observations.
+        scale : float
+            Variance of the innovations `e_t`.
+
+        Returns
+        -------
+        sigma : ToeplitzSigma
+            Whitening is exact and takes O(nobs * p) operations.
+        """
+        rho = np.atleast_1d(np.asarray(rho, dtype=np.float64))
+        order = len(rho)
+        # solve the Yule-Walker equations for the autocovariances
+        a = np.eye(order + 1)
+        for h in range(order + 1):
+            for j in range(1, order + 1):
+                a[h, abs(h - j)] -= rho[j - 1]
+        rhs = np.zeros(order + 1)
+        rhs[0] = scale
+        acov = np.zeros(max(nobs, order + 1))
+        acov[:order + 1] = np.linalg.solve(a, rhs)
+        if acov[0] <= 0:
+            raise ValueError("AR process is not stationary")
+        # remaining autocovariances follow the AR difference equation
+        for h in range(order + 1, nobs):
+            acov[h] = rho.dot(acov[h - 1:h - order - 1:-1])
+        return cls(acov, nobs, order=order)
+
+    def _levinson_steps(self):
+        """
+        Generator for the Durbin-Levinson recursion
+
+        Yields the prediction coefficients for ``u_t`` given
+        ``u_{t-1}, ..., u_0`` and the prediction error variance, for
+        t = 0, ..., order.
+        """
+        acov = self.acov
+        phi = np.zeros(0)
+        v = acov[0]
+        if v <= 0:
+            raise ValueError("sigma is not positive definite")
+        yield phi, v
+        for t in range(1, self.order + 1):
+            kappa = (acov[t] - phi.dot(acov[t - 1:0:-1])) / v
+            phi = np.concatenate((phi - kappa * phi[::-1], [kappa]))
+            v = v * (1 - kappa**2)
+            if v <= 0:
+                raise ValueError("sigma is not positive definite")
+            yield phi, v
+
+    def _whiten(self, x):
+        wx = np.empty_like(x)
+        if self._phis is None:
+            steps = self._levinson_steps()
+        else:
+            steps = zip(self._phis, self._variances)
+        for t, (phi, v) in enumerate(steps):
+            pred = phi.dot(x[t - 1::-1]) if t > 0 else 0
+            wx[t] = (x[t] - pred) / np.sqrt(v)
+
+        p = self.order
+        if p < self.nobs - 1:
+            # stationary part, prediction from the last p observations
+            resid = x[p + 1:].copy()
+            for j in range(1, p + 1):
+                resid -= phi[j - 1] * x[p + 1 - j:self.nobs - j]
+            wx[p + 1:] = resid / np.sqrt(v)
+        return wx
+
+    def logdet(self):
+        if self._variances is None:
+            variances = np.array([v for phi, v in self._levinson_steps()])
+        else:
+            variances = self._variances
+        n_rest = self.nobs - len(variances)
+        return np.log(variances).sum() + n_rest * np.log(variances[-1])
+
+    def to_dense(self):
+        return linalg.toeplitz(self.acov)
+
+
+class BlockDiagonalSigma(StructuredSigma):
+    """
+    Block-diagonal covariance matrix, e.g. for clustered observations
+
+    Parameters
+    ----------
+    blocks : list of array-like
+        Square covariance matrices of the blocks.
+    groups : array-like or None
+        If None, then the blocks are for consecutive observations in the
+        order of `blocks`.  Otherwise `groups` is a 1d array of group labels
+        and ``blocks[i]`` is the covariance matrix for the observations of
+        the i-th group in sorted order of the labels, with observations
+        ordered as they appear in the data.
+
+    Notes
+    -----
+    The Cholesky factor of each block is computed once.  Whitening costs
+    O(sum_g nobs_g**2) per column, which is linear in nobs for bounded
+    group sizes.
+    """
+
+    def __init__(self, blocks, groups=None):
+        self.blocks = [np.atleast_2d(np.asarray(b, dtype=np.float64))
+                       for b in blocks]
+        sizes = [b.shape[0] for b in self.blocks]
+        self.nobs = sum(sizes)
+
+        if groups is None:
+            bounds = np.cumsum([0] + sizes)
+            self.indices = [slice(bounds[i], bounds[i + 1])
+                            for i in range(len(sizes))]
+        else:
+            groups = np.asarray(groups)
+            labels, group_idx = np.unique(groups, return_inverse=True)
+            if len(labels) != len(self.blocks):
+                raise ValueError("number of groups and blocks differ")
+            sort_idx = np.argsort(group_idx, kind='mergesort')
+            bounds = np.cumsum(np.r_[0, np.bincount(group_idx)])
+            self.indices = [sort_idx[bounds[i]:bounds[i + 1]]
+                            for i in range(len(labels))]
+            if len(groups) != self.nobs or any(
+                    len(idx) != size for idx, size in zip(self.indices, sizes)):
+                raise ValueError("group sizes and block shapes differ")
+
+        try:
+            self.chol_blocks = [np.linalg.cholesky(b) for b in self.blocks]
+        except np.linalg.LinAlgError:
+            raise ValueError("sigma is not positive definite")
+
+    def _whiten(self, x):
+        wx = np.empty_like(x)
+        for idx, chol in zip(self.indices, self.chol_blocks):
+            wx[idx] = linalg.solve_triangular(chol, x[idx], lower=True)
+        return wx
+
+    def logdet(self):
+        return 2 * sum(np.log(np.diag(chol)).sum()
+                       for chol in self.chol_blocks)
+
+    def to_dense(self):
+        sigma = np.zeros((self.nobs, self.nobs))
+        rows = np.arange(self.nobs)
+        for idx, block in zip(self.indices, self.blocks):
+            idx = rows[idx]
+            sigma[np.ix_(idx, idx)] = block
+        return sigma
+
+
+class LowRankDiagonalSigma(StructuredSigma):
+    """
+    Covariance matrix that is diagonal plus low rank, ``D + U U'``
+
+    Parameters
+    ----------
+    diag : array-like
+        1d array with the positive diagonal elements of D.
+    factors : array-like
+        2d array U of shape (nobs, rank).
+
+    Notes
+    -----
+    Let ``A = D^{-1/2} U`` with thin singular value decomposition
+    ``A = Q S V'``.  Whitening uses the symmetric inverse square root
+    ``(I + A A')^{-1/2} D^{-1/2}``, where
+    ``(I + A A')^{-1/2} = I - Q diag(1 - 1 / sqrt(1 + s**2)) Q'``.
+    Whitening costs O(nobs * rank) per column and the log-determinant is
+    ``sum(log(diag)) + sum(log(1 + s**2))``.
+    """
+
+    def __init__(self, diag, factors):
+        self.diag = np.asarray(diag, dtype=np.float64)
+        factors = np.asarray(factors, dtype=np.float64)
+        if factors.ndim == 1:
+            factors = factors[:, None]
+        self.factors = factors
+        self.nobs = len(self.diag)
+        if factors.shape[0] != self.nobs:
+            raise ValueError("diag and factors need the same number of rows")
+        if np.any(self.diag <= 0):
+            raise ValueError("diag has to be positive")
+
+        self._sqrt_diag = np.sqrt(self.diag)
+        q, s, _ = np.linalg.svd(factors / self._sqrt_diag[:, None],
+                                full_matrices=False)
+        self._q = q
+        self._s2 = s**2
+        self._shrink = 1 - 1 / np.sqrt(1 + self._s2)
+
+    def _whiten(self, x):
+        y = x / self._sqrt_diag if x.ndim == 1 else \
+            x / self._sqrt_diag[:, None]
+        qty = self._q.T.dot(y)
+        if qty.ndim == 1:
+            qty *= self._shrink
+        else:
+            qty *= self._shrink[:, None]
+        return y - self._q.dot(qty)
+
+    def logdet(self):
+        return np.log(self.diag).sum() + np.log1p(self._s2).sum()
+
+    def to_dense(self):
+        return np.diag(self.diag) + self.factors.dot(self.factors.T)
@@ -0,0 +1,125 @@
+"""
+Tests for absorbing fixed effects in OLS and WLS
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.regression.absorb import AbsorbedFactors
+from statsmodels.tools.tools import add_constant
+
+
+class CheckAbsorb(object):
+
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(98765)
+        nobs = 500
+        f1 = np.random.randint(0, 40, size=nobs)
+        f2 = np.random.randint(0, 15, size=nobs)
+        exog = np.random.randn(nobs, 2) + 0.1 * f1[:, None]
+        endog = (exog.dot([1., -0.5]) + 0.2 * f1 - 0.3 * f2 +
+                 np.random.randn(nobs))
+        cls.groups = np.random.randint(0, 50, size=nobs)
+        cls.weights = 0.5 + np.random.rand(nobs)
+        cls.endog, cls.exog, cls.f1, cls.f2 = endog, exog, f1, f2
+        cls.setup_results()
+
+    def test_params(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.params, res2.params[:2], rtol=1e-8)
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-7)
+        assert_equal(res1.df_resid, res2.df_resid)
+        assert_allclose(res1.ssr, res2.ssr, rtol=1e-8)
+        assert_allclose(res1.resid, res2.resid, atol=1e-7)
+
+    def test_cluster(self):
+        kwds = {'groups': self.groups, 'use_correction': False}
+        res1 = self.res1.model.fit(cov_type='cluster', cov_kwds=kwds)
+        res2 = self.res2.model.fit(cov_type='cluster', cov_kwds=kwds)
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-7)
+
+    def test_hc1(self):
+        res1 = self.res1.model.fit(cov_type='HC1')
+        res2 = self.res2.model.fit(cov_type='HC1')
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-7)
+
+
+class TestAbsorbOneWay(CheckAbsorb):
+
+    @classmethod
+    def setup_results(cls):
+        dummies = pd.get_dummies(cls.f1).values
+        cls.res1 = OLS(cls.endog, cls.exog, absorb=cls.f1).fit()
+        cls.res2 = OLS(cls.endog, np.column_stack((cls.exog, dummies))).fit()
+
+    def test_rsquared(self):
+        # within rsquared
+        y = self.res1.model.endog
+        assert_allclose(y.dot(y), self.res1.uncentered_tss, rtol=1e-10)
+        assert_allclose(self.res1.rsquared, 1 - self.res2.ssr / y.dot(y),
+                        rtol=1e-8)
+
+
+class TestAbsorbTwoWay(CheckAbsorb):
+
+    @classmethod
+    def setup_results(cls):
+        dummies = np.column_stack((pd.get_dummies(cls.f1).values,
+                                   pd.get_dummies(cls.f2).values[:, 1:]))
+        absorb = pd.DataFrame({'f1': cls.f1, 'f2': cls.f2})
+        cls.res1 = OLS(cls.endog, cls.exog, absorb=absorb).fit()
+        cls.res2 = OLS(cls.endog, np.column_stack((cls.exog, dummies))).fit()
+
+    def test_converged(self):
+        assert_equal(self.res1.model.absorbed.converged, True)
+        assert_equal(self.res1.model.absorbed.n_levels, (40, 15))
+
+
+class TestAbsorbWLS(CheckAbsorb):
+
+    @classmethod
+    def setup_results(cls):
+        dummies = np.column_stack((pd.get_dummies(cls.f1).values,
+                                   pd.get_dummies(cls.f2).values[:, 1:]))
+        cls.res1 = WLS(cls.endog, cls.exog, weights=cls.weights,
+                       absorb=[cls.f1, cls.f2]).fit()
+        cls.res2 = WLS(cls.endog, np.column_stack((cls.exog, dummies)),
+                       weights=cls.weights).fit()
+
+
+def test_df_components():
+    # two factors that split the sample into two unconnected blocks
+    f1 = np.array([0, 0, 1, 1, 2, 2, 3, 3])
+    f2 = np.array(['a', 'b', 'a', 'b', 'c', 'd', 'c', 'c'])
+    absorbed = AbsorbedFactors([f1, f2])
+    dummies = np.column_stack((pd.get_dummies(f1).values,
+                               pd.get_dummies(f2).values))
+    assert_equal(absorbed.df_absorbed, np.linalg.matrix_rank(dummies))
+    x = np.random.randn(8, 2)
+    resid = x - dummies.dot(np.linalg.lstsq(dummies, x)[0])
+    assert_allclose(absorbed.demean(x), resid, atol=1e-9)
+
+
+def test_absorb_missing():
+    np.random.seed(1234)
+    f1 = np.repeat(np.arange(10), 5)
+    exog = np.random.randn(50, 2)
+    endog = exog.sum(1) + f1 + np.random.randn(50)
+    endog[[3, 17]] = np.nan
+    res1 = OLS(endog, exog, absorb=f1, missing='drop').fit()
+    mask = np.isfinite(endog)
+    res2 = OLS(endog[mask], exog[mask], absorb=f1[mask]).fit()
+    assert_allclose(res1.params, res2.params, rtol=1e-10)
+    assert_equal(res1.df_resid, 48 - 2 - 10)
+
+
+def test_absorb_errors():
+    f1 = np.repeat(np.arange(5), 4)
+    exog = np.random.randn(20, 2)
+    endog = np.random.randn(20)
+    assert_raises(ValueError, OLS, endog, add_constant(exog), absorb=f1)
+    assert_raises(ValueError, OLS, endog, exog, absorb=f1[:-1])
+    assert_raises(ValueError, OLS, endog, exog,
+                  absorb=np.where(f1 == 2, np.nan, f1))
@@ -0,0 +1,150 @@
+"""
+Tests for out-of-core least squares with IncrementalLS
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.regression.incremental_ls import IncrementalLS
+
+
+class CheckIncrementalLS(object):
+
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(987125)
+        nobs = 500
+        exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 3)))
+        endog = (exog.sum(1) +
+                 np.random.randn(nobs) * (1 + np.abs(exog[:, 1])))
+        weights = np.random.uniform(0.5, 2, nobs)
+        cls.exog, cls.endog, cls.weights = exog, endog, weights
+        cls.setup_results()
+
+    @classmethod
+    def fit_chunks(cls, chunksize=73, **kwds):
+        mod = IncrementalLS(sandwich=True)
+        nobs = len(cls.endog)
+        for i in range(0, nobs, chunksize):
+            w = cls.weights[i:i + chunksize] if cls.use_weights else None
+            mod.partial_fit(cls.endog[i:i + chunksize],
+                            cls.exog[i:i + chunksize], weights=w)
+        return mod, mod.finalize(**kwds)
+
+    def test_basic(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.params, res2.params, rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        assert_allclose(res1.pvalues, res2.pvalues, rtol=1e-8)
+        assert_equal(res1.nobs, res2.nobs)
+        assert_equal(res1.df_model, res2.df_model)
+        assert_equal(res1.df_resid, res2.df_resid)
+        assert_equal(res1.k_constant, res2.k_constant)
+
+    def test_fit_statistics(self):
+        res1, res2 = self.res1, self.res2
+        for attr in ['ssr', 'scale', 'centered_tss', 'uncentered_tss',
+                     'rsquared', 'rsquared_adj', 'fvalue', 'f_pvalue',
+                     'llf', 'aic', 'bic', 'condition_number']:
+            assert_allclose(getattr(res1, attr), getattr(res2, attr),
+                            rtol=1e-9, err_msg=attr)
+
+    def test_robust(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.cov_HC0, res2.cov_HC0, rtol=1e-9)
+        assert_allclose(res1.HC1_se, res2.HC1_se, rtol=1e-9)
+
+        res1r = res1.get_robustcov_results('HC1')
+        res2r = res2.get_robustcov_results('HC1')
+        assert_allclose(res1r.bse, res2r.bse, rtol=1e-9)
+        assert_allclose(res1r.fvalue, res2r.fvalue, rtol=1e-9)
+
+        _, res1r = self.fit_chunks(cov_type='HC0')
+        assert_equal(res1r.cov_type, 'HC0')
+        assert_allclose(res1r.bse, res2.HC0_se, rtol=1e-9)
+
+    def test_not_available(self):
+        assert_raises(ValueError, getattr, self.res1, 'resid')
+        assert_raises(ValueError, getattr, self.res1, 'HC3_se')
+        assert_raises(ValueError, self.res1.get_robustcov_results, 'HAC',
+                      maxlags=2)
+
+    def test_summary(self):
+        self.res1.summary()
+
+
+class TestIncrementalOLS(CheckIncrementalLS):
+
+    use_weights = False
+
+    @classmethod
+    def setup_results(cls):
+        cls.res2 = OLS(cls.endog, cls.exog).fit()
+        cls.mod1, cls.res1 = cls.fit_chunks()
+
+
+class TestIncrementalWLS(CheckIncrementalLS):
+
+    use_weights = True
+
+    @classmethod
+    def setup_results(cls):
+        cls.res2 = WLS(cls.endog, cls.exog, weights=cls.weights).fit()
+        cls.mod1, cls.res1 = cls.fit_chunks()
+
+
+class TestIncrementalNoConstant(CheckIncrementalLS):
+
+    use_weights = False
+
+    @classmethod
+    def setup_results(cls):
+        cls.exog = cls.exog[:, 1:]
+        cls.res2 = OLS(cls.endog, cls.exog).fit()
+        cls.mod1, cls.res1 = cls.fit_chunks()
+
+
+def test_incremental_pandas():
+    np.random.seed(9876)
+    nobs = 100
+    exog = pd.DataFrame(np.random.randn(nobs, 2), columns=['a', 'b'])
+    exog['const'] = 1.
+    endog = pd.Series(exog.sum(1) + np.random.randn(nobs), name='y')
+    res2 = OLS(endog, exog).fit()
+
+    mod = IncrementalLS()
+    mod.partial_fit(endog[:60], exog[:60])
+    res_partial = mod.finalize()
+    mod.partial_fit(endog[60:], exog[60:])
+    res1 = mod.finalize()
+
+    assert_equal(res1.params.index.tolist(), ['a', 'b', 'const'])
+    assert_allclose(res1.params, res2.params, rtol=1e-10)
+    assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+    # results are not changed by later chunks
+    assert_equal(res_partial.nobs, 60)
+    assert_equal(res_partial.df_resid, 57)
+    assert_equal(res_partial.model.df_resid, 57)
+    assert_equal(res1.model.df_resid, 97)
+    assert_raises(ValueError, res1.get_robustcov_results, 'HC0')
+
+
+def test_zero_weights():
+    np.random.seed(3141)
+    nobs = 120
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = exog.sum(1) + np.random.randn(nobs)
+    weights = np.random.uniform(0.5, 2, nobs)
+    weights[40:60] = 0
+    res2 = WLS(endog, exog, weights=weights).fit()
+
+    mod = IncrementalLS()
+    for i in range(0, nobs, 20):
+        mod.partial_fit(endog[i:i + 20], exog[i:i + 20],
+                        weights=weights[i:i + 20])
+    res1 = mod.finalize()
+    assert_equal(res1.nobs, nobs)
+    assert_allclose(res1.params, res2.params, rtol=1e-10)
+    assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+    assert_equal(res1.df_resid, res2.df_resid)
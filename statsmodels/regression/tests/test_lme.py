@@ -726,6 +726,142 @@ def test_random_effects():
     assert_(isinstance(re[0], pd.Series))
     assert_(len(re[0]) == 2)
 
+
+class LoopMixedLM(MixedLM):
+    # solves the covariance matrices of the groups one at a time
+    _batch_groups = False
+
+
+def test_batched_groups():
+    # unequal group sizes, and a variance component that is missing in
+    # some of the groups
+    np.random.seed(8723)
+    sizes = np.random.randint(3, 6, size=60)
+    groups = np.repeat(np.arange(60), sizes)
+    n = len(groups)
+    exog = np.random.normal(size=(n, 2))
+    exog_re = np.column_stack((np.ones(n), np.random.normal(size=n)))
+    exog_vc = np.random.normal(size=(n, 3))
+    endog = (exog.sum(1) + np.random.normal(size=60)[groups] +
+             exog_vc[:, 0] * np.random.normal(size=60)[groups] +
+             exog_vc[:, 2] * np.random.normal(size=60)[groups] *
+             (groups % 3 > 0) + np.random.normal(size=n))
+    vc = {"a": {}, "b": {}}
+    for i in range(60):
+        ix = np.flatnonzero(groups == i)
+        vc["a"][i] = exog_vc[ix, 0:2]
+        if i % 3 > 0:
+            vc["b"][i] = exog_vc[ix, 2:3]
+
+    model1 = MixedLM(endog, exog, groups, exog_re, exog_vc=vc)
+    model2 = LoopMixedLM(endog, exog, groups, exog_re, exog_vc=vc)
+    assert_equal(len(model1._loop_groups), 0)
+    assert_equal(len(model2._batches), 0)
+    assert_equal(len(model1._batches), 6)
+
+    result1 = model1.fit()
+    result2 = model2.fit()
+    assert_allclose(result1.params, result2.params, rtol=1e-6)
+    assert_allclose(result1.bse, result2.bse, rtol=1e-6)
+
+    for reml in False, True:
+        model1.reml = model2.reml = reml
+        for kr in range(3):
+            cov_re = np.random.normal(size=(2, 2))
+            cov_re = np.dot(cov_re.T, cov_re)
+            params = MixedLMParams.from_components(
+                np.random.normal(size=2), cov_re=cov_re,
+                vcomp=np.random.uniform(0.5, 2, size=2))
+
+            # loglike from the dense marginal covariance matrices
+            if not reml:
+                qf, ld = 0., 0.
+                for i in range(60):
+                    ix = np.flatnonzero(groups == i)
+                    cov = np.eye(len(ix)) + np.dot(
+                        np.dot(exog_re[ix], cov_re), exog_re[ix].T)
+                    cov += params.vcomp[0] * np.dot(vc["a"][i], vc["a"][i].T)
+                    if i in vc["b"]:
+                        cov += params.vcomp[1] * np.dot(vc["b"][i],
+                                                        vc["b"][i].T)
+                    resid = endog[ix] - np.dot(exog[ix], params.fe_params)
+                    qf += np.dot(resid, np.linalg.solve(cov, resid))
+                    ld += np.linalg.slogdet(cov)[1]
+                llf = -(ld + n * np.log(qf) + n * np.log(2 * np.pi) -
+                        n * np.log(n) + n) / 2.
+                assert_allclose(model1.loglike(params, profile_fe=False),
+                                llf, rtol=1e-10)
+
+            for profile_fe in False, True:
+                assert_allclose(model1.loglike(params, profile_fe),
+                                model2.loglike(params, profile_fe),
+                                rtol=1e-10)
+                assert_allclose(model1.score(params, profile_fe),
+                                model2.score(params, profile_fe),
+                                rtol=1e-8, atol=1e-8)
+            assert_allclose(model1.hessian(params), model2.hessian(params),
+                            rtol=1e-8, atol=1e-8)
+
+        # the score of the variance component that is missing in some
+        # groups
+        loglike = loglike_function(model1, profile_fe=True, has_fe=False)
+        params_vec = params.get_packed(has_fe=False, use_sqrt=True)
+        assert_allclose(model1.score(params, profile_fe=True),
+                        -nd.approx_fprime(params_vec, loglike), rtol=1e-3,
+                        atol=1e-2)
+
+
+def test_factor_cache():
+    np.random.seed(3421)
+    groups = np.repeat(np.arange(30), 4)
+    endog = np.random.normal(size=120) + np.random.normal(size=30)[groups]
+    exog = np.ones((120, 1))
+    model = MixedLM(endog, exog, groups)
+    result = model.fit()
+    assert_(model._factor_cache is None)
+    assert_equal(result.converged, True)
+
+    factors = model._get_factors(np.eye(1), [])
+    assert_(model._get_factors(np.eye(1), []) is factors)
+    assert_(model._get_factors(2 * np.eye(1), []) is not factors)
+
+    # loglike, score and the fixed effects share the solves
+    model.loglike(np.r_[0.5])
+    factors = model._factor_cache[1]
+    model.score(np.r_[0.5])
+    assert_(model._factor_cache[1] is factors)
+
+
+def test_location_shift():
+    # a large mean in endog should only shift the intercept
+    np.random.seed(5291)
+    groups = np.repeat(np.arange(200), 5)
+    exog = np.column_stack((np.ones(1000), np.random.normal(size=1000)))
+    endog = (exog[:, 1] + 0.02 * np.random.normal(size=200)[groups] +
+             0.01 * np.random.normal(size=1000))
+
+    for klass in MixedLM, LoopMixedLM:
+        model0 = klass(endog, exog, groups)
+        result0 = model0.fit()
+        model1 = klass(endog + 1e7, exog, groups)
+        result1 = model1.fit()
+
+        cov_re = result0.cov_re_unscaled
+        fe_params = result0.fe_params
+        params0 = MixedLMParams.from_components(fe_params, cov_re=cov_re)
+        params1 = MixedLMParams.from_components(fe_params + [1e7, 0],
+                                                cov_re=cov_re)
+        assert_allclose(model1.loglike(params1, profile_fe=False),
+                        model0.loglike(params0, profile_fe=False),
+                        rtol=1e-8)
+
+        assert_allclose(result1.fe_params - result0.fe_params, [1e7, 0],
+                        rtol=1e-8, atol=1e-6)
+        assert_allclose(result1.cov_re, result0.cov_re, rtol=1e-6)
+        assert_allclose(result1.scale, result0.scale, rtol=1e-6)
+        assert_allclose(result1.llf, result0.llf, rtol=1e-6)
+
+
 if __name__ == "__main__":
 
     import nose
@@ -2,7 +2,8 @@ from unittest import TestCase
 import scipy.stats
 import numpy as np
 import statsmodels.api as sm
-from numpy.testing import assert_allclose, assert_equal, assert_almost_equal
+from numpy.testing import (assert_allclose, assert_equal, assert_almost_equal,
+                           assert_)
 from patsy import dmatrices  # pylint: disable=E0611
 from statsmodels.regression.quantile_regression import QuantReg
 from .results_quantile_regression import (
@@ -113,6 +114,42 @@ def test_fitted_residuals():
     assert_almost_equal(np.array(res.resid), Rquantreg.residuals, 5)
 
 
+def test_fitted_residuals_interior_point():
+    data = sm.datasets.engel.load_pandas().data
+    y, X = dmatrices('foodexp ~ income', data, return_type='dataframe')
+    res = QuantReg(y, X).fit(q=.1, method='interior-point')
+    assert_almost_equal(np.array(res.fittedvalues), Rquantreg.fittedvalues, 5)
+    assert_almost_equal(np.array(res.resid), Rquantreg.residuals, 5)
+    assert_(res.iterations < 30)
+
+
+def test_fit_many():
+    np.random.seed(2345)
+    nobs = 2000
+    exog = sm.add_constant(np.random.randn(nobs, 2))
+    endog = exog.sum(1) + np.random.standard_t(3, size=nobs) * (
+        1 + 0.5 * np.abs(exog[:, 1]))
+    mod = QuantReg(endog, exog)
+    qs = [0.5, 0.1, 0.25, 0.75, 0.9]
+    res_many = mod.fit_many(qs)
+    assert_equal(len(res_many), len(qs))
+    for q, res1 in zip(qs, res_many):
+        res2 = mod.fit(q=q, method='interior-point')
+        assert_equal(res1.q, q)
+        assert_allclose(res1.params, res2.params, rtol=1e-6, atol=1e-8)
+        # signs of the k interpolated residuals are numerical noise, they
+        # change the weights in the robust covariance
+        assert_allclose(res1.bse, res2.bse, rtol=5e-3)
+        assert_allclose(res1.sparsity, res2.sparsity, rtol=1e-5)
+        # IRLS converges to the same solution, up to its tolerance
+        res3 = mod.fit(q=q)
+        assert_allclose(res1.params, res3.params, rtol=1e-2, atol=1e-3)
+
+    res_iid = mod.fit_many(qs[:2], vcov='iid')
+    res2 = mod.fit(q=qs[1], vcov='iid', method='interior-point')
+    assert_allclose(res_iid[1].bse, res2.bse, rtol=1e-5)
+
+
 class TestEpanechnikovHsheatherQ75(TestCase, CheckModelResultsMixin):
     # Vincent Arel-Bundock also spot-checked q=.1
     @classmethod
@@ -123,6 +160,17 @@ class TestEpanechnikovHsheatherQ75(TestCase, CheckModelResultsMixin):
         cls.res2 = epanechnikov_hsheather_q75
 
 
+class TestEpanechnikovHsheatherQ75IP(TestCase, CheckModelResultsMixin):
+    @classmethod
+    def setup_class(cls):
+        data = sm.datasets.engel.load_pandas().data
+        y, X = dmatrices('foodexp ~ income', data, return_type='dataframe')
+        cls.res1 = QuantReg(y, X).fit(q=.75, vcov='iid', kernel='epa',
+                                      bandwidth='hsheather',
+                                      method='interior-point')
+        cls.res2 = epanechnikov_hsheather_q75
+
+
 class TestEpanechnikovBofinger(TestCase, CheckModelResultsMixin):
     @classmethod
     def setup_class(cls):
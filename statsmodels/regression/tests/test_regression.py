@@ -1031,6 +1031,72 @@ class TestRegularizedFit(object):
             result = mod.fit_regularized(L1_wt=L1_wt, alpha=lam, profile_scale=True)
 
 
+    def test_regularized_path(self):
+
+        np.random.seed(8734)
+        n, k = 200, 20
+        exog = np.random.normal(size=(n, k))
+        endog = exog[:, :4].sum(1) + np.random.normal(size=n)
+        model = OLS(endog, exog)
+        alphas = [0.01, 1., 0.1, 0.3, 0.03]
+
+        def objective(params, alpha, L1_wt):
+            ssr = np.sum((endog - np.dot(exog, params))**2) / (2 * n)
+            return ssr + alpha * ((1 - L1_wt) * np.sum(params**2) / 2 +
+                                  L1_wt * np.sum(np.abs(params)))
+
+        for L1_wt in 1, 0.5, 0:
+            path = model.fit_regularized_path(alphas, L1_wt=L1_wt)
+            assert_equal(path.shape, (len(alphas), k))
+            for alpha, params in zip(alphas, path):
+                result = model.fit_regularized(alpha=alpha, L1_wt=L1_wt)
+                # fit_regularized can stop early after dropping a variable
+                assert_allclose(params, result.params, rtol=1e-3,
+                                atol=1e-3)
+                assert_(objective(params, alpha, L1_wt) <=
+                        objective(result.params, alpha, L1_wt) + 1e-12)
+
+            path2 = model.fit_regularized_path(alphas, L1_wt=L1_wt,
+                                               strong_rules=False)
+            assert_allclose(path2, path, rtol=1e-7, atol=1e-9)
+
+        # the lasso solution is sparse for large alpha
+        path = model.fit_regularized_path(alphas, L1_wt=1)
+        assert_((path[0] != 0).sum() > (path[3] != 0).sum())
+        alpha_max = np.max(np.abs(np.dot(exog.T, endog))) / n
+        path = model.fit_regularized_path([1.01 * alpha_max], L1_wt=1)
+        assert_equal(path, 0.)
+
+    def test_regularized_cv(self):
+        from statsmodels.tools.cross_val import KFold
+
+        np.random.seed(2341)
+        n, k = 100, 10
+        exog = np.random.normal(size=(n, k))
+        endog = exog[:, :3].sum(1) + np.random.normal(size=n)
+        model = OLS(endog, exog)
+        alphas = [0.3, 0.1, 0.03, 0.01, 0.003]
+        folds = list(KFold(n, 4, shuffle=True, random_state=3))
+
+        res = model.fit_regularized_cv(alphas, L1_wt=0.5, cv=folds)
+        for i, (train, test) in enumerate(folds):
+            path = OLS(endog[train], exog[train]).fit_regularized_path(
+                alphas, L1_wt=0.5)
+            resid = endog[test][:, None] - np.dot(exog[test], path.T)
+            assert_allclose(res.cv_deviance[i],
+                            (resid**2).sum(0) / test.sum(), rtol=1e-10)
+
+        mean = res.mean_deviance
+        se = res.cv_deviance.std(0, ddof=1) / 2
+        assert_allclose(res.se_deviance, se, rtol=1e-10)
+        i_min = np.argmin(mean)
+        assert_equal(res.alpha_min, alphas[i_min])
+        i_1se = np.flatnonzero(mean <= mean[i_min] + se[i_min]).min()
+        assert_equal(res.alpha_1se, alphas[i_1se])
+        assert_allclose(res.params, model.fit_regularized_path(
+            alphas, L1_wt=0.5)[i_1se], rtol=1e-10)
+
+
 def test_formula_missing_cat():
     # gh-805
 
@@ -1091,6 +1157,188 @@ def test_fvalue_implicit_constant():
     res.summary()
 
 
+class TestMultiOLS(object):
+
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(54321)
+        nobs = 100
+        exog = add_constant(np.random.randn(nobs, 2), prepend=True)
+        endog = np.random.randn(nobs, 4) + exog[:, 1:2]
+        cls.exog, cls.endog = exog, endog
+        from statsmodels.regression.linear_model import MultiOLS
+        cls.res1 = MultiOLS(endog, exog).fit()
+        cls.res2 = [OLS(endog[:, i], exog).fit() for i in range(4)]
+
+    def test_vectorized(self):
+        res1 = self.res1
+        for i, res2 in enumerate(self.res2):
+            for attr in ['params', 'bse', 'tvalues', 'pvalues', 'resid',
+                         'fittedvalues']:
+                assert_allclose(getattr(res1, attr)[..., i],
+                                getattr(res2, attr), rtol=1e-10,
+                                err_msg=attr)
+            for attr in ['ssr', 'scale', 'rsquared', 'rsquared_adj',
+                         'fvalue', 'f_pvalue', 'llf', 'aic', 'bic']:
+                assert_allclose(getattr(res1, attr)[i],
+                                getattr(res2, attr), rtol=1e-10,
+                                err_msg=attr)
+            lower, upper = res1.conf_int()
+            assert_allclose(np.column_stack((lower[:, i], upper[:, i])),
+                            res2.conf_int(), rtol=1e-10)
+
+    def test_get_results(self):
+        for i, res2 in enumerate(self.res2):
+            res1 = self.res1.get_results(i)
+            assert_allclose(res1.params, res2.params, rtol=1e-10)
+            assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+            assert_allclose(res1.HC1_se, res2.HC1_se, rtol=1e-10)
+        assert_(self.res1.get_results(1) is self.res1.get_results(1))
+
+    def test_qr(self):
+        from statsmodels.regression.linear_model import MultiOLS
+        res1 = MultiOLS(self.endog, self.exog).fit(method='qr')
+        assert_allclose(res1.params, self.res1.params, rtol=1e-10)
+        assert_allclose(res1.get_results(2).params, self.res2[2].params,
+                        rtol=1e-10)
+
+    def test_pandas(self):
+        from statsmodels.regression.linear_model import MultiOLS
+        endog = pandas.DataFrame(self.endog, columns=list('abcd'))
+        exog = pandas.DataFrame(self.exog, columns=['const', 'x1', 'x2'])
+        res1 = MultiOLS(endog, exog).fit()
+        assert_equal(res1.params.columns.tolist(), list('abcd'))
+        assert_equal(res1.params.index.tolist(), ['const', 'x1', 'x2'])
+        assert_equal(res1.rsquared.index.tolist(), list('abcd'))
+        assert_allclose(res1.rsquared, self.res1.rsquared, rtol=1e-10)
+        res_c = res1.get_results('c')
+        assert_equal(res_c.model.endog_names, 'c')
+        assert_allclose(res_c.params, self.res2[2].params, rtol=1e-10)
+
+
+class TestLeanFit(object):
+
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(987125)
+        exog = add_constant(np.random.randn(100, 3), prepend=False)
+        endog = exog.sum(1) + np.random.randn(100)
+        cls.mod_args = (endog, exog)
+        cls.res_full = OLS(endog, exog).fit()
+
+    def check_results(self, res1):
+        res2 = self.res_full
+        assert_allclose(res1.params, res2.params, rtol=1e-7)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-7)
+        assert_allclose(res1.resid, res2.resid, rtol=1e-5, atol=1e-5)
+        assert_allclose(res1.rsquared, res2.rsquared, rtol=1e-10)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+        assert_allclose(res1.HC1_se, res2.HC1_se, rtol=1e-7)
+        assert_allclose(res1.HC3_se, res2.HC3_se, rtol=1e-7)
+        assert_allclose(res1.condition_number, res2.condition_number,
+                        rtol=1e-5)
+
+    def test_cholesky(self):
+        res1 = OLS(*self.mod_args).fit(method='cholesky')
+        self.check_results(res1)
+
+    def test_minimal(self):
+        for method in ['pinv', 'qr', 'cholesky']:
+            mod = OLS(*self.mod_args)
+            res1 = mod.fit(method=method, store='minimal')
+            assert_(not hasattr(mod, 'pinv_wexog'))
+            assert_(not hasattr(mod, 'exog_Q'))
+            self.check_results(res1)
+            res1.summary()
+            # nobs-sized arrays are not cached
+            cached = [key for key, value in res1._results._cache.items()
+                      if value is not None]
+            assert_('resid' not in cached)
+            assert_('wresid' not in cached)
+            assert_('ssr' in cached)
+
+            infl1 = res1.get_influence()
+            infl2 = self.res_full.get_influence()
+            assert_allclose(infl1.hat_matrix_diag, infl2.hat_matrix_diag,
+                            rtol=1e-6)
+
+            res1r = res1.get_robustcov_results('HC1')
+            assert_equal(res1r._store, 'minimal')
+            assert_allclose(res1r.bse, self.res_full.HC1_se, rtol=1e-7)
+
+            # the heteroscedasticity scale is not kept on the results
+            for cov_type in ['HC0', 'HC1', 'HC2', 'HC3']:
+                assert_allclose(getattr(res1, cov_type + '_se'),
+                                getattr(self.res_full, cov_type + '_se'),
+                                rtol=1e-7)
+            assert_(not hasattr(res1, 'het_scale'))
+            assert_(not hasattr(res1r, 'het_scale'))
+            assert_(hasattr(self.res_full, 'het_scale'))
+
+    def test_cholesky_singular(self):
+        endog, exog = self.mod_args
+        exog_s = np.column_stack((exog, exog[:, 0]))
+        assert_raises(ValueError, OLS(endog, exog_s).fit, method='cholesky')
+        assert_raises(ValueError, OLS(endog, exog).fit, store='none')
+
+
+class TestSparseExog(object):
+
+    @classmethod
+    def setupClass(cls):
+        from scipy import sparse
+        from statsmodels.tools.grouputils import dummy_sparse
+        np.random.seed(54321)
+        nobs = 200
+        groups = np.random.randint(0, 15, size=nobs)
+        x = np.random.randn(nobs)
+        cls.exog = sparse.hstack((dummy_sparse(groups),
+                                  x[:, None])).tocsr()
+        cls.exog_dense = cls.exog.toarray()
+        cls.endog = 0.1 * groups + x + np.random.randn(nobs)
+        cls.weights = 0.5 + np.random.rand(nobs)
+        cls.groups = groups
+
+    def test_methods(self):
+        res2 = OLS(self.endog, self.exog_dense).fit()
+        for method in ['pinv', 'cholesky', 'lsqr']:
+            res1 = OLS(self.endog, self.exog).fit(method=method)
+            assert_allclose(res1.params, res2.params, rtol=1e-10)
+            assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+            assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+            assert_equal(res1.df_model, res2.df_model)
+            assert_equal(res1.df_resid, res2.df_resid)
+        assert_raises(ValueError, OLS(self.endog, self.exog).fit, method='qr')
+
+    def test_wls(self):
+        res1 = WLS(self.endog, self.exog, weights=self.weights).fit()
+        res2 = WLS(self.endog, self.exog_dense, weights=self.weights).fit()
+        assert_allclose(res1.params, res2.params, rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+        assert_allclose(res1.rsquared, res2.rsquared, rtol=1e-10)
+
+    def test_robust(self):
+        model1 = OLS(self.endog, self.exog)
+        model2 = OLS(self.endog, self.exog_dense)
+        for cov_type in ['HC1', 'HC3']:
+            res1 = model1.fit(cov_type=cov_type)
+            res2 = model2.fit(cov_type=cov_type)
+            assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        kwds = {'groups': self.groups}
+        res1 = model1.fit(cov_type='cluster', cov_kwds=kwds)
+        res2 = model2.fit(cov_type='cluster', cov_kwds=kwds)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+
+    def test_predict(self):
+        res1 = OLS(self.endog, self.exog).fit()
+        res2 = OLS(self.endog, self.exog_dense).fit()
+        assert_allclose(res1.fittedvalues, res2.fittedvalues, rtol=1e-10)
+        assert_allclose(res1.predict(self.exog[:5]),
+                        res2.predict(self.exog_dense[:5]), rtol=1e-10)
+        res1.summary()
+
+
 if __name__=="__main__":
 
     import nose
@@ -10,7 +10,7 @@ import numpy as np
 from scipy import stats
 
 from numpy.testing import (assert_allclose, assert_equal, assert_warns,
-                           assert_raises)
+                           assert_)
 
 
 from statsmodels.regression.linear_model import OLS, WLS
@@ -408,11 +408,30 @@ class TestOLSRobustCluster2Input(CheckOLSRobustCluster, CheckOLSRobustNewMixin):
         self.rtol = 1e-6
         self.rtolh = 1e-10
 
-    def test_too_many_groups(self):
+    def test_3way_identical(self):
+        # inclusion-exclusion over three identical groups is one-way
         long_groups = self.groups.reshape(-1, 1)
         groups3 = np.hstack((long_groups, long_groups, long_groups))
-        assert_raises(ValueError, self.res1.get_robustcov_results,'cluster',
-                      groups=groups3, use_correction=True, use_t=True)
+        res = self.res1.get_robustcov_results('cluster', groups=groups3,
+                                              use_correction=True, use_t=True)
+        res1 = self.res1.get_robustcov_results('cluster', groups=self.groups,
+                                               use_correction=True, use_t=True)
+        assert_allclose(res.cov_params(), res1.cov_params(), rtol=1e-10)
+        assert_equal(res.df_resid_inference, res1.df_resid_inference)
+
+    def test_missing_label(self):
+        # a missing cluster label is treated as one additional group
+        groups = self.groups.astype(np.float64)
+        first = groups == groups[0]
+        groups[first] = np.nan
+        res = self.res1.get_robustcov_results('cluster', groups=groups,
+                                              use_correction=True, use_t=True)
+        groups[first] = groups[~first].max() + 1
+        res1 = self.res1.get_robustcov_results('cluster', groups=groups,
+                                               use_correction=True, use_t=True)
+        assert_(np.isfinite(res.bse).all())
+        assert_allclose(res.cov_params(), res1.cov_params(), rtol=1e-10)
+        assert_equal(res.df_resid_inference, res1.df_resid_inference)
 
     def test_2way_dataframe(self):
         import pandas as pd
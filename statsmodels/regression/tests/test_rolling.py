@@ -0,0 +1,97 @@
+"""
+Tests for rolling and expanding window OLS
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import (assert_allclose, assert_equal, assert_,
+                           assert_raises)
+
+from statsmodels.regression.linear_model import OLS
+from statsmodels.regression.rolling import RollingOLS
+from statsmodels.tools.tools import add_constant
+
+
+class CheckRollingOLS(object):
+
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(54321)
+        nobs = 300
+        # level shifted random walks, as for price histories
+        exog = add_constant(np.random.randn(nobs, 2).cumsum(0) + 100)
+        endog = exog.dot([5, 1, 2]) + np.random.randn(nobs) + 200
+        endog[37] = np.nan
+        cls.endog, cls.exog = endog, exog
+        cls.res1 = RollingOLS(endog, exog, window=cls.window).fit(
+            block_size=64)
+
+    def test_params(self):
+        res1 = self.res1
+        for t in [90, 120, 199, 299]:
+            lower = 0 if self.window is None else t - self.window + 1
+            endog, exog = self.endog[lower:t + 1], self.exog[lower:t + 1]
+            mask = np.isfinite(endog)
+            res2 = OLS(endog[mask], exog[mask]).fit()
+            assert_equal(res1.nobs[t], res2.nobs)
+            assert_allclose(res1.params[t], res2.params, rtol=1e-9)
+            assert_allclose(res1.bse[t], res2.bse, rtol=1e-9)
+            assert_allclose(res1.tvalues[t], res2.tvalues, rtol=1e-9)
+            assert_allclose(res1.pvalues[t], res2.pvalues, rtol=1e-7,
+                            atol=1e-14)
+            assert_allclose(res1.ssr[t], res2.ssr, rtol=1e-9)
+            assert_allclose(res1.mse_resid[t], res2.mse_resid, rtol=1e-9)
+            assert_allclose(res1.rsquared[t], res2.rsquared, rtol=1e-9)
+            assert_allclose(res1.rsquared_adj[t], res2.rsquared_adj,
+                            rtol=1e-9)
+            assert_allclose(res1.cov_params()[t], res2.cov_params(),
+                            rtol=1e-9)
+
+    def test_blocks(self):
+        res2 = RollingOLS(self.endog, self.exog, window=self.window).fit()
+        assert_allclose(self.res1.params, res2.params, rtol=1e-10)
+        assert_allclose(self.res1.bse, res2.bse, rtol=1e-10)
+
+
+class TestRollingOLS(CheckRollingOLS):
+    window = 50
+
+    def test_min_nobs(self):
+        # windows with fewer than window observations are nan
+        assert_(np.isnan(self.res1.params[:49]).all())
+        assert_(np.isnan(self.res1.params[49:87]).all())
+        assert_(np.isfinite(self.res1.params[87:]).all())
+
+        res2 = RollingOLS(self.endog, self.exog, window=50,
+                          min_nobs=10).fit()
+        assert_(np.isnan(res2.params[:9]).all())
+        assert_(np.isfinite(res2.params[9:]).all())
+        assert_allclose(res2.params[87:], self.res1.params[87:], rtol=1e-10)
+
+
+class TestExpandingOLS(CheckRollingOLS):
+    window = None
+
+
+def test_rolling_pandas():
+    np.random.seed(987)
+    index = pd.date_range('2000-01-01', periods=100, freq='D')
+    exog = pd.DataFrame(np.random.randn(100, 2), columns=['a', 'b'],
+                        index=index)
+    endog = pd.Series(exog.sum(1) + np.random.randn(100), name='y')
+    res = RollingOLS(endog, exog, window=20).fit()
+    assert_equal(res.params.columns.tolist(), ['a', 'b'])
+    assert_(res.params.index.equals(index))
+    assert_(res.rsquared.index.equals(index))
+    res2 = OLS(endog.iloc[-20:], exog.iloc[-20:]).fit()
+    assert_allclose(res.params.iloc[-1], res2.params, rtol=1e-10)
+    # no constant, uncentered rsquared
+    assert_allclose(res.rsquared.iloc[-1], res2.rsquared, rtol=1e-10)
+
+
+def test_rolling_errors():
+    endog = np.random.randn(20)
+    exog = add_constant(np.random.randn(20))
+    endog[3] = np.nan
+    assert_raises(ValueError, RollingOLS, endog, exog, 10, missing='raise')
+    assert_raises(ValueError, RollingOLS, endog, exog, 10, min_nobs=1)
+    assert_raises(ValueError, RollingOLS, endog, exog, 0)
@@ -0,0 +1,219 @@
+"""
+Tests for the linear mixed model with sparse variance components
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+from scipy import sparse
+
+from statsmodels.regression.mixed_linear_model import MixedLM
+from statsmodels.regression.sparse_mixed_linear_model import SparseMixedLM
+
+
+def gen_crossed(nobs=400, seed=3142):
+    np.random.seed(seed)
+    g1 = np.random.randint(0, 25, size=nobs)
+    g2 = np.random.randint(0, 6, size=nobs)
+    g3 = np.random.randint(0, 12, size=nobs)
+    x1 = np.random.randn(nobs)
+    x2 = np.random.randn(nobs)
+    endog = (1 + 0.5 * x1 - 0.3 * x2 + 0.8 * np.random.randn(25)[g1] +
+             0.4 * np.random.randn(25 * 6)[g1 * 6 + g2] +
+             0.6 * np.random.randn(12)[g3] +
+             0.3 * x1 * np.random.randn(12)[g3] + np.random.randn(nobs))
+    return pd.DataFrame({'y': endog, 'x1': x1, 'x2': x2, 'g1': g1,
+                         'g2': g2, 'g3': g3})
+
+
+def dense_deviance(model, theta, reml):
+    """
+    Profiled deviance from the dense marginal covariance of endog
+    """
+    endog, exog = model.endog, model.exog
+    nobs, k_fe = exog.shape
+    zmat = model.exog_vc.toarray() * model._lambda(theta)
+    cov = np.eye(nobs) + np.dot(zmat, zmat.T)
+    vinv_x = np.linalg.solve(cov, exog)
+    xvx = np.dot(exog.T, vinv_x)
+    params = np.linalg.solve(xvx, np.dot(vinv_x.T, endog))
+    resid = endog - np.dot(exog, params)
+    rss = np.dot(resid, np.linalg.solve(cov, resid))
+    dev = np.linalg.slogdet(cov)[1]
+    df = nobs
+    if reml:
+        dev += np.linalg.slogdet(xvx)[1]
+        df -= k_fe
+    dev += df * (1 + np.log(2 * np.pi * rss / df))
+    # random effects predicted at theta, scaled like re_unscaled
+    re = model._lambda(theta) * np.dot(zmat.T, np.linalg.solve(cov, resid))
+    return dev, params, re
+
+
+class TestCompareMixedLM(object):
+    # nested random intercepts are variance components within the groups
+    # of MixedLM
+
+    @classmethod
+    def setupClass(cls):
+        cls.data = gen_crossed()
+
+    def check(self, reml):
+        data = self.data
+        vcf = {'g1': '1 | g1', 'g2': '1 | g1:g2'}
+        mod1 = SparseMixedLM.from_formula('y ~ x1 + x2', vcf, data)
+        res1 = mod1.fit(reml=reml)
+        mod2 = MixedLM.from_formula('y ~ x1 + x2', data, groups='g1',
+                                    re_formula='1',
+                                    vc_formula={'g2': '0 + C(g2)'})
+        res2 = mod2.fit(reml=reml)
+
+        assert_allclose(res1.params, res2.fe_params, rtol=1e-4)
+        # MixedLM inverts the joint Hessian of all parameters, the
+        # standard errors of SparseMixedLM are from the GLS covariance
+        assert_allclose(res1.bse, res2.bse_fe, rtol=1e-2)
+        assert_allclose(res1.scale, res2.scale, rtol=1e-3)
+        assert_allclose(res1.vcomp, [res2.cov_re.iloc[0, 0], res2.vcomp[0]],
+                        rtol=1e-3)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-8)
+        assert_equal(res1.method, 'REML' if reml else 'ML')
+        assert_equal(res1.converged, True)
+        if reml:
+            assert_equal(np.isnan(res1.aic), True)
+        else:
+            assert_allclose(res1.aic, -2 * res1.llf + 12)
+
+        re2 = res2.random_effects
+        re1 = res1.random_effects['g1']
+        assert_equal(len(re1), 25)
+        assert_allclose(re1.values, [re2[key].iloc[0] for key in sorted(re2)],
+                        rtol=1e-3, atol=1e-4)
+        assert_equal(re1.index[0], 'g1[0]')
+        assert_equal(res1.random_effects['g2'].index[0], 'g2[0:0]')
+
+    def test_reml(self):
+        self.check(True)
+
+    def test_ml(self):
+        self.check(False)
+
+
+class TestCrossed(object):
+
+    @classmethod
+    def setupClass(cls):
+        cls.data = gen_crossed()
+        vcf = {'g1': '1 | g1', 'g3': '1 | g3', 'x1': 'x1 | g3'}
+        cls.model = SparseMixedLM.from_formula('y ~ x1 + x2', vcf, cls.data)
+        cls.res = cls.model.fit()
+
+    def test_design(self):
+        model = self.model
+        assert_equal(model.vc_names, ['g1', 'g3', 'x1'])
+        assert_equal(model.exog_vc.shape, (400, 25 + 12 + 12))
+        assert_equal(np.bincount(model.ident), [25, 12, 12])
+        zmat = model.exog_vc.toarray()
+        assert_equal(zmat[np.arange(400), self.data.g1.values], 1)
+        assert_allclose(zmat[:, 37:].sum(1), self.data.x1.values)
+
+    def test_deviance(self):
+        model = self.model
+        for theta in [[0.5, 1., 0.2], [1.3, 0., 0.7], [0., 0., 0.]]:
+            for reml in [True, False]:
+                dev, params, re = dense_deviance(model, theta, reml)
+                assert_allclose(model.deviance(theta, reml), dev, rtol=1e-10)
+                pls = model._pls(theta)
+                assert_allclose(pls['fe_params'], params, rtol=1e-8)
+                assert_allclose(model._lambda(theta) * pls['u'], re,
+                                atol=1e-10)
+
+    def test_fit(self):
+        res, model = self.res, self.model
+        dev, params, re = dense_deviance(model, res.theta, True)
+        assert_allclose(res.deviance, dev, rtol=1e-10)
+        assert_allclose(res.llf, -dev / 2, rtol=1e-10)
+        assert_allclose(res.params, params, rtol=1e-8)
+        assert_allclose(res.re_unscaled, re, atol=1e-10)
+        assert_allclose(res.vcomp, res.scale * res.theta**2)
+        assert_allclose(res.fittedvalues + res.resid, model.endog)
+        assert_equal(res.params.index.tolist(), ['Intercept', 'x1', 'x2'])
+
+        # the minimum over theta
+        for delta in np.eye(3) * 1e-3:
+            assert_equal(model.deviance(np.abs(res.theta + delta)) >=
+                         res.deviance - 1e-8, True)
+            assert_equal(model.deviance(np.abs(res.theta - delta)) >=
+                         res.deviance - 1e-8, True)
+
+        # the covariance of the fixed effects is the GLS covariance
+        zmat = model.exog_vc.toarray() * model._lambda(res.theta)
+        cov = res.scale * (np.eye(400) + np.dot(zmat, zmat.T))
+        xvx = np.dot(model.exog.T, np.linalg.solve(cov, model.exog))
+        assert_allclose(res.cov_params(), np.linalg.inv(xvx), rtol=1e-8)
+
+        smry = res.summary()
+        assert_equal('g3 Var' in str(smry), True)
+
+    def test_arrays(self):
+        # the same model from arrays and a dense exog_vc
+        model = self.model
+        mod2 = SparseMixedLM(model.endog, model.exog,
+                             model.exog_vc.toarray(), model.ident)
+        assert_allclose(mod2.deviance([0.5, 1., 0.2]),
+                        model.deviance([0.5, 1., 0.2]), rtol=1e-12)
+        res2 = mod2.fit(start_theta=self.res.theta)
+        assert_allclose(res2.params, self.res.params, rtol=1e-6)
+        assert_equal(mod2.vc_names, ['VC1', 'VC2', 'VC3'])
+
+
+def test_location_shift():
+    # the residual sum of squares does not cancel for large endog
+    np.random.seed(9753)
+    nobs, n_groups = 2000, 50
+    groups = np.random.randint(0, n_groups, nobs)
+    x = np.random.randn(nobs)
+    endog = (0.5 * x + 0.45 * np.random.randn(n_groups)[groups] +
+             0.01 * np.random.randn(nobs))
+    vcf = {'g': '1 | g'}
+    data = pd.DataFrame({'y': endog, 'x': x, 'g': groups})
+    mod1 = SparseMixedLM.from_formula('y ~ x', vcf, data)
+    res1 = mod1.fit()
+    for shift in [1e5, 1e6]:
+        data['y'] = endog + shift
+        mod2 = SparseMixedLM.from_formula('y ~ x', vcf, data)
+        assert_allclose(mod2.deviance(res1.theta), res1.deviance,
+                        rtol=1e-10)
+        res2 = mod2.fit()
+        assert_equal(res2.converged, True)
+        assert_allclose(res2.params - [shift, 0], res1.params, rtol=1e-6,
+                        atol=1e-6)
+        assert_allclose(res2.scale, res1.scale, rtol=1e-3)
+        assert_allclose(res2.vcomp, res1.vcomp, rtol=1e-3)
+        assert_allclose(res2.llf, res1.llf, rtol=1e-8)
+
+
+def test_missing():
+    data = gen_crossed()
+    data.loc[3, 'x1'] = np.nan
+    data.loc[7, 'g3'] = np.nan
+    vcf = {'g1': '1 | g1', 'g3': '1 | g3'}
+    mod1 = SparseMixedLM.from_formula('y ~ x1', vcf, data)
+    mod2 = SparseMixedLM.from_formula('y ~ x1', vcf,
+                                      data.drop([3, 7]))
+    assert_equal(mod1.n_totobs, 398)
+    assert_allclose(mod1.exog_vc.toarray(), mod2.exog_vc.toarray())
+    assert_allclose(mod1.deviance([1., 1.]), mod2.deviance([1., 1.]))
+    assert_raises(ValueError, SparseMixedLM.from_formula, 'y ~ x1', vcf,
+                  data, missing='raise')
+
+
+def test_errors():
+    endog = np.random.randn(10)
+    exog = np.ones((10, 1))
+    exog_vc = sparse.eye(10, 4)
+    assert_raises(ValueError, SparseMixedLM, endog, exog, exog_vc, [0, 1])
+    assert_raises(ValueError, SparseMixedLM, endog, exog, exog_vc,
+                  [0, 0, 2, 2])
+    assert_raises(ValueError, SparseMixedLM, endog, exog, exog_vc,
+                  [0, 0, 1, 1], missing='drop')
+    assert_raises(ValueError, SparseMixedLM.from_formula, 'y ~ 1',
+                  {'a': 'g'}, pd.DataFrame({'y': endog, 'g': endog}))
@@ -0,0 +1,127 @@
+"""
+Tests for GLS with structured covariance matrices
+"""
+import numpy as np
+from numpy.testing import assert_allclose, assert_raises
+
+from statsmodels.regression.linear_model import GLS
+from statsmodels.regression.structured_sigma import (
+    BandedSigma, ToeplitzSigma, BlockDiagonalSigma, LowRankDiagonalSigma)
+
+
+class CheckStructuredGLS(object):
+
+    @classmethod
+    def setupClass(cls):
+        np.random.seed(9876)
+        nobs = 60
+        cls.exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+        cls.endog = cls.exog.sum(1) + np.random.randn(nobs)
+        cls.sigma = cls.get_sigma(nobs)
+        cls.res1 = GLS(cls.endog, cls.exog, sigma=cls.sigma).fit()
+        cls.res2 = GLS(cls.endog, cls.exog, sigma=cls.sigma.to_dense()).fit()
+
+    def test_logdet(self):
+        logdet = np.linalg.slogdet(self.sigma.to_dense())[1]
+        assert_allclose(self.sigma.logdet(), logdet, rtol=1e-10)
+
+    def test_whiten(self):
+        # W sigma W' = I
+        dense = self.sigma.to_dense()
+        w = self.sigma.whiten(np.eye(self.sigma.nobs))
+        assert_allclose(w.dot(dense).dot(w.T), np.eye(self.sigma.nobs),
+                        atol=1e-10)
+        w1 = self.sigma.whiten(self.endog)
+        assert_allclose(w1, w.dot(self.endog), atol=1e-10)
+
+    def test_results(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.params, res2.params, rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+        assert_allclose(res1.ssr, res2.ssr, rtol=1e-10)
+        assert_allclose(res1.fittedvalues, res2.fittedvalues, rtol=1e-10)
+        res1.summary()
+
+
+class TestBanded(CheckStructuredGLS):
+
+    @classmethod
+    def get_sigma(cls, nobs):
+        bands = np.zeros((3, nobs))
+        bands[0] = 2 + np.random.rand(nobs)
+        bands[1] = 0.5
+        bands[2] = 0.2
+        return BandedSigma(bands)
+
+    def test_from_dense(self):
+        dense = self.sigma.to_dense()
+        sigma = BandedSigma.from_dense(dense, 2)
+        assert_allclose(sigma.to_dense(), dense, rtol=1e-13)
+        assert_allclose(sigma.logdet(), self.sigma.logdet(), rtol=1e-13)
+
+
+class TestToeplitzAR(CheckStructuredGLS):
+
+    @classmethod
+    def get_sigma(cls, nobs):
+        return ToeplitzSigma.from_ar([0.5, -0.2], nobs, scale=2.)
+
+    def test_acov(self):
+        from statsmodels.tsa.arima_process import arma_acovf
+        acov = 2 * arma_acovf([1, -0.5, 0.2], [1], nobs=10)
+        assert_allclose(self.sigma.acov[:10], acov, rtol=1e-8)
+
+
+class TestToeplitzMA(CheckStructuredGLS):
+
+    @classmethod
+    def get_sigma(cls, nobs):
+        return ToeplitzSigma([2., 0.8, 0.3], nobs)
+
+
+class TestBlockDiagonal(CheckStructuredGLS):
+
+    @classmethod
+    def get_sigma(cls, nobs):
+        groups = np.repeat(np.arange(nobs // 4), 4)
+        np.random.shuffle(groups)
+        blocks = []
+        for i in range(nobs // 4):
+            a = np.random.randn(4, 4)
+            blocks.append(a.dot(a.T) + np.eye(4))
+        return BlockDiagonalSigma(blocks, groups=groups)
+
+
+class TestLowRankDiagonal(CheckStructuredGLS):
+
+    @classmethod
+    def get_sigma(cls, nobs):
+        return LowRankDiagonalSigma(1 + np.random.rand(nobs),
+                                    np.random.randn(nobs, 2))
+
+    def test_whiten(self):
+        # whitening is not triangular, only check W sigma W' = I
+        dense = self.sigma.to_dense()
+        w = self.sigma.whiten(np.eye(self.sigma.nobs))
+        assert_allclose(w.dot(dense).dot(w.T), np.eye(self.sigma.nobs),
+                        atol=1e-10)
+
+
+def test_structured_sigma_errors():
+    sigma = ToeplitzSigma([1., 0.5], 10)
+    assert_raises(ValueError, GLS, np.ones(12), np.ones(12), sigma=sigma)
+    assert_raises(ValueError, sigma.whiten, np.ones(12))
+    assert_raises(ValueError, BandedSigma, [[1., 1.], [2., 0.]])
+    assert_raises(ValueError, ToeplitzSigma.from_ar, [1.5], 10)
+    assert_raises(ValueError, BlockDiagonalSigma, [np.eye(2)] * 2,
+                  groups=[0, 0, 1])
+
+
+def test_toeplitz_truncated():
+    # truncated recursion is exact for AR autocovariances
+    sigma = ToeplitzSigma.from_ar([0.5, -0.2], 30)
+    sigma_full = ToeplitzSigma(sigma.acov, 30)
+    x = np.random.randn(30, 2)
+    assert_allclose(sigma.whiten(x), sigma_full.whiten(x), rtol=1e-8)
+    assert_allclose(sigma.logdet(), sigma_full.logdet(), rtol=1e-10)
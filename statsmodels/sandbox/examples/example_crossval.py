@@ -1,7 +1,7 @@
 
 import numpy as np
 
-from statsmodels.sandbox.tools import cross_val
+from statsmodels.tools import cross_val
 
 
 if __name__ == '__main__':
@@ -19,7 +19,7 @@ import numpy as np
 from numpy.testing import assert_array_almost_equal
 import statsmodels.api as sm
 from statsmodels.sandbox.tools import pca
-from statsmodels.sandbox.tools.cross_val import LeaveOneOut
+from statsmodels.tools.cross_val import LeaveOneOut
 
 
 # Example: principal component regression
@@ -8,6 +8,10 @@ License: BSD-3
 """
 from statsmodels.compat.python import lzip
 from collections import defaultdict
+try:
+    from collections.abc import Iterator
+except ImportError:  # Python 2
+    from collections import Iterator
 import numpy as np
 
 from statsmodels.regression.linear_model import OLS
@@ -152,7 +156,8 @@ def variance_inflation_factor(exog, exog_idx):
 
     See Also
     --------
-    xxx : class for regression diagnostics  TODO: doesn't exist yet
+    variance_inflation_factors : VIF for all variables without auxiliary
+        regressions
 
     References
     ----------
@@ -168,6 +173,115 @@ def variance_inflation_factor(exog, exog_idx):
     return vif
 
 
+def variance_inflation_factors(exog, chunksize=None, rcond=1e-13):
+    '''variance inflation factors, VIF, for all exogenous variables
+
+    This computes the same values as `variance_inflation_factor` for every
+    column of exog, but without any auxiliary regression. All VIFs are
+    obtained from one eigendecomposition of the cross-product matrix of exog.
+
+    Parameters
+    ----------
+    exog : array-like or iterator of array-like
+        design matrix with all explanatory variables, (nobs, k_vars), as for
+        example used in regression. `exog` can also be an iterator, e.g. a
+        generator, that yields blocks of rows of the design matrix. This
+        allows to stream the data, for example from disk.
+    chunksize : None or int
+        If an integer, then `exog` is processed in blocks of `chunksize`
+        rows. This can be used to bound memory usage if exog is a memory
+        mapped array.
+    rcond : float
+        Cutoff for small eigenvalues of the cross-product matrix, i.e. the
+        squared singular values of exog, relative to the largest eigenvalue.
+        The columns of exog are scaled to unit length. A variable that is in
+        the span of the other variables up to this precision has an infinite
+        VIF.
+
+    Returns
+    -------
+    vif : ndarray or pandas Series
+        variance inflation factors, one for each column of exog. A Series
+        with the column names as index is returned if exog is a DataFrame.
+
+    Notes
+    -----
+    The VIF of variable j is ``tss_j * inv(X'X)[j, j]`` where tss_j is the
+    total sum of squares of the variable. tss_j is centered if the other
+    variables include a constant column and uncentered otherwise, which
+    corresponds to the R-squared of the auxiliary regression. Implicit
+    constants, e.g. a full set of dummy variables, are not detected.
+
+    See Also
+    --------
+    variance_inflation_factor
+
+    '''
+    columns = getattr(exog, 'columns', None)
+    if chunksize is None and isinstance(exog, Iterator):
+        # iterator of blocks
+        blocks = exog
+    else:
+        exog = np.asarray(exog)
+        if chunksize is None:
+            chunksize = max(exog.shape[0], 1)
+        blocks = (exog[i:i + chunksize]
+                  for i in range(0, exog.shape[0], chunksize))
+
+    nobs = 0
+    xtx = xsum = xmin = xmax = None
+    for block in blocks:
+        block = np.asarray(block, dtype=np.float64)
+        if xtx is None:
+            k_vars = block.shape[1]
+            xtx = np.zeros((k_vars, k_vars))
+            xsum = np.zeros(k_vars)
+            xmin = np.empty(k_vars)
+            xmin.fill(np.inf)
+            xmax = -xmin
+        if block.shape[0] == 0:
+            continue
+        nobs += block.shape[0]
+        xtx += np.dot(block.T, block)
+        xsum += block.sum(0)
+        xmin = np.minimum(xmin, block.min(0))
+        xmax = np.maximum(xmax, block.max(0))
+
+    if xtx is None or nobs == 0:
+        raise ValueError('exog has no observations')
+
+    # VIF are invariant to scaling, use unit diagonal for accuracy
+    xtx_diag = np.diag(xtx)
+    scale = np.sqrt(np.where(xtx_diag > 0, xtx_diag, 1))
+    xtx_scaled = xtx / np.outer(scale, scale)
+
+    # eigenvalues of scaled X'X are the squared singular values
+    evals, evecs = np.linalg.eigh(xtx_scaled)
+    nonsingular = evals > rcond * evals.max()
+    inv_evals = np.zeros_like(evals)
+    inv_evals[nonsingular] = 1. / evals[nonsingular]
+    inv_diag = (evecs**2 * inv_evals).sum(1) / xtx_diag
+
+    # a variable in the span of the others loads on the null space
+    null_vecs = evecs[:, ~nonsingular]
+    collinear = (np.abs(null_vecs) > np.sqrt(rcond)).any(1)
+
+    is_const = (xmin == xmax) & (xmax != 0)
+    n_const = is_const.sum()
+    # constant among the other variables
+    const_other = (n_const - is_const) > 0
+    tss = np.where(const_other, xtx_diag - xsum**2 / nobs, xtx_diag)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vif = tss * inv_diag
+    vif[collinear] = np.inf
+
+    if columns is not None:
+        from pandas import Series
+        vif = Series(vif, index=columns)
+    return vif
+
+
 class OLSInfluence(object):
     '''class to calculate outlier and influence measures for OLS result
 
@@ -180,15 +294,13 @@ class OLSInfluence(object):
     -----
     One part of the results can be calculated without any auxiliary regression
     (some of which have the `_internal` postfix in the name. Other statistics
-    require leave-one-observation-out (LOOO) auxiliary regression, and will be
-    slower (mainly results with `_external` postfix in the name).
-    The auxiliary LOOO regression only the required results are stored.
+    are based on leave-one-observation-out (LOOO) estimates (mainly results
+    with `_external` postfix in the name).
 
-    Using the LOO measures is currently only recommended if the data set
-    is not too large. One possible approach for LOOO measures would be to
-    identify possible problem observations with the _internal measures, and
-    then run the leave-one-observation-out only with observations that are
-    possible outliers. (However, this is not yet available in an automized way.)
+    The LOOO parameters and error variances are not computed by refitting the
+    regression, they are computed in closed form from the full sample
+    regression, see `_res_looo`. Observations are processed in blocks of size
+    `chunksize` to bound the memory of the temporary arrays.
 
     This should be extended to general least squares.
 
@@ -197,6 +309,8 @@ class OLSInfluence(object):
 
     '''
 
+    chunksize = 10000
+
     def __init__(self, results):
         #check which model is allowed
         self.results = maybe_unwrap_results(results)
@@ -218,7 +332,16 @@ class OLSInfluence(object):
         -----
         temporarily calculated here, this should go to model class
         '''
-        return (self.exog * self.results.model.pinv_wexog.T).sum(1)
+        model = self.results.model
+        if hasattr(model, 'pinv_wexog'):
+            return (self.exog * model.pinv_wexog.T).sum(1)
+        # pinv_wexog is not stored, e.g. with fit(store="minimal")
+        ncp = self.results.normalized_cov_params
+        hii = np.empty(self.nobs)
+        for start in range(0, self.nobs, self.chunksize):
+            sl = slice(start, start + self.chunksize)
+            hii[sl] = (np.dot(self.exog[sl], ncp) * model.wexog[sl]).sum(1)
+        return hii
 
     @cache_readonly
     def resid_press(self):
@@ -270,7 +393,7 @@ class OLSInfluence(object):
 
         this uses sigma from leave-one-out estimates
 
-        requires leave one out loop for observations
+        uses closed form leave-one-observation-out estimates
         '''
         sigma_looo = np.sqrt(self.sigma2_not_obsi)
         return self.get_resid_studentized_external(sigma=sigma_looo)
@@ -329,7 +452,7 @@ class OLSInfluence(object):
         '''(cached attribute) dffits measure for influence of an observation
 
         based on resid_studentized_external,
-        uses results from leave-one-observation-out loop
+        uses closed form leave-one-observation-out estimates
 
         It is recommended that observations with dffits large than a
         threshold of 2 sqrt{k / n} where k is the number of parameters, should
@@ -357,7 +480,7 @@ class OLSInfluence(object):
     def dfbetas(self):
         '''(cached attribute) dfbetas
 
-        uses results from leave-one-observation-out loop
+        uses closed form leave-one-observation-out estimates
         '''
         dfbetas = self.results.params - self.params_not_obsi#[None,:]
         dfbetas /= np.sqrt(self.sigma2_not_obsi[:,None])
@@ -370,7 +493,7 @@ class OLSInfluence(object):
 
         This is 'mse_resid' from each auxiliary regression.
 
-        uses results from leave-one-observation-out loop
+        uses closed form leave-one-observation-out estimates
         '''
         return np.asarray(self._res_looo['mse_resid'])
 
@@ -378,7 +501,7 @@ class OLSInfluence(object):
     def params_not_obsi(self):
         '''(cached attribute) parameter estimates for all LOOO regressions
 
-        uses results from leave-one-observation-out loop
+        uses closed form leave-one-observation-out estimates
         '''
         return np.asarray(self._res_looo['params'])
 
@@ -386,7 +509,7 @@ class OLSInfluence(object):
     def det_cov_params_not_obsi(self):
         '''(cached attribute) determinant of cov_params of all LOOO regressions
 
-        uses results from leave-one-observation-out loop
+        uses closed form leave-one-observation-out estimates
         '''
         return np.asarray(self._res_looo['det_cov_params'])
 
@@ -415,12 +538,14 @@ class OLSInfluence(object):
 
         This uses determinant of the estimate of the parameter covariance
         from leave-one-out estimates.
-        requires leave one out loop for observations
+        uses the closed form leave-one-observation-out estimates
 
         '''
-        #don't use inplace division / because then we change original
-        cov_ratio = (self.det_cov_params_not_obsi
-                            / np.linalg.det(self.results.cov_params()))
+        # ratio of determinants without forming them, det(cov_params) is
+        # scale**k_vars * det(normalized_cov_params)
+        hii = self.hat_matrix_diag
+        scale_ratio = self.sigma2_not_obsi / self.results.mse_resid
+        cov_ratio = scale_ratio**self.k_vars / (1 - hii)
         return cov_ratio
 
     @cache_readonly
@@ -514,7 +639,7 @@ class OLSInfluence(object):
 
         not yet used
         '''
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
+        from statsmodels.tools.cross_val import LeaveOneOut
 
         endog = self.results.model.endog
         exog = self.exog
@@ -535,26 +660,38 @@ class OLSInfluence(object):
         all results will be attached.
         currently only 'params', 'mse_resid', 'det_cov_params' are stored
 
-        regresses endog on exog dropping one observation at a time
+        The leave-one-observation-out estimates are not computed by
+        refitting the regression. They are obtained in closed form from the
+        full sample estimates with rank one (Sherman-Morrison) downdates ::
 
-        this uses a nobs loop, only attributes of the OLS instance are stored.
-        '''
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
-        get_det_cov_params = lambda res: np.linalg.det(res.cov_params())
+            params_i = params - (X'X)^{-1} x_i resid_i / (1 - h_i)
+            ssr_i = ssr - resid_i**2 / (1 - h_i)
+            det((X_i'X_i)^{-1}) = det((X'X)^{-1}) / (1 - h_i)
 
-        endog = self.endog
+        where h_i is the diagonal of the hat matrix. Observations are
+        processed in blocks of `chunksize` rows.
+        '''
+        results = self.results
         exog = self.exog
-
-        params = np.zeros(exog.shape, dtype=np.float)
-        mse_resid = np.zeros(endog.shape, dtype=np.float)
-        det_cov_params = np.zeros(endog.shape, dtype=np.float)
-
-        cv_iter = LeaveOneOut(self.nobs)
-        for inidx, outidx in cv_iter:
-            res_i = self.model_class(endog[inidx], exog[inidx]).fit()
-            params[outidx] = res_i.params
-            mse_resid[outidx] = res_i.mse_resid
-            det_cov_params[outidx] = get_det_cov_params(res_i)
+        resid = np.asarray(results.resid)
+        hii = self.hat_matrix_diag
+        ncp = results.normalized_cov_params
+        nobs, k_vars = exog.shape
+
+        params = np.zeros(exog.shape, dtype=np.float64)
+        # residual divided by (1 - h_i) is the PRESS residual
+        resid_press = resid / (1 - hii)
+        for start in range(0, nobs, self.chunksize):
+            sl = slice(start, start + self.chunksize)
+            params[sl] = np.dot(exog[sl], ncp) * resid_press[sl, None]
+        params = results.params - params
+
+        df_resid = results.df_resid - 1
+        ssr = np.dot(resid, resid)
+        mse_resid = (ssr - resid * resid_press) / df_resid
+
+        det_ncp = np.linalg.det(ncp)
+        det_cov_params = mse_resid**k_vars * det_ncp / (1 - hii)
 
         return dict(params=params, mse_resid=mse_resid,
                        det_cov_params=det_cov_params)
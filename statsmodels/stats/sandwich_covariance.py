@@ -102,10 +102,11 @@ Statistics 90, no. 3 (2008): 414–427.
 
 """
 from statsmodels.compat.python import range
+from itertools import combinations
 import pandas as pd
 import numpy as np
+from scipy import sparse
 
-from statsmodels.tools.grouputils import Group
 from statsmodels.stats.moment_helpers import se_cov
 
 __all__ = ['cov_cluster', 'cov_cluster_2groups', 'cov_hac', 'cov_nw_panel',
@@ -166,8 +167,14 @@ def _HCCM(results, scale):
     where pinv(x) = (X'X)^(-1) X
     and scale is (nobs,)
     '''
-    H = np.dot(results.model.pinv_wexog,
-        scale[:,None]*results.model.pinv_wexog.T)
+    if hasattr(results.model, 'pinv_wexog'):
+        H = np.dot(results.model.pinv_wexog,
+            scale[:,None]*results.model.pinv_wexog.T)
+    else:
+        # pinv_wexog is not stored, e.g. with fit(store="minimal")
+        wexog = results.model.wexog
+        ncp = results.normalized_cov_params
+        H = np.dot(ncp, np.dot(np.dot(wexog.T, scale[:,None]*wexog), ncp))
     return H
 
 def cov_hc0(results):
@@ -241,7 +248,11 @@ def _get_sandwich_arrays(results, cov_type=''):
             xu = results.model.score_obs(results.params)
             hessian_inv = np.linalg.inv(results.model.hessian(results.params))
         else:
-            xu = results.model.wexog * results.wresid[:, None]
+            wexog = results.model.wexog
+            if sparse.issparse(wexog):
+                xu = wexog.multiply(results.wresid[:, None]).toarray()
+            else:
+                xu = wexog * results.wresid[:, None]
 
             hessian_inv = np.asarray(results.normalized_cov_params)
 
@@ -280,12 +291,16 @@ def _HCCM1(results, scale):
         robust covariance matrix for the parameter estimates
 
     '''
+    if hasattr(results.model, 'pinv_wexog'):
+        pinv_wexog = results.model.pinv_wexog
+    else:
+        # pinv_wexog is not stored, e.g. with fit(store="minimal")
+        pinv_wexog = np.dot(results.normalized_cov_params,
+                            results.model.wexog.T)
     if scale.ndim == 1:
-        H = np.dot(results.model.pinv_wexog,
-                   scale[:,None]*results.model.pinv_wexog.T)
+        H = np.dot(pinv_wexog, scale[:,None]*pinv_wexog.T)
     else:
-        H = np.dot(results.model.pinv_wexog,
-                   np.dot(scale, results.model.pinv_wexog.T))
+        H = np.dot(pinv_wexog, np.dot(scale, pinv_wexog.T))
     return H
 
 def _HCCM2(hessian_inv, scale):
@@ -356,6 +371,25 @@ def weights_uniform(nlags):
     #with lag zero
     return np.ones(nlags+1)
 
+def weights_parzen(nlags):
+    '''Parzen weights for HAC
+
+    Parameters
+    ----------
+    nlags : int
+       highest lag in the kernel window, this does not include the zero lag
+
+    Returns
+    -------
+    kernel : ndarray, (nlags+1,)
+        weights for Parzen kernel with bandwidth nlags + 1
+
+    '''
+
+    z = np.arange(nlags+1) / (nlags+1.)
+    return np.where(z <= 0.5, 1 - 6 * z**2 + 6 * z**3, 2 * (1 - z)**3)
+
+
 def S_hac_simple(x, nlags=None, weights_func=weights_bartlett):
     '''inner covariance matrix for HAC (Newey, West) sandwich
 
@@ -403,6 +437,211 @@ def S_hac_simple(x, nlags=None, weights_func=weights_bartlett):
 
     return S
 
+def _hac_fft_weights(weights, nfft):
+    '''Fourier transform of the symmetric, circular kernel weights
+    '''
+    nlags = len(weights) - 1
+    weights_c = np.zeros(nfft)
+    weights_c[:nlags+1] = weights
+    if nlags > 0:
+        weights_c[-nlags:] = weights[:0:-1]
+    # the weights are symmetric, so the transform is real
+    transform = np.fft.rfft(weights_c).real
+    # frequencies 1, ..., nfft/2 - 1 represent two conjugate frequencies
+    transform[1:(nfft + 1) // 2] *= 2
+    return transform / nfft
+
+
+def S_hac_fft(x, nlags=None, weights_func=weights_bartlett):
+    '''inner covariance matrix for HAC (Newey, West) sandwich using the FFT
+
+    Parameters
+    ----------
+    x : ndarray (nobs,) or (nobs, k_var)
+        data, for HAC this is array of x_i * u_i
+    nlags : int or None
+        highest lag to include in kernel window. If None, then
+        nlags = floor(4(T/100)^(2/9)) is used.
+    weights_func : callable
+        weights_func is called with nlags as argument to get the kernel
+        weights. default are Bartlett weights
+
+    Returns
+    -------
+    S : ndarray, (k_vars, k_vars)
+        inner covariance matrix for sandwich
+
+    Notes
+    -----
+    This is the same as S_hac_simple.  The kernel weighted sum of the
+    lagged cross-products is the cross-periodogram of x weighted by the
+    Fourier transform of the kernel, so that all lags are handled in one
+    pass.  This takes O(k_var nobs log(nobs) + k_var**2 nobs) operations
+    independent of nlags, compared to O(k_var**2 nobs nlags) for the loop
+    over lags.
+
+    '''
+
+    if x.ndim == 1:
+        x = x[:,None]
+    n_periods = x.shape[0]
+    if nlags is None:
+        nlags = int(np.floor(4 * (n_periods / 100.)**(2./9.)))
+    # lags beyond the number of observations don't contribute
+    weights = weights_func(nlags)[:n_periods]
+
+    # zero padding so that the circular cross-products do not wrap around
+    nfft = 2**int(np.ceil(np.log2(n_periods + len(weights) - 1)))
+    fx = np.fft.rfft(x, nfft, axis=0)
+    transform = _hac_fft_weights(weights, nfft)
+    S = np.dot(fx.T * transform, fx.conj()).real
+
+    return (S + S.T) / 2.
+
+
+def S_hac_stream(x_chunks, nlags, weights_func=weights_bartlett):
+    '''inner covariance matrix for HAC (Newey, West) accumulated over chunks
+
+    Parameters
+    ----------
+    x_chunks : iterable of ndarrays
+        consecutive chunks of the data, for HAC this is array of x_i * u_i.
+        Each chunk is (nobs_chunk,) or (nobs_chunk, k_var).
+    nlags : int
+        highest lag to include in kernel window
+    weights_func : callable
+        weights_func is called with nlags as argument to get the kernel
+        weights. default are Bartlett weights
+
+    Returns
+    -------
+    S : ndarray, (k_vars, k_vars)
+        inner covariance matrix for sandwich, the same as S_hac_simple for
+        the concatenated chunks
+
+    Notes
+    -----
+    Only the last nlags rows of the previous chunks are kept.  The terms
+    for pairs of observations that are at most nlags apart and include an
+    observation of the current chunk are the terms of the current chunk
+    with the kept rows prepended minus the terms of the kept rows alone.
+
+    '''
+
+    S = 0.
+    tail = None
+    for x in x_chunks:
+        x = np.asarray(x)
+        if x.ndim == 1:
+            x = x[:,None]
+        if tail is None:
+            S = S + S_hac_fft(x, nlags, weights_func)
+            tail = x[-nlags:] if nlags > 0 else x[:0]
+            continue
+        if nlags > 0 and tail.shape[0] > 0:
+            z = np.concatenate((tail, x))
+            S = S + (S_hac_fft(z, nlags, weights_func) -
+                     S_hac_fft(tail, nlags, weights_func))
+            tail = z[-nlags:]
+        else:
+            S = S + S_hac_fft(x, 0, weights_func)
+
+    if tail is None:
+        raise ValueError('x_chunks is empty')
+    return S
+
+
+def hac_nlags(x, method='newey-west', weights_func=weights_bartlett,
+              weights=None):
+    '''automatic lag length for HAC covariance matrices
+
+    Parameters
+    ----------
+    x : ndarray (nobs,) or (nobs, k_var)
+        data, for HAC this is array of x_i * u_i
+    method : str
+        'newey-west' for the nonparametric plug-in of Newey and West (1994),
+        'andrews' for the AR(1) plug-in of Andrews (1991)
+    weights_func : callable
+        kernel, either weights_bartlett or weights_parzen
+    weights : None or ndarray (k_var,)
+        weights of the columns of x for the criterion.  The default is one
+        for each column.  Columns that correspond to a constant are often
+        given zero weight.
+
+    Returns
+    -------
+    nlags : int
+        highest lag of the kernel window, floor of the estimated optimal
+        bandwidth
+
+    Notes
+    -----
+    The optimal bandwidth is gamma * T**(1/3) for the Bartlett and
+    gamma * T**(1/5) for the Parzen kernel, where gamma depends on the
+    ratio of a weighted sum of autocovariances to the long run variance.
+    The Newey-West method estimates the ratio from the autocovariances of
+    the weighted sum of the columns up to a preliminary lag that depends
+    only on nobs, the Andrews method from AR(1) models fitted to each
+    column.
+
+    References
+    ----------
+    Andrews, D. W. K. (1991).  Heteroskedasticity and autocorrelation
+    consistent covariance matrix estimation.  Econometrica 59(3), 817-858.
+
+    Newey, W. K. and West, K. D. (1994).  Automatic lag selection in
+    covariance matrix estimation.  Review of Economic Studies 61(4),
+    631-653.
+
+    '''
+
+    x = np.asarray(x)
+    if x.ndim == 1:
+        x = x[:,None]
+    n_periods, k_vars = x.shape
+    if weights is None:
+        weights = np.ones(k_vars)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    # kernel constants and rate of the preliminary lag in Newey-West
+    if weights_func is weights_bartlett:
+        q, cq, rate = 1, 1.1447, 2. / 9
+    elif weights_func is weights_parzen:
+        q, cq, rate = 2, 2.6614, 4. / 25
+    else:
+        raise ValueError('automatic lag selection requires Bartlett or '
+                         'Parzen weights')
+
+    if method == 'newey-west':
+        # preliminary lag length
+        n_pre = int(np.floor(4 * (n_periods / 100.)**rate))
+        xw = np.dot(x, weights)
+        sigma = np.array([np.dot(xw[j:], xw[:n_periods-j])
+                          for j in range(n_pre + 1)]) / n_periods
+        s0 = sigma[0] + 2 * sigma[1:].sum()
+        sq = 2 * np.sum(np.arange(1, n_pre + 1)**q * sigma[1:])
+        alpha = (sq / s0)**2
+    elif method == 'andrews':
+        y, ylag = x[1:], x[:-1]
+        ylag_c = ylag - ylag.mean(0)
+        rho = (ylag_c * (y - y.mean(0))).sum(0) / (ylag_c**2).sum(0)
+        resid = y - y.mean(0) - rho * ylag_c
+        sigma2 = (resid**2).sum(0) / (n_periods - 1)
+        denom = np.sum(weights * sigma2**2 / (1 - rho)**4)
+        if q == 1:
+            num = np.sum(weights * 4 * rho**2 * sigma2**2 /
+                         ((1 - rho)**6 * (1 + rho)**2))
+        else:
+            num = np.sum(weights * 4 * rho**2 * sigma2**2 / (1 - rho)**8)
+        alpha = num / denom
+    else:
+        raise ValueError("method has to be 'newey-west' or 'andrews'")
+
+    bandwidth = cq * (alpha * n_periods)**(1. / (2 * q + 1))
+    return int(min(np.floor(bandwidth), n_periods - 1))
+
+
 def S_white_simple(x):
     '''inner covariance matrix for White heteroscedastistity sandwich
 
@@ -541,18 +780,11 @@ def cov_cluster(results, group, use_correction=True):
     same result as Stata in UCLA example and same as Peterson
 
     '''
-    #TODO: currently used version of groupsums requires 2d resid
     xu, hessian_inv = _get_sandwich_arrays(results, cov_type='clu')
-
-    if not hasattr(group, 'dtype') or group.dtype != np.dtype('int'):
-        clusters, group = np.unique(group, return_inverse=True)
-    else:
-        clusters = np.unique(group)
-
-    scale = S_crosssection(xu, group)
+    codes, n_groups = _group_codes(group)
+    scale = _cluster_meat(xu, codes, n_groups)
 
     nobs, k_params = xu.shape
-    n_groups = len(clusters) #replace with stored group attributes if available
 
     cov_c = _HCCM2(hessian_inv, scale)
 
@@ -603,21 +835,125 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
         group = (group0, group1)
 
 
-    cov0 = cov_cluster(results, group0, use_correction=use_correction)
-    #[0] because we get still also returns bse
-    cov1 = cov_cluster(results, group1, use_correction=use_correction)
+    cov_both, covs = _cov_cluster_multi(results, (group0, group1),
+                                        use_correction=use_correction)
 
-    group_intersection = Group(group)
-    #cov of cluster formed by intersection of two groups
-    cov01 = cov_cluster(results,
-                        group_intersection.group_int,
-                        use_correction=use_correction)
+    #return all three (for now?)
+    return cov_both, covs[(0,)], covs[(1,)]
 
-    #robust cov matrix for union of groups
-    cov_both = cov0 + cov1 - cov01
 
-    #return all three (for now?)
-    return cov_both, cov0, cov1
+def _group_codes(group):
+    '''integer codes 0, ..., n_groups - 1 for the labels in group
+    '''
+    group = np.asarray(group)
+    if group.dtype.kind in 'iu' and group.size > 0 and group.min() >= 0 \
+            and group.max() < 2 * group.shape[0]:
+        # bincount of small integer labels avoids hashing
+        counts = np.bincount(group)
+        relabel = np.cumsum(counts > 0) - 1
+        return relabel[group], int(relabel[-1]) + 1
+    codes, uniques = pd.factorize(group, sort=True)
+    n_groups = len(uniques)
+    missing = codes < 0
+    if missing.any():
+        # missing labels form one additional group, as with np.unique
+        codes[missing] = n_groups
+        n_groups += 1
+    return codes, n_groups
+
+
+def _cluster_meat(xu, codes, n_groups):
+    '''sum of outer products of the group sums of xu
+
+    The group sums are a product with a sparse indicator matrix, which
+    takes O(nobs * k_vars) operations for any number of groups.
+    '''
+    nobs = xu.shape[0]
+    indicator = sparse.csr_matrix((np.ones(nobs), (codes, np.arange(nobs))),
+                                  shape=(n_groups, nobs))
+    xu_sums = indicator.dot(xu)
+    return np.dot(xu_sums.T, xu_sums)
+
+
+def _cov_cluster_multi(results, groups, use_correction=True):
+    '''multi-way cluster robust covariance and the terms of the sum
+    '''
+    xu, hessian_inv = _get_sandwich_arrays(results, cov_type='clu')
+    nobs, k_params = xu.shape
+    n_dims = len(groups)
+    # group codes of all intersections, built from the lower order ones
+    codes = {}
+    for i in range(n_dims):
+        codes[(i,)] = _group_codes(groups[i])
+
+    covs = {}
+    cov = np.zeros((k_params, k_params))
+    for n_comb in range(1, n_dims + 1):
+        for comb in combinations(range(n_dims), n_comb):
+            if comb not in codes:
+                codes0, n_groups0 = codes[comb[:-1]]
+                codes1, n_groups1 = codes[comb[-1:]]
+                codes[comb] = _group_codes(codes0.astype(np.int64) *
+                                           n_groups1 + codes1)
+            codes_c, n_groups = codes[comb]
+            cov_c = _HCCM2(hessian_inv, _cluster_meat(xu, codes_c, n_groups))
+            if use_correction:
+                cov_c *= (n_groups / (n_groups - 1.) *
+                          ((nobs-1.) / float(nobs - k_params)))
+            covs[comb] = cov_c
+            # inclusion-exclusion over the intersections
+            cov += (-1)**(n_comb + 1) * cov_c
+
+    return cov, covs
+
+
+def cov_cluster_multi(results, groups, use_correction=True):
+    '''cluster robust covariance matrix for several cluster dimensions
+
+    Parameters
+    ----------
+    results : result instance
+       result of a regression or likelihood model, uses the scores of the
+       observations and the hessian
+    groups : array_like, (nobs, n_dims) or list of n_dims arrays
+       labels for each clustering dimension, the dimensions don't need to
+       be nested
+    use_correction : bool
+       If true (default), then the small sample correction factor is used
+       for each term.
+
+    Returns
+    -------
+    cov : ndarray, (k_vars, k_vars)
+        cluster robust covariance matrix for parameter estimates
+
+    Notes
+    -----
+    This is the inclusion-exclusion sum of Cameron, Gelbach and Miller
+    over the covariances clustered by all intersections of the cluster
+    dimensions, which are added for an odd and subtracted for an even
+    number of dimensions.  With two dimensions this is the same as
+    `cov_cluster_2groups`.  The result is not guaranteed to be positive
+    semi-definite.
+
+    The labels are converted to integer codes once, and the intersections
+    are coded from the lower order intersections.  Scores are summed
+    within groups by a product with a sparse indicator matrix.
+
+    References
+    ----------
+    Cameron, A. C., Gelbach, J. B. and Miller, D. L. (2011).  Robust
+    inference with multiway clustering.  Journal of Business & Economic
+    Statistics 29(2), 238-249.
+    '''
+    if hasattr(groups, 'values'):
+        groups = groups.values
+    if isinstance(groups, np.ndarray):
+        if groups.ndim == 1:
+            groups = groups[:, None]
+        groups = groups.T
+    return _cov_cluster_multi(results, list(groups),
+                              use_correction=use_correction)[0]
 
 
 def cov_white_simple(results, use_correction=True):
@@ -661,7 +997,7 @@ def cov_white_simple(results, use_correction=True):
 
 
 def cov_hac_simple(results, nlags=None, weights_func=weights_bartlett,
-                   use_correction=True):
+                   use_correction=True, chunk_size=None):
     '''
     heteroscedasticity and autocorrelation robust covariance matrix (Newey-West)
 
@@ -680,6 +1016,10 @@ def cov_hac_simple(results, nlags=None, weights_func=weights_bartlett,
     weights_func : callable
         weights_func is called with nlags as argument to get the kernel
         weights. default are Bartlett weights
+    chunk_size : None or int
+        If not None, then the inner covariance matrix is accumulated over
+        chunks of chunk_size observations with S_hac_stream.  For regression
+        results the products wexog * wresid are formed chunk by chunk.
 
     Returns
     -------
@@ -693,18 +1033,57 @@ def cov_hac_simple(results, nlags=None, weights_func=weights_bartlett,
 
     options might change when other kernels besides Bartlett are available.
 
+    For more than 20 lags the inner covariance matrix is computed with
+    S_hac_fft, which costs the same for any number of lags.
+
     '''
-    xu, hessian_inv = _get_sandwich_arrays(results)
-    sigma = S_hac_simple(xu, nlags=nlags, weights_func=weights_func)
+    if chunk_size is not None:
+        xu_chunks, hessian_inv, nobs = _get_sandwich_chunks(results,
+                                                            chunk_size)
+        k_params = hessian_inv.shape[0]
+        if nlags is None:
+            nlags = int(np.floor(4 * (nobs / 100.)**(2./9.)))
+        sigma = S_hac_stream(xu_chunks, nlags, weights_func=weights_func)
+    else:
+        xu, hessian_inv = _get_sandwich_arrays(results)
+        nobs, k_params = xu.shape
+        if nlags is not None and nlags > 20:
+            sigma = S_hac_fft(xu, nlags=nlags, weights_func=weights_func)
+        else:
+            sigma = S_hac_simple(xu, nlags=nlags, weights_func=weights_func)
 
     cov_hac = _HCCM2(hessian_inv, sigma)
 
     if use_correction:
-        nobs, k_params = xu.shape
         cov_hac *= nobs / float(nobs - k_params)
 
     return cov_hac
 
+
+def _get_sandwich_chunks(results, chunk_size):
+    '''generator for the chunks of the scores and the hessian_inv
+
+    Regression results without score_obs form wexog * wresid for each chunk,
+    so that the full nobs x k_vars array is not created.
+    '''
+    if hasattr(results, '_results'):
+        results = results._results
+    model = getattr(results, 'model', None)
+    if (model is not None and not hasattr(model, 'jac') and
+            not hasattr(model, 'score_obs') and
+            not hasattr(model, 'freq_weights')):
+        wexog = model.wexog
+        wresid = results.wresid
+        nobs = wexog.shape[0]
+        hessian_inv = np.asarray(results.normalized_cov_params)
+        chunks = (wexog[i:i+chunk_size] * wresid[i:i+chunk_size, None]
+                  for i in range(0, nobs, chunk_size))
+    else:
+        xu, hessian_inv = _get_sandwich_arrays(results)
+        nobs = xu.shape[0]
+        chunks = (xu[i:i+chunk_size] for i in range(0, nobs, chunk_size))
+    return chunks, hessian_inv, nobs
+
 cov_hac = cov_hac_simple   #alias for users
 
 #---------------------- use time lags corrected for groups
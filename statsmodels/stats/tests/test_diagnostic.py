@@ -786,6 +786,70 @@ def test_influence_dtype():
     assert_almost_equal(cr1, cr3, decimal=8)
 
 
+def test_influence_looo_closed_form():
+    # compare closed form leave-one-observation-out with explicit refits
+    np.random.seed(98765)
+    nobs = 50
+    x = add_constant(np.random.randn(nobs, 3))
+    y = x.sum(1) + np.random.standard_t(3, size=nobs)
+    res = OLS(y, x).fit()
+    infl = oi.OLSInfluence(res)
+    # use several blocks of observations
+    infl.chunksize = 7
+
+    params = np.zeros((nobs, 4))
+    mse_resid = np.zeros(nobs)
+    det_cov = np.zeros(nobs)
+    for i in range(nobs):
+        mask = np.arange(nobs) != i
+        res_i = OLS(y[mask], x[mask]).fit()
+        params[i] = res_i.params
+        mse_resid[i] = res_i.mse_resid
+        det_cov[i] = np.linalg.det(res_i.cov_params())
+
+    assert_allclose(infl.params_not_obsi, params, rtol=1e-10)
+    assert_allclose(infl.sigma2_not_obsi, mse_resid, rtol=1e-10)
+    assert_allclose(infl.det_cov_params_not_obsi, det_cov, rtol=1e-9)
+    cov_ratio = det_cov / np.linalg.det(res.cov_params())
+    assert_allclose(infl.cov_ratio, cov_ratio, rtol=1e-9)
+    dfbetas = (res.params - params) / np.sqrt(mse_resid[:, None])
+    dfbetas /= np.sqrt(np.diag(res.normalized_cov_params))
+    assert_allclose(infl.dfbetas, dfbetas, rtol=1e-9)
+
+
+def test_variance_inflation_factors():
+    np.random.seed(2468)
+    nobs = 100
+    x = np.random.randn(nobs, 4)
+    x[:, 3] += 0.9 * x[:, 0]
+    exog = add_constant(x)
+    for ex in [exog, x, np.column_stack((x, np.ones(nobs)))]:
+        k_vars = ex.shape[1]
+        vif2 = [oi.variance_inflation_factor(ex, i) for i in range(k_vars)]
+        assert_allclose(oi.variance_inflation_factors(ex), vif2, rtol=1e-12)
+        # chunked and streamed exog
+        vif1 = oi.variance_inflation_factors(ex, chunksize=13)
+        assert_allclose(vif1, vif2, rtol=1e-12)
+        vif1 = oi.variance_inflation_factors(iter(np.array_split(ex, 7)))
+        assert_allclose(vif1, vif2, rtol=1e-12)
+        # nested list is a design matrix, not a sequence of blocks
+        vif1 = oi.variance_inflation_factors(ex.tolist())
+        assert_allclose(vif1, vif2, rtol=1e-12)
+
+    # singular design, the last column is in the span of columns 1 and 2
+    exog_s = np.column_stack((exog, exog[:, 1] + exog[:, 2]))
+    vif1 = oi.variance_inflation_factors(exog_s)
+    assert_equal(np.isinf(vif1), [False, True, True, False, False, True])
+    vif2 = [oi.variance_inflation_factor(exog_s, i) for i in [0, 3, 4]]
+    assert_allclose(vif1[[0, 3, 4]], vif2, rtol=1e-10)
+
+    import pandas as pd
+    exog_df = pd.DataFrame(exog, columns=['const', 'a', 'b', 'c', 'd'])
+    vif1 = oi.variance_inflation_factors(exog_df)
+    assert_equal(vif1.index.tolist(), ['const', 'a', 'b', 'c', 'd'])
+    assert_allclose(vif1.values, oi.variance_inflation_factors(exog))
+
+
 def test_outlier_test():
     # results from R with NA -> 1. Just testing interface here because
     # outlier_test is just a wrapper
@@ -10,9 +10,12 @@ Created on Sat Dec 17 08:39:16 2011
 Author: Josef Perktold
 """
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_almost_equal, assert_allclose, assert_equal
 
 from statsmodels.regression.linear_model import OLS, GLSAR
+from statsmodels.genmod.generalized_linear_model import GLM
+from statsmodels.genmod import families
+from statsmodels.discrete.discrete_model import Poisson
 from statsmodels.tools.tools import add_constant
 import statsmodels.stats.sandwich_covariance as sw
 #import statsmodels.sandbox.panel.sandwich_covariance_generic as swg
@@ -52,6 +55,53 @@ def test_cov_cluster_2groups():
     assert_almost_equal(bse_1, bse_pet1, decimal=4)
     assert_almost_equal(bse_01, bse_pet01, decimal=4)
 
+def test_cov_cluster_multi():
+    np.random.seed(1234)
+    nobs = 500
+    groups = np.column_stack((np.random.randint(0, 40, nobs),
+                              np.random.randint(0, 15, nobs),
+                              np.random.randint(0, 4, nobs)))
+    exog = add_constant(np.random.randn(nobs, 2))
+    endog = np.random.poisson(np.exp(0.2 * exog.sum(1)))
+    res = OLS(endog, exog).fit()
+
+    # two-way is the same as cov_cluster_2groups
+    cov2 = sw.cov_cluster_multi(res, groups[:, :2])
+    assert_allclose(cov2, sw.cov_cluster_2groups(res, groups[:, :2])[0],
+                    rtol=1e-12)
+
+    # three-way inclusion-exclusion with string labels for intersections
+    labels = groups.astype(str)
+    def inter(*cols):
+        return np.array(['-'.join(row) for row in labels[:, list(cols)]])
+    cov3 = (sw.cov_cluster(res, labels[:, 0]) +
+            sw.cov_cluster(res, labels[:, 1]) +
+            sw.cov_cluster(res, labels[:, 2]) -
+            sw.cov_cluster(res, inter(0, 1)) -
+            sw.cov_cluster(res, inter(0, 2)) -
+            sw.cov_cluster(res, inter(1, 2)) +
+            sw.cov_cluster(res, inter(0, 1, 2)))
+    assert_allclose(sw.cov_cluster_multi(res, groups), cov3, rtol=1e-12)
+    assert_allclose(sw.cov_cluster_multi(res, list(labels.T)), cov3,
+                    rtol=1e-12)
+    # one dimension and non-consecutive labels
+    assert_allclose(sw.cov_cluster_multi(res, 7 * groups[:, 0] + 10**6),
+                    sw.cov_cluster(res, groups[:, 0]), rtol=1e-12)
+
+    # through get_robustcov_results
+    cov_kwds = {'groups': groups}
+    for res in [OLS(endog, exog).fit(cov_type='cluster', cov_kwds=cov_kwds),
+                GLM(endog, exog, family=families.Poisson()).fit(
+                    cov_type='cluster', cov_kwds=cov_kwds),
+                Poisson(endog, exog).fit(disp=False, cov_type='cluster',
+                                         cov_kwds=cov_kwds)]:
+        assert_allclose(res.cov_params(),
+                        sw.cov_cluster_multi(res, groups), rtol=1e-12)
+        assert_equal(res.n_groups, (40, 15, 4))
+        # degrees of freedom of the smallest cluster dimension
+        assert_equal(res.df_resid_inference, 3)
+
+
 def test_hac_simple():
 
     from statsmodels.datasets import macrodata
@@ -89,6 +139,81 @@ def test_hac_simple():
     cov4 = sw.cov_hac_simple(res_olsg, nlags=4, use_correction=False)
     assert_almost_equal(cov3, cov4, decimal=14)
 
+
+def test_hac_fft_stream():
+    np.random.seed(987)
+    e = np.random.randn(301, 3)
+    x = e[1:] + 0.6 * e[:-1]
+    for weights_func in [sw.weights_bartlett, sw.weights_uniform,
+                         sw.weights_parzen]:
+        for nlags in [0, 1, 5, 40, 400]:
+            s1 = sw.S_hac_simple(x, nlags=nlags, weights_func=weights_func)
+            s2 = sw.S_hac_fft(x, nlags=nlags, weights_func=weights_func)
+            assert_allclose(s2, s1, rtol=1e-12, atol=1e-12)
+            # chunks shorter and longer than nlags
+            for n_chunks in [1, 7, 60]:
+                s3 = sw.S_hac_stream(np.array_split(x, n_chunks), nlags,
+                                     weights_func=weights_func)
+                assert_allclose(s3, s1, rtol=1e-12, atol=1e-12)
+
+
+def test_hac_nlags():
+    np.random.seed(3287)
+    nobs = 5000
+    e = np.random.randn(nobs + 1, 2)
+    x = e[1:] + 0.5 * e[:-1]
+
+    # Newey-West plug-in for the sum of the columns
+    xw = x.sum(1)
+    sigma = [np.dot(xw[j:], xw[:nobs - j]) / nobs for j in range(10)]
+    s0 = sigma[0] + 2 * np.sum(sigma[1:])
+    s1 = 2 * np.sum(np.arange(1, 10) * sigma[1:])
+    nlags = int(1.1447 * ((s1 / s0)**2 * nobs)**(1. / 3))
+    assert_equal(sw.hac_nlags(x), nlags)
+
+    # Andrews AR(1) plug-in is close to the value for the true rho of a
+    # long AR(1) series
+    y = np.zeros(nobs)
+    for t in range(1, nobs):
+        y[t] = 0.6 * y[t - 1] + e[t, 0]
+    alpha1 = 4 * 0.6**2 / (0.4**2 * 1.6**2)
+    bw1 = 1.1447 * (alpha1 * nobs)**(1. / 3)
+    assert_allclose(sw.hac_nlags(y, method='andrews'), bw1, rtol=0.15)
+    alpha2 = 4 * 0.6**2 / 0.4**4
+    bw2 = 2.6614 * (alpha2 * nobs)**(1. / 5)
+    assert_allclose(sw.hac_nlags(y, method='andrews',
+                                 weights_func=sw.weights_parzen),
+                    bw2, rtol=0.15)
+
+
+def test_hac_robustcov():
+    from statsmodels.datasets import macrodata
+    d2 = macrodata.load().data
+    g_gdp = 400*np.diff(np.log(d2['realgdp']))
+    g_inv = 400*np.diff(np.log(d2['realinv']))
+    exogg = add_constant(np.c_[g_gdp, d2['realint'][:-1]])
+
+    for mod in [OLS(g_inv, exogg), GLM(g_inv, exogg)]:
+        res = mod.fit(cov_type='HAC', cov_kwds={'lag_selection': 'andrews'})
+        nlags = res.cov_kwds['maxlags']
+        xu = sw._get_sandwich_arrays(res)[0]
+        assert_equal(nlags, sw.hac_nlags(xu, method='andrews',
+                                         weights=[0, 1, 1]))
+        res2 = mod.fit(cov_type='HAC', cov_kwds={'maxlags': nlags})
+        assert_allclose(res.bse, res2.bse, rtol=1e-12)
+        res3 = mod.fit(cov_type='HAC', cov_kwds={'maxlags': nlags,
+                                                 'chunk_size': 17})
+        assert_allclose(res3.bse, res2.bse, rtol=1e-12)
+
+    # many lags use the FFT
+    res = OLS(g_inv, exogg).fit()
+    cov1 = sw.cov_hac_simple(res, nlags=50)
+    cov2 = sw._HCCM2(res.normalized_cov_params,
+                     sw.S_hac_simple(res.model.wexog * res.wresid[:, None],
+                                     nlags=50))
+    assert_allclose(cov1, cov2 * 202. / 199, rtol=1e-12)
+
+
 if __name__ == '__main__':
     import nose
     nose.runmodule(argv=[__file__, '-vvs', '-x'], exit=False)
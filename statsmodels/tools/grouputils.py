@@ -80,6 +80,34 @@ def combine_indices(groups, prefix='', sep='.', return_labels=False):
         return uni_inv, uni_idx, uni
 
 
+def compress_rows(arrays, weights=None):
+    """unique rows of several arrays and their frequencies
+
+    Parameters
+    ----------
+    arrays : list of array-like
+        1d or 2d arrays with the same number of rows, None entries are
+        ignored.  The rows of the column-stacked arrays are compared.
+    weights : None or array-like
+        Frequency weights of the rows.
+
+    Returns
+    -------
+    index : ndarray
+        Index of the first occurrence of each unique row.
+    inverse : ndarray
+        Position of each row in the unique rows, ``index[inverse]`` selects
+        a row equal to each original row.
+    counts : ndarray
+        Number of rows, or sum of weights, for each unique row.
+    """
+    x = np.column_stack([np.asarray(arr, dtype=np.float64)
+                         for arr in arrays if arr is not None])
+    inverse, index, _ = combine_indices(x)
+    counts = np.bincount(inverse, weights=weights)
+    return index, inverse, counts
+
+
 # written for and used in try_covariance_grouploop.py
 def group_sums(x, group, use_bincount=True):
     """simple bincount version, again
@@ -175,9 +203,10 @@ def dummy_sparse(groups):
     """
     from scipy import sparse
 
+    groups = np.asarray(groups)
     indptr = np.arange(len(groups)+1)
     data = np.ones(len(groups), dtype=np.int8)
-    indi = sparse.csr_matrix((data, g, indptr))
+    indi = sparse.csr_matrix((data, groups, indptr))
 
     return indi
 
@@ -0,0 +1,29 @@
+import numpy as np
+from numpy.testing import assert_equal, assert_, assert_raises
+
+from statsmodels.tools.cross_val import KFold
+
+
+def test_kfold():
+    # folds partition the observations and have almost equal size
+    for shuffle in False, True:
+        kf = KFold(10, 4, shuffle=shuffle, random_state=123)
+        tests = [test for train, test in kf]
+        assert_equal([t.sum() for t in tests], [3, 3, 2, 2])
+        assert_equal(np.sum(tests, 0), np.ones(10))
+        for train, test in kf:
+            assert_equal(train, ~test)
+
+    kf = KFold(6, 2)
+    assert_equal([np.flatnonzero(test) for train, test in kf],
+                 [[0, 1, 2], [3, 4, 5]])
+
+    tests1 = [test for train, test in KFold(20, 3, shuffle=True,
+                                            random_state=5)]
+    tests2 = [test for train, test in KFold(20, 3, shuffle=True,
+                                            random_state=5)]
+    assert_equal(tests1, tests2)
+    assert_(not np.all(tests1[0][:7]))
+
+    assert_raises(ValueError, KFold, 5, 6)
+    assert_raises(ValueError, KFold, 5, 0)
@@ -248,3 +248,24 @@ def test_init_api():
     grouping = Grouping(list_groups)
     np.testing.assert_array_equal(grouping.group_names,
                                   ['group0', 'group1', 'group2'])
+
+
+def test_dummy_sparse_function():
+    from statsmodels.tools.grouputils import dummy_sparse
+    groups = np.array([0, 0, 2, 1, 1, 2, 0])
+    indi = dummy_sparse(groups)
+    np.testing.assert_equal(indi.toarray(), categorical(groups, drop=True))
+
+
+def test_compress_rows():
+    from statsmodels.tools.grouputils import compress_rows
+    y = np.array([1, 0, 1, 1, 0, 1])
+    x = np.array([[1, 2], [1, 2], [1, 2], [0, 2], [1, 2], [1, 2]])
+    index, inverse, counts = compress_rows([y, x, None])
+    np.testing.assert_equal(len(index), 3)
+    np.testing.assert_equal(y[index][inverse], y)
+    np.testing.assert_equal(x[index][inverse], x)
+    np.testing.assert_equal(counts.sum(), 6)
+    np.testing.assert_equal(counts[inverse[0]], 3)
+    _, _, wcounts = compress_rows([y, x], weights=np.arange(6.))
+    np.testing.assert_equal(wcounts[inverse[0]], 0 + 2 + 5)
@@ -6,6 +6,7 @@ import numpy as np
 import numpy.lib.recfunctions as nprf
 import numpy.linalg as L
 from scipy.linalg import svdvals
+from scipy import sparse
 import pandas as pd
 
 from statsmodels.datasets import webuse
@@ -352,6 +353,60 @@ def pinv_extended(X, rcond=1e-15):
     return res, s_orig
 
 
+def _scale_rows(x, weights):
+    """
+    Multiply the rows of a dense or scipy.sparse 2d array by weights
+    """
+    if sparse.issparse(x):
+        return sparse.diags(weights).dot(x).tocsr()
+    return np.asarray(weights)[:, None] * x
+
+
+def _crossprod(x, weights=None):
+    """
+    Return the dense matrix x' diag(weights) x
+
+    x can be a scipy.sparse matrix, in which case the product is assembled
+    without converting x to a dense array.
+    """
+    if sparse.issparse(x):
+        x = x.tocsr()
+        wx = x if weights is None else _scale_rows(x, weights)
+        return x.T.dot(wx).toarray()
+    x = np.asarray(x)
+    wx = x if weights is None else _scale_rows(x, weights)
+    return np.dot(x.T, wx)
+
+
+def _pinv_crossprod(xtx):
+    """
+    Pseudoinverse, singular values and rank for a cross-product matrix
+
+    Parameters
+    ----------
+    xtx : ndarray
+        Symmetric positive semi-definite matrix x'x
+
+    Returns
+    -------
+    pinv : ndarray
+        Moore-Penrose pseudoinverse of xtx, this is pinv(x) pinv(x)'.
+    singular_values : ndarray
+        Singular values of x in decreasing order.
+    rank : int
+        Rank of x.
+    """
+    eigvals, eigvecs = np.linalg.eigh(xtx)
+    eigvals = np.clip(eigvals[::-1], 0, np.inf)
+    eigvecs = eigvecs[:, ::-1]
+    tol = eigvals[0] * xtx.shape[0] * np.finfo(float).eps
+    rank = int((eigvals > tol).sum())
+    inv_eigvals = np.zeros_like(eigvals)
+    inv_eigvals[:rank] = 1. / eigvals[:rank]
+    pinv = np.dot(eigvecs * inv_eigvals, eigvecs.T)
+    return pinv, np.sqrt(eigvals), rank
+
+
 def recipr(X):
     """
     Return the reciprocal of an array, setting all entries less than or